@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os.path
+from abc import abstractmethod
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
+
+from mephisto.utils.logger_core import get_logger
+
+if TYPE_CHECKING:
+    from mephisto.abstractions.database import MephistoDB
+    from mephisto.data_model.agent import Agent, OnboardingAgent
+
+JOURNAL_FILE = "state.journal.jsonl"
+
+logger = get_logger(name=__name__)
+
+
+@dataclass
+class JournaledAgentStateArgs:
+    """Args for blueprints whose agent states can journal their live updates"""
+
+    journal_agent_state: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Append each live update to a journal next to the agent state, rather "
+                "than rewriting the whole state. The journal is compacted into the "
+                "state when the whole state is next saved, like on submit."
+            ),
+        },
+    )
+    journal_fsync_interval: int = field(
+        default=0,
+        metadata={
+            "help": (
+                "Flush the agent state journal to disk every this many live updates. "
+                "0 leaves flushing to the OS, which only loses updates if the OS crashes."
+            ),
+        },
+    )
+
+
+class AgentStateJournal:
+    """
+    Append-only JSONL log of the live updates made to an agent state since its
+    last snapshot. Each record is written in a single append, so a crash can at
+    most cut one record short. That record is ignored on reading, and any record
+    appended after it on the same line is recovered.
+    """
+
+    def __init__(self, db: "MephistoDB", path_key: str, fsync_interval: int = 0):
+        self.db = db
+        self.path_key = path_key
+        self.fsync_interval = fsync_interval
+        self._unsynced_records = 0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append the given record to the journal"""
+        self._unsynced_records += 1
+        sync = self.fsync_interval > 0 and self._unsynced_records >= self.fsync_interval
+        self.db.append_text(self.path_key, json.dumps(record) + "\n", sync=sync)
+        if sync:
+            self._unsynced_records = 0
+
+    @staticmethod
+    def _find_appended_record(line: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the record appended after one that was cut short on the given line,
+        which the cut short record didn't end, if there is a complete one
+        """
+        decoder = json.JSONDecoder()
+        start = line.find("{", 1)
+        while start != -1:
+            try:
+                record, end = decoder.raw_decode(line, start)
+                if end == len(line):
+                    return record
+            except json.JSONDecodeError:
+                pass
+            start = line.find("{", start + 1)
+        return None
+
+    def read(self) -> List[Dict[str, Any]]:
+        """Return every complete record in the journal, which must exist"""
+        lines = self.db.read_text(self.path_key).split("\n")
+        # Anything after the last newline is a record that was cut short
+        if lines[-1] != "":
+            logger.warning(f"Ignoring incomplete last record of journal {self.path_key}")
+        records = []
+        for line in lines[:-1]:
+            if line == "":
+                continue
+            try:
+                records.append(json.loads(line))
+                continue
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring incomplete record of journal {self.path_key}")
+            record = self._find_appended_record(line)
+            if record is not None:
+                records.append(record)
+        return records
+
+    def clear(self) -> None:
+        """Remove every record from the journal"""
+        self.db.remove_key(self.path_key)
+        self._unsynced_records = 0
+
+
+class JournaledAgentStateMixin:
+    """
+    Mixin for agent states that can append their live updates to an
+    `AgentStateJournal` rather than rewriting their whole state on every update,
+    when `journal_agent_state` is set in the blueprint args.
+
+    Journals are replayed on load whatever the blueprint args, so records must
+    be idempotent: replaying a record already in the snapshot is a no-op.
+    """
+
+    agent: Union["Agent", "OnboardingAgent"]
+
+    def _get_journal(self) -> AgentStateJournal:
+        """Return the journal of this agent state"""
+        journal = getattr(self, "_journal", None)
+        if journal is None:
+            journal = self._journal = AgentStateJournal(
+                self.agent.db, os.path.join(self.agent.get_data_dir(), JOURNAL_FILE)
+            )
+        return journal
+
+    def _is_journal_enabled(self) -> bool:
+        """Return whether live updates should be journaled, per the blueprint args"""
+        journal_enabled = getattr(self, "_journal_enabled", None)
+        if journal_enabled is None:
+            blueprint_args = self.agent.get_task_run().args.get("blueprint") or {}
+            journal_enabled = bool(blueprint_args.get("journal_agent_state", False))
+            self._get_journal().fsync_interval = int(
+                blueprint_args.get("journal_fsync_interval", 0)
+            )
+            self._journal_enabled = journal_enabled
+        return journal_enabled
+
+    def _journal_update(self, record: Dict[str, Any]) -> bool:
+        """
+        Append the given record to the journal if journaling is enabled,
+        returning false if the caller should save the full state instead
+        """
+        if not self._is_journal_enabled():
+            return False
+        self._get_journal().append(record)
+        self._journal_dirty = True
+        return True
+
+    def _load_journal(self) -> None:
+        """
+        Replay the journal onto the snapshot that was just loaded. The journal
+        is only compacted into the snapshot when the full state is next saved,
+        so that loading never writes.
+        """
+        journal = self._get_journal()
+        self._journal_dirty = self.agent.db.key_exists(journal.path_key)
+        if not self._journal_dirty:
+            return
+        for record in journal.read():
+            self._replay_journal_record(record)
+
+    def _clear_journal(self) -> None:
+        """Remove the journal once the full state has been saved"""
+        if getattr(self, "_journal_dirty", False):
+            self._get_journal().clear()
+            self._journal_dirty = False
+
+    @abstractmethod
+    def _replay_journal_record(self, record: Dict[str, Any]) -> None:
+        """Apply the given journal record to this agent state"""
+        raise NotImplementedError()
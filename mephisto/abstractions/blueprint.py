@@ -99,6 +99,18 @@ class SharedTaskState:
             "default": "No-op function",
         },
     )
+    unit_launch_priority: Callable[["Unit"], float] = field(
+        default_factory=lambda: (lambda unit: 0),
+        metadata={
+            "help": (
+                "Function giving the launch priority of a unit. When launches are limited "
+                "by max_num_concurrent_units, higher priority units are launched first, "
+                "and units of equal priority in the order their assignments were created"
+            ),
+            "type": "Callable[[Unit], float]",
+            "default": "Returns 0 always",
+        },
+    )
 
 
 class BlueprintMixin(ABC):
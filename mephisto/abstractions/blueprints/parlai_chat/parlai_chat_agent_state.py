@@ -9,19 +9,27 @@ from mephisto.abstractions._subcomponents.agent_state import (
     AgentState,
     _AgentStateMetadata,
 )
+from mephisto.abstractions._subcomponents.agent_state_journal import JournaledAgentStateMixin
 import os.path
 import time
 import dataclasses
 
+from mephisto.utils.logger_core import get_logger
+
 if TYPE_CHECKING:
     from mephisto.data_model.agent import Agent
     from mephisto.data_model.packet import Packet
 
+logger = get_logger(name=__name__)
+
 
-class ParlAIChatAgentState(AgentState):
+class ParlAIChatAgentState(JournaledAgentStateMixin, AgentState):
     """
     Holds information about ParlAI-style chat. Data is stored in json files
     containing every act from the ParlAI world.
+
+    With `journal_agent_state`, each act is appended to a journal instead of
+    rewriting the json file, see `JournaledAgentStateMixin`.
     """
 
     def _set_init_state(self, data: Any):
@@ -66,6 +74,7 @@ class ParlAIChatAgentState(AgentState):
                 )
             else:
                 self.metadata = _AgentStateMetadata()
+        self._load_journal()
 
     def get_data(self) -> Dict[str, Any]:
         """Return dict with the messages of this agent"""
@@ -119,6 +128,7 @@ class ParlAIChatAgentState(AgentState):
         """Save all messages from this agent to"""
         agent_file = self._get_expected_data_file()
         self.agent.db.write_dict(agent_file, self.get_data())
+        self._clear_journal()
 
     def update_data(self, live_update: Dict[str, Any]) -> None:
         """
@@ -126,7 +136,19 @@ class ParlAIChatAgentState(AgentState):
         """
         live_update["timestamp"] = time.time()
         self.messages.append(live_update)
-        self.save_data()
+        if not self._journal_update({"index": len(self.messages) - 1, "message": live_update}):
+            self.save_data()
+
+    def _replay_journal_record(self, record: Dict[str, Any]) -> None:
+        """Append the journaled message, unless the snapshot already has it"""
+        if record["index"] < len(self.messages):
+            return
+        if record["index"] > len(self.messages):
+            logger.warning(
+                f"Journal of agent {self.agent.db_id} skips from message "
+                f"{len(self.messages)} to {record['index']}"
+            )
+        self.messages.append(record["message"])
 
     def _update_submit(self, submitted_data: Dict[str, Any]) -> None:
         """Append any final submission to this state"""
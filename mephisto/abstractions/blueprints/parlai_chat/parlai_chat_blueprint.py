@@ -9,6 +9,7 @@ from mephisto.abstractions.blueprint import (
     BlueprintArgs,
     SharedTaskState,
 )
+from mephisto.abstractions._subcomponents.agent_state_journal import JournaledAgentStateArgs
 from mephisto.abstractions.blueprints.mixins.onboarding_required import (
     OnboardingRequired,
     OnboardingSharedState,
@@ -66,7 +67,7 @@ class SharedParlAITaskState(OnboardingSharedState, SharedTaskState):
 
 
 @dataclass
-class ParlAIChatBlueprintArgs(OnboardingRequiredArgs, BlueprintArgs):
+class ParlAIChatBlueprintArgs(JournaledAgentStateArgs, OnboardingRequiredArgs, BlueprintArgs):
     _blueprint_type: str = BLUEPRINT_TYPE_PARLAI_CHAT
     _group: str = field(
         default="ParlAIChatBlueprint",
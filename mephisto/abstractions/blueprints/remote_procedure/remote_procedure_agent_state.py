@@ -6,6 +6,7 @@
 
 from typing import Optional, Dict, Any, TYPE_CHECKING
 from mephisto.abstractions.blueprint import AgentState
+from mephisto.abstractions._subcomponents.agent_state_journal import JournaledAgentStateMixin
 import os
 import time
 from uuid import uuid4
@@ -24,9 +25,12 @@ class RemoteRequest:
         return dict((field.name, getattr(self, field.name)) for field in fields(self))
 
 
-class RemoteProcedureAgentState(AgentState):
+class RemoteProcedureAgentState(JournaledAgentStateMixin, AgentState):
     """
     Holds information about tasks with live interactions in a remote query model.
+
+    With `journal_agent_state`, each request and response is appended to a
+    journal as it happens, see `JournaledAgentStateMixin`.
     """
 
     def _set_init_state(self, data: Any):
@@ -71,6 +75,7 @@ class RemoteProcedureAgentState(AgentState):
             if "start_time" in state:
                 self.metadata.task_start = state["start_time"]
                 self.metadata.task_end = state["end_time"]
+        self._load_journal()
 
     def get_data(self) -> Dict[str, Any]:
         """Return dict with the messages of this agent"""
@@ -94,6 +99,7 @@ class RemoteProcedureAgentState(AgentState):
         """Save all messages from this agent to"""
         agent_file = self._get_expected_data_file()
         self.agent.db.write_dict(agent_file, self.get_data())
+        self._clear_journal()
 
     def update_data(self, live_update: Dict[str, Any]) -> None:
         """
@@ -110,6 +116,7 @@ class RemoteProcedureAgentState(AgentState):
                 timestamp=time.time(),
             )
             self.requests[response_id] = response
+            self._journal_update({"request": response.to_dict()})
         else:
             # incoming
             request = RemoteRequest(
@@ -120,6 +127,12 @@ class RemoteProcedureAgentState(AgentState):
                 timestamp=time.time(),
             )
             self.requests[live_update["request_id"]] = request
+            self._journal_update({"request": request.to_dict()})
+
+    def _replay_journal_record(self, record: Dict[str, Any]) -> None:
+        """Restore the journaled request, replacing any copy from the snapshot"""
+        request = RemoteRequest(**record["request"])
+        self.requests[request.uuid] = request
 
     def _update_submit(self, submitted_data: Dict[str, Any]) -> None:
         """Append any final submission to this state"""
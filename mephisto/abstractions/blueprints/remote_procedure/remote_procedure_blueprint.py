@@ -9,6 +9,7 @@ from mephisto.abstractions.blueprint import (
     BlueprintArgs,
     SharedTaskState,
 )
+from mephisto.abstractions._subcomponents.agent_state_journal import JournaledAgentStateArgs
 from dataclasses import dataclass, field
 from mephisto.abstractions.blueprints.mixins.onboarding_required import (
     OnboardingRequired,
@@ -80,7 +81,11 @@ class SharedRemoteProcedureTaskState(
 
 @dataclass
 class RemoteProcedureBlueprintArgs(
-    ScreenTaskRequiredArgs, OnboardingRequiredArgs, UseGoldUnitArgs, BlueprintArgs
+    JournaledAgentStateArgs,
+    ScreenTaskRequiredArgs,
+    OnboardingRequiredArgs,
+    UseGoldUnitArgs,
+    BlueprintArgs,
 ):
     _blueprint_type: str = BLUEPRINT_TYPE_REMOTE_PROCEDURE
     _group: str = field(
@@ -6,24 +6,40 @@
 
 
 import os
+import threading
+import time
 import warnings
 from abc import ABC
 from abc import abstractmethod
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import Union
 
 from prometheus_client import Histogram  # type: ignore
 
+from mephisto.abstractions.databases.async_database import AsyncMephistoDB
+from mephisto.abstractions.databases.async_database import DEFAULT_AIO_MAX_WORKERS
+from mephisto.abstractions.databases.qualification_cache import (
+    DEFAULT_QUALIFICATION_CACHE_TTL_SECONDS,
+)
+from mephisto.abstractions.databases.qualification_cache import QualificationCache
 from mephisto.data_model.agent import Agent
 from mephisto.data_model.agent import OnboardingAgent
 from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.project import Project
 from mephisto.data_model.qualification import GrantedQualification
 from mephisto.data_model.qualification import Qualification
+from mephisto.data_model.records import AgentRecord
+from mephisto.data_model.records import AssignmentRecord
+from mephisto.data_model.records import UnitRecord
+from mephisto.data_model.records import WorkerRecord
 from mephisto.data_model.requester import Requester
 from mephisto.data_model.task import Task
 from mephisto.data_model.task_run import TaskRun
@@ -32,9 +48,11 @@ from mephisto.data_model.worker import Worker
 from mephisto.operations.registry import get_crowd_provider_from_type
 from mephisto.operations.registry import get_valid_provider_types
 from mephisto.utils.dirs import get_data_dir
+from mephisto.utils.qualifications import QualificationType
+from mephisto.utils.qualifications import worker_is_qualified
 
-
-# TODO(#101) investigate cursors for DB queries as the project scales
+# Number of rows fetched per page by the iter_* methods
+DEFAULT_ITER_BATCH_SIZE = 1000
 
 
 # Initialize histogram for database latency
@@ -53,11 +71,16 @@ GET_TASK_RUN_LATENCY = DATABASE_LATENCY.labels(method="get_task_run")
 FIND_TASK_RUNS_LATENCY = DATABASE_LATENCY.labels(method="find_task_runs")
 UPDATE_TASK_RUN_LATENCY = DATABASE_LATENCY.labels(method="update_task_run")
 NEW_ASSIGNMENT_LATENCY = DATABASE_LATENCY.labels(method="new_assignment")
+NEW_ASSIGNMENTS_BULK_LATENCY = DATABASE_LATENCY.labels(method="new_assignments_bulk")
 GET_ASSIGNMENT_LATENCY = DATABASE_LATENCY.labels(method="get_assignment")
 FIND_ASSIGNMENTS_LATENCY = DATABASE_LATENCY.labels(method="find_assignments")
+SELECT_ASSIGNMENTS_LATENCY = DATABASE_LATENCY.labels(method="select_assignments")
 NEW_UNIT_LATENCY = DATABASE_LATENCY.labels(method="new_unit")
+NEW_UNITS_BULK_LATENCY = DATABASE_LATENCY.labels(method="new_units_bulk")
 GET_UNIT_LATENCY = DATABASE_LATENCY.labels(method="get_unit")
 FIND_UNITS_LATENCY = DATABASE_LATENCY.labels(method="find_units")
+SELECT_UNITS_LATENCY = DATABASE_LATENCY.labels(method="select_units")
+COUNT_UNITS_BY_STATUS_LATENCY = DATABASE_LATENCY.labels(method="count_units_by_status")
 UPDATE_UNIT_LATENCY = DATABASE_LATENCY.labels(method="update_unit")
 NEW_REQUESTER_LATENCY = DATABASE_LATENCY.labels(method="new_requester")
 GET_REQUESTER_LATENCY = DATABASE_LATENCY.labels(method="get_requester")
@@ -65,11 +88,15 @@ FIND_REQUESTERS_LATENCY = DATABASE_LATENCY.labels(method="find_requesters")
 NEW_WORKER_LATENCY = DATABASE_LATENCY.labels(method="new_worker")
 GET_WORKER_LATENCY = DATABASE_LATENCY.labels(method="get_worker")
 FIND_WORKERS_LATENCY = DATABASE_LATENCY.labels(method="find_workers")
+SELECT_WORKERS_LATENCY = DATABASE_LATENCY.labels(method="select_workers")
 NEW_AGENT_LATENCY = DATABASE_LATENCY.labels(method="new_agent")
 GET_AGENT_LATENCY = DATABASE_LATENCY.labels(method="get_agent")
 FIND_AGENTS_LATENCY = DATABASE_LATENCY.labels(method="find_agents")
+SELECT_AGENTS_LATENCY = DATABASE_LATENCY.labels(method="select_agents")
 UPDATE_AGENT_LATENCY = DATABASE_LATENCY.labels(method="update_agent")
 CLEAR_UNIT_AGENT_ASSIGNMENT_LATENCY = DATABASE_LATENCY.labels(method="clear_unit_agent_assignment")
+RESERVE_UNIT_LATENCY = DATABASE_LATENCY.labels(method="reserve_unit")
+CLEAR_UNIT_RESERVATION_LATENCY = DATABASE_LATENCY.labels(method="clear_unit_reservation")
 NEW_ONBOARDING_AGENT_LATENCY = DATABASE_LATENCY.labels(method="new_onboarding_agent")
 GET_ONBOARDING_AGENT_LATENCY = DATABASE_LATENCY.labels(method="get_onboarding_agent")
 FIND_ONBOARDING_AGENTS_LATENCY = DATABASE_LATENCY.labels(method="find_onboarding_agents")
@@ -84,7 +111,11 @@ FIND_GRANT_QUALIFICATION_LATENCY = DATABASE_LATENCY.labels(method="find_granted_
 CHECK_GRANTED_QUALIFICATIONS_LATENCY = DATABASE_LATENCY.labels(
     method="check_granted_qualifications"
 )
+FIND_QUALIFIED_WORKERS_LATENCY = DATABASE_LATENCY.labels(method="find_qualified_workers")
 GET_GRANTED_QUALIFICATION_LATENCY = DATABASE_LATENCY.labels(method="get_granted_qualification")
+GET_WORKER_GRANTED_QUALIFICATION_LATENCY = DATABASE_LATENCY.labels(
+    method="get_worker_granted_qualification"
+)
 REVOKE_QUALIFICATION_LATENCY = DATABASE_LATENCY.labels(method="revoke_qualification")
 NEW_WORKER_REVIEW_LATENCY = DATABASE_LATENCY.labels(method="new_worker_review")
 UPDATE_WORKER_REVIEW_LATENCY = DATABASE_LATENCY.labels(method="update_worker_review")
@@ -99,12 +130,37 @@ class MephistoDB(ABC):
     By default, we use a LocalMesphistoDB located at `mephisto/data/database.db`
     """
 
+    # Number of threads (and so connections) used by the `aio` facade
+    aio_max_workers: int = DEFAULT_AIO_MAX_WORKERS
+    # Whether `get_worker_granted_qualification` lookups are cached, and for how
+    # long in seconds (0 keeps them until a grant or revoke invalidates them)
+    qualification_cache: bool = False
+    qualification_cache_ttl: float = DEFAULT_QUALIFICATION_CACHE_TTL_SECONDS
+    # Whether this class overrides `optimized_load` or `cache_result`, set once
+    # per class so that constructing data model objects can skip both otherwise
+    optimizes_loads: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.optimizes_loads = (
+            cls.optimized_load is not MephistoDB.optimized_load
+            or cls.cache_result is not MephistoDB.cache_result
+        )
+
     def __init__(self, database_path=None):
         """Ensure the database is set up and ready to handle data"""
         if database_path is None:
             database_path = os.path.join(get_data_dir(), "database.db")
         self.db_path = database_path
         self.db_root = os.path.dirname(self.db_path)
+        self._aio: Optional[AsyncMephistoDB] = None
+        self._aio_lock = threading.Lock()
+        self._qualification_cache: Optional[QualificationCache] = None
+        # Unit reservations of the default `_reserve_unit`, by unit id
+        self._unit_reservations: Dict[str, Tuple[str, float]] = {}
+        self._unit_reservations_lock = threading.Lock()
+        if self.qualification_cache:
+            self._qualification_cache = QualificationCache(self.qualification_cache_ttl)
         self.init_tables()
         self.__provider_datastores: Dict[str, Any] = {}
 
@@ -147,6 +203,35 @@ class MephistoDB(ABC):
         """Opportunity to store the result class from a load"""
         return None
 
+    def pin_task_run(self, task_run_id: str) -> None:
+        """
+        Opportunity to keep any cached data for the given task run
+        around for as long as the run is live
+        """
+        return None
+
+    def unpin_task_run(self, task_run_id: str) -> None:
+        """Opportunity to release cached data pinned for the given task run"""
+        return None
+
+    @property
+    def aio(self) -> AsyncMephistoDB:
+        """
+        Awaitable access to this database, running calls on a small executor
+        dedicated to it rather than the event loop's default executor
+        """
+        with self._aio_lock:
+            if self._aio is None:
+                self._aio = AsyncMephistoDB(self, max_workers=self.aio_max_workers)
+            return self._aio
+
+    def _shutdown_aio(self) -> None:
+        """Stop the `aio` executor if it was started"""
+        with self._aio_lock:
+            aio, self._aio = self._aio, None
+        if aio is not None:
+            aio.shutdown()
+
     @abstractmethod
     def shutdown(self) -> None:
         """Do whatever is required to close this database's resources"""
@@ -414,6 +499,59 @@ class MephistoDB(ABC):
             sandbox=sandbox,
         )
 
+    def _new_assignments_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        task_type: str,
+        provider_type: str,
+        count: int,
+        sandbox: bool = True,
+    ) -> List[str]:
+        """
+        new_assignments_bulk implementation. Databases that can batch the
+        inserts should override this, by default it creates assignments one by one.
+        """
+        return [
+            self._new_assignment(
+                task_id=task_id,
+                task_run_id=task_run_id,
+                requester_id=requester_id,
+                task_type=task_type,
+                provider_type=provider_type,
+                sandbox=sandbox,
+            )
+            for _ in range(count)
+        ]
+
+    @NEW_ASSIGNMENTS_BULK_LATENCY.time()
+    def new_assignments_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        task_type: str,
+        provider_type: str,
+        count: int,
+        sandbox: bool = True,
+    ) -> List[str]:
+        """
+        Create `count` new assignments for the given task run at once,
+        returning the ids of the created assignments in creation order
+        """
+        if count <= 0:
+            return []
+        return self._new_assignments_bulk(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            task_type=task_type,
+            provider_type=provider_type,
+            count=count,
+            sandbox=sandbox,
+        )
+
     @abstractmethod
     def _get_assignment(self, assignment_id: str) -> Mapping[str, Any]:
         """get_assignment implementation"""
@@ -465,6 +603,102 @@ class MephistoDB(ABC):
             sandbox=sandbox,
         )
 
+    def _iter_assignments(
+        self,
+        batch_size: int,
+        task_run_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+    ) -> Iterator[Assignment]:
+        """
+        iter_assignments implementation. Databases that support cursors should
+        override this, by default it iterates over the result of find_assignments.
+        """
+        yield from self._find_assignments(
+            task_run_id=task_run_id,
+            task_id=task_id,
+            requester_id=requester_id,
+            task_type=task_type,
+            provider_type=provider_type,
+            sandbox=sandbox,
+        )
+
+    def iter_assignments(
+        self,
+        task_run_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+    ) -> Iterator[Assignment]:
+        """
+        Lazily iterate over the assignments that match the above, loading at most
+        `batch_size` of them at a time. Unlike find_assignments, the results
+        are ordered by id rather than creation date.
+        """
+        assert batch_size > 0, "batch_size must be positive"
+        return self._iter_assignments(
+            batch_size,
+            task_run_id=task_run_id,
+            task_id=task_id,
+            requester_id=requester_id,
+            task_type=task_type,
+            provider_type=provider_type,
+            sandbox=sandbox,
+        )
+
+    def _select_assignments(
+        self,
+        task_run_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+    ) -> List[AssignmentRecord]:
+        """
+        select_assignments implementation. Databases that can skip building
+        Assignments should override this, by default it converts the result
+        of find_assignments.
+        """
+        assignments = self._find_assignments(
+            task_run_id=task_run_id,
+            task_id=task_id,
+            requester_id=requester_id,
+            task_type=task_type,
+            provider_type=provider_type,
+            sandbox=sandbox,
+        )
+        return [AssignmentRecord.from_model(assignment) for assignment in assignments]
+
+    @SELECT_ASSIGNMENTS_LATENCY.time()
+    def select_assignments(
+        self,
+        task_run_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+    ) -> List[AssignmentRecord]:
+        """
+        Return the records of the assignments find_assignments would return,
+        in the same order. Use `AssignmentRecord.hydrate` to get an Assignment.
+        """
+        return self._select_assignments(
+            task_run_id=task_run_id,
+            task_id=task_id,
+            requester_id=requester_id,
+            task_type=task_type,
+            provider_type=provider_type,
+            sandbox=sandbox,
+        )
+
     @abstractmethod
     def _new_unit(
         self,
@@ -510,6 +744,66 @@ class MephistoDB(ABC):
             sandbox=sandbox,
         )
 
+    def _new_units_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_keys: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[str]:
+        """
+        new_units_bulk implementation. Databases that can batch the
+        inserts should override this, by default it creates units one by one.
+        """
+        return [
+            self._new_unit(
+                task_id=task_id,
+                task_run_id=task_run_id,
+                requester_id=requester_id,
+                assignment_id=assignment_id,
+                unit_index=unit_index,
+                pay_amount=pay_amount,
+                provider_type=provider_type,
+                task_type=task_type,
+                sandbox=sandbox,
+            )
+            for assignment_id, unit_index in unit_keys
+        ]
+
+    @NEW_UNITS_BULK_LATENCY.time()
+    def new_units_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_keys: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[str]:
+        """
+        Create a new unit for every (assignment_id, unit_index) pair in `unit_keys`
+        at once, returning the ids of the created units in the same order.
+        Raises EntryAlreadyExistsException if any of the pairs already has a unit.
+        """
+        if len(unit_keys) == 0:
+            return []
+        return self._new_units_bulk(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            unit_keys=unit_keys,
+            pay_amount=pay_amount,
+            provider_type=provider_type,
+            task_type=task_type,
+            sandbox=sandbox,
+        )
+
     @abstractmethod
     def _get_unit(self, unit_id: str) -> Mapping[str, Any]:
         """get_unit implementation"""
@@ -576,6 +870,159 @@ class MephistoDB(ABC):
             status=status,
         )
 
+    def _iter_units(
+        self,
+        batch_size: int,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        unit_index: Optional[int] = None,
+        provider_type: Optional[str] = None,
+        task_type: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+        status: Optional[str] = None,
+    ) -> Iterator[Unit]:
+        """
+        iter_units implementation. Databases that support cursors should
+        override this, by default it iterates over the result of find_units.
+        """
+        yield from self._find_units(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            assignment_id=assignment_id,
+            unit_index=unit_index,
+            provider_type=provider_type,
+            task_type=task_type,
+            agent_id=agent_id,
+            worker_id=worker_id,
+            sandbox=sandbox,
+            status=status,
+        )
+
+    def iter_units(
+        self,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        unit_index: Optional[int] = None,
+        provider_type: Optional[str] = None,
+        task_type: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+        status: Optional[str] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+    ) -> Iterator[Unit]:
+        """
+        Lazily iterate over the units that match the above, loading at most
+        `batch_size` of them at a time. Unlike find_units, the results
+        are ordered by id rather than creation date.
+        """
+        assert batch_size > 0, "batch_size must be positive"
+        return self._iter_units(
+            batch_size,
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            assignment_id=assignment_id,
+            unit_index=unit_index,
+            provider_type=provider_type,
+            task_type=task_type,
+            agent_id=agent_id,
+            worker_id=worker_id,
+            sandbox=sandbox,
+            status=status,
+        )
+
+    def _select_units(
+        self,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        unit_index: Optional[int] = None,
+        provider_type: Optional[str] = None,
+        task_type: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+        status: Optional[str] = None,
+    ) -> List[UnitRecord]:
+        """
+        select_units implementation. Databases that can skip building Units
+        should override this, by default it converts the result of find_units.
+        """
+        units = self._find_units(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            assignment_id=assignment_id,
+            unit_index=unit_index,
+            provider_type=provider_type,
+            task_type=task_type,
+            agent_id=agent_id,
+            worker_id=worker_id,
+            sandbox=sandbox,
+            status=status,
+        )
+        return [UnitRecord.from_model(unit) for unit in units]
+
+    @SELECT_UNITS_LATENCY.time()
+    def select_units(
+        self,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        unit_index: Optional[int] = None,
+        provider_type: Optional[str] = None,
+        task_type: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+        status: Optional[str] = None,
+    ) -> List[UnitRecord]:
+        """
+        Return the records of the units find_units would return, in the same
+        order. Use `UnitRecord.hydrate` to get a Unit.
+        """
+        return self._select_units(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            assignment_id=assignment_id,
+            unit_index=unit_index,
+            provider_type=provider_type,
+            task_type=task_type,
+            agent_id=agent_id,
+            worker_id=worker_id,
+            sandbox=sandbox,
+            status=status,
+        )
+
+    def _count_units_by_status(self, task_run_id: str) -> Dict[str, int]:
+        """
+        count_units_by_status implementation. Databases that can aggregate
+        should override this, by default it counts the result of find_units.
+        """
+        counts = {status: 0 for status in AssignmentState.valid_unit()}
+        for unit in self._find_units(task_run_id=task_run_id):
+            counts[unit.db_status] += 1
+        return counts
+
+    @COUNT_UNITS_BY_STATUS_LATENCY.time()
+    def count_units_by_status(self, task_run_id: str) -> Dict[str, int]:
+        """
+        Return the number of units of the given task run in each of the
+        valid unit statuses, as currently stored in the database
+        """
+        return self._count_units_by_status(task_run_id=task_run_id)
+
     @abstractmethod
     def _clear_unit_agent_assignment(self, unit_id: str) -> None:
         """clear_unit_agent_assignment implementation"""
@@ -589,6 +1036,48 @@ class MephistoDB(ABC):
         """
         return self._clear_unit_agent_assignment(unit_id=unit_id)
 
+    def _reserve_unit(
+        self, unit_ids: List[str], reserved_by: str, lease_seconds: float
+    ) -> Optional[str]:
+        """
+        reserve_unit implementation. Reservations are only kept in this process by
+        default, databases shared by several processes should override this.
+        """
+        now = time.time()
+        with self._unit_reservations_lock:
+            for unit_id in unit_ids:
+                reservation = self._unit_reservations.get(unit_id)
+                if reservation is None or reservation[1] <= now:
+                    self._unit_reservations[unit_id] = (reserved_by, now + lease_seconds)
+                    return unit_id
+        return None
+
+    @RESERVE_UNIT_LATENCY.time()
+    def reserve_unit(
+        self, unit_ids: List[str], reserved_by: str, lease_seconds: float
+    ) -> Optional[str]:
+        """
+        Atomically reserve the first of the given units that isn't already reserved,
+        or whose reservation has expired, for `lease_seconds`. Return the id of the
+        reserved unit, or None if all of them are taken.
+
+        Reservations expire so that units held by a process that crashed become
+        available again without any cleanup.
+        """
+        return self._reserve_unit(
+            unit_ids=unit_ids, reserved_by=reserved_by, lease_seconds=lease_seconds
+        )
+
+    def _clear_unit_reservation(self, unit_id: str) -> None:
+        """clear_unit_reservation implementation, see `_reserve_unit`"""
+        with self._unit_reservations_lock:
+            self._unit_reservations.pop(unit_id, None)
+
+    @CLEAR_UNIT_RESERVATION_LATENCY.time()
+    def clear_unit_reservation(self, unit_id: str) -> None:
+        """Release the reservation held on the given unit, if any"""
+        return self._clear_unit_reservation(unit_id=unit_id)
+
     @abstractmethod
     def _update_unit(
         self, unit_id: str, agent_id: Optional[str] = None, status: Optional[str] = None
@@ -701,6 +1190,26 @@ class MephistoDB(ABC):
         """
         return self._find_workers(worker_name=worker_name, provider_type=provider_type)
 
+    def _select_workers(
+        self, worker_name: Optional[str] = None, provider_type: Optional[str] = None
+    ) -> List[WorkerRecord]:
+        """
+        select_workers implementation. Databases that can skip building Workers
+        should override this, by default it converts the result of find_workers.
+        """
+        workers = self._find_workers(worker_name=worker_name, provider_type=provider_type)
+        return [WorkerRecord.from_model(worker) for worker in workers]
+
+    @SELECT_WORKERS_LATENCY.time()
+    def select_workers(
+        self, worker_name: Optional[str] = None, provider_type: Optional[str] = None
+    ) -> List[WorkerRecord]:
+        """
+        Return the records of the workers find_workers would return, in the same
+        order. Use `WorkerRecord.hydrate` to get a Worker.
+        """
+        return self._select_workers(worker_name=worker_name, provider_type=provider_type)
+
     @abstractmethod
     def _new_agent(
         self,
@@ -812,6 +1321,117 @@ class MephistoDB(ABC):
             provider_type=provider_type,
         )
 
+    def _iter_agents(
+        self,
+        batch_size: int,
+        status: Optional[str] = None,
+        unit_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+    ) -> Iterator[Agent]:
+        """
+        iter_agents implementation. Databases that support cursors should
+        override this, by default it iterates over the result of find_agents.
+        """
+        yield from self._find_agents(
+            status=status,
+            unit_id=unit_id,
+            worker_id=worker_id,
+            task_id=task_id,
+            task_run_id=task_run_id,
+            assignment_id=assignment_id,
+            task_type=task_type,
+            provider_type=provider_type,
+        )
+
+    def iter_agents(
+        self,
+        status: Optional[str] = None,
+        unit_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+        batch_size: int = DEFAULT_ITER_BATCH_SIZE,
+    ) -> Iterator[Agent]:
+        """
+        Lazily iterate over the agents that match the above, loading at most
+        `batch_size` of them at a time. Unlike find_agents, the results
+        are ordered by id rather than creation date.
+        """
+        assert batch_size > 0, "batch_size must be positive"
+        return self._iter_agents(
+            batch_size,
+            status=status,
+            unit_id=unit_id,
+            worker_id=worker_id,
+            task_id=task_id,
+            task_run_id=task_run_id,
+            assignment_id=assignment_id,
+            task_type=task_type,
+            provider_type=provider_type,
+        )
+
+    def _select_agents(
+        self,
+        status: Optional[str] = None,
+        unit_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+    ) -> List[AgentRecord]:
+        """
+        select_agents implementation. Databases that can skip building Agents
+        should override this, by default it converts the result of find_agents.
+        """
+        agents = self._find_agents(
+            status=status,
+            unit_id=unit_id,
+            worker_id=worker_id,
+            task_id=task_id,
+            task_run_id=task_run_id,
+            assignment_id=assignment_id,
+            task_type=task_type,
+            provider_type=provider_type,
+        )
+        return [AgentRecord.from_model(agent) for agent in agents]
+
+    @SELECT_AGENTS_LATENCY.time()
+    def select_agents(
+        self,
+        status: Optional[str] = None,
+        unit_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+    ) -> List[AgentRecord]:
+        """
+        Return the records of the agents find_agents would return, in the same
+        order. Use `AgentRecord.hydrate` to get an Agent.
+        """
+        return self._select_agents(
+            status=status,
+            unit_id=unit_id,
+            worker_id=worker_id,
+            task_id=task_id,
+            task_run_id=task_run_id,
+            assignment_id=assignment_id,
+            task_type=task_type,
+            provider_type=provider_type,
+        )
+
     @abstractmethod
     def _new_onboarding_agent(
         self, worker_id: str, task_id: str, task_run_id: str, task_type: str
@@ -957,6 +1577,7 @@ class MephistoDB(ABC):
         Remove this qualification from all workers that have it, then delete the qualification
         """
         self._delete_qualification(qualification_name)
+        self._invalidate_qualification_cache()
         for crowd_provider_name in get_valid_provider_types():
             ProviderClass = get_crowd_provider_from_type(crowd_provider_name)
             provider = ProviderClass(self)
@@ -983,11 +1604,12 @@ class MephistoDB(ABC):
         Update the given qualification with the given parameters if possible,
         raise appropriate exception otherwise.
         """
-        return self._update_qualification(
+        self._update_qualification(
             qualification_id=qualification_id,
             name=name,
             description=description,
         )
+        self._invalidate_qualification_cache()
 
     @FIND_GRANT_QUALIFICATION_LATENCY.time()
     def find_granted_qualifications(
@@ -1014,9 +1636,10 @@ class MephistoDB(ABC):
         Grant a worker the given qualification. Update the qualification value if it
         already exists
         """
-        return self._grant_qualification(
+        self._grant_qualification(
             qualification_id=qualification_id, worker_id=worker_id, value=value
         )
+        self._invalidate_qualification_cache(worker_id)
 
     @abstractmethod
     def _check_granted_qualifications(
@@ -1043,6 +1666,44 @@ class MephistoDB(ABC):
             qualification_id=qualification_id, worker_id=worker_id, value=value
         )
 
+    def _find_qualified_workers(
+        self,
+        qualifications: List[QualificationType],
+        worker_ids: Optional[List[str]] = None,
+        provider_type: Optional[str] = None,
+    ) -> Set[str]:
+        """
+        find_qualified_workers implementation. Databases that can evaluate the
+        requirements in bulk should override this, by default it checks every
+        worker with worker_is_qualified.
+        """
+        if worker_ids is None:
+            workers = self._find_workers(provider_type=provider_type)
+        else:
+            workers = [Worker.get(self, worker_id) for worker_id in worker_ids]
+            if provider_type is not None:
+                workers = [w for w in workers if w.provider_type == provider_type]
+        return {w.db_id for w in workers if worker_is_qualified(w, qualifications)}
+
+    @FIND_QUALIFIED_WORKERS_LATENCY.time()
+    def find_qualified_workers(
+        self,
+        qualifications: List[QualificationType],
+        worker_ids: Optional[List[str]] = None,
+        provider_type: Optional[str] = None,
+    ) -> Set[str]:
+        """
+        Return the ids of the workers that meet every given qualification
+        requirement, as checked by worker_is_qualified, among the given workers
+        or, if no worker ids are given, among all workers. Only workers of
+        `provider_type` are considered if it's given.
+        """
+        return self._find_qualified_workers(
+            qualifications=qualifications,
+            worker_ids=worker_ids,
+            provider_type=provider_type,
+        )
+
     @abstractmethod
     def _get_granted_qualification(
         self, qualification_id: str, worker_id: str
@@ -1072,7 +1733,50 @@ class MephistoDB(ABC):
         """
         Remove the given qualification from the given worker
         """
-        return self._revoke_qualification(qualification_id=qualification_id, worker_id=worker_id)
+        self._revoke_qualification(qualification_id=qualification_id, worker_id=worker_id)
+        self._invalidate_qualification_cache(worker_id)
+
+    def _load_worker_granted_qualification(
+        self, worker_id: str, qualification_name: str
+    ) -> Optional[GrantedQualification]:
+        """Read the qualification of the given name granted to the given worker, if any"""
+        found_qualifications = self.find_qualifications(qualification_name)
+        if len(found_qualifications) == 0:
+            return None
+        granted_qualifications = self.check_granted_qualifications(
+            found_qualifications[0].db_id, worker_id
+        )
+        if len(granted_qualifications) == 0:
+            return None
+        return granted_qualifications[0]
+
+    @GET_WORKER_GRANTED_QUALIFICATION_LATENCY.time()
+    def get_worker_granted_qualification(
+        self, worker_id: str, qualification_name: str
+    ) -> Optional[GrantedQualification]:
+        """
+        Return the qualification of the given name granted to the given worker,
+        or None if there is no such qualification or grant. With `qualification_cache`
+        set, lookups are cached per worker and qualification name until the worker is
+        granted or revoked a qualification through this database, or
+        `qualification_cache_ttl` expires.
+        """
+        if self._qualification_cache is None:
+            return self._load_worker_granted_qualification(worker_id, qualification_name)
+        return self._qualification_cache.get_or_load(
+            worker_id,
+            qualification_name,
+            lambda: self._load_worker_granted_qualification(worker_id, qualification_name),
+        )
+
+    def _invalidate_qualification_cache(self, worker_id: Optional[str] = None) -> None:
+        """Drop the cached qualifications of the given worker, or of every worker"""
+        if self._qualification_cache is None:
+            return
+        if worker_id is None:
+            self._qualification_cache.clear()
+        else:
+            self._qualification_cache.invalidate_worker(worker_id)
 
     def _new_worker_review(
         self,
@@ -1174,3 +1878,17 @@ class MephistoDB(ABC):
     def key_exists(self, path_key: str) -> bool:
         """See if the given path refers to a known file"""
         raise NotImplementedError()
+
+    def append_text(self, path_key: str, data_string: str, sync: bool = False):
+        """
+        Append the given text to the given key, flushing it to disk if `sync` is
+        set. Required by agent states that journal their live updates.
+        """
+        raise NotImplementedError()
+
+    def remove_key(self, path_key: str):
+        """
+        Remove any data stored at the given key. Required by agent states that
+        journal their live updates.
+        """
+        raise NotImplementedError()
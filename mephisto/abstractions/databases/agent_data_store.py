@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import gzip
+import os
+import sqlite3
+import threading
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from mephisto.utils.dirs import get_data_dir
+from .connection_pool import SQLiteConnectionPool
+
+FILES_BACKEND = "files"
+SQLITE_BACKEND = "sqlite"
+DEFAULT_AGENT_DATA_BACKEND = FILES_BACKEND
+
+# Name of the file holding all of the agent data of a task run, in its run dir
+PACKED_AGENT_DATA_FILE = "agent_data.db"
+# Files written through `write_dict` by agent states, which can be packed
+AGENT_DATA_FILE_NAMES = ["agent_meta.json", "state.json", "agent_data.json"]
+MAX_CONNECTIONS_PER_RUN = 4
+# Runs whose packed files are kept open at once, least recently used are closed
+MAX_OPEN_RUNS = 64
+
+# Compressed agent data is stored in the gzip format, so it can be recognized
+# by the gzip magic number (JSON can't start with it) and inspected with `zcat`
+GZIP_MAGIC = b"\x1f\x8b"
+DEFAULT_COMPRESSION_THRESHOLD_BYTES = 4096
+COMPRESSION_LEVEL = 6
+
+CREATE_IF_NOT_EXISTS_AGENT_DATA_TABLE = """
+    CREATE TABLE IF NOT EXISTS agent_data (
+        key TEXT PRIMARY KEY,
+        data BLOB NOT NULL,
+        update_date DATETIME DEFAULT(STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW'))
+    );
+"""
+
+
+def compress_agent_data(
+    data: bytes, threshold_bytes: int = DEFAULT_COMPRESSION_THRESHOLD_BYTES
+) -> bytes:
+    """Return the given data gzip compressed if it's at least `threshold_bytes` long"""
+    if len(data) < threshold_bytes or data.startswith(GZIP_MAGIC):
+        return data
+    compressed_data = gzip.compress(data, compresslevel=COMPRESSION_LEVEL, mtime=0)
+    return compressed_data if len(compressed_data) < len(data) else data
+
+
+def decompress_agent_data(data: bytes) -> bytes:
+    """Return the given data decompressed if it was compressed by `compress_agent_data`"""
+    if data.startswith(GZIP_MAGIC):
+        return gzip.decompress(data)
+    return data
+
+
+class AgentDataStore(ABC):
+    """
+    Storage backend for the data that agent states save through
+    `MephistoDB.write_dict` and `read_dict`, addressed by the path of the file
+    that holds it on the default backend
+    """
+
+    @abstractmethod
+    def write(self, path_key: str, data: bytes) -> None:
+        """Store the given data under the given key, replacing any previous data"""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def read(self, path_key: str) -> bytes:
+        """Return the data stored under the given key, raise FileNotFoundError if none"""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def exists(self, path_key: str) -> bool:
+        """See if any data is stored under the given key"""
+        raise NotImplementedError()
+
+    def append(self, path_key: str, data: bytes, sync: bool = False) -> None:
+        """
+        Append the given data to the file at the given key, flushing it to disk
+        if `sync` is set. Appended data is always kept in files, as it's only
+        used for short-lived journals.
+        """
+        os.makedirs(os.path.dirname(path_key), exist_ok=True)
+        with open(path_key, "ab") as data_file:
+            data_file.write(data)
+            if sync:
+                data_file.flush()
+                os.fsync(data_file.fileno())
+
+    def remove(self, path_key: str) -> None:
+        """Remove any data stored under the given key"""
+        if os.path.exists(path_key):
+            os.remove(path_key)
+
+    def close(self) -> None:
+        """Release any resources held by this store"""
+        pass
+
+
+class FileAgentDataStore(AgentDataStore):
+    """Stores the data of every key in its own file, at the path of the key"""
+
+    def write(self, path_key: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path_key), exist_ok=True)
+        with open(path_key, "wb") as data_file:
+            data_file.write(data)
+
+    def read(self, path_key: str) -> bytes:
+        with open(path_key, "rb") as data_file:
+            return data_file.read()
+
+    def exists(self, path_key: str) -> bool:
+        return os.path.exists(path_key)
+
+
+def open_packed_run_pool(run_dir: str) -> SQLiteConnectionPool:
+    """Open a connection pool to the packed agent data of the given run dir"""
+    os.makedirs(run_dir, exist_ok=True)
+    pool = SQLiteConnectionPool(
+        os.path.join(run_dir, PACKED_AGENT_DATA_FILE),
+        max_size=MAX_CONNECTIONS_PER_RUN,
+        row_factory=None,
+        name="agent_data",
+        pragmas=["PRAGMA synchronous = NORMAL;"],
+    )
+    with pool.connection() as conn:
+        conn.execute("PRAGMA journal_mode = WAL;")
+        with conn:
+            conn.execute(CREATE_IF_NOT_EXISTS_AGENT_DATA_TABLE)
+    return pool
+
+
+class SQLiteAgentDataStore(AgentDataStore):
+    """
+    Packs the data of every agent of a task run into a single SQLite file in
+    the run dir, keyed by the path of each file relative to the run dir.
+
+    Runs that already have a packed file are always read from and written to
+    it. Other runs are only packed if `pack_new_runs` is set, otherwise they
+    keep using a file per key. Keys that aren't in a run dir, and files written
+    before a run was packed, are still served from files, so runs can be packed
+    at any time with `pack_run_dir`.
+    """
+
+    def __init__(self, db_root: str, pack_new_runs: bool = True):
+        self.runs_root = os.path.join(get_data_dir(db_root), "runs")
+        self.pack_new_runs = pack_new_runs
+        self._files = FileAgentDataStore()
+        self._pools: "OrderedDict[str, SQLiteConnectionPool]" = OrderedDict()
+        self._pools_lock = threading.Lock()
+
+    def _split_key(self, path_key: str) -> Optional[Tuple[str, str]]:
+        """
+        Return the run dir the given key belongs to, and the key relative to it,
+        or None if the key isn't in a run dir
+        """
+        relative_path = os.path.relpath(path_key, self.runs_root)
+        parts = relative_path.split(os.sep)
+        # <project>/<task_run_id>/<...>/<file>
+        if parts[0] == os.pardir or len(parts) < 4:
+            return None
+        return os.path.join(self.runs_root, parts[0], parts[1]), "/".join(parts[2:])
+
+    def _get_pool(self, run_dir: str, create: bool) -> Optional[SQLiteConnectionPool]:
+        """Return the pool of the given run, if its packed file exists or `create` is set"""
+        with self._pools_lock:
+            pool = self._pools.get(run_dir)
+            if pool is not None:
+                self._pools.move_to_end(run_dir)
+                return pool
+            packed_path = os.path.join(run_dir, PACKED_AGENT_DATA_FILE)
+            if not create and not os.path.exists(packed_path):
+                return None
+            pool = self._pools[run_dir] = open_packed_run_pool(run_dir)
+            if len(self._pools) > MAX_OPEN_RUNS:
+                # Threads still using the evicted pool can keep doing so, its
+                # connections are closed once it's garbage collected
+                _, evicted_pool = self._pools.popitem(last=False)
+                evicted_pool.close_idle()
+            return pool
+
+    def _read_packed(self, path_key: str, only_check: bool = False) -> Optional[bytes]:
+        """Return the packed data of the given key, or None if it isn't packed"""
+        split_key = self._split_key(path_key)
+        if split_key is None:
+            return None
+        run_dir, key = split_key
+        pool = self._get_pool(run_dir, create=False)
+        if pool is None:
+            return None
+        column = "1" if only_check else "data"
+        with pool.connection() as conn:
+            row = conn.execute(
+                f"SELECT {column} FROM agent_data WHERE key = ?;", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return b"" if only_check else bytes(row[0])
+
+    def write(self, path_key: str, data: bytes) -> None:
+        split_key = self._split_key(path_key)
+        if split_key is None:
+            self._files.write(path_key, data)
+            return
+        run_dir, key = split_key
+        pool = self._get_pool(run_dir, create=self.pack_new_runs)
+        if pool is None:
+            self._files.write(path_key, data)
+            return
+        with pool.connection() as conn, conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO agent_data (key, data, update_date)
+                VALUES (?, ?, STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW'));
+                """,
+                (key, sqlite3.Binary(data)),
+            )
+
+    def read(self, path_key: str) -> bytes:
+        data = self._read_packed(path_key)
+        if data is not None:
+            return data
+        return self._files.read(path_key)
+
+    def exists(self, path_key: str) -> bool:
+        packed = self._read_packed(path_key, only_check=True)
+        return packed is not None or self._files.exists(path_key)
+
+    def remove(self, path_key: str) -> None:
+        split_key = self._split_key(path_key)
+        if split_key is not None:
+            run_dir, key = split_key
+            pool = self._get_pool(run_dir, create=False)
+            if pool is not None:
+                with pool.connection() as conn, conn:
+                    conn.execute("DELETE FROM agent_data WHERE key = ?;", (key,))
+        self._files.remove(path_key)
+
+    def close(self) -> None:
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools = OrderedDict()
+
+
+AGENT_DATA_BACKENDS = [FILES_BACKEND, SQLITE_BACKEND]
+
+
+def get_agent_data_store(backend: str, db_root: str) -> AgentDataStore:
+    """
+    Create the agent data store for the given backend name. Both backends
+    read and update runs that were already packed, they only differ in where
+    they put the data of new runs.
+    """
+    if backend not in AGENT_DATA_BACKENDS:
+        raise AssertionError(
+            f"Provided agent data backend {backend} is not valid, "
+            f"expected one of {AGENT_DATA_BACKENDS}"
+        )
+    return SQLiteAgentDataStore(db_root, pack_new_runs=backend == SQLITE_BACKEND)
+
+
+def find_agent_data_files(run_dir: str) -> List[str]:
+    """
+    Return the paths of the agent data files of the given run dir, stored in
+    `<assignment_id or onboarding>/<agent_id>/<file>`
+    """
+    paths = []
+    for group_name in sorted(os.listdir(run_dir)):
+        group_dir = os.path.join(run_dir, group_name)
+        if not os.path.isdir(group_dir):
+            continue
+        for agent_dir_name in sorted(os.listdir(group_dir)):
+            agent_dir = os.path.join(group_dir, agent_dir_name)
+            if not os.path.isdir(agent_dir):
+                continue
+            for file_name in AGENT_DATA_FILE_NAMES:
+                path = os.path.join(agent_dir, file_name)
+                if os.path.isfile(path):
+                    paths.append(path)
+    return paths
+
+
+def pack_run_dir(run_dir: str, remove_files: bool = True, batch_size: int = 1000) -> int:
+    """
+    Move the agent data files of the given run dir into its packed agent data
+    file, returning the number of files packed. Files replace any data already
+    packed under the same key. Runs shouldn't be packed while they're live.
+    """
+    paths = find_agent_data_files(run_dir)
+    if len(paths) == 0:
+        return 0
+    pool = open_packed_run_pool(run_dir)
+    try:
+        for batch_start in range(0, len(paths), batch_size):
+            batch = paths[batch_start : batch_start + batch_size]
+            rows = []
+            for path in batch:
+                with open(path, "rb") as data_file:
+                    key = "/".join(os.path.relpath(path, run_dir).split(os.sep))
+                    rows.append((key, sqlite3.Binary(data_file.read())))
+            with pool.connection() as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO agent_data (key, data) VALUES (?, ?);", rows
+                )
+            if remove_files:
+                for path in batch:
+                    os.remove(path)
+                    agent_dir = os.path.dirname(path)
+                    if len(os.listdir(agent_dir)) == 0:
+                        os.rmdir(agent_dir)
+    finally:
+        pool.close()
+    return len(paths)
+
+
+def find_run_dirs(runs_root: str) -> List[str]:
+    """Return all `<project>/<task_run_id>` run dirs under the given runs root"""
+    run_dirs = []
+    if not os.path.isdir(runs_root):
+        return run_dirs
+    for project_name in sorted(os.listdir(runs_root)):
+        project_dir = os.path.join(runs_root, project_name)
+        if not os.path.isdir(project_dir):
+            continue
+        for run_name in sorted(os.listdir(project_dir)):
+            run_dir = os.path.join(project_dir, run_name)
+            if os.path.isdir(run_dir):
+                run_dirs.append(run_dir)
+    return run_dirs
+
+
+def compress_agent_data_files(
+    paths: Sequence[str], threshold_bytes: int = DEFAULT_COMPRESSION_THRESHOLD_BYTES
+) -> Tuple[int, int]:
+    """
+    Compress the given agent data files in place, returning their total size
+    before and after
+    """
+    size_before = 0
+    size_after = 0
+    for path in paths:
+        with open(path, "rb") as data_file:
+            data = data_file.read()
+        compressed_data = compress_agent_data(data, threshold_bytes)
+        size_before += len(data)
+        size_after += len(compressed_data)
+        if compressed_data is data:
+            continue
+        # Write next to the original and swap, so readers never see a partial file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as data_file:
+            data_file.write(compressed_data)
+        os.replace(tmp_path, path)
+    return size_before, size_after
+
+
+def compress_packed_run(
+    run_dir: str,
+    threshold_bytes: int = DEFAULT_COMPRESSION_THRESHOLD_BYTES,
+    batch_size: int = 1000,
+) -> Tuple[int, int]:
+    """
+    Compress the data packed in the given run dir, returning the size of the
+    packed file before and after
+    """
+    packed_path = os.path.join(run_dir, PACKED_AGENT_DATA_FILE)
+    size_before = os.path.getsize(packed_path)
+    pool = open_packed_run_pool(run_dir)
+    try:
+        with pool.connection() as conn:
+            last_rowid = 0
+            while True:
+                rows = conn.execute(
+                    """
+                    SELECT rowid, data FROM agent_data
+                    WHERE rowid > ? ORDER BY rowid LIMIT ?;
+                    """,
+                    (last_rowid, batch_size),
+                ).fetchall()
+                if len(rows) == 0:
+                    break
+                last_rowid = rows[-1][0]
+                updates = []
+                for rowid, data in rows:
+                    compressed_data = compress_agent_data(bytes(data), threshold_bytes)
+                    if len(compressed_data) != len(data):
+                        updates.append((sqlite3.Binary(compressed_data), rowid))
+                with conn:
+                    conn.executemany("UPDATE agent_data SET data = ? WHERE rowid = ?;", updates)
+            # Give the space freed by compression back to the file system
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+            conn.execute("VACUUM;")
+    finally:
+        pool.close()
+    return size_before, os.path.getsize(packed_path)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Archival of finished task runs out of the main database into per-period shard
+databases, under `archive/` next to it. Archived rows are moved, so the main
+database only holds what live task runs need.
+
+Read connections `ATTACH` the shards, and shadow each archived table with a
+temporary view of the union of the main table and its shard counterparts, so
+that read queries see archived rows without being changed. Writes go to the main
+database only, so archived task runs are read-only.
+
+Shards are created with the schema the main database has when archiving. If a
+later migration adds columns to an archived table, the views read those
+columns as NULL for archived rows.
+"""
+
+import os
+import re
+import sqlite3
+from datetime import date
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.utils.db import MephistoDBException
+from mephisto.utils.logger_core import get_logger
+
+logger = get_logger(name=__name__)
+
+ARCHIVE_DIR_NAME = "archive"
+ARCHIVE_PERIODS = ["year", "quarter", "month"]
+DEFAULT_ARCHIVE_PERIOD = "year"
+
+# Archived tables, with the condition selecting the rows of the given task runs.
+# Rows are deleted from the main database in this order, as reviews are found
+# through the units of the task runs.
+ARCHIVED_TABLES: List[Tuple[str, str]] = [
+    (
+        "worker_review",
+        "unit_id IN (SELECT unit_id FROM main.units WHERE task_run_id IN ({task_run_ids}))",
+    ),
+    ("agents", "task_run_id IN ({task_run_ids})"),
+    ("onboarding_agents", "task_run_id IN ({task_run_ids})"),
+    ("units", "task_run_id IN ({task_run_ids})"),
+    ("assignments", "task_run_id IN ({task_run_ids})"),
+    ("task_runs", "task_run_id IN ({task_run_ids})"),
+]
+
+# Task runs with units in these statuses may still change, so aren't archived
+UNARCHIVABLE_UNIT_STATUSES = AssignmentState.incomplete() + [AssignmentState.COMPLETED]
+
+
+def get_archive_dir(db_path: str) -> str:
+    """Return the directory holding the shards of the given database"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), ARCHIVE_DIR_NAME)
+
+
+def find_archive_shards(db_path: str) -> List[str]:
+    """Return the paths of the shards of the given database, oldest period first"""
+    archive_dir = get_archive_dir(db_path)
+    if not os.path.isdir(archive_dir):
+        return []
+    return [
+        os.path.join(archive_dir, file_name)
+        for file_name in sorted(os.listdir(archive_dir))
+        if file_name.endswith(".db")
+    ]
+
+
+def get_shard_name(creation_date: str, period: str = DEFAULT_ARCHIVE_PERIOD) -> str:
+    """
+    Return the name of the shard holding task runs created on the given date,
+    like `2024`, `2024-Q1` or `2024-01`
+    """
+    year, month = int(creation_date[:4]), int(creation_date[5:7])
+    if period == "year":
+        return f"{year}"
+    elif period == "quarter":
+        return f"{year}-Q{(month - 1) // 3 + 1}"
+    elif period == "month":
+        return f"{year}-{month:02d}"
+    raise AssertionError(f"Archive period must be one of {ARCHIVE_PERIODS}, not {period}")
+
+
+def _get_columns(conn: sqlite3.Connection, schema: str, table_name: str) -> List[str]:
+    """Return the column names of the given table, whatever the connection's row factory"""
+    c = conn.cursor()
+    c.row_factory = None
+    return [r[1] for r in c.execute(f"PRAGMA {schema}.table_info({table_name});")]
+
+
+def attach_archive_shards(conn: sqlite3.Connection, shard_paths: List[str]) -> None:
+    """
+    Attach the given shards to a fresh read connection to the main database, and
+    shadow every archived table with a view of its rows in the main database and
+    in every shard
+    """
+    schemas = []
+    for shard_path in shard_paths:
+        schema = f"archive_{len(schemas)}"
+        try:
+            conn.execute("ATTACH DATABASE ? AS " + schema, (shard_path,))
+        except sqlite3.OperationalError as e:
+            logger.warning(
+                f"Couldn't attach archive shard {shard_path} ({e}), reads won't see "
+                f"the task runs archived in it or in later shards"
+            )
+            break
+        schemas.append(schema)
+    if len(schemas) == 0:
+        return
+
+    for table_name, _ in ARCHIVED_TABLES:
+        columns = _get_columns(conn, "main", table_name)
+        selects = [f"SELECT {', '.join(columns)} FROM main.{table_name}"]
+        for schema in schemas:
+            shard_columns = set(_get_columns(conn, schema, table_name))
+            if len(shard_columns) == 0:
+                continue
+            select_columns = [c if c in shard_columns else f"NULL AS {c}" for c in columns]
+            selects.append(f"SELECT {', '.join(select_columns)} FROM {schema}.{table_name}")
+        conn.execute(f"CREATE TEMP VIEW {table_name} AS {' UNION ALL '.join(selects)};")
+
+
+def find_archivable_task_runs(conn: sqlite3.Connection, before: date) -> List[Tuple[str, str]]:
+    """
+    Return the id and creation date of the completed task runs created before the
+    given date, which have no unit left to work on or review
+    """
+    statuses = ", ".join("?" * len(UNARCHIVABLE_UNIT_STATUSES))
+    rows = conn.execute(
+        f"""
+        SELECT task_run_id, creation_date FROM main.task_runs AS tr
+        WHERE is_completed = 1 AND creation_date < ?
+        AND NOT EXISTS (
+            SELECT 1 FROM main.units AS u
+            WHERE u.task_run_id = tr.task_run_id AND u.status IN ({statuses})
+        )
+        ORDER BY creation_date ASC;
+        """,
+        [before.isoformat(), *UNARCHIVABLE_UNIT_STATUSES],
+    ).fetchall()
+    return [(str(r[0]), r[1]) for r in rows]
+
+
+def _create_shard_schema(conn: sqlite3.Connection, schema: str) -> None:
+    """Create the archived tables and their indices in the attached shard"""
+    for table_name, _ in ARCHIVED_TABLES:
+        rows = conn.execute(
+            "SELECT type, sql FROM main.sqlite_master WHERE tbl_name = ? AND sql IS NOT NULL;",
+            (table_name,),
+        ).fetchall()
+        for object_type, sql in sorted(rows, key=lambda r: r[0] != "table"):
+            if object_type == "table":
+                sql = re.sub(
+                    r"^CREATE TABLE (\"?\w+\"?)",
+                    rf"CREATE TABLE IF NOT EXISTS {schema}.\1",
+                    sql,
+                )
+            elif object_type == "index":
+                sql = re.sub(
+                    r"^CREATE (UNIQUE )?INDEX (\"?\w+\"?)",
+                    rf"CREATE \1INDEX IF NOT EXISTS {schema}.\2",
+                    sql,
+                )
+            else:
+                continue
+            conn.execute(sql)
+
+
+def _move_task_runs(conn: sqlite3.Connection, schema: str, task_run_ids: List[str]) -> None:
+    """Move the rows of the given task runs into the attached shard, in one transaction"""
+    id_list = ", ".join(str(int(task_run_id)) for task_run_id in task_run_ids)
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        for table_name, condition in ARCHIVED_TABLES:
+            shard_columns = set(_get_columns(conn, schema, table_name))
+            columns = ", ".join(
+                c for c in _get_columns(conn, "main", table_name) if c in shard_columns
+            )
+            where = condition.format(task_run_ids=id_list)
+            # Replacing makes re-archiving runs left in both databases by a crash a no-op
+            conn.execute(
+                f"INSERT OR REPLACE INTO {schema}.{table_name} ({columns}) "
+                f"SELECT {columns} FROM main.{table_name} WHERE {where};"
+            )
+        for table_name, condition in ARCHIVED_TABLES:
+            where = condition.format(task_run_ids=id_list)
+            conn.execute(f"DELETE FROM main.{table_name} WHERE {where};")
+        conn.execute("COMMIT;")
+    except BaseException:
+        conn.execute("ROLLBACK;")
+        raise
+
+
+def archive_task_runs(
+    db_path: str,
+    before: date,
+    period: str = DEFAULT_ARCHIVE_PERIOD,
+    task_run_ids: Optional[List[str]] = None,
+) -> Dict[str, List[str]]:
+    """
+    Move the archivable task runs created before the given date, or only the given
+    ones among them, into the shard of the period they were created in. Returns
+    the ids of the archived task runs by shard name.
+
+    Callers must stop other writers of this process for the duration, other
+    processes are kept out by SQLite's locking.
+    """
+    archive_dir = get_archive_dir(db_path)
+    archived: Dict[str, List[str]] = {}
+    try:
+        conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    except sqlite3.Error as e:
+        raise MephistoDBException(e)
+    try:
+        for task_run_id, creation_date in find_archivable_task_runs(conn, before):
+            if task_run_ids is None or task_run_id in task_run_ids:
+                shard_name = get_shard_name(creation_date, period)
+                archived.setdefault(shard_name, []).append(task_run_id)
+        if len(archived) > 0:
+            os.makedirs(archive_dir, exist_ok=True)
+        for shard_name, shard_task_run_ids in archived.items():
+            shard_path = os.path.join(archive_dir, f"{shard_name}.db")
+            conn.execute("ATTACH DATABASE ? AS shard;", (shard_path,))
+            try:
+                _create_shard_schema(conn, "shard")
+                _move_task_runs(conn, "shard", shard_task_run_ids)
+            finally:
+                conn.execute("DETACH DATABASE shard;")
+            logger.info(f"Archived {len(shard_task_run_ids)} task runs into {shard_path}")
+    except sqlite3.Error as e:
+        raise MephistoDBException(e)
+    finally:
+        conn.close()
+    return archived
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import TYPE_CHECKING
+from typing import TypeVar
+
+from prometheus_client import Gauge  # type: ignore
+from prometheus_client import Histogram  # type: ignore
+
+if TYPE_CHECKING:
+    from mephisto.abstractions.database import MephistoDB
+    from mephisto.data_model.qualification import GrantedQualification
+    from mephisto.data_model.unit import Unit
+    from mephisto.data_model.worker import Worker
+    from mephisto.utils.qualifications import QualificationType
+
+DEFAULT_AIO_MAX_WORKERS = 4
+
+AIO_QUEUE_DEPTH = Gauge(
+    "database_aio_queue_depth",
+    "Database calls waiting for a thread of the async database executor",
+)
+AIO_WAIT_TIME = Histogram(
+    "database_aio_wait_seconds",
+    "Time database calls wait for a thread of the async database executor",
+    ["method"],
+)
+
+T = TypeVar("T")
+
+
+class AsyncMephistoDB:
+    """
+    Awaitable facade over a MephistoDB, available as `db.aio`.
+
+    Calls run on a small executor dedicated to the database rather than on the
+    loop's default executor, so they don't compete with other blocking work, and
+    at most `max_workers` of them hold a database connection at once.
+    """
+
+    def __init__(self, db: "MephistoDB", max_workers: int = DEFAULT_AIO_MAX_WORKERS):
+        assert max_workers > 0, "Async database executor needs at least one thread"
+        self.db = db
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="mephisto-db",
+        )
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run the given blocking database call on the executor, recording how long
+        it waited for a free thread
+        """
+        loop = asyncio.get_running_loop()
+        method = getattr(fn, "__name__", "call")
+        queued_at = time.monotonic()
+        AIO_QUEUE_DEPTH.inc()
+
+        def timed_call() -> T:
+            AIO_QUEUE_DEPTH.dec()
+            AIO_WAIT_TIME.labels(method=method).observe(time.monotonic() - queued_at)
+            return fn(*args, **kwargs)
+
+        return await loop.run_in_executor(self._executor, timed_call)
+
+    async def find_workers(
+        self, worker_name: Optional[str] = None, provider_type: Optional[str] = None
+    ) -> List["Worker"]:
+        """Awaitable MephistoDB.find_workers"""
+        return await self.run(
+            self.db.find_workers, worker_name=worker_name, provider_type=provider_type
+        )
+
+    async def find_units(
+        self,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        unit_index: Optional[int] = None,
+        provider_type: Optional[str] = None,
+        task_type: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+        status: Optional[str] = None,
+    ) -> List["Unit"]:
+        """Awaitable MephistoDB.find_units"""
+        return await self.run(
+            self.db.find_units,
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            assignment_id=assignment_id,
+            unit_index=unit_index,
+            provider_type=provider_type,
+            task_type=task_type,
+            agent_id=agent_id,
+            worker_id=worker_id,
+            sandbox=sandbox,
+            status=status,
+        )
+
+    async def new_agent(
+        self,
+        worker_id: str,
+        unit_id: str,
+        task_id: str,
+        task_run_id: str,
+        assignment_id: str,
+        task_type: str,
+        provider_type: str,
+    ) -> str:
+        """Awaitable MephistoDB.new_agent"""
+        return await self.run(
+            self.db.new_agent,
+            worker_id=worker_id,
+            unit_id=unit_id,
+            task_id=task_id,
+            task_run_id=task_run_id,
+            assignment_id=assignment_id,
+            task_type=task_type,
+            provider_type=provider_type,
+        )
+
+    async def check_granted_qualifications(
+        self,
+        qualification_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        value: Optional[int] = None,
+    ) -> List["GrantedQualification"]:
+        """Awaitable MephistoDB.check_granted_qualifications"""
+        return await self.run(
+            self.db.check_granted_qualifications,
+            qualification_id=qualification_id,
+            worker_id=worker_id,
+            value=value,
+        )
+
+    async def find_qualified_workers(
+        self,
+        qualifications: List["QualificationType"],
+        worker_ids: Optional[List[str]] = None,
+        provider_type: Optional[str] = None,
+    ) -> Set[str]:
+        """Awaitable MephistoDB.find_qualified_workers"""
+        return await self.run(
+            self.db.find_qualified_workers,
+            qualifications=qualifications,
+            worker_ids=worker_ids,
+            provider_type=provider_type,
+        )
+
+    def shutdown(self) -> None:
+        """Wait for queued calls to finish and stop the executor threads"""
+        self._executor.shutdown(wait=True)
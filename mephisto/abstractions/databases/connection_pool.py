@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Callable
+from typing import cast
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Type
+
+from prometheus_client import Gauge  # type: ignore
+
+from mephisto.utils.db import MephistoDBException
+
+DEFAULT_MAX_READER_CONNECTIONS = 8
+DEFAULT_MAX_CONNECTIONS = 8
+DEFAULT_BUSY_TIMEOUT_SECONDS = 30
+DEFAULT_MAX_IDLE_SECONDS = 60
+
+POOL_CONNECTIONS = Gauge(
+    "sqlite_pool_connections",
+    "Open connections of SQLite connection pools, by pool and state",
+    ["pool", "state"],
+)
+
+
+def get_read_only_uri(db_path: str, immutable: bool = False) -> str:
+    """
+    Return a `file:` URI opening the given database read-only. `immutable` also
+    skips locking and change detection, so it's only safe for databases no
+    process writes to anymore.
+    """
+    uri = f"file:{urllib.request.pathname2url(os.path.abspath(db_path))}?mode=ro"
+    if immutable:
+        uri += "&immutable=1"
+    return uri
+
+
+class SQLiteConnectionPool:
+    """
+    A bounded pool of SQLite connections to a single database file.
+
+    Connections are opened lazily up to `max_size`, and callers that find the
+    pool exhausted block until another caller checks its connection back in.
+    Connections left idle for more than `max_idle_seconds` are closed.
+
+    When `read_only` is set, every connection is put in `query_only` mode, so
+    the pool can be safely used for concurrent readers of a WAL-mode database
+    without going through the writer lock.
+
+    Connections are created with `connection_factory`, which allows swapping in
+    an instrumented `sqlite3.Connection` subclass, and then passed to `on_connect`
+    if it's set, before `query_only` mode is turned on. If `uri` is set, it's
+    opened instead of `db_path`, e.g. to open the database in `mode=ro`.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_size: int = DEFAULT_MAX_CONNECTIONS,
+        row_factory: Optional[Type[sqlite3.Row]] = sqlite3.Row,
+        read_only: bool = False,
+        timeout: float = DEFAULT_BUSY_TIMEOUT_SECONDS,
+        name: str = "default",
+        max_idle_seconds: float = DEFAULT_MAX_IDLE_SECONDS,
+        pragmas: Sequence[str] = (),
+        connection_factory: Type[sqlite3.Connection] = sqlite3.Connection,
+        on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+        uri: Optional[str] = None,
+    ):
+        assert max_size > 0, "Connection pool must allow at least one connection"
+        self.db_path = db_path
+        self.max_size = max_size
+        self.row_factory = row_factory
+        self.read_only = read_only
+        self.timeout = timeout
+        self.name = name
+        self.max_idle_seconds = max_idle_seconds
+        self.pragmas = list(pragmas)
+        self.connection_factory = connection_factory
+        self.on_connect = on_connect
+        self.uri = uri
+
+        # Idle connections with the time they were checked in, most recent last
+        self._idle: List[Tuple[sqlite3.Connection, float]] = []
+        self._num_open = 0
+        self._available = threading.Condition()
+        self._is_closed = False
+
+        self._active_gauge = POOL_CONNECTIONS.labels(pool=name, state="active")
+        self._idle_gauge = POOL_CONNECTIONS.labels(pool=name, state="idle")
+
+    @property
+    def num_idle(self) -> int:
+        return len(self._idle)
+
+    @property
+    def num_active(self) -> int:
+        return self._num_open - len(self._idle)
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a new connection configured for this pool"""
+        try:
+            conn = sqlite3.connect(
+                self.uri if self.uri is not None else self.db_path,
+                timeout=self.timeout,
+                check_same_thread=False,
+                factory=self.connection_factory,
+                uri=self.uri is not None,
+            )
+            conn.row_factory = self.row_factory
+            for pragma in self.pragmas:
+                conn.execute(pragma)
+            if self.on_connect is not None:
+                self.on_connect(conn)
+            if self.read_only:
+                conn.execute("PRAGMA query_only = ON;")
+        except sqlite3.Error as e:
+            raise MephistoDBException(e)
+        return conn
+
+    def _reap_idle(self) -> None:
+        """Close connections idle for too long. Call with `_available` held."""
+        reap_before = time.monotonic() - self.max_idle_seconds
+        while len(self._idle) > 0 and self._idle[0][1] < reap_before:
+            conn, _ = self._idle.pop(0)
+            conn.close()
+            self._num_open -= 1
+            self._idle_gauge.dec()
+
+    def checkout(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """
+        Take a connection out of the pool, opening a new one if the pool
+        hasn't reached its size limit yet, otherwise waiting for one to be returned.
+        Raises a MephistoDBException if none was returned within `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while True:
+                if self._is_closed:
+                    raise MephistoDBException(f"Connection pool for {self.db_path} is closed")
+                self._reap_idle()
+                if len(self._idle) > 0:
+                    conn, _ = self._idle.pop()
+                    self._idle_gauge.dec()
+                    break
+                if self._num_open < self.max_size:
+                    conn = self._open_connection()
+                    self._num_open += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise MephistoDBException(
+                        f"Timed out waiting for a connection to {self.db_path}"
+                    )
+                self._available.wait(remaining)
+            self._active_gauge.inc()
+        return conn
+
+    def checkin(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, discarding any uncommitted writes"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._available:
+            self._active_gauge.dec()
+            if self._is_closed:
+                conn.close()
+                self._num_open -= 1
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._idle_gauge.inc()
+            self._reap_idle()
+            self._available.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Context manager that checks out a connection and always checks it back in"""
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def close_idle(self) -> None:
+        """Close every idle connection, leaving the pool open"""
+        with self._available:
+            for conn, _ in self._idle:
+                conn.close()
+            self._num_open -= len(self._idle)
+            self._idle_gauge.dec(len(self._idle))
+            self._idle = []
+
+    def close(self) -> None:
+        """
+        Close every idle connection. Connections still checked out are closed
+        when they're checked back in.
+        """
+        with self._available:
+            self._is_closed = True
+            for conn, _ in self._idle:
+                conn.close()
+            self._num_open -= len(self._idle)
+            self._idle_gauge.dec(len(self._idle))
+            self._idle = []
+            self._available.notify_all()
+
+
+class _UnguardedLease:
+    """
+    Connection leased to a thread that doesn't hold the lock of its
+    LeasedConnectionCondition. Used as a context manager, it commits like a
+    `sqlite3.Connection` does, and returns the lease to the pool once the
+    outermost `with` block exits. Everything else is passed to the connection.
+    """
+
+    def __init__(self, condition: "LeasedConnectionCondition", conn: sqlite3.Connection):
+        self._condition = condition
+        self._conn = conn
+        self._depth = 0
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._depth += 1
+        return self._conn.__enter__()
+
+    def __exit__(self, *args) -> None:
+        try:
+            self._conn.__exit__(*args)
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._condition._release_unguarded_lease(self)
+
+
+class LeasedConnectionCondition:
+    """
+    Drop-in replacement for the `threading.Condition` guarding a datastore's
+    tables, that also leases the holding thread a connection from the given pool
+    for as long as it holds the lock. `get_connection` returns that connection,
+    so the usual pattern keeps working without tying a connection to every
+    thread that ever touched the datastore:
+
+        with self.table_access_condition, self.get_connection() as conn:
+            ...
+
+    Connections are checked out before taking the lock, so that threads waiting
+    for one never hold it. Connections requested without holding the lock are
+    leased to their thread until the `with` block using them exits, or else
+    until the thread exits. They're also used by the thread while it holds the lock.
+    """
+
+    def __init__(self, pool: SQLiteConnectionPool):
+        self.pool = pool
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._unguarded_leases: Dict[threading.Thread, _UnguardedLease] = {}
+        self._unguarded_lock = threading.Lock()
+
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        depth = self._depth()
+        if depth > 0:
+            # Reentrant acquires keep using the outermost one's connection
+            self._condition.acquire()
+            self._local.depth = depth + 1
+            return True
+
+        if len(self._unguarded_leases) > 0:
+            self._release_dead_thread_leases()
+        lease = self._unguarded_leases.get(threading.current_thread())
+        if lease is not None:
+            conn = lease._conn
+        else:
+            checkout_timeout = None
+            if not blocking:
+                checkout_timeout = 0.0
+            elif timeout >= 0:
+                checkout_timeout = timeout
+            start_time = time.monotonic()
+            try:
+                conn = self.pool.checkout(timeout=checkout_timeout)
+            except MephistoDBException:
+                if checkout_timeout is None:
+                    raise
+                return False
+            if timeout >= 0:
+                timeout = max(0.0, timeout - (time.monotonic() - start_time))
+
+        try:
+            acquired = self._condition.acquire(blocking, timeout)
+        except BaseException:
+            if lease is None:
+                self.pool.checkin(conn)
+            raise
+        if not acquired:
+            if lease is None:
+                self.pool.checkin(conn)
+            return False
+        self._local.conn = conn
+        self._local.owns_conn = lease is None
+        self._local.depth = 1
+        return True
+
+    def release(self) -> None:
+        depth = self._depth() - 1
+        self._local.depth = depth
+        try:
+            if depth == 0:
+                conn, self._local.conn = self._local.conn, None
+                if self._local.owns_conn:
+                    self.pool.checkin(conn)
+        finally:
+            self._condition.release()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._condition.wait(timeout)
+
+    def notify(self, n: int = 1) -> None:
+        self._condition.notify(n)
+
+    def notify_all(self) -> None:
+        self._condition.notify_all()
+
+    def _release_dead_thread_leases(self) -> None:
+        """Check in connections leased to threads that have exited"""
+        with self._unguarded_lock:
+            dead_threads = [t for t in self._unguarded_leases if not t.is_alive()]
+            leases = [self._unguarded_leases.pop(t) for t in dead_threads]
+        for lease in leases:
+            self.pool.checkin(lease._conn)
+
+    def _release_unguarded_lease(self, lease: _UnguardedLease) -> None:
+        """Check in a lease once the `with` block using it exits"""
+        with self._unguarded_lock:
+            thread = threading.current_thread()
+            if self._unguarded_leases.get(thread) is not lease:
+                return
+            del self._unguarded_leases[thread]
+        if self._depth() > 0 and self._local.conn is lease._conn:
+            # Still used by the lock the thread holds, which now returns it
+            self._local.owns_conn = True
+            return
+        self.pool.checkin(lease._conn)
+
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Return the connection leased to the calling thread. Without the lock held,
+        use it in a `with` block so that it's returned to the pool afterwards.
+        """
+        if self._depth() > 0:
+            return self._local.conn
+        self._release_dead_thread_leases()
+        thread = threading.current_thread()
+        lease = self._unguarded_leases.get(thread)
+        if lease is None:
+            lease = _UnguardedLease(self, self.pool.checkout())
+            with self._unguarded_lock:
+                self._unguarded_leases[thread] = lease
+        return cast(sqlite3.Connection, lease)
@@ -8,13 +8,20 @@ import json
 import os
 import sqlite3
 import threading
+import time
+from contextlib import contextmanager
+from datetime import date
 from sqlite3 import Connection
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Set
 from typing import Tuple
+from typing import Type
+from typing import TypeVar
 from typing import Union
 
 from mephisto.abstractions.database import MephistoDB
@@ -27,6 +34,10 @@ from mephisto.data_model.constants import NO_PROJECT_NAME
 from mephisto.data_model.project import Project
 from mephisto.data_model.qualification import GrantedQualification
 from mephisto.data_model.qualification import Qualification
+from mephisto.data_model.records import AgentRecord
+from mephisto.data_model.records import AssignmentRecord
+from mephisto.data_model.records import UnitRecord
+from mephisto.data_model.records import WorkerRecord
 from mephisto.data_model.requester import Requester
 from mephisto.data_model.task import Task
 from mephisto.data_model.task_run import TaskRun
@@ -39,12 +50,47 @@ from mephisto.utils.db import EntryDoesNotExistException
 from mephisto.utils.db import make_randomized_int_id
 from mephisto.utils.db import MephistoDBException
 from mephisto.utils.db import retry_generate_id
+from mephisto.utils.dirs import get_data_dir
 from mephisto.utils.logger_core import get_logger
+from mephisto.utils.qualifications import QualificationType
+from mephisto.utils.qualifications import requirement_is_met
 from . import local_database_tables as tables
+from .agent_data_store import AgentDataStore
+from .archive_shards import archive_task_runs
+from .archive_shards import attach_archive_shards
+from .archive_shards import DEFAULT_ARCHIVE_PERIOD
+from .archive_shards import find_archive_shards
+from .archive_shards import get_archive_dir
+from .agent_data_store import compress_agent_data
+from .agent_data_store import decompress_agent_data
+from .agent_data_store import DEFAULT_AGENT_DATA_BACKEND
+from .agent_data_store import DEFAULT_COMPRESSION_THRESHOLD_BYTES
+from .agent_data_store import get_agent_data_store
+from .connection_pool import get_read_only_uri
+from .connection_pool import LeasedConnectionCondition
+from .connection_pool import SQLiteConnectionPool
+from .local_database_args import AgentDataArgs
+from .local_database_args import ArchiveArgs
+from .local_database_args import LocalMephistoDBArgs
 from .migrations import migrations
+from .query_profiler import DEFAULT_PROFILE_LOG_NAME
+from .query_profiler import QueryProfiler
 
 logger = get_logger(name=__name__)
 
+DEFAULT_GROUP_COMMIT_INTERVAL_MS = 50
+DEFAULT_GROUP_COMMIT_MAX_WRITES = 500
+# Worker ids per query when finding qualified workers, below SQLite's variable limit
+QUALIFIED_WORKERS_BATCH_SIZE = 500
+# Candidate units checked per query when reserving one of them
+UNIT_RESERVATION_BATCH_SIZE = 100
+# Reader connections of read-only databases map this much of the file, and cache
+# this many KiB of pages, as nothing but their own queries competes for them
+READ_ONLY_MMAP_SIZE_BYTES = 1024 * 1024 * 1024
+READ_ONLY_CACHE_SIZE_KIB = 256 * 1024
+
+RecordT = TypeVar("RecordT", AgentRecord, AssignmentRecord, UnitRecord, WorkerRecord)
+
 
 def nonesafe_int(in_string: Optional[Union[str, int]]) -> Optional[int]:
     """Cast input to an int or None"""
@@ -92,43 +138,343 @@ class LocalMephistoDB(MephistoDB):
     """
     Local database for core Mephisto data storage, the LocalMephistoDatabase handles
     grounding all the python interactions with the Mephisto architecture to
-    local files and a database.
+    local files and a database. It's configured with `LocalMephistoDBArgs`, see
+    local_database_args.py, of which the options below are part.
+
+    By default every query is serialized through `table_access_condition`. With
+    `use_wal` set, the database is switched to SQLite's WAL journal mode: writes
+    are still serialized through `table_access_condition`, but reads are served
+    from a pool of up to `max_reader_connections` query-only connections that
+    never take the writer lock.
+
+    With `group_commit` set, status-only updates of units, agents and onboarding
+    agents are queued and written together in one transaction every
+    `group_commit_interval_ms`, or as soon as `group_commit_max_writes` are queued.
+    Reads by id see queued statuses, and any other query or write touching those
+    tables flushes the queue first, so reads within this process always see the
+    latest status. Queued updates may be lost if the process crashes.
+
+    With `read_only` set, an existing database is opened as it is, for analysis
+    and review workloads running beside an operator: tables aren't created or
+    migrated, every connection is opened in SQLite's `mode=ro` (`immutable` too
+    if set, for snapshots no process writes to anymore), and the queries of this
+    class are served from the reader pool without any Python-level lock. Writes
+    fail with SQLite's "attempt to write a readonly database" error.
     """
 
-    def __init__(self, database_path=None):
+    def __init__(self, database_path=None, args: Optional[LocalMephistoDBArgs] = None):
         logger.debug(f"database path: {database_path}")
-        self.conn: Dict[int, Connection] = {}
-        self.table_access_condition = threading.Condition()
+        if database_path is None:
+            database_path = os.path.join(get_data_dir(), "database.db")
+        if args is None:
+            args = LocalMephistoDBArgs()
+        self.read_only = read_only = args.read_only
+        self.immutable = args.immutable
+        if read_only and not os.path.exists(database_path):
+            raise MephistoDBException(f"Can't open missing database {database_path} read-only")
+        self.aio_max_workers = args.aio_max_workers
+        # Grants made by other processes can't be seen by cached lookups, and a
+        # read-only database only ever sees those
+        self.qualification_cache = args.qualification_cache and not read_only
+        self.qualification_cache_ttl = args.qualification_cache_ttl
+        # Where agent states saved through write_dict end up, see `configure_agent_data`
+        self.agent_data_backend = DEFAULT_AGENT_DATA_BACKEND
+        self._agent_data_store: AgentDataStore = get_agent_data_store(
+            DEFAULT_AGENT_DATA_BACKEND, os.path.dirname(database_path)
+        )
+        self.agent_data_compression = False
+        self.agent_data_compression_threshold = DEFAULT_COMPRESSION_THRESHOLD_BYTES
+        # Queries slower than the threshold are logged next to the database,
+        # see `mephisto db profile`
+        self._query_profiler: Optional[QueryProfiler] = None
+        connection_factory = sqlite3.Connection
+        if args.profile_queries:
+            db_dir = os.path.dirname(os.path.abspath(database_path))
+            self._query_profiler = QueryProfiler(
+                os.path.join(db_dir, DEFAULT_PROFILE_LOG_NAME),
+                threshold_ms=args.slow_query_threshold_ms,
+            )
+            connection_factory = self._query_profiler.connection_factory
+        self._connection_factory = connection_factory
+        self.use_wal = use_wal = args.use_wal
+        # Writer connections are leased from this pool to whichever thread holds
+        # table_access_condition, rather than being kept open for every thread
+        writer_pragmas = ["PRAGMA foreign_keys = on;"]
+        if use_wal:
+            # NORMAL is durable across application crashes in WAL mode,
+            # and avoids an fsync on every committed write
+            writer_pragmas.append("PRAGMA synchronous = NORMAL;")
+        self._connection_pool = SQLiteConnectionPool(
+            database_path,
+            row_factory=StringIDRow,
+            name="mephisto",
+            pragmas=writer_pragmas,
+            connection_factory=connection_factory,
+            uri=get_read_only_uri(database_path, self.immutable) if read_only else None,
+        )
+        self.table_access_condition = LeasedConnectionCondition(self._connection_pool)
+        self.max_reader_connections = args.max_reader_connections
+        self._reader_pool: Optional[SQLiteConnectionPool] = None
+        # Reads see task runs archived into shards by `archive_task_runs` through
+        # reader connections that attach them, see `configure_archives`
+        self.attach_archives = True
+        self._archive_shards: List[str] = []
+        # Modification time of the archive directory when shards were last listed, to
+        # notice shards added by other processes without listing them on every read
+        self._archive_dir_mtime: Optional[int] = None
+        self._archive_shards_lock = threading.Lock()
+        # Per-run unit status counts, kept up to date by writes made through this
+        # object once a run's counts have been requested. Guarded by table_access_condition.
+        self._unit_status_counts: Dict[str, Dict[str, int]] = {}
+        # Version of the `unit_writes` row when the counts were last checked, which
+        # triggers bump for every unit row written, and the unit rows this object
+        # wrote since. Any other difference means units were written by something else.
+        self._unit_writes_version: Optional[int] = None
+        self._own_unit_writes = 0
+        # Queued status updates by (table_name, db_id). Only modified with
+        # table_access_condition held, and entries are only removed once committed.
+        self.group_commit = args.group_commit and not read_only
+        self.group_commit_interval_ms = args.group_commit_interval_ms
+        self.group_commit_max_writes = args.group_commit_max_writes
+        self._pending_status_writes: Dict[Tuple[str, str], str] = {}
+        self._group_commit_stop = threading.Event()
+        self._group_commit_thread: Optional[threading.Thread] = None
         super().__init__(database_path)
+        self._open_reader_pool()
+        if self.group_commit:
+            self._group_commit_thread = threading.Thread(
+                target=self._run_group_commit,
+                name="db-group-commit",
+                daemon=True,
+            )
+            self._group_commit_thread.start()
+
+    def configure_agent_data(self, args: AgentDataArgs) -> None:
+        """
+        Set where and how the agent data saved through write_dict is stored, see
+        agent_data_store.py. Should be called before any agent data is written.
+        """
+        self._agent_data_store.close()
+        self.agent_data_backend = args.backend
+        self._agent_data_store = get_agent_data_store(args.backend, self.db_root)
+        self.agent_data_compression = args.compression
+        self.agent_data_compression_threshold = args.compression_threshold
+
+    def configure_archives(self, args: ArchiveArgs) -> None:
+        """Set whether reads see task runs archived into shards, see archive_shards.py"""
+        if args.attach == self.attach_archives:
+            return
+        self.attach_archives = args.attach
+        self._archive_shards = []
+        self._archive_dir_mtime = None
+        self._open_reader_pool()
 
     def get_connection(self) -> Connection:
-        """Returns a singular database connection to be shared amongst all
-        calls for a given thread.
+        """Returns the pooled database connection leased to the calling thread
+        while it holds `table_access_condition`.
+        """
+        return self.table_access_condition.get_connection()
+
+    def _open_reader_pool(self) -> None:
+        """
+        Replace the pool of reader connections, which is needed in WAL or read-only
+        mode, or to attach archive shards. Connections of the previous pool are
+        closed once they're checked back in.
+        """
+        previous_pool = self._reader_pool
+        if self.attach_archives:
+            self._archive_dir_mtime = self.__get_archive_dir_mtime()
+            self._archive_shards = find_archive_shards(self.db_path)
+        if self.use_wal or self.read_only or len(self._archive_shards) > 0:
+            archive_shards = list(self._archive_shards)
+            uri = None
+            pragmas = []
+            if self.read_only:
+                uri = get_read_only_uri(self.db_path, self.immutable)
+                archive_shards = [get_read_only_uri(p, self.immutable) for p in archive_shards]
+                pragmas = [
+                    f"PRAGMA mmap_size = {READ_ONLY_MMAP_SIZE_BYTES};",
+                    f"PRAGMA cache_size = -{READ_ONLY_CACHE_SIZE_KIB};",
+                ]
+            self._reader_pool = SQLiteConnectionPool(
+                self.db_path,
+                max_size=self.max_reader_connections,
+                row_factory=StringIDRow,
+                read_only=True,
+                name="mephisto_readers",
+                pragmas=pragmas,
+                connection_factory=self._connection_factory,
+                on_connect=lambda conn: attach_archive_shards(conn, archive_shards),
+                uri=uri,
+            )
+        else:
+            self._reader_pool = None
+        if previous_pool is not None:
+            previous_pool.close()
+
+    def __get_archive_dir_mtime(self) -> Optional[int]:
+        """Return the modification time of the archive directory, if there is one"""
+        try:
+            return os.stat(get_archive_dir(self.db_path)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _check_archive_shards(self) -> None:
+        """
+        Reopen the reader pool if shards were added or removed since it was opened,
+        like by `mephisto db archive` running in another process, so that reads keep
+        seeing the task runs moved out of the main database
+        """
+        if not self.attach_archives or self.__get_archive_dir_mtime() == self._archive_dir_mtime:
+            return
+        with self._archive_shards_lock:
+            archive_dir_mtime = self.__get_archive_dir_mtime()
+            if archive_dir_mtime == self._archive_dir_mtime:
+                return
+            if find_archive_shards(self.db_path) == self._archive_shards:
+                self._archive_dir_mtime = archive_dir_mtime
+                return
+            logger.info(f"Archive shards of {self.db_path} changed, reopening reader connections")
+            self._open_reader_pool()
+
+    @contextmanager
+    def _read_connection(self) -> Iterator[Connection]:
+        """
+        Provide a connection for a read-only query. In WAL or read-only mode, or when
+        there are archive shards, this is a pooled reader connection that doesn't take
+        the writer lock, otherwise it's the connection leased under `table_access_condition`.
+        """
+        self._check_archive_shards()
+        if self._reader_pool is None:
+            with self.table_access_condition:
+                yield self.get_connection()
+        else:
+            with self._reader_pool.connection() as conn:
+                yield conn
+
+    @contextmanager
+    def read_connection(self) -> Iterator[Connection]:
+        """
+        Provide a connection for read-only queries made outside of this class,
+        which sees archived task runs like the queries of this class do
         """
-        curr_thread = threading.get_ident()
-        if curr_thread not in self.conn or self.conn[curr_thread] is None:
+        self._flush_status_writes()
+        with self._read_connection() as conn:
+            yield conn
+
+    def archive_task_runs(
+        self,
+        before: date,
+        period: str = DEFAULT_ARCHIVE_PERIOD,
+        task_run_ids: Optional[List[str]] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Move completed task runs created before the given date, with no unit left
+        to work on or review, into per-period archive shards next to the database.
+        Returns the ids of the archived task runs by shard name. See archive_shards.py
+        """
+        if self.read_only:
+            raise MephistoDBException(f"Can't archive from read-only database {self.db_path}")
+        self._flush_status_writes()
+        with self.table_access_condition:
+            archived = archive_task_runs(self.db_path, before, period, task_run_ids)
+            for shard_task_run_ids in archived.values():
+                for task_run_id in shard_task_run_ids:
+                    self._unit_status_counts.pop(task_run_id, None)
+        if len(archived) > 0:
+            self._open_reader_pool()
+        return archived
+
+    def _run_group_commit(self) -> None:
+        """Flush queued status updates every group_commit_interval_ms until shutdown"""
+        while not self._group_commit_stop.wait(self.group_commit_interval_ms / 1000):
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
-                conn.row_factory = StringIDRow
-                self.conn[curr_thread] = conn
+                self._flush_status_writes()
+            except MephistoDBException:
+                logger.exception("Failed to flush queued status updates", exc_info=True)
+
+    def _queue_status_write(self, table_name: str, db_id: str, status: str) -> None:
+        """Queue a status update for the next group commit"""
+        with self.table_access_condition:
+            self._pending_status_writes[(table_name, str(db_id))] = status
+            should_flush = len(self._pending_status_writes) >= self.group_commit_max_writes
+        if should_flush:
+            self._flush_status_writes()
+
+    def _get_queued_status(self, table_name: str, db_id: str) -> Optional[str]:
+        """Return the not yet committed status for the given row, if there is one"""
+        if not self.group_commit:
+            return None
+        return self._pending_status_writes.get((table_name, str(db_id)))
+
+    def _flush_status_writes(self) -> None:
+        """Write all queued status updates in a single transaction"""
+        if not self.group_commit or len(self._pending_status_writes) == 0:
+            return
+        id_names = {
+            "units": "unit_id",
+            "agents": "agent_id",
+            "onboarding_agents": "onboarding_agent_id",
+        }
+        with self.table_access_condition, self.get_connection() as conn:
+            pending = dict(self._pending_status_writes)
+            c = conn.cursor()
+            try:
+                for (table_name, db_id), status in pending.items():
+                    tracked_status = None
+                    if table_name == "units":
+                        tracked_status = self.__get_tracked_unit_status(c, db_id)
+                    c.execute(
+                        f"""
+                        UPDATE {table_name}
+                        SET status = ?
+                        WHERE {id_names[table_name]} = ?;
+                        """,
+                        (status, int(db_id)),
+                    )
+                    if table_name == "units":
+                        self.__note_unit_writes(c)
+                    if c.rowcount == 0:
+                        logger.warning(
+                            f"Dropping queued status {status} of missing {table_name} row "
+                            f"{db_id}, which may have been archived"
+                        )
+                    if tracked_status is not None:
+                        self.__update_unit_status_counts(*tracked_status, status)
             except sqlite3.Error as e:
                 raise MephistoDBException(e)
-        return self.conn[curr_thread]
+            conn.commit()
+            # Only drop entries once committed, so that reads by id never miss a status
+            for key, status in pending.items():
+                if self._pending_status_writes.get(key) == status:
+                    del self._pending_status_writes[key]
 
     def shutdown(self) -> None:
         """Close all open connections"""
-        with self.table_access_condition:
-            curr_thread = threading.get_ident()
-            self.conn[curr_thread].close()
-            del self.conn[curr_thread]
+        if self._group_commit_thread is not None:
+            self._group_commit_stop.set()
+            self._group_commit_thread.join()
+            self._group_commit_thread = None
+            self._flush_status_writes()
+        self._shutdown_aio()
+        self._connection_pool.close()
+        if self._reader_pool is not None:
+            self._reader_pool.close()
+        if self._query_profiler is not None:
+            self._query_profiler.close()
+        self._agent_data_store.close()
 
     def init_tables(self) -> None:
         """
         Run all the table creation SQL queries to ensure the expected tables exist
         """
+        if self.read_only:
+            # Read-only databases are used as they are, migrating is left to writers
+            return
         with self.table_access_condition:
             conn = self.get_connection()
-            conn.execute("PRAGMA foreign_keys = on;")
+            if self.use_wal:
+                conn.execute("PRAGMA journal_mode = WAL;")
 
             with conn:
                 c = conn.cursor()
@@ -161,8 +507,10 @@ class LocalMephistoDB(MephistoDB):
         Try to request the row for the given table and entry,
         raise EntryDoesNotExistException if it isn't present
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        # Check queued statuses before reading, as a flush may commit and clear
+        # them while the read is in progress
+        queued_status = self._get_queued_status(table_name, db_id)
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 f"""
@@ -174,6 +522,8 @@ class LocalMephistoDB(MephistoDB):
             results = c.fetchall()
             if len(results) != 1:
                 raise EntryDoesNotExistException(f"Table {table_name} has no {id_name} {db_id}")
+            if queued_status is not None:
+                return {**dict(results[0]), "status": queued_status}
             return results[0]
 
     @staticmethod
@@ -203,6 +553,127 @@ class LocalMephistoDB(MephistoDB):
 
         return "".join(query_lines), tuple(fin_vals)
 
+    def __iter_rows(
+        self,
+        table_name: str,
+        id_name: str,
+        arg_list: List[str],
+        arg_vals: List[Optional[Union[str, int, bool]]],
+        batch_size: int,
+    ) -> Iterator[Mapping[str, Any]]:
+        """
+        Iterate over the rows of the given table that match the filters, in order of
+        their id. Rows are read in pages of `batch_size`, each starting after the
+        last id of the previous page, so no connection or lock is held between pages.
+        """
+        self._flush_status_writes()
+        additional_query, arg_tuple = self.__create_query_and_tuple(arg_list, arg_vals)
+        keyset_clause = "AND" if additional_query else "WHERE"
+        last_id_idx = len(arg_tuple) + 1
+        query = f"""
+            SELECT * FROM {table_name}
+            {additional_query}
+            {keyset_clause} {id_name} > ?{last_id_idx}
+            ORDER BY {id_name} ASC
+            LIMIT ?{last_id_idx + 1};
+        """
+        last_id = -1
+        while True:
+            with self._read_connection() as conn:
+                c = conn.cursor()
+                c.execute(query, arg_tuple + (last_id, batch_size))
+                rows = c.fetchmany(batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            last_id = int(rows[-1][id_name])
+
+    def __select_records(
+        self,
+        table_name: str,
+        record_class: Type[RecordT],
+        arg_list: List[str],
+        arg_vals: List[Optional[Union[str, int, bool]]],
+    ) -> List[RecordT]:
+        """
+        Return the rows of the given table that match the filters as records, in
+        order of creation. Ids are converted to text by SQLite, and rows are read
+        as plain tuples, so no Python code runs per column.
+        """
+        columns = ", ".join(
+            f"CAST({field} AS TEXT) AS {field}" if field.endswith("_id") else field
+            for field in record_class._fields
+        )
+        additional_query, arg_tuple = self.__create_query_and_tuple(arg_list, arg_vals)
+        with self._read_connection() as conn:
+            c = conn.cursor()
+            c.row_factory = None
+            c.execute(
+                f"SELECT {columns} FROM {table_name} {additional_query} "
+                "ORDER BY creation_date ASC",
+                arg_tuple,
+            )
+            return list(map(record_class._make, c.fetchall()))
+
+    def __check_not_archived(self, table_name: str, id_name: str, db_id: str) -> None:
+        """
+        Raise if the given row, that an update didn't find in the main database, was
+        archived into a shard, as writes only go to the main database. Must be
+        called without the table_access_condition held.
+        """
+        if len(self._archive_shards) == 0:
+            return
+        with self._read_connection() as conn:
+            row = conn.execute(
+                f"SELECT 1 FROM {table_name} WHERE {id_name} = ?;", (int(db_id),)
+            ).fetchone()
+        if row is not None:
+            raise MephistoDBException(
+                f"Can't update {table_name} row {db_id}, as its task run was archived"
+            )
+
+    def __get_tracked_unit_status(
+        self, c: sqlite3.Cursor, unit_id: str
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Return the (task_run_id, status) of the given unit if its run has status counts
+        being tracked, so that a status change can be applied to the counts after the
+        update. Must be called with the table_access_condition held.
+        """
+        if len(self._unit_status_counts) == 0:
+            return None
+        c.execute(
+            "SELECT task_run_id, status FROM units WHERE unit_id = ?;",
+            (int(unit_id),),
+        )
+        row = c.fetchone()
+        if row is None or row["task_run_id"] not in self._unit_status_counts:
+            return None
+        return row["task_run_id"], row["status"]
+
+    def __note_unit_writes(self, c: sqlite3.Cursor) -> None:
+        """
+        Account for the unit rows written by the last statement of the given cursor,
+        which bumped the `unit_writes` version as many times. Must be called with the
+        table_access_condition held.
+        """
+        self._own_unit_writes += max(c.rowcount, 0)
+
+    def __update_unit_status_counts(
+        self, task_run_id: str, old_status: Optional[str], new_status: str, count: int = 1
+    ) -> None:
+        """
+        Move `count` units of a tracked run from old_status to new_status (or
+        register them, if old_status is None). Must be called with the
+        table_access_condition held.
+        """
+        counts = self._unit_status_counts.get(str(task_run_id))
+        if counts is None or old_status == new_status:
+            return
+        if old_status is not None:
+            counts[old_status] -= count
+        counts[new_status] += count
+
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def _new_project(self, project_name: str) -> str:
         """
@@ -254,8 +725,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any project that matches the above. When called with no arguments,
         return all projects.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["project_name"], [project_name]
@@ -337,8 +807,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any task that matches the above. When called with no arguments,
         return all tasks.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["task_name", "project_id", "parent_task_id"],
@@ -480,8 +949,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any task_run that matches the above. When called with no arguments,
         return all task_runs.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["task_id", "requester_id", "is_completed"],
@@ -513,10 +981,13 @@ class LocalMephistoDB(MephistoDB):
                     """,
                     (is_completed, int(task_run_id)),
                 )
+                updated = c.rowcount > 0
             except sqlite3.IntegrityError as e:
                 if is_key_failure(e):
                     raise EntryDoesNotExistException(e)
                 raise MephistoDBException(e)
+        if not updated:
+            self.__check_not_archived("task_runs", "task_run_id", task_run_id)
 
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def _new_assignment(
@@ -568,6 +1039,60 @@ class LocalMephistoDB(MephistoDB):
                     )
                 raise MephistoDBException(e)
 
+    @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
+    def _new_assignments_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        task_type: str,
+        provider_type: str,
+        count: int,
+        sandbox: bool = True,
+    ) -> List[str]:
+        """Create `count` new assignments for the given task in a single transaction"""
+        # Ensure task run exists
+        self.get_task_run(task_run_id)
+        assignment_ids = [make_randomized_int_id() for _ in range(count)]
+        with self.table_access_condition, self.get_connection() as conn:
+            c = conn.cursor()
+            try:
+                c.executemany(
+                    """
+                    INSERT INTO assignments(
+                        assignment_id,
+                        task_id,
+                        task_run_id,
+                        requester_id,
+                        task_type,
+                        provider_type,
+                        sandbox
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?);
+                    """,
+                    [
+                        (
+                            assignment_id,
+                            int(task_id),
+                            int(task_run_id),
+                            int(requester_id),
+                            task_type,
+                            provider_type,
+                            sandbox,
+                        )
+                        for assignment_id in assignment_ids
+                    ],
+                )
+                return [str(assignment_id) for assignment_id in assignment_ids]
+            except sqlite3.IntegrityError as e:
+                if is_unique_failure(e):
+                    raise EntryAlreadyExistsException(
+                        e,
+                        db=self,
+                        table_name="assignments",
+                        original_exc=e,
+                    )
+                raise MephistoDBException(e)
+
     def _get_assignment(self, assignment_id: str) -> Mapping[str, Any]:
         """
         Return assignment's fields by assignment_id, raise EntryDoesNotExistException
@@ -590,8 +1115,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any task that matches the above. When called with no arguments,
         return all tasks.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 [
@@ -624,6 +1148,68 @@ class LocalMephistoDB(MephistoDB):
                 Assignment(self, str(r["assignment_id"]), row=r, _used_new_call=True) for r in rows
             ]
 
+    def _select_assignments(
+        self,
+        task_run_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+    ) -> List[AssignmentRecord]:
+        """Return the records of the assignments that match the above"""
+        return self.__select_records(
+            "assignments",
+            AssignmentRecord,
+            ["task_run_id", "task_id", "requester_id", "task_type", "provider_type", "sandbox"],
+            [
+                nonesafe_int(task_run_id),
+                nonesafe_int(task_id),
+                nonesafe_int(requester_id),
+                task_type,
+                provider_type,
+                sandbox,
+            ],
+        )
+
+    def _iter_assignments(
+        self,
+        batch_size: int,
+        task_run_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+    ) -> Iterator[Assignment]:
+        """
+        Iterate over the assignments that match the above in order of id,
+        reading `batch_size` rows at a time
+        """
+        rows = self.__iter_rows(
+            "assignments",
+            "assignment_id",
+            [
+                "task_run_id",
+                "task_id",
+                "requester_id",
+                "task_type",
+                "provider_type",
+                "sandbox",
+            ],
+            [
+                nonesafe_int(task_run_id),
+                nonesafe_int(task_id),
+                nonesafe_int(requester_id),
+                task_type,
+                provider_type,
+                sandbox,
+            ],
+            batch_size,
+        )
+        for r in rows:
+            yield Assignment(self, str(r["assignment_id"]), row=r, _used_new_call=True)
+
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def _new_unit(
         self,
@@ -675,6 +1261,8 @@ class LocalMephistoDB(MephistoDB):
                     ),
                 )
                 unit_id = str(c.lastrowid)
+                self.__note_unit_writes(c)
+                self.__update_unit_status_counts(task_run_id, None, AssignmentState.CREATED)
                 return unit_id
             except sqlite3.IntegrityError as e:
                 if is_key_failure(e):
@@ -688,6 +1276,76 @@ class LocalMephistoDB(MephistoDB):
                     )
                 raise MephistoDBException(e)
 
+    @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
+    def _new_units_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_keys: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[str]:
+        """
+        Create a unit for every (assignment_id, unit_index) pair in a single
+        transaction. If any of the units can't be created, none of them are.
+        """
+        unit_ids = [make_randomized_int_id() for _ in unit_keys]
+        with self.table_access_condition, self.get_connection() as conn:
+            c = conn.cursor()
+            try:
+                c.executemany(
+                    """
+                    INSERT INTO units(
+                        unit_id,
+                        task_id,
+                        task_run_id,
+                        requester_id,
+                        assignment_id,
+                        unit_index,
+                        pay_amount,
+                        provider_type,
+                        task_type,
+                        sandbox,
+                        status
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+                    """,
+                    [
+                        (
+                            unit_id,
+                            int(task_id),
+                            int(task_run_id),
+                            int(requester_id),
+                            int(assignment_id),
+                            unit_index,
+                            pay_amount,
+                            provider_type,
+                            task_type,
+                            sandbox,
+                            AssignmentState.CREATED,
+                        )
+                        for unit_id, (assignment_id, unit_index) in zip(unit_ids, unit_keys)
+                    ],
+                )
+                self.__note_unit_writes(c)
+                self.__update_unit_status_counts(
+                    task_run_id, None, AssignmentState.CREATED, count=len(unit_ids)
+                )
+                return [str(unit_id) for unit_id in unit_ids]
+            except sqlite3.IntegrityError as e:
+                if is_key_failure(e):
+                    raise EntryDoesNotExistException(e)
+                elif is_unique_failure(e):
+                    raise EntryAlreadyExistsException(
+                        e,
+                        db=self,
+                        table_name="units",
+                        original_exc=e,
+                    )
+                raise MephistoDBException(e)
+
     def _get_unit(self, unit_id: str) -> Mapping[str, Any]:
         """
         Return unit's fields by unit_id, raise EntryDoesNotExistException
@@ -715,8 +1373,8 @@ class LocalMephistoDB(MephistoDB):
         Try to find any unit that matches the above. When called with no arguments,
         return all units.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        self._flush_status_writes()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 [
@@ -757,14 +1415,175 @@ class LocalMephistoDB(MephistoDB):
             rows = c.fetchall()
             return [Unit(self, str(r["unit_id"]), row=r, _used_new_call=True) for r in rows]
 
+    def _iter_units(
+        self,
+        batch_size: int,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        unit_index: Optional[int] = None,
+        provider_type: Optional[str] = None,
+        task_type: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+        status: Optional[str] = None,
+    ) -> Iterator[Unit]:
+        """
+        Iterate over the units that match the above in order of id,
+        reading `batch_size` rows at a time
+        """
+        rows = self.__iter_rows(
+            "units",
+            "unit_id",
+            [
+                "task_id",
+                "task_run_id",
+                "requester_id",
+                "assignment_id",
+                "unit_index",
+                "provider_type",
+                "task_type",
+                "agent_id",
+                "worker_id",
+                "sandbox",
+                "status",
+            ],
+            [
+                nonesafe_int(task_id),
+                nonesafe_int(task_run_id),
+                nonesafe_int(requester_id),
+                nonesafe_int(assignment_id),
+                unit_index,
+                provider_type,
+                task_type,
+                nonesafe_int(agent_id),
+                nonesafe_int(worker_id),
+                sandbox,
+                status,
+            ],
+            batch_size,
+        )
+        for r in rows:
+            yield Unit(self, str(r["unit_id"]), row=r, _used_new_call=True)
+
+    def _select_units(
+        self,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        requester_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        unit_index: Optional[int] = None,
+        provider_type: Optional[str] = None,
+        task_type: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        sandbox: Optional[bool] = None,
+        status: Optional[str] = None,
+    ) -> List[UnitRecord]:
+        """Return the records of the units that match the above"""
+        self._flush_status_writes()
+        return self.__select_records(
+            "units",
+            UnitRecord,
+            [
+                "task_id",
+                "task_run_id",
+                "requester_id",
+                "assignment_id",
+                "unit_index",
+                "provider_type",
+                "task_type",
+                "agent_id",
+                "worker_id",
+                "sandbox",
+                "status",
+            ],
+            [
+                nonesafe_int(task_id),
+                nonesafe_int(task_run_id),
+                nonesafe_int(requester_id),
+                nonesafe_int(assignment_id),
+                unit_index,
+                provider_type,
+                task_type,
+                nonesafe_int(agent_id),
+                nonesafe_int(worker_id),
+                sandbox,
+                status,
+            ],
+        )
+
+    def _count_units_by_status(self, task_run_id: str) -> Dict[str, int]:
+        """
+        Return the number of units of the given run in each status. The first call
+        for a run aggregates the units table, after which the counts are kept up to
+        date by the unit writes made through this database, until the database is
+        written by anything else or the run is unpinned.
+        """
+        self._flush_status_writes()
+        if self.read_only:
+            # Units are written by other processes, so counts can't be kept up to date
+            with self._read_connection() as conn:
+                return self.__aggregate_unit_status_counts(conn, task_run_id)
+        with self.table_access_condition:
+            conn = self.get_connection()
+            self.__check_unit_status_counts(conn)
+            task_run_id = str(task_run_id)
+            counts = self._unit_status_counts.get(task_run_id)
+            if counts is None:
+                counts = self.__aggregate_unit_status_counts(conn, task_run_id)
+                self._unit_status_counts[task_run_id] = counts
+            return dict(counts)
+
+    def __check_unit_status_counts(self, conn: Connection) -> None:
+        """
+        Drop the tracked counts if units may have been written by anything but this
+        object's tracked writes since they were last checked, like by another process,
+        another database object, or queries made on its connections from outside this
+        class. Writes made on any of this object's pooled connections are accounted for.
+        Must be called with the table_access_condition held.
+        """
+        row = conn.execute("SELECT version FROM unit_writes WHERE id = 1;").fetchone()
+        version = None if row is None else row["version"]
+        last_version = self._unit_writes_version
+        if last_version is None or version != last_version + self._own_unit_writes:
+            self._unit_status_counts.clear()
+        self._unit_writes_version = version
+        self._own_unit_writes = 0
+
+    def unpin_task_run(self, task_run_id: str) -> None:
+        """Stop keeping the unit status counts of the given task run"""
+        with self.table_access_condition:
+            self._unit_status_counts.pop(str(task_run_id), None)
+
+    def __aggregate_unit_status_counts(self, conn: Connection, task_run_id: str) -> Dict[str, int]:
+        """Count the units of the given run in each status from the units table"""
+        c = conn.cursor()
+        c.execute(
+            """
+            SELECT status, COUNT(*) AS unit_count FROM units
+            WHERE task_run_id = ?
+            GROUP BY status;
+            """,
+            (int(task_run_id),),
+        )
+        counts = {status: 0 for status in AssignmentState.valid_unit()}
+        for r in c.fetchall():
+            counts[r["status"]] = r["unit_count"]
+        return counts
+
     def _clear_unit_agent_assignment(self, unit_id: str) -> None:
         """
         Update the given unit by removing the agent that is assigned to it, thus updating
         the status to assignable.
         """
+        self._flush_status_writes()
         with self.table_access_condition, self.get_connection() as conn:
             c = conn.cursor()
             try:
+                tracked_status = self.__get_tracked_unit_status(c, unit_id)
                 c.execute(
                     """
                     UPDATE units
@@ -773,6 +1592,9 @@ class LocalMephistoDB(MephistoDB):
                     """,
                     (None, None, AssignmentState.LAUNCHED, int(unit_id)),
                 )
+                self.__note_unit_writes(c)
+                if tracked_status is not None:
+                    self.__update_unit_status_counts(*tracked_status, AssignmentState.LAUNCHED)
             except sqlite3.IntegrityError as e:
                 if is_key_failure(e):
                     raise EntryDoesNotExistException(
@@ -780,6 +1602,58 @@ class LocalMephistoDB(MephistoDB):
                     )
                 raise MephistoDBException(e)
 
+    def _reserve_unit(
+        self, unit_ids: List[str], reserved_by: str, lease_seconds: float
+    ) -> Optional[str]:
+        """
+        Reserve the first available unit of the given ones. Candidates are narrowed
+        down to the unreserved ones in batches, and each reservation is only taken
+        by an `UPDATE` conditional on the unit still being available, so concurrent
+        reservations by other processes can't both succeed.
+        """
+        now = time.time()
+        batch_size = UNIT_RESERVATION_BATCH_SIZE
+        with self.table_access_condition, self.get_connection() as conn:
+            c = conn.cursor()
+            for idx in range(0, len(unit_ids), batch_size):
+                batch = [int(unit_id) for unit_id in unit_ids[idx : idx + batch_size]]
+                c.execute(
+                    f"""
+                    SELECT unit_id FROM units
+                    WHERE unit_id IN ({", ".join("?" * len(batch))})
+                    AND (reserved_by IS NULL OR reserved_until < ?);
+                    """,
+                    (*batch, now),
+                )
+                available = {int(r["unit_id"]) for r in c.fetchall()}
+                for unit_id in batch:
+                    if unit_id not in available:
+                        continue
+                    c.execute(
+                        """
+                        UPDATE units
+                        SET reserved_by = ?, reserved_until = ?
+                        WHERE unit_id = ?
+                        AND (reserved_by IS NULL OR reserved_until < ?);
+                        """,
+                        (reserved_by, now + lease_seconds, unit_id, now),
+                    )
+                    if c.rowcount == 1:
+                        return str(unit_id)
+        return None
+
+    def _clear_unit_reservation(self, unit_id: str) -> None:
+        """Release the reservation held on the given unit"""
+        with self.table_access_condition, self.get_connection() as conn:
+            conn.execute(
+                """
+                UPDATE units
+                SET reserved_by = NULL, reserved_until = NULL
+                WHERE unit_id = ?;
+                """,
+                (int(unit_id),),
+            )
+
     def _update_unit(
         self, unit_id: str, agent_id: Optional[str] = None, status: Optional[str] = None
     ) -> None:
@@ -789,6 +1663,11 @@ class LocalMephistoDB(MephistoDB):
         """
         if status not in AssignmentState.valid_unit():
             raise MephistoDBException(f"Invalid status {status} for a unit")
+        if self.group_commit:
+            if agent_id is None:
+                self._queue_status_write("units", unit_id, status)
+                return
+            self._flush_status_writes()
         with self.table_access_condition, self.get_connection() as conn:
             c = conn.cursor()
             try:
@@ -802,6 +1681,7 @@ class LocalMephistoDB(MephistoDB):
                         (int(agent_id), int(unit_id)),
                     )
                 if status is not None:
+                    tracked_status = self.__get_tracked_unit_status(c, unit_id)
                     c.execute(
                         """
                         UPDATE units
@@ -810,12 +1690,18 @@ class LocalMephistoDB(MephistoDB):
                         """,
                         (status, int(unit_id)),
                     )
+                    self.__note_unit_writes(c)
+                    if tracked_status is not None:
+                        self.__update_unit_status_counts(*tracked_status, status)
+                updated = c.rowcount > 0
             except sqlite3.IntegrityError as e:
                 if is_key_failure(e):
                     raise EntryDoesNotExistException(
                         f"Given unit_id {unit_id} not found in the database"
                     )
                 raise MephistoDBException(e)
+        if not updated:
+            self.__check_not_archived("units", "unit_id", unit_id)
 
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def _new_requester(self, requester_name: str, provider_type: str) -> str:
@@ -872,8 +1758,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any requester that matches the above. When called with no arguments,
         return all requesters.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["requester_name", "provider_type"], [requester_name, provider_type]
@@ -949,8 +1834,7 @@ class LocalMephistoDB(MephistoDB):
         Try to find any worker that matches the above. When called with no arguments,
         return all workers.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["worker_name", "provider_type"], [worker_name, provider_type]
@@ -966,6 +1850,17 @@ class LocalMephistoDB(MephistoDB):
             rows = c.fetchall()
             return [Worker(self, str(r["worker_id"]), row=r, _used_new_call=True) for r in rows]
 
+    def _select_workers(
+        self, worker_name: Optional[str] = None, provider_type: Optional[str] = None
+    ) -> List[WorkerRecord]:
+        """Return the records of the workers that match the above"""
+        return self.__select_records(
+            "workers",
+            WorkerRecord,
+            ["worker_name", "provider_type"],
+            [worker_name, provider_type],
+        )
+
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def _new_agent(
         self,
@@ -982,6 +1877,7 @@ class LocalMephistoDB(MephistoDB):
         Raises EntryAlreadyExistsException if there is already an agent with this name
         """
         assert_valid_provider(provider_type)
+        self._flush_status_writes()
         with self.table_access_condition, self.get_connection() as conn:
             c = conn.cursor()
             try:
@@ -1012,6 +1908,7 @@ class LocalMephistoDB(MephistoDB):
                     ),
                 )
                 agent_id = str(c.lastrowid)
+                tracked_status = self.__get_tracked_unit_status(c, unit_id)
                 c.execute(
                     """
                     UPDATE units
@@ -1025,6 +1922,9 @@ class LocalMephistoDB(MephistoDB):
                         int(unit_id),
                     ),
                 )
+                self.__note_unit_writes(c)
+                if tracked_status is not None:
+                    self.__update_unit_status_counts(*tracked_status, AssignmentState.ASSIGNED)
                 return agent_id
             except sqlite3.IntegrityError as e:
                 if is_key_failure(e):
@@ -1055,6 +1955,9 @@ class LocalMephistoDB(MephistoDB):
         if status not in AgentState.valid():
             raise MephistoDBException(f"Invalid status {status} for an agent")
 
+        if self.group_commit:
+            self._queue_status_write("agents", agent_id, status)
+            return
         with self.table_access_condition, self.get_connection() as conn:
             c = conn.cursor()
             c.execute(
@@ -1065,6 +1968,9 @@ class LocalMephistoDB(MephistoDB):
                 """,
                 (status, int(agent_id)),
             )
+            updated = c.rowcount > 0
+        if not updated:
+            self.__check_not_archived("agents", "agent_id", agent_id)
 
     def _find_agents(
         self,
@@ -1081,8 +1987,8 @@ class LocalMephistoDB(MephistoDB):
         Try to find any agent that matches the above. When called with no arguments,
         return all agents.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        self._flush_status_writes()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 [
@@ -1117,6 +2023,88 @@ class LocalMephistoDB(MephistoDB):
             rows = c.fetchall()
             return [Agent(self, str(r["agent_id"]), row=r, _used_new_call=True) for r in rows]
 
+    def _select_agents(
+        self,
+        status: Optional[str] = None,
+        unit_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+    ) -> List[AgentRecord]:
+        """Return the records of the agents that match the above"""
+        self._flush_status_writes()
+        return self.__select_records(
+            "agents",
+            AgentRecord,
+            [
+                "status",
+                "unit_id",
+                "worker_id",
+                "task_id",
+                "task_run_id",
+                "assignment_id",
+                "task_type",
+                "provider_type",
+            ],
+            [
+                status,
+                nonesafe_int(unit_id),
+                nonesafe_int(worker_id),
+                nonesafe_int(task_id),
+                nonesafe_int(task_run_id),
+                nonesafe_int(assignment_id),
+                task_type,
+                provider_type,
+            ],
+        )
+
+    def _iter_agents(
+        self,
+        batch_size: int,
+        status: Optional[str] = None,
+        unit_id: Optional[str] = None,
+        worker_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+        task_run_id: Optional[str] = None,
+        assignment_id: Optional[str] = None,
+        task_type: Optional[str] = None,
+        provider_type: Optional[str] = None,
+    ) -> Iterator[Agent]:
+        """
+        Iterate over the agents that match the above in order of id,
+        reading `batch_size` rows at a time
+        """
+        rows = self.__iter_rows(
+            "agents",
+            "agent_id",
+            [
+                "status",
+                "unit_id",
+                "worker_id",
+                "task_id",
+                "task_run_id",
+                "assignment_id",
+                "task_type",
+                "provider_type",
+            ],
+            [
+                status,
+                nonesafe_int(unit_id),
+                nonesafe_int(worker_id),
+                nonesafe_int(task_id),
+                nonesafe_int(task_run_id),
+                nonesafe_int(assignment_id),
+                task_type,
+                provider_type,
+            ],
+            batch_size,
+        )
+        for r in rows:
+            yield Agent(self, str(r["agent_id"]), row=r, _used_new_call=True)
+
     def _make_qualification(
         self, qualification_name: str, description: Optional[str] = None
     ) -> str:
@@ -1149,8 +2137,7 @@ class LocalMephistoDB(MephistoDB):
         """
         Find a qualification. If no name is supplied, returns all qualifications.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 ["qualification_name"], [qualification_name]
@@ -1287,17 +2274,18 @@ class LocalMephistoDB(MephistoDB):
         """
         Find granted qualifications that match the given specifications
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
+            additional_query, arg_tuple = self.__create_query_and_tuple(
+                ["qualification_id", "worker_id", "value"],
+                [nonesafe_int(qualification_id), nonesafe_int(worker_id), value],
+            )
             c.execute(
                 """
                 SELECT * from granted_qualifications
-                WHERE (?1 IS NULL OR qualification_id = ?1)
-                AND (?2 IS NULL OR worker_id = ?2)
-                AND (?3 IS NULL OR value = ?3)
-                """,
-                (qualification_id, worker_id, value),
+                """
+                + additional_query,
+                arg_tuple,
             )
             rows = c.fetchall()
             return [
@@ -1310,6 +2298,79 @@ class LocalMephistoDB(MephistoDB):
                 for r in rows
             ]
 
+    def _find_qualified_workers(
+        self,
+        qualifications: List[QualificationType],
+        worker_ids: Optional[List[str]] = None,
+        provider_type: Optional[str] = None,
+    ) -> Set[str]:
+        """
+        Return the ids of the qualified workers among the given ones, reading
+        every candidate worker along with their relevant granted qualifications
+        in one joined query (per batch of given worker ids)
+        """
+        qualification_names = list({q["qualification_name"] for q in qualifications})
+        with self._read_connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                f"""
+                SELECT qualification_id, qualification_name FROM qualifications
+                WHERE qualification_name IN ({", ".join("?" * len(qualification_names))});
+                """,
+                qualification_names,
+            )
+            qualification_ids = {
+                r["qualification_name"]: r["qualification_id"] for r in c.fetchall()
+            }
+            requirements = []
+            for qualification in qualifications:
+                qualification_name = qualification["qualification_name"]
+                if qualification_name not in qualification_ids:
+                    logger.warning(
+                        f"Expected to create qualification for {qualification_name}, "
+                        f"but none found... skipping."
+                    )
+                    continue
+                requirements.append((qualification_ids[qualification_name], qualification))
+
+            id_list = ", ".join(str(int(q_id)) for q_id in qualification_ids.values())
+            query = f"""
+                SELECT w.worker_id, g.qualification_id, g.value
+                FROM workers AS w
+                LEFT JOIN granted_qualifications AS g
+                    ON g.worker_id = w.worker_id AND g.qualification_id IN ({id_list})
+                WHERE (?1 IS NULL OR w.provider_type = ?1)
+            """
+            batch_size = QUALIFIED_WORKERS_BATCH_SIZE
+            if worker_ids is None:
+                batches: List[Tuple[Any, ...]] = [(provider_type,)]
+            else:
+                query += " AND w.worker_id IN ({})"
+                batches = [
+                    (provider_type, *[int(w_id) for w_id in worker_ids[idx : idx + batch_size]])
+                    for idx in range(0, len(worker_ids), batch_size)
+                ]
+            granted_values: Dict[str, Dict[str, int]] = {}
+            for batch in batches:
+                batch_query = query.format(", ".join("?" * (len(batch) - 1)))
+                for r in c.execute(batch_query, batch):
+                    worker_granted_values = granted_values.setdefault(r["worker_id"], {})
+                    if r["qualification_id"] is not None:
+                        worker_granted_values[r["qualification_id"]] = r["value"]
+
+        return {
+            worker_id
+            for worker_id, worker_granted_values in granted_values.items()
+            if all(
+                requirement_is_met(
+                    qualification,
+                    qualification_id in worker_granted_values,
+                    worker_granted_values.get(qualification_id),
+                )
+                for qualification_id, qualification in requirements
+            )
+        }
+
     def _get_granted_qualification(
         self, qualification_id: str, worker_id: str
     ) -> Mapping[str, Any]:
@@ -1319,8 +2380,7 @@ class LocalMephistoDB(MephistoDB):
 
         See GrantedQualification for the expected fields for the returned mapping
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 f"""
@@ -1414,6 +2474,9 @@ class LocalMephistoDB(MephistoDB):
         """
         if status not in AgentState.valid():
             raise MephistoDBException(f"Invalid status {status} for an agent")
+        if self.group_commit:
+            self._queue_status_write("onboarding_agents", onboarding_agent_id, status)
+            return
         with self.table_access_condition, self.get_connection() as conn:
             c = conn.cursor()
             if status is not None:
@@ -1438,8 +2501,8 @@ class LocalMephistoDB(MephistoDB):
         Try to find any onboarding agent that matches the above. When called with no arguments,
         return all onboarding agents.
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        self._flush_status_writes()
+        with self._read_connection() as conn:
             c = conn.cursor()
             additional_query, arg_tuple = self.__create_query_and_tuple(
                 [
@@ -1612,33 +2675,47 @@ class LocalMephistoDB(MephistoDB):
             self.db_root
         ), f"Accessing invalid key {path_key} for root {self.db_root}"
 
+    def _write_agent_data(self, path_key: str, data: bytes) -> None:
+        """Write the given data to the agent data store, compressing it if enabled"""
+        if self.agent_data_compression:
+            data = compress_agent_data(data, self.agent_data_compression_threshold)
+        self._agent_data_store.write(path_key, data)
+
+    def _read_agent_data(self, path_key: str) -> bytes:
+        """Read the given key from the agent data store, decompressing it if needed"""
+        return decompress_agent_data(self._agent_data_store.read(path_key))
+
     def write_dict(self, path_key: str, target_dict: Dict[str, Any]):
         """Write an object to the given key"""
         self._assert_path_in_domain(path_key)
-        os.makedirs(os.path.dirname(path_key), exist_ok=True)
-        with open(path_key, "w+") as data_file:
-            json.dump(target_dict, data_file)
+        self._write_agent_data(path_key, json.dumps(target_dict).encode())
 
     def read_dict(self, path_key: str) -> Dict[str, Any]:
         """Return the dict loaded from the given path key"""
         self._assert_path_in_domain(path_key)
-        with open(path_key, "r") as data_file:
-            return json.load(data_file)
+        return json.loads(self._read_agent_data(path_key))
 
     def write_text(self, path_key: str, data_string: str):
         """Write the given text to the given key"""
         self._assert_path_in_domain(path_key)
-        os.makedirs(os.path.dirname(path_key), exist_ok=True)
-        with open(path_key, "w+") as data_file:
-            data_file.write(data_string)
+        self._write_agent_data(path_key, data_string.encode())
 
     def read_text(self, path_key: str) -> str:
         """Get text data stored at the given key"""
         self._assert_path_in_domain(path_key)
-        with open(path_key, "r") as data_file:
-            return data_file.read()
+        return self._read_agent_data(path_key).decode()
 
     def key_exists(self, path_key: str) -> bool:
         """See if the given path refers to a known file"""
         self._assert_path_in_domain(path_key)
-        return os.path.exists(path_key)
+        return self._agent_data_store.exists(path_key)
+
+    def append_text(self, path_key: str, data_string: str, sync: bool = False):
+        """Append the given text to the given key, flushing it to disk if `sync` is set"""
+        self._assert_path_in_domain(path_key)
+        self._agent_data_store.append(path_key, data_string.encode(), sync=sync)
+
+    def remove_key(self, path_key: str):
+        """Remove any data stored at the given key"""
+        self._assert_path_in_domain(path_key)
+        self._agent_data_store.remove(path_key)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Options of LocalMephistoDB, kept apart from it so that the hydra configs can
+use them without importing the database. Defaults of modules that can't be
+imported here without a cycle are checked against theirs in test/tools/test_scripts.py
+"""
+
+from dataclasses import dataclass
+from dataclasses import field
+
+from mephisto.abstractions.databases.async_database import DEFAULT_AIO_MAX_WORKERS
+from mephisto.abstractions.databases.qualification_cache import (
+    DEFAULT_QUALIFICATION_CACHE_TTL_SECONDS,
+)
+from mephisto.abstractions.databases.query_profiler import DEFAULT_SLOW_QUERY_THRESHOLD_MS
+
+
+@dataclass
+class LocalMephistoDBArgs:
+    """Arguments of the connections, locking and caching of a LocalMephistoDB"""
+
+    use_wal: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Run the database in WAL journal mode, serving reads from a pool "
+                "of connections that don't wait on writes."
+            )
+        },
+    )
+    max_reader_connections: int = field(
+        default=8,
+        metadata={"help": "Maximum number of pooled reader connections when using WAL mode."},
+    )
+    group_commit: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Queue status-only updates of units and agents, and write them "
+                "together in one transaction. Queued updates may be lost on a crash."
+            )
+        },
+    )
+    group_commit_interval_ms: int = field(
+        default=50,
+        metadata={"help": "Maximum time status updates stay queued when using group commit."},
+    )
+    group_commit_max_writes: int = field(
+        default=500,
+        metadata={"help": "Number of queued status updates that triggers an immediate write."},
+    )
+    aio_max_workers: int = field(
+        default=DEFAULT_AIO_MAX_WORKERS,
+        metadata={
+            "help": (
+                "Number of threads, and so database connections, serving async "
+                "database calls from the live task server."
+            )
+        },
+    )
+    profile_queries: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Log slow queries, with their query plans, to query_profile.log in the "
+                "data directory. Inspect the log with `mephisto db profile`."
+            )
+        },
+    )
+    slow_query_threshold_ms: float = field(
+        default=DEFAULT_SLOW_QUERY_THRESHOLD_MS,
+        metadata={"help": "Queries taking longer than this are logged when profiling."},
+    )
+    qualification_cache: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Cache the qualifications granted to workers by name. Grants and "
+                "revokes made by this process are seen immediately, but the ones made "
+                "by other processes, like blocks from the review app, only once "
+                "cached entries expire."
+            )
+        },
+    )
+    qualification_cache_ttl: float = field(
+        default=DEFAULT_QUALIFICATION_CACHE_TTL_SECONDS,
+        metadata={
+            "help": (
+                "Seconds after which cached qualifications are read again, bounding how "
+                "long grants made by other processes go unnoticed. 0 never expires them."
+            )
+        },
+    )
+    read_only: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Open an existing database without ever writing to it, for analysis "
+                "and review beside a running operator."
+            )
+        },
+    )
+    immutable: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Also open a read-only database as immutable, for snapshots that no "
+                "process writes to anymore."
+            )
+        },
+    )
+
+
+@dataclass
+class AgentDataArgs:
+    """Arguments of the storage of agent data, see agent_data_store.py"""
+
+    backend: str = field(
+        default="files",
+        metadata={
+            "help": (
+                "Where agent state is saved: 'files' writes a JSON file per agent, "
+                "'sqlite' packs every agent of a run into one agent_data.db file."
+            )
+        },
+    )
+    compression: bool = field(
+        default=False,
+        metadata={
+            "help": (
+                "Gzip agent state of at least compression_threshold bytes when saving "
+                "it. Compressed state is always readable."
+            )
+        },
+    )
+    compression_threshold: int = field(
+        default=4096,
+        metadata={"help": "Size in bytes from which agent state is compressed."},
+    )
+
+
+@dataclass
+class ArchiveArgs:
+    """Arguments of the reads of archive shards, see archive_shards.py"""
+
+    attach: bool = field(
+        default=True,
+        metadata={
+            "help": (
+                "Let reads see task runs moved to archive shards by `mephisto db archive`. "
+                "Turning it off keeps reads on the main database only."
+            )
+        },
+    )
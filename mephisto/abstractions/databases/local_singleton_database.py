@@ -4,14 +4,17 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-import threading
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.abstractions.databases.object_cache import DEFAULT_OBJECT_CACHE_SIZE
+from mephisto.abstractions.databases.object_cache import LRUObjectCache
 from mephisto.data_model.agent import Agent
 from mephisto.data_model.agent import OnboardingAgent
 from mephisto.data_model.assignment import Assignment
@@ -25,10 +28,6 @@ from mephisto.data_model.unit import Unit
 from mephisto.data_model.worker import Worker
 from mephisto.utils.logger_core import get_logger
 
-# We should be using WeakValueDictionary rather than a full dict once
-# we're better able to trade-off between memory and space.
-# from weakref import WeakValueDictionary
-
 logger = get_logger(name=__name__)
 
 
@@ -39,8 +38,10 @@ class MephistoSingletonDB(LocalMephistoDB):
     """
     Class that creates a singleton storage for all accessed data.
 
-    Tries to keep the data usage down with weak references, but it's
-    still subject to memory leaks.
+    Each cached class keeps at most `cache_size` objects, evicting the least
+    recently used ones. Objects that belong to a task run pinned with
+    `pin_task_run` (as the Operator does for live runs) are never evicted,
+    as they may hold live state that must not be loaded twice.
 
     This is a tradeoff to have more speed for not making db queries from disk
     """
@@ -59,19 +60,55 @@ class MephistoSingletonDB(LocalMephistoDB):
         Requester,
     ]
 
-    def __init__(self, database_path=None):
-        super().__init__(database_path=database_path)
+    def __init__(
+        self,
+        database_path=None,
+        args: Optional[LocalMephistoDBArgs] = None,
+        cache_size: int = DEFAULT_OBJECT_CACHE_SIZE,
+    ):
+        super().__init__(database_path=database_path, args=args)
 
-        # Create singleton dictionaries for entries
-        self._singleton_cache = {k: dict() for k in self._cached_classes}
+        # Create singleton caches for entries
+        self._singleton_cache: Dict[type, LRUObjectCache] = {
+            k: LRUObjectCache(
+                k.__name__,
+                max_size=cache_size,
+                get_group=self._get_task_run_id_of,
+                on_evict=self._on_evict,
+            )
+            for k in self._cached_classes
+        }
+        # Cached class that each data model class loaded so far is stored under,
+        # provider-specific subclasses included, or None if it isn't cached
+        self._cached_class_of: Dict[type, Optional[type]] = {
+            k: k for k in self._cached_classes
+        }
         self._assignment_to_unit_mapping: Dict[str, List[Unit]] = {}
 
-    def shutdown(self) -> None:
-        """Close all open connections"""
-        with self.table_access_condition:
-            curr_thread = threading.get_ident()
-            self.conn[curr_thread].close()
-            del self.conn[curr_thread]
+    @staticmethod
+    def _get_task_run_id_of(value: Any) -> Optional[str]:
+        """Return the task run a cached object belongs to, if any"""
+        if isinstance(value, TaskRun):
+            return value.db_id
+        return getattr(value, "task_run_id", None)
+
+    def _on_evict(self, value: Any) -> None:
+        """Drop cached unit lists that would otherwise keep evicted objects alive"""
+        if isinstance(value, Assignment):
+            self._assignment_to_unit_mapping.pop(value.db_id, None)
+        elif isinstance(value, Unit):
+            self._assignment_to_unit_mapping.pop(value.assignment_id, None)
+
+    def pin_task_run(self, task_run_id: str) -> None:
+        """Keep all cached objects of the given task run until it is unpinned"""
+        for cache in self._singleton_cache.values():
+            cache.pin_group(task_run_id)
+
+    def unpin_task_run(self, task_run_id: str) -> None:
+        """Allow the cached objects of the given task run to be evicted again"""
+        super().unpin_task_run(task_run_id)
+        for cache in self._singleton_cache.values():
+            cache.unpin_group(task_run_id)
 
     def optimized_load(
         self,
@@ -83,19 +120,35 @@ class MephistoSingletonDB(LocalMephistoDB):
         Load the given class in an optimized fashion, if this DB has a more
         efficient way of storing and managing the data
         """
-        for stored_class in self._cached_classes:
-            if issubclass(target_cls, stored_class):
-                return self._singleton_cache[stored_class].get(db_id)
-        return None
+        stored_class = self._get_cached_class(target_cls)
+        if stored_class is None:
+            return None
+        return self._singleton_cache[stored_class].get(db_id)
 
     def cache_result(self, target_cls, value) -> None:
         """Store the result of a load for caching reasons"""
-        for stored_class in self._cached_classes:
-            if issubclass(target_cls, stored_class):
-                self._singleton_cache[stored_class][value.db_id] = value
-                break
+        stored_class = self._get_cached_class(target_cls)
+        if stored_class is not None:
+            self._singleton_cache[stored_class].put(value.db_id, value)
         return None
 
+    def _get_cached_class(self, target_cls: type) -> Optional[type]:
+        """
+        Return the cached class the given class is stored under, resolving it
+        against `_cached_classes` only the first time the class is seen
+        """
+        try:
+            return self._cached_class_of[target_cls]
+        except KeyError:
+            pass
+        stored_class = None
+        for cached_class in self._cached_classes:
+            if issubclass(target_cls, cached_class):
+                stored_class = cached_class
+                break
+        self._cached_class_of[target_cls] = stored_class
+        return stored_class
+
     def _new_agent(
         self,
         worker_id: str,
@@ -168,7 +221,10 @@ class MephistoSingletonDB(LocalMephistoDB):
                 units = self._assignment_to_unit_mapping.get(assignment_id)
                 if units is None:
                     units = super()._find_units(assignment_id=assignment_id)
-                    self._assignment_to_unit_mapping[assignment_id] = units
+                    if len(units) > 0:
+                        # Empty results are not cached, as there are no unit
+                        # evictions that would ever clear them
+                        self._assignment_to_unit_mapping[assignment_id] = units
                 return units
 
         # Any other cases are less common and more complicated, and so we don't cache
@@ -215,3 +271,31 @@ class MephistoSingletonDB(LocalMephistoDB):
             task_type=task_type,
             sandbox=sandbox,
         )
+
+    def new_units_bulk(
+        self,
+        task_id: str,
+        task_run_id: str,
+        requester_id: str,
+        unit_keys: List[Tuple[str, int]],
+        pay_amount: float,
+        provider_type: str,
+        task_type: str,
+        sandbox: bool = True,
+    ) -> List[str]:
+        """
+        Create a new unit for every (assignment_id, unit_index) pair in `unit_keys`,
+        clearing the cached units of every assignment involved.
+        """
+        for assignment_id, _ in unit_keys:
+            self._assignment_to_unit_mapping.pop(assignment_id, None)
+        return super().new_units_bulk(
+            task_id=task_id,
+            task_run_id=task_run_id,
+            requester_id=requester_id,
+            unit_keys=unit_keys,
+            pay_amount=pay_amount,
+            provider_type=provider_type,
+            task_type=task_type,
+            sandbox=sandbox,
+        )
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+List of changes:
+1. Add index on `agents.unit_id`
+2. Add index on `onboarding_agents(worker_id, task_run_id)`
+3. Add index on `granted_qualifications.qualification_id`
+    (lookups by `(worker_id, qualification_id)` already use the index of its UNIQUE constraint)
+4. Add index on `task_runs(task_id, is_completed)`
+5. Add index on `worker_review(worker_id, status)`
+"""
+
+
+ADD_HOT_LOOKUP_INDICES = """
+    CREATE INDEX IF NOT EXISTS agent_by_unit_index ON agents(unit_id);
+    CREATE INDEX IF NOT EXISTS onboarding_agent_by_worker_by_task_run_index
+        ON onboarding_agents(worker_id, task_run_id);
+    CREATE INDEX IF NOT EXISTS granted_qualification_by_qualification_index
+        ON granted_qualifications(qualification_id);
+    CREATE INDEX IF NOT EXISTS task_run_by_task_by_is_completed_index
+        ON task_runs(task_id, is_completed);
+    CREATE INDEX IF NOT EXISTS worker_review_by_worker_by_status_index
+        ON worker_review(worker_id, status);
+"""
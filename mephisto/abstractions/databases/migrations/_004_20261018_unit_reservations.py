@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+List of changes:
+1. Add `units.reserved_by`, the holder of a unit's reservation
+2. Add `units.reserved_until`, the unix time after which the reservation can be taken over
+"""
+
+
+ADD_UNIT_RESERVATIONS = """
+    ALTER TABLE units ADD COLUMN reserved_by TEXT;
+    ALTER TABLE units ADD COLUMN reserved_until FLOAT;
+"""
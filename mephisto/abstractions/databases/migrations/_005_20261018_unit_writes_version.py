@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+List of changes:
+1. Add `unit_writes`, a single row whose `version` counts the unit rows ever written
+2. Add triggers bumping it on every unit insert, status update and delete,
+    so that a database object can tell whether units were written by anything but itself
+"""
+
+
+ADD_UNIT_WRITES_VERSION = """
+    CREATE TABLE IF NOT EXISTS unit_writes (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO unit_writes(id, version) VALUES (1, 0);
+
+    CREATE TRIGGER IF NOT EXISTS unit_writes_on_insert AFTER INSERT ON units
+    BEGIN
+        INSERT INTO unit_writes(id, version) VALUES (1, 1)
+        ON CONFLICT(id) DO UPDATE SET version = version + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS unit_writes_on_status_update AFTER UPDATE OF status ON units
+    BEGIN
+        INSERT INTO unit_writes(id, version) VALUES (1, 1)
+        ON CONFLICT(id) DO UPDATE SET version = version + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS unit_writes_on_delete AFTER DELETE ON units
+    BEGIN
+        INSERT INTO unit_writes(id, version) VALUES (1, 1)
+        ON CONFLICT(id) DO UPDATE SET version = version + 1;
+    END;
+"""
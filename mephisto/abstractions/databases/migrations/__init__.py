@@ -6,9 +6,15 @@
 
 from ._001_20240325_data_porter_feature import *
 from ._002_20241002_modify_qualifications import *
+from ._003_20261018_hot_lookup_indices import *
+from ._004_20261018_unit_reservations import *
+from ._005_20261018_unit_writes_version import *
 
 
 migrations = {
     "20240418_data_porter_feature": MODIFICATIONS_FOR_DATA_PORTER,
     "20241002_modify_qualifications": MODIFY_QUALIFICATIONS,
+    "20261018_hot_lookup_indices": ADD_HOT_LOOKUP_INDICES,
+    "20261018_unit_reservations": ADD_UNIT_RESERVATIONS,
+    "20261018_unit_writes_version": ADD_UNIT_WRITES_VERSION,
 }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import threading
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+
+from prometheus_client import Counter  # type: ignore
+from prometheus_client import Gauge  # type: ignore
+
+DEFAULT_OBJECT_CACHE_SIZE = 50000
+
+OBJECT_CACHE_HITS = Counter(
+    "object_cache_hits",
+    "Loads served from the singleton db object cache",
+    ["object_type"],
+)
+OBJECT_CACHE_MISSES = Counter(
+    "object_cache_misses",
+    "Loads that missed the singleton db object cache",
+    ["object_type"],
+)
+OBJECT_CACHE_EVICTIONS = Counter(
+    "object_cache_evictions",
+    "Objects evicted from the singleton db object cache",
+    ["object_type"],
+)
+OBJECT_CACHE_SIZE = Gauge(
+    "object_cache_size",
+    "Objects currently held in the singleton db object cache",
+    ["object_type"],
+)
+
+
+class LRUObjectCache:
+    """
+    Bounded cache of data model objects by db_id, evicting the least recently
+    used objects once more than `max_size` are held.
+
+    Objects can be pinned by group (for the singleton db, the task run they belong
+    to), in which case they are held outside of the LRU and never evicted until
+    their group is unpinned. Pinned objects don't count against `max_size`.
+    """
+
+    def __init__(
+        self,
+        object_type: str,
+        max_size: int = DEFAULT_OBJECT_CACHE_SIZE,
+        get_group: Optional[Callable[[Any], Optional[str]]] = None,
+        on_evict: Optional[Callable[[Any], None]] = None,
+    ):
+        assert max_size > 0, "Object cache must be able to hold at least one object"
+        self.object_type = object_type
+        self.max_size = max_size
+        self._get_group = get_group
+        self._on_evict = on_evict
+
+        self._lru: "OrderedDict[str, Any]" = OrderedDict()
+        self._pinned: Dict[str, Any] = {}
+        self._pinned_groups: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+        self._hits = OBJECT_CACHE_HITS.labels(object_type=object_type)
+        self._misses = OBJECT_CACHE_MISSES.labels(object_type=object_type)
+        self._evictions = OBJECT_CACHE_EVICTIONS.labels(object_type=object_type)
+        self._size = OBJECT_CACHE_SIZE.labels(object_type=object_type)
+
+    def __len__(self) -> int:
+        return len(self._lru) + len(self._pinned)
+
+    def __contains__(self, db_id: str) -> bool:
+        return db_id in self._pinned or db_id in self._lru
+
+    def _group_of(self, value: Any) -> Optional[str]:
+        if self._get_group is None:
+            return None
+        return self._get_group(value)
+
+    def get(self, db_id: str) -> Optional[Any]:
+        """Return the cached object for db_id if present, marking it as recently used"""
+        with self._lock:
+            value = self._pinned.get(db_id)
+            if value is None:
+                value = self._lru.get(db_id)
+                if value is not None:
+                    self._lru.move_to_end(db_id)
+        if value is None:
+            self._misses.inc()
+        else:
+            self._hits.inc()
+        return value
+
+    def put(self, db_id: str, value: Any) -> None:
+        """Cache the given object, evicting the least recently used ones if over budget"""
+        group = self._group_of(value)
+        with self._lock:
+            if group is not None and group in self._pinned_groups:
+                self._lru.pop(db_id, None)
+                self._pinned[db_id] = value
+                self._pinned_groups[group].add(db_id)
+            else:
+                self._lru[db_id] = value
+                self._lru.move_to_end(db_id)
+            evicted = self._evict_over_budget()
+        self._after_evict(evicted)
+
+    def discard(self, db_id: str) -> None:
+        """Remove the given object from the cache, if present"""
+        with self._lock:
+            self._lru.pop(db_id, None)
+            value = self._pinned.pop(db_id, None)
+            if value is not None:
+                group = self._group_of(value)
+                if group in self._pinned_groups:
+                    self._pinned_groups[group].discard(db_id)
+            self._size.set(len(self))
+
+    def pin_group(self, group: str) -> None:
+        """Keep every object of the given group, current or future, in the cache"""
+        with self._lock:
+            if group in self._pinned_groups:
+                return
+            keys = {k for k, v in self._lru.items() if self._group_of(v) == group}
+            for key in keys:
+                self._pinned[key] = self._lru.pop(key)
+            self._pinned_groups[group] = keys
+
+    def unpin_group(self, group: str) -> None:
+        """Return the objects of the given group to the LRU, where they may be evicted"""
+        with self._lock:
+            keys = self._pinned_groups.pop(group, set())
+            for key in keys:
+                value = self._pinned.pop(key, None)
+                if value is not None:
+                    self._lru[key] = value
+            evicted = self._evict_over_budget()
+        self._after_evict(evicted)
+
+    def _evict_over_budget(self) -> List[Any]:
+        """Pop least recently used objects until within budget. Call with the lock held."""
+        evicted = []
+        while len(self._lru) > self.max_size:
+            _, value = self._lru.popitem(last=False)
+            evicted.append(value)
+        self._size.set(len(self))
+        return evicted
+
+    def _after_evict(self, evicted: List[Any]) -> None:
+        if len(evicted) == 0:
+            return
+        self._evictions.inc(len(evicted))
+        if self._on_evict is not None:
+            for value in evicted:
+                self._on_evict(value)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import functools
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+from typing import TypeVar
+
+from prometheus_client import Histogram  # type: ignore
+
+from mephisto.abstractions.databases.connection_pool import DEFAULT_MAX_READER_CONNECTIONS
+from mephisto.abstractions.databases.connection_pool import LeasedConnectionCondition
+from mephisto.abstractions.databases.connection_pool import SQLiteConnectionPool
+from mephisto.utils.db import MephistoDBException
+
+PROVIDER_DATASTORE_LATENCY = Histogram(
+    "provider_datastore_latency_seconds",
+    "Logging for provider datastore requests",
+    ["provider", "method"],
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def timed_datastore_method(method: F) -> F:
+    """
+    Record the latency of a datastore method in `provider_datastore_latency_seconds`,
+    labelled with the datastore's provider type and the method name
+    """
+
+    @functools.wraps(method)
+    def wrapped(self: "ProviderDatastore", *args, **kwargs):
+        latency = PROVIDER_DATASTORE_LATENCY.labels(
+            provider=self.PROVIDER_TYPE,
+            method=method.__name__,
+        )
+        with latency.time():
+            return method(self, *args, **kwargs)
+
+    return wrapped  # type: ignore
+
+
+class ProviderDatastore:
+    """
+    Base class of the SQLite datastores crowd providers keep next to the main
+    database, in `<datastore_root>/<PROVIDER_TYPE>.db`.
+
+    Writes are serialized through `table_access_condition`, which leases the
+    holding thread a connection from a bounded pool, like `LocalMephistoDB`.
+    With `use_wal` set (the default), the datastore is in SQLite's WAL journal
+    mode and reads made through `_read_connection` are served from a pool of
+    query-only connections that never take that lock, so that frequent status
+    lookups don't queue up behind writes.
+    """
+
+    PROVIDER_TYPE: str
+
+    def __init__(
+        self,
+        datastore_root: str,
+        use_wal: bool = True,
+        max_reader_connections: int = DEFAULT_MAX_READER_CONNECTIONS,
+    ):
+        self.datastore_root = datastore_root
+        self.db_path = os.path.join(datastore_root, f"{self.PROVIDER_TYPE}.db")
+        self.use_wal = use_wal
+        writer_pragmas = ["PRAGMA foreign_keys = on;"]
+        if use_wal:
+            # NORMAL is durable across application crashes in WAL mode,
+            # and avoids an fsync on every committed write
+            writer_pragmas.append("PRAGMA synchronous = NORMAL;")
+        self._connection_pool = SQLiteConnectionPool(
+            self.db_path,
+            name=self.PROVIDER_TYPE,
+            pragmas=writer_pragmas,
+        )
+        self.table_access_condition = LeasedConnectionCondition(self._connection_pool)
+        self._reader_pool: Optional[SQLiteConnectionPool] = None
+        if use_wal:
+            with self.table_access_condition:
+                self.get_connection().execute("PRAGMA journal_mode = WAL;")
+            self._reader_pool = SQLiteConnectionPool(
+                self.db_path,
+                max_size=max_reader_connections,
+                read_only=True,
+                name=f"{self.PROVIDER_TYPE}_readers",
+            )
+        self.init_tables()
+
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Returns the pooled database connection leased to the calling thread
+        while it holds `table_access_condition`.
+        """
+        return self.table_access_condition.get_connection()
+
+    @contextmanager
+    def _read_connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Provide a connection for a read-only query. In WAL mode this is a pooled
+        reader connection that doesn't take the writer lock, otherwise it's the
+        connection leased under `table_access_condition`.
+        """
+        if self._reader_pool is None:
+            with self.table_access_condition:
+                yield self.get_connection()
+        else:
+            with self._reader_pool.connection() as conn:
+                yield conn
+
+    def init_tables(self) -> None:
+        """Run all the table creation SQL queries to ensure the expected tables exist"""
+        raise NotImplementedError()
+
+    def _row_exists(self, table_name: str, params: dict) -> bool:
+        """
+        Check if a row of `table_name` matches all of the given column values,
+        without taking the writer lock in WAL mode
+        """
+        where_string = " AND ".join(f"{field_name} = ?" for field_name in params)
+        with self._read_connection() as conn:
+            row = conn.execute(
+                f"SELECT 1 FROM {table_name} WHERE {where_string} LIMIT 1;",
+                list(params.values()),
+            ).fetchone()
+        return row is not None
+
+    def _upsert_many(
+        self,
+        table_name: str,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str] = (),
+    ) -> None:
+        """
+        Insert the given rows in one transaction. Rows conflicting with an existing
+        one on `conflict_columns` update its `update_columns` instead, or are
+        skipped if there are none.
+
+        Other constraint failures roll the whole batch back and are raised as
+        `sqlite3.IntegrityError`, for callers to handle like single inserts.
+        """
+        if len(rows) == 0:
+            return
+        if len(update_columns) > 0:
+            updates = ", ".join(f"{c} = excluded.{c}" for c in update_columns)
+            on_conflict = f"DO UPDATE SET {updates}"
+        else:
+            on_conflict = "DO NOTHING"
+        with self.table_access_condition, self.get_connection() as conn:
+            conn.executemany(
+                f"""
+                INSERT INTO {table_name}({", ".join(columns)})
+                VALUES ({", ".join("?" * len(columns))})
+                ON CONFLICT({", ".join(conflict_columns)}) {on_conflict};
+                """,
+                rows,
+            )
+
+    def _update_many(self, sql: str, rows: Sequence[Sequence[Any]]) -> None:
+        """Run the given `UPDATE` statement for every row of parameters in one transaction"""
+        if len(rows) == 0:
+            return
+        with self.table_access_condition, self.get_connection() as conn:
+            try:
+                conn.executemany(sql, rows)
+            except sqlite3.IntegrityError as e:
+                raise MephistoDBException(e)
+
+    def shutdown(self) -> None:
+        """Close all open connections"""
+        self._connection_pool.close()
+        if self._reader_pool is not None:
+            self._reader_pool.close()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import TYPE_CHECKING
+
+from prometheus_client import Counter  # type: ignore
+from prometheus_client import Gauge  # type: ignore
+
+if TYPE_CHECKING:
+    from mephisto.data_model.qualification import GrantedQualification
+
+DEFAULT_QUALIFICATION_CACHE_SIZE = 100000
+DEFAULT_QUALIFICATION_CACHE_TTL_SECONDS = 60.0
+
+QUALIFICATION_CACHE_HITS = Counter(
+    "qualification_cache_hits",
+    "Granted qualification lookups by worker and name served from the cache",
+)
+QUALIFICATION_CACHE_MISSES = Counter(
+    "qualification_cache_misses",
+    "Granted qualification lookups by worker and name that read the database",
+)
+QUALIFICATION_CACHE_HIT_RATIO = Gauge(
+    "qualification_cache_hit_ratio",
+    "Share of granted qualification lookups served from the cache since startup",
+)
+
+CacheKey = Tuple[str, str]
+
+
+class QualificationCache:
+    """
+    Bounded cache of the qualification granted to a worker by qualification
+    name, including the absence of one, evicting the least recently used
+    entries once more than `max_size` are held.
+
+    Entries expire after `ttl_seconds` (never if it's 0), which bounds how long
+    grants made by other processes can go unnoticed. Grants made through this
+    process' database invalidate the entries of the worker instead.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_QUALIFICATION_CACHE_TTL_SECONDS,
+        max_size: int = DEFAULT_QUALIFICATION_CACHE_SIZE,
+    ):
+        assert max_size > 0, "Qualification cache must be able to hold at least one entry"
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[CacheKey, Tuple[Optional[GrantedQualification], float]]" = (
+            OrderedDict()
+        )
+        self._worker_names: Dict[str, Set[str]] = {}
+        # Bumped on every invalidation, so that loads racing with one aren't cached
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_load(
+        self,
+        worker_id: str,
+        qualification_name: str,
+        load: Callable[[], Optional["GrantedQualification"]],
+    ) -> Optional["GrantedQualification"]:
+        """
+        Return the cached granted qualification for the given worker and name,
+        calling `load` to read and cache it if it isn't cached or has expired
+        """
+        key = (worker_id, qualification_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._record_lookup(hit=True)
+                return entry[0]
+            self._record_lookup(hit=False)
+            generation = self._generation
+
+        granted_qualification = load()
+
+        with self._lock:
+            if generation == self._generation:
+                if self.ttl_seconds > 0:
+                    expires_at = time.monotonic() + self.ttl_seconds
+                else:
+                    expires_at = math.inf
+                self._entries[key] = (granted_qualification, expires_at)
+                self._entries.move_to_end(key)
+                self._worker_names.setdefault(worker_id, set()).add(qualification_name)
+                while len(self._entries) > self.max_size:
+                    (evicted_worker_id, evicted_name), _ = self._entries.popitem(last=False)
+                    self._discard_name(evicted_worker_id, evicted_name)
+        return granted_qualification
+
+    def invalidate_worker(self, worker_id: str) -> None:
+        """Drop every cached entry of the given worker"""
+        with self._lock:
+            self._generation += 1
+            for qualification_name in self._worker_names.pop(worker_id, set()):
+                self._entries.pop((worker_id, qualification_name), None)
+
+    def clear(self) -> None:
+        """Drop every cached entry"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._worker_names.clear()
+
+    def _discard_name(self, worker_id: str, qualification_name: str) -> None:
+        """Remove an evicted entry from the worker index. Call with the lock held."""
+        names = self._worker_names.get(worker_id)
+        if names is not None:
+            names.discard(qualification_name)
+            if len(names) == 0:
+                del self._worker_names[worker_id]
+
+    def _record_lookup(self, hit: bool) -> None:
+        """Update the hit metrics. Call with the lock held."""
+        if hit:
+            self._hits += 1
+            QUALIFICATION_CACHE_HITS.inc()
+        else:
+            self._misses += 1
+            QUALIFICATION_CACHE_MISSES.inc()
+        QUALIFICATION_CACHE_HIT_RATIO.set(self._hits / (self._hits + self._misses))
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served from this cache"""
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups > 0 else 0.0
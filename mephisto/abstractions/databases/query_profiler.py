@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import glob
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Type
+
+from prometheus_client import Counter  # type: ignore
+
+DEFAULT_SLOW_QUERY_THRESHOLD_MS = 50.0
+DEFAULT_PROFILE_LOG_NAME = "query_profile.log"
+DEFAULT_PROFILE_LOG_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_PROFILE_LOG_BACKUP_COUNT = 5
+
+SLOW_QUERIES = Counter(
+    "database_slow_queries",
+    "Queries slower than the profiling threshold, by whether they scan a full table",
+    ["full_scan"],
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.?])\d+(?:\.\d+)?(?![\w.])")
+_NUMBERED_PARAM = re.compile(r"\?\d+")
+_PARAM_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+# "SCAN units" on newer SQLite versions, "SCAN TABLE units" on older ones. Scans
+# using an index are reported with "USING [COVERING] INDEX" and aren't full-table.
+_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?!.*USING)")
+
+
+def get_query_shape(sql: str) -> str:
+    """
+    Normalize the given SQL so that queries differing only in literal values
+    or in the length of an IN list share the same shape
+    """
+    shape = _WHITESPACE.sub(" ", sql).strip().rstrip(";").strip()
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBERED_PARAM.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return _PARAM_LIST.sub("(?, ...)", shape)
+
+
+def get_param_shape(params: Any) -> str:
+    """Describe the given query parameters by type, rather than by value"""
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in params.items()) + "}"
+    return "(" + ", ".join(type(p).__name__ for p in params) + ")"
+
+
+def get_full_scans(plan: List[str]) -> List[str]:
+    """Return the tables that a query plan scans in full"""
+    tables = []
+    for detail in plan:
+        match = _FULL_SCAN.match(detail)
+        if match is not None:
+            tables.append(match.group(1))
+    return tables
+
+
+class QueryProfiler:
+    """
+    Records every query slower than `threshold_ms` to a rotating log of JSON
+    lines, with its SQL text and parameter shape. The first time a slow query
+    of a given shape is seen, its `EXPLAIN QUERY PLAN` is captured too, and
+    any tables it scans in full are flagged.
+
+    Connections opened with `connection_factory` are profiled.
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        threshold_ms: float = DEFAULT_SLOW_QUERY_THRESHOLD_MS,
+        max_bytes: int = DEFAULT_PROFILE_LOG_MAX_BYTES,
+        backup_count: int = DEFAULT_PROFILE_LOG_BACKUP_COUNT,
+    ):
+        self.log_path = log_path
+        self.threshold_ms = threshold_ms
+        self._explained_shapes: Dict[str, List[str]] = {}
+        self._explain_lock = threading.Lock()
+        self._handler = RotatingFileHandler(
+            log_path, maxBytes=max_bytes, backupCount=backup_count
+        )
+        self._log = logging.Logger(f"{__name__}.{log_path}")
+        self._log.addHandler(self._handler)
+        self.connection_factory: Type[sqlite3.Connection] = type(
+            "ProfiledConnection", (ProfiledConnection,), {"profiler": self}
+        )
+
+    def _explain(self, conn: sqlite3.Connection, sql: str, params: Any) -> List[str]:
+        """Return the query plan details for the given query"""
+        try:
+            c = sqlite3.Cursor(conn)
+            c.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in c.fetchall()]
+        except sqlite3.Error as e:
+            return [f"EXPLAIN failed: {e}"]
+
+    def record(
+        self,
+        conn: sqlite3.Connection,
+        sql: str,
+        params: Any,
+        duration_ms: float,
+        num_rows: Optional[int] = None,
+    ) -> None:
+        """Log a query that took longer than the threshold"""
+        shape = get_query_shape(sql)
+        record: Dict[str, Any] = {
+            "time": time.time(),
+            "duration_ms": round(duration_ms, 3),
+            "shape": shape,
+            "sql": sql.strip(),
+            "param_shape": get_param_shape(params),
+        }
+        if num_rows is not None:
+            record["num_rows"] = num_rows
+
+        with self._explain_lock:
+            plan = self._explained_shapes.get(shape)
+        if plan is None:
+            # Only the first slow query of each shape carries its plan in the log
+            plan = [] if num_rows is not None else self._explain(conn, sql, params)
+            with self._explain_lock:
+                self._explained_shapes[shape] = plan
+            record["plan"] = plan
+        full_scans = get_full_scans(plan)
+        record["full_scans"] = full_scans
+        SLOW_QUERIES.labels(full_scan=str(len(full_scans) > 0)).inc()
+        self._log.warning(json.dumps(record))
+
+    def close(self) -> None:
+        self._handler.close()
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Cursor that times its statements, including the time spent fetching their
+    rows, and reports them once they cross the profiler's threshold
+    """
+
+    def _start(self, sql: str, params: Any, num_rows: Optional[int] = None) -> None:
+        self._sql = sql
+        self._params = params
+        self._num_rows = num_rows
+        self._elapsed = 0.0
+        self._reported = False
+
+    def _add_time(self, start_time: float) -> None:
+        if not hasattr(self, "_sql"):
+            return
+        self._elapsed += time.perf_counter() - start_time
+        profiler: QueryProfiler = self.connection.profiler  # type: ignore
+        elapsed_ms = self._elapsed * 1000
+        if not self._reported and elapsed_ms >= profiler.threshold_ms:
+            self._reported = True
+            profiler.record(self.connection, self._sql, self._params, elapsed_ms, self._num_rows)
+
+    def execute(self, sql, parameters=()):  # type: ignore
+        self._start(sql, parameters)
+        start_time = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._add_time(start_time)
+
+    def executemany(self, sql, seq_of_parameters):  # type: ignore
+        seq_of_parameters = list(seq_of_parameters)
+        first_params = seq_of_parameters[0] if len(seq_of_parameters) > 0 else ()
+        self._start(sql, first_params, num_rows=len(seq_of_parameters))
+        start_time = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._add_time(start_time)
+
+    def fetchone(self):
+        start_time = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._add_time(start_time)
+
+    def fetchmany(self, *args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return super().fetchmany(*args, **kwargs)
+        finally:
+            self._add_time(start_time)
+
+    def fetchall(self):
+        start_time = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._add_time(start_time)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose cursors report slow queries to `profiler`"""
+
+    profiler: Optional[QueryProfiler] = None
+
+    def cursor(self, factory=ProfiledCursor):  # type: ignore
+        return super().cursor(factory)
+
+
+def load_query_log(log_path: str) -> List[Dict[str, Any]]:
+    """Read every record of a query log, including its rotated backups"""
+    records = []
+    paths = sorted(glob.glob(f"{log_path}.*"), reverse=True) + [log_path]
+    for path in paths:
+        try:
+            with open(path, "r") as log_file:
+                for line in log_file:
+                    line = line.strip()
+                    if len(line) > 0:
+                        records.append(json.loads(line))
+        except FileNotFoundError:
+            continue
+    return records
+
+
+def summarize_query_log(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Group slow query records by shape, returning one summary per shape
+    ordered by the total time spent in it
+    """
+    summaries: Dict[str, Dict[str, Any]] = {}
+    param_shapes: Dict[str, Set[str]] = {}
+    for record in records:
+        shape = record["shape"]
+        summary = summaries.get(shape)
+        if summary is None:
+            summary = summaries[shape] = {
+                "shape": shape,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "plan": None,
+                "full_scans": [],
+            }
+            param_shapes[shape] = set()
+        summary["count"] += 1
+        summary["total_ms"] += record["duration_ms"]
+        summary["max_ms"] = max(summary["max_ms"], record["duration_ms"])
+        param_shapes[shape].add(record["param_shape"])
+        if record.get("plan") is not None:
+            summary["plan"] = record["plan"]
+        for table in record.get("full_scans", []):
+            if table not in summary["full_scans"]:
+                summary["full_scans"].append(table)
+
+    for shape, summary in summaries.items():
+        summary["mean_ms"] = summary["total_ms"] / summary["count"]
+        summary["param_shapes"] = sorted(param_shapes[shape])
+    return sorted(summaries.values(), key=lambda s: s["total_ms"], reverse=True)
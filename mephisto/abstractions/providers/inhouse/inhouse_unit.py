@@ -5,8 +5,10 @@
 # LICENSE file in the root directory of this source tree.
 
 from typing import Any
+from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import TYPE_CHECKING
 
 from mephisto.abstractions.providers.inhouse.provider_type import PROVIDER_TYPE
@@ -102,3 +104,14 @@ class InhouseUnit(Unit):
         unit = InhouseUnit._register_unit(db, assignment, index, pay_amount, PROVIDER_TYPE)
         logger.debug(f'{InhouseUnit.log_prefix}Created Unit "{unit.db_id}"')
         return unit
+
+    @staticmethod
+    def new_bulk(
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """Create Units for the given (assignment, index) pairs in one db write"""
+        units = InhouseUnit._register_units_bulk(db, unit_specs, pay_amount, PROVIDER_TYPE)
+        logger.debug(f"{InhouseUnit.log_prefix}Created {len(units)} Units")
+        return units
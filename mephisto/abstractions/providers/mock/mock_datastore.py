@@ -4,12 +4,11 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-import os
-import sqlite3
-import threading
 from typing import Any
 from typing import Dict
 
+from mephisto.abstractions.databases.provider_datastore import ProviderDatastore
+from mephisto.abstractions.providers.mock.provider_type import PROVIDER_TYPE
 from mephisto.utils.db import check_if_row_with_params_exists
 from . import mock_datastore_tables as tables
 from .mock_datastore_export import export_datastore
@@ -17,32 +16,18 @@ from .mock_datastore_export import export_datastore
 MTURK_REGION_NAME = "us-east-1"
 
 
-class MockDatastore:
+class MockDatastore(ProviderDatastore):
     """
     Handles storing mock results and statuses across processes for use
     in unit testing and manual experimentation.
     """
 
+    PROVIDER_TYPE = PROVIDER_TYPE
+
     def __init__(self, datastore_root: str):
         """Initialize local storage of active agents, connect to the database"""
         self.agent_data: Dict[str, Dict[str, Any]] = {}
-        self.table_access_condition = threading.Condition()
-        self.conn: Dict[int, sqlite3.Connection] = {}
-        self.db_path = os.path.join(datastore_root, "mock.db")
-        self.init_tables()
-        self.datastore_root = datastore_root
-
-    def get_connection(self) -> sqlite3.Connection:
-        """
-        Returns a singular database connection to be shared amongst all
-        calls for a given thread.
-        """
-        curr_thread = threading.get_ident()
-        if curr_thread not in self.conn or self.conn[curr_thread] is None:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
-            self.conn[curr_thread] = conn
-        return self.conn[curr_thread]
+        super().__init__(datastore_root)
 
     def init_tables(self) -> None:
         """
@@ -50,7 +35,6 @@ class MockDatastore:
         """
         with self.table_access_condition:
             conn = self.get_connection()
-            conn.execute("PRAGMA foreign_keys = on;")
 
             with conn:
                 c = conn.cursor()
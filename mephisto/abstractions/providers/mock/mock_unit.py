@@ -78,3 +78,12 @@ class MockUnit(Unit):
     def new(db: "MephistoDB", assignment: "Assignment", index: int, pay_amount: float) -> "Unit":
         """Create a Unit for the given assignment"""
         return MockUnit._register_unit(db, assignment, index, pay_amount, PROVIDER_TYPE)
+
+    @staticmethod
+    def new_bulk(
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """Create Units for the given (assignment, index) pairs in one db write"""
+        return MockUnit._register_units_bulk(db, unit_specs, pay_amount, PROVIDER_TYPE)
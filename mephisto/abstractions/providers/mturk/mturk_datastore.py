@@ -4,9 +4,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-import os
 import sqlite3
-import threading
 import time
 from collections import defaultdict
 from typing import Any
@@ -18,6 +16,9 @@ from botocore.exceptions import ClientError  # type: ignore
 from botocore.exceptions import ProfileNotFound  # type: ignore
 
 from mephisto.abstractions.databases.local_database import is_unique_failure
+from mephisto.abstractions.databases.provider_datastore import ProviderDatastore
+from mephisto.abstractions.databases.provider_datastore import timed_datastore_method
+from mephisto.abstractions.providers.mturk.provider_type import PROVIDER_TYPE
 from mephisto.utils.db import apply_migrations
 from mephisto.utils.logger_core import get_logger
 from . import mturk_datastore_tables as tables
@@ -29,7 +30,7 @@ MTURK_REGION_NAME = "us-east-1"
 logger = get_logger(name=__name__)
 
 
-class MTurkDatastore:
+class MTurkDatastore(ProviderDatastore):
     """
     Handles storing multiple sessions for different requesters
     across a single mephisto thread (locked to a MephistoDB).
@@ -37,30 +38,16 @@ class MTurkDatastore:
     and mephisto.
     """
 
+    PROVIDER_TYPE = PROVIDER_TYPE
+
     def __init__(self, datastore_root: str):
         """Initialize the session storage to empty, initialize tables if needed"""
         self.session_storage: Dict[str, boto3.Session] = {}
-        self.table_access_condition = threading.Condition()
-        self.conn: Dict[int, sqlite3.Connection] = {}
-        self.db_path = os.path.join(datastore_root, "mturk.db")
-        self.init_tables()
-        self.datastore_root = datastore_root
+        super().__init__(datastore_root)
         self._last_hit_mapping_update_times: Dict[str, float] = defaultdict(
             lambda: time.monotonic()
         )
 
-    def get_connection(self) -> sqlite3.Connection:
-        """
-        Returns a singular database connection to be shared amongst all
-        calls for a given thread.
-        """
-        curr_thread = threading.get_ident()
-        if curr_thread not in self.conn or self.conn[curr_thread] is None:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
-            self.conn[curr_thread] = conn
-        return self.conn[curr_thread]
-
     def _mark_hit_mapping_update(self, unit_id: str) -> None:
         """
         Update the last hit mapping time to mark a change to the hit
@@ -74,7 +61,6 @@ class MTurkDatastore:
         """
         with self.table_access_condition:
             conn = self.get_connection()
-            conn.execute("PRAGMA foreign_keys = on;")
 
             with conn:
                 c = conn.cursor()
@@ -103,6 +89,7 @@ class MTurkDatastore:
         """
         return compare_time > self._last_hit_mapping_update_times[unit_id]
 
+    @timed_datastore_method
     def new_hit(self, hit_id: str, hit_link: str, duration: int, run_id: str) -> None:
         """Register a new HIT mapping in the table"""
         with self.table_access_condition, self.get_connection() as conn:
@@ -127,12 +114,12 @@ class MTurkDatastore:
                 (hit_id, run_id),
             )
 
+    @timed_datastore_method
     def get_unassigned_hit_ids(self, run_id: str):
         """
         Return a list of all HIT ids that haven't been assigned
         """
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -152,6 +139,7 @@ class MTurkDatastore:
             results = c.fetchall()
             return [r["hit_id"] for r in results]
 
+    @timed_datastore_method
     def register_assignment_to_hit(
         self,
         hit_id: str,
@@ -191,6 +179,7 @@ class MTurkDatastore:
             if unit_id is not None:
                 self._mark_hit_mapping_update(unit_id)
 
+    @timed_datastore_method
     def clear_hit_from_unit(self, unit_id: str) -> None:
         """
         Clear the hit mapping that maps the given unit,
@@ -225,10 +214,10 @@ class MTurkDatastore:
             )
             self._mark_hit_mapping_update(unit_id)
 
+    @timed_datastore_method
     def get_hit_mapping(self, unit_id: str) -> sqlite3.Row:
         """Get the mapping between Mephisto IDs and MTurk ids"""
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -240,6 +229,7 @@ class MTurkDatastore:
             results = c.fetchall()
             return results[0]
 
+    @timed_datastore_method
     def register_run(
         self,
         run_id: str,
@@ -269,10 +259,10 @@ class MTurkDatastore:
                 ),
             )
 
+    @timed_datastore_method
     def get_run(self, run_id: str) -> sqlite3.Row:
         """Get the details for a run by task_run_id"""
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -284,6 +274,7 @@ class MTurkDatastore:
             results = c.fetchall()
             return results[0]
 
+    @timed_datastore_method
     def create_qualification_mapping(
         self,
         qualification_name: str,
@@ -347,10 +338,10 @@ class MTurkDatastore:
             else:
                 raise e
 
+    @timed_datastore_method
     def get_qualification_mapping(self, qualification_name: str) -> Optional[sqlite3.Row]:
         """Get the mapping between Mephisto qualifications and MTurk qualifications"""
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -361,6 +361,15 @@ class MTurkUnit(Unit):
         """Create a Unit for the given assignment"""
         return MTurkUnit._register_unit(db, assignment, index, pay_amount, PROVIDER_TYPE)
 
+    @staticmethod
+    def new_bulk(
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """Create Units for the given (assignment, index) pairs in one db write"""
+        return MTurkUnit._register_units_bulk(db, unit_specs, pay_amount, PROVIDER_TYPE)
+
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}({self.db_id}, {self.get_mturk_hit_id()}, {self.db_status})"
@@ -5,21 +5,21 @@
 # LICENSE file in the root directory of this source tree.
 
 import json
-import os
 import sqlite3
-import threading
 import time
 from collections import defaultdict
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 from mephisto.abstractions.databases.local_database import is_unique_failure
+from mephisto.abstractions.databases.provider_datastore import ProviderDatastore
+from mephisto.abstractions.databases.provider_datastore import timed_datastore_method
 from mephisto.abstractions.providers.prolific.api.constants import StudyStatus
 from mephisto.abstractions.providers.prolific.provider_type import PROVIDER_TYPE
 from mephisto.utils.db import apply_migrations
-from mephisto.utils.db import check_if_row_with_params_exists
 from mephisto.utils.db import EntryAlreadyExistsException
 from mephisto.utils.db import make_randomized_int_id
 from mephisto.utils.db import MephistoDBException
@@ -35,31 +35,18 @@ from .prolific_utils import get_authenticated_client
 logger = get_logger(name=__name__)
 
 
-class ProlificDatastore:
+class ProlificDatastore(ProviderDatastore):
+    PROVIDER_TYPE = PROVIDER_TYPE
+
     def __init__(self, datastore_root: str):
         """Initialize local storage of active agents, connect to the database"""
         self.session_storage: Dict[str, ProlificClient] = {}
         self.agent_data: Dict[str, Dict[str, Any]] = {}
-        self.table_access_condition = threading.Condition()
-        self.conn: Dict[int, sqlite3.Connection] = {}
-        self.db_path = os.path.join(datastore_root, f"{PROVIDER_TYPE}.db")
-        self.init_tables()
-        self.datastore_root = datastore_root
+        super().__init__(datastore_root)
         self._last_study_mapping_update_times: Dict[str, float] = defaultdict(
             lambda: time.monotonic()
         )
 
-    def get_connection(self) -> sqlite3.Connection:
-        """
-        Returns a singular database connection to be shared amongst all calls for a given thread.
-        """
-        curr_thread = threading.get_ident()
-        if curr_thread not in self.conn or self.conn[curr_thread] is None:
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
-            self.conn[curr_thread] = conn
-        return self.conn[curr_thread]
-
     def _mark_study_mapping_update(self, unit_id: str) -> None:
         """
         Update the last Study mapping time to mark a change to the Study
@@ -71,7 +58,6 @@ class ProlificDatastore:
         """Run all the table creation SQL queries to ensure the expected tables exist"""
         with self.table_access_condition:
             conn = self.get_connection()
-            conn.execute("PRAGMA foreign_keys = on;")
 
             with conn:
                 c = conn.cursor()
@@ -90,10 +76,40 @@ class ProlificDatastore:
     def get_export_data(self, **kwargs) -> dict:
         return export_datastore(self, **kwargs)
 
+    def _insert_with_random_ids(
+        self,
+        table_name: str,
+        columns: List[str],
+        rows: List[Tuple[Any, ...]],
+        conflict_columns: List[str],
+    ) -> None:
+        """
+        Insert the given rows in one transaction with new randomized ids, skipping
+        those conflicting with an existing row on `conflict_columns`. Id collisions
+        are raised as `EntryAlreadyExistsException` for `retry_generate_id`.
+        """
+        try:
+            self._upsert_many(
+                table_name,
+                ["id", *columns],
+                [(make_randomized_int_id(), *row) for row in rows],
+                conflict_columns=conflict_columns,
+            )
+        except sqlite3.IntegrityError as e:
+            if is_unique_failure(e):
+                raise EntryAlreadyExistsException(
+                    e,
+                    db=self,
+                    table_name=table_name,
+                    original_exc=e,
+                )
+            raise MephistoDBException(e)
+
     def is_study_mapping_in_sync(self, unit_id: str, compare_time: float):
         """Determine if a cached value from the given compare time is still valid"""
         return compare_time > self._last_study_mapping_update_times[unit_id]
 
+    @timed_datastore_method
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def new_study(
         self,
@@ -137,6 +153,7 @@ class ProlificDatastore:
                     )
                 raise MephistoDBException(e)
 
+    @timed_datastore_method
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def new_run_mapping(self, prolific_study_id: str, task_run_id: str) -> None:
         """Register a new Run mapping in the table"""
@@ -167,26 +184,27 @@ class ProlificDatastore:
                     )
                 raise MephistoDBException(e)
 
+    @timed_datastore_method
     def update_study_status(self, study_id: str, status: str) -> None:
         """Set the study status in datastore"""
-        with self.table_access_condition:
-            conn = self.get_connection()
-            c = conn.cursor()
-            c.execute(
-                """
-                UPDATE studies
-                SET status = ?
-                WHERE prolific_study_id = ?
-                """,
-                (status, study_id),
-            )
-            conn.commit()
-            return None
+        self.update_study_statuses({study_id: status})
+
+    @timed_datastore_method
+    def update_study_statuses(self, study_statuses: Dict[str, str]) -> None:
+        """Set the statuses of the given studies, by Prolific Study ID, in one transaction"""
+        self._update_many(
+            """
+            UPDATE studies
+            SET status = ?
+            WHERE prolific_study_id = ?;
+            """,
+            [(status, study_id) for study_id, status in study_statuses.items()],
+        )
 
+    @timed_datastore_method
     def all_study_units_are_expired(self, task_run_id: str) -> bool:
         """Return a list of all Study ids that haven't been assigned"""
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
 
             c.execute(
@@ -213,7 +231,7 @@ class ProlificDatastore:
             results = c.fetchall()
             return bool(results)
 
-    @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
+    @timed_datastore_method
     def register_submission_to_study(
         self,
         prolific_study_id: str,
@@ -229,48 +247,30 @@ class ProlificDatastore:
             f"Unit {unit_id}, "
             f"Submission {prolific_submission_id}."
         )
-        already_exists = check_if_row_with_params_exists(
-            db=self,
-            table_name="submissions",
-            params={
-                "prolific_study_id": prolific_study_id,
-                "prolific_submission_id": prolific_submission_id,
-            },
-            select_field="id",
-        )
-
-        with self.table_access_condition, self.get_connection() as conn:
-            c = conn.cursor()
-
-            if not already_exists:
-                try:
-                    c.execute(
-                        """
-                        INSERT INTO submissions(
-                            id,
-                            prolific_study_id,
-                            prolific_submission_id
-                        ) VALUES (?, ?, ?);
-                        """,
-                        (
-                            make_randomized_int_id(),
-                            prolific_study_id,
-                            prolific_submission_id,
-                        ),
-                    )
-                except sqlite3.IntegrityError as e:
-                    if is_unique_failure(e):
-                        raise EntryAlreadyExistsException(
-                            e,
-                            db=self,
-                            table_name="submissions",
-                            original_exc=e,
-                        )
-                    raise MephistoDBException(e)
+        self.register_submissions_to_study(prolific_study_id, [(unit_id, prolific_submission_id)])
 
+    @timed_datastore_method
+    @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
+    def register_submissions_to_study(
+        self,
+        prolific_study_id: str,
+        submissions: List[Tuple[Optional[str], Optional[str]]],
+    ) -> None:
+        """
+        Register the given (unit_id, prolific_submission_id) pairs to a Study in one
+        transaction. Submissions that are already registered are left as they are.
+        """
+        self._insert_with_random_ids(
+            "submissions",
+            ["prolific_study_id", "prolific_submission_id"],
+            [(prolific_study_id, submission_id) for _, submission_id in submissions],
+            conflict_columns=["prolific_submission_id"],
+        )
+        for unit_id, _ in submissions:
             if unit_id is not None:
                 self._mark_study_mapping_update(unit_id)
 
+    @timed_datastore_method
     def update_submission_status(self, prolific_submission_id: str, status: str) -> None:
         """Set prolific_submission_id to unit"""
         with self.table_access_condition:
@@ -287,51 +287,20 @@ class ProlificDatastore:
             conn.commit()
             return None
 
+    @timed_datastore_method
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def ensure_worker_exists(self, worker_id: str) -> None:
         """Create a record of this worker if it doesn't exist"""
-        already_exists = check_if_row_with_params_exists(
-            db=self,
-            table_name="workers",
-            params={
-                "worker_id": worker_id,
-            },
-            select_field="id",
-        )
-
-        with self.table_access_condition:
-            conn = self.get_connection()
-            c = conn.cursor()
-
-            if not already_exists:
-                try:
-                    c.execute(
-                        """
-                        INSERT INTO workers(
-                            id,
-                            worker_id,
-                            is_blocked
-                        ) VALUES (?, ?, ?);
-                        """,
-                        (
-                            make_randomized_int_id(),
-                            worker_id,
-                            False,
-                        ),
-                    )
-                    conn.commit()
-                except sqlite3.IntegrityError as e:
-                    if is_unique_failure(e):
-                        raise EntryAlreadyExistsException(
-                            e,
-                            db=self,
-                            table_name="workers",
-                            original_exc=e,
-                        )
-                    raise MephistoDBException(e)
-
+        if self._row_exists("workers", {"worker_id": worker_id}):
             return None
+        self._insert_with_random_ids(
+            "workers",
+            ["worker_id", "is_blocked"],
+            [(worker_id, False)],
+            conflict_columns=["worker_id"],
+        )
 
+    @timed_datastore_method
     def set_worker_blocked(self, worker_id: str, is_blocked: bool) -> None:
         """Set the worker registration status for the given id"""
         self.ensure_worker_exists(worker_id)
@@ -349,11 +318,11 @@ class ProlificDatastore:
             conn.commit()
             return None
 
+    @timed_datastore_method
     def get_worker_blocked(self, worker_id: str) -> bool:
         """Get the blocked status of a worker"""
         self.ensure_worker_exists(worker_id)
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -365,10 +334,10 @@ class ProlificDatastore:
             results = c.fetchall()
             return bool(results[0]["is_blocked"])
 
+    @timed_datastore_method
     def get_blocked_workers(self) -> List[dict]:
         """Get all workers with blocked status"""
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -383,107 +352,44 @@ class ProlificDatastore:
     def get_bloked_participant_ids(self) -> List[str]:
         return [w["worker_id"] for w in self.get_blocked_workers()]
 
+    @timed_datastore_method
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def ensure_unit_exists(self, unit_id: str) -> None:
         """Create a record of this unit if it doesn't exist"""
-        already_exists = check_if_row_with_params_exists(
-            db=self,
-            table_name="units",
-            params={
-                "unit_id": unit_id,
-            },
-            select_field="id",
-        )
-
-        with self.table_access_condition:
-            conn = self.get_connection()
-            c = conn.cursor()
-
-            if not already_exists:
-                try:
-                    c.execute(
-                        """
-                        INSERT INTO units(
-                            id,
-                            unit_id,
-                            is_expired
-                        ) VALUES (?, ?, ?);
-                        """,
-                        (
-                            make_randomized_int_id(),
-                            unit_id,
-                            False,
-                        ),
-                    )
-                    conn.commit()
-                except sqlite3.IntegrityError as e:
-                    if is_unique_failure(e):
-                        raise EntryAlreadyExistsException(
-                            e,
-                            db=self,
-                            table_name="units",
-                            original_exc=e,
-                        )
-                    raise MephistoDBException(e)
-
+        if self._row_exists("units", {"unit_id": unit_id}):
             return None
+        self._insert_with_random_ids(
+            "units",
+            ["unit_id", "is_expired"],
+            [(unit_id, False)],
+            conflict_columns=["unit_id"],
+        )
 
-    @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
+    @timed_datastore_method
     def create_unit(self, unit_id: str, task_run_id: str, prolific_study_id: str) -> None:
         """Create the unit if not exists"""
-        already_exists = check_if_row_with_params_exists(
-            db=self,
-            table_name="units",
-            params={
-                "unit_id": unit_id,
-                "task_run_id": task_run_id,
-                "prolific_study_id": prolific_study_id,
-                "is_expired": False,
-            },
-            select_field="id",
-        )
+        self.create_units([unit_id], task_run_id, prolific_study_id)
 
-        with self.table_access_condition:
-            conn = self.get_connection()
-            c = conn.cursor()
-
-            if not already_exists:
-                try:
-                    c.execute(
-                        """
-                        INSERT INTO units(
-                            id,
-                            unit_id,
-                            task_run_id,
-                            prolific_study_id,
-                            is_expired
-                        ) VALUES (?, ?, ?, ?, ?);
-                        """,
-                        (
-                            make_randomized_int_id(),
-                            unit_id,
-                            task_run_id,
-                            prolific_study_id,
-                            False,
-                        ),
-                    )
-                    conn.commit()
-                except sqlite3.IntegrityError as e:
-                    if is_unique_failure(e):
-                        raise EntryAlreadyExistsException(
-                            e,
-                            db=self,
-                            table_name="units",
-                            original_exc=e,
-                        )
-                    raise MephistoDBException(e)
-
-            return None
+    @timed_datastore_method
+    @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
+    def create_units(
+        self,
+        unit_ids: List[str],
+        task_run_id: str,
+        prolific_study_id: str,
+    ) -> None:
+        """Create the units that don't exist yet for the given Study, in one transaction"""
+        self._insert_with_random_ids(
+            "units",
+            ["unit_id", "task_run_id", "prolific_study_id", "is_expired"],
+            [(unit_id, task_run_id, prolific_study_id, False) for unit_id in unit_ids],
+            conflict_columns=["unit_id"],
+        )
 
+    @timed_datastore_method
     def get_unit(self, unit_id: str) -> sqlite3.Row:
         """Get the details for a unit by unit_id"""
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -495,6 +401,7 @@ class ProlificDatastore:
             results = c.fetchall()
             return results[0]
 
+    @timed_datastore_method
     def set_unit_expired(self, unit_id: str, val: bool) -> None:
         """Set the unit registration status for the given id"""
         self.ensure_unit_exists(unit_id)
@@ -512,11 +419,11 @@ class ProlificDatastore:
             conn.commit()
             return None
 
+    @timed_datastore_method
     def get_unit_expired(self, unit_id: str) -> bool:
         """Get the registration status of a unit"""
         self.ensure_unit_exists(unit_id)
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -528,6 +435,7 @@ class ProlificDatastore:
             results = c.fetchall()
             return bool(results[0]["is_expired"])
 
+    @timed_datastore_method
     def set_submission_for_unit(self, unit_id: str, prolific_submission_id: str) -> None:
         """Set prolific_submission_id to unit"""
         self.ensure_unit_exists(unit_id)
@@ -563,10 +471,10 @@ class ProlificDatastore:
         """
         return self.get_session_for_requester(requester_name)
 
+    @timed_datastore_method
     def get_qualification_mapping(self, qualification_name: str) -> Optional[sqlite3.Row]:
         """Get the mapping between Mephisto qualifications and Prolific Participant Group"""
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -580,6 +488,7 @@ class ProlificDatastore:
                 return None
             return results[0]
 
+    @timed_datastore_method
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def create_participant_group_mapping(
         self,
@@ -661,6 +570,7 @@ class ProlificDatastore:
             else:
                 raise e
 
+    @timed_datastore_method
     def delete_participant_groups_by_participant_group_ids(
         self,
         participant_group_ids: List[str] = None,
@@ -687,6 +597,7 @@ class ProlificDatastore:
             )
             return None
 
+    @timed_datastore_method
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def create_qualification_mapping(
         self,
@@ -729,6 +640,7 @@ class ProlificDatastore:
                     )
                 raise MephistoDBException(e)
 
+    @timed_datastore_method
     def find_studies_by_status(self, statuses: List[str], exclude: bool = False) -> List[dict]:
         """Find all studies having or excluding certain statuses"""
         if not statuses:
@@ -737,7 +649,7 @@ class ProlificDatastore:
         logic_str = "NOT" if exclude else ""
         statuses_str = ",".join([f'"{s}"' for s in statuses])
 
-        with self.table_access_condition, self.get_connection() as conn:
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 f"""
@@ -766,6 +678,7 @@ class ProlificDatastore:
             task_run_ids=task_run_ids,
         )
 
+    @timed_datastore_method
     def find_qualifications_by_ids(
         self,
         qualification_ids: List[str] = None,
@@ -775,7 +688,7 @@ class ProlificDatastore:
         if not qualification_ids:
             return []
 
-        with self.table_access_condition, self.get_connection() as conn:
+        with self._read_connection() as conn:
             c = conn.cursor()
 
             qualification_ids_block = ""
@@ -799,6 +712,7 @@ class ProlificDatastore:
             results = c.fetchall()
             return results
 
+    @timed_datastore_method
     def delete_qualifications_by_participant_group_ids(
         self,
         participant_group_ids: List[str] = None,
@@ -825,6 +739,7 @@ class ProlificDatastore:
             )
             return None
 
+    @timed_datastore_method
     def clear_study_from_unit(self, unit_id: str) -> None:
         """
         Clear the Study mapping that maps the given unit,
@@ -860,10 +775,10 @@ class ProlificDatastore:
             )
             self._mark_study_mapping_update(unit_id)
 
+    @timed_datastore_method
     def get_study_mapping(self, unit_id: str) -> sqlite3.Row:
         """Get the mapping between Mephisto IDs and Prolific IDs"""
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -876,6 +791,7 @@ class ProlificDatastore:
             results = c.fetchall()
             return results[0]
 
+    @timed_datastore_method
     @retry_generate_id(caught_excs=[EntryAlreadyExistsException])
     def register_run(
         self,
@@ -930,10 +846,10 @@ class ProlificDatastore:
                     )
                 raise MephistoDBException(e)
 
+    @timed_datastore_method
     def get_run(self, task_run_id: str) -> sqlite3.Row:
         """Get the details for a run by task_run_id"""
-        with self.table_access_condition:
-            conn = self.get_connection()
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute(
                 """
@@ -945,6 +861,7 @@ class ProlificDatastore:
             results = c.fetchall()
             return results[0]
 
+    @timed_datastore_method
     def set_available_places_for_run(
         self,
         task_run_id: str,
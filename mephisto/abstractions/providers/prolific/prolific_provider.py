@@ -32,7 +32,6 @@ from mephisto.abstractions.providers.prolific.provider_type import PROVIDER_TYPE
 from mephisto.operations.registry import register_mephisto_abstraction
 from mephisto.utils.logger_core import get_logger
 from mephisto.utils.qualifications import QualificationType
-from mephisto.utils.qualifications import worker_is_qualified
 from .api.client import ProlificClient
 from .api.data_models import ParticipantGroup
 from .api.data_models import Project
@@ -175,16 +174,17 @@ class ProlificProvider(CrowdProvider):
         qualifications: List[QualificationType],
         bloked_participant_ids: List[str],
     ) -> List["Worker"]:
-        qualified_workers = []
-        workers: List[Worker] = self.db.find_workers(provider_type="prolific")
+        workers = self.db.select_workers(provider_type="prolific")
         # `worker_name` is Prolific Participant ID in provider-specific datastore
         available_workers = [w for w in workers if w.worker_name not in bloked_participant_ids]
-
-        for worker in available_workers:
-            if worker_is_qualified(worker, qualifications):
-                qualified_workers.append(worker)
-
-        return qualified_workers
+        qualified_worker_ids = self.db.find_qualified_workers(
+            qualifications,
+            worker_ids=[w.worker_id for w in available_workers],
+            provider_type="prolific",
+        )
+        return [
+            w.hydrate(self.db) for w in available_workers if w.worker_id in qualified_worker_ids
+        ]
 
     def _create_participant_group_with_qualified_workers(
         self,
@@ -7,8 +7,10 @@
 import time
 from typing import Any
 from typing import cast
+from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import TYPE_CHECKING
 
 from mephisto.abstractions._subcomponents.agent_state import AgentState
@@ -409,3 +411,29 @@ class ProlificUnit(Unit):
         logger.debug(f"{ProlificUnit.log_prefix}Unit was created in datastore successfully!")
 
         return unit
+
+    @staticmethod
+    def new_bulk(
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """Create Units for the given (assignment, index) pairs in one db write"""
+        units = ProlificUnit._register_units_bulk(db, unit_specs, pay_amount, PROVIDER_TYPE)
+        if len(units) == 0:
+            return units
+
+        # Write units in provider-specific datastore
+        task_run_id = unit_specs[0][0].task_run_id
+        datastore: "ProlificDatastore" = db.get_datastore_for_provider(PROVIDER_TYPE)
+        task_run_details = dict(datastore.get_run(task_run_id))
+        datastore.create_units(
+            unit_ids=[unit.db_id for unit in units],
+            task_run_id=task_run_id,
+            prolific_study_id=task_run_details["prolific_study_id"],
+        )
+        logger.debug(
+            f"{ProlificUnit.log_prefix}{len(units)} Units were created in datastore successfully!"
+        )
+
+        return units
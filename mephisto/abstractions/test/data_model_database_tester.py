@@ -20,6 +20,10 @@ from mephisto.data_model.assignment import Assignment
 from mephisto.data_model.constants import NO_PROJECT_NAME
 from mephisto.data_model.constants.assignment_state import AssignmentState
 from mephisto.data_model.project import Project
+from mephisto.data_model.qualification import QUAL_EXISTS
+from mephisto.data_model.qualification import QUAL_GREATER_EQUAL
+from mephisto.data_model.qualification import QUAL_IN_LIST
+from mephisto.data_model.qualification import QUAL_NOT_EXIST
 from mephisto.data_model.qualification import Qualification
 from mephisto.data_model.requester import Requester
 from mephisto.data_model.task import Task
@@ -30,6 +34,8 @@ from mephisto.data_model.worker import Worker
 from mephisto.utils.db import EntryAlreadyExistsException
 from mephisto.utils.db import EntryDoesNotExistException
 from mephisto.utils.db import MephistoDBException
+from mephisto.utils.qualifications import make_qualification_dict
+from mephisto.utils.qualifications import worker_is_qualified
 from mephisto.utils.testing import get_test_agent
 from mephisto.utils.testing import get_test_assignment
 from mephisto.utils.testing import get_test_project
@@ -577,6 +583,61 @@ class BaseDatabaseTests(unittest.TestCase):
         assignments = db.find_assignments()
         self.assertEqual(len(assignments), 0)
 
+    def test_assignments_bulk(self) -> None:
+        """Test creation of many assignments at once"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run_id = get_test_task_run(db)
+        task_run = TaskRun.get(db, task_run_id)
+
+        assignment_ids = db.new_assignments_bulk(
+            task_run.task_id,
+            task_run_id,
+            task_run.requester_id,
+            task_run.task_type,
+            task_run.provider_type,
+            count=5,
+            sandbox=task_run.sandbox,
+        )
+        self.assertEqual(len(assignment_ids), 5)
+        self.assertEqual(len(set(assignment_ids)), 5)
+        for assignment_id in assignment_ids:
+            self.assertTrue(isinstance(assignment_id, str))
+            assignment = Assignment.get(db, assignment_id)
+            self.assertEqual(assignment.task_run_id, task_run_id)
+
+        assignments = db.find_assignments(task_run_id=task_run_id)
+        self.assertEqual(
+            sorted(a.db_id for a in assignments),
+            sorted(assignment_ids),
+        )
+
+        # Can't create assignments for a task run that doesn't exist
+        with self.assertRaises(EntryDoesNotExistException):
+            db.new_assignments_bulk(
+                task_run.task_id,
+                self.get_fake_id("TaskRun"),
+                task_run.requester_id,
+                task_run.task_type,
+                task_run.provider_type,
+                count=5,
+            )
+
+        # Nothing to create is a no-op
+        self.assertEqual(
+            db.new_assignments_bulk(
+                task_run.task_id,
+                task_run_id,
+                task_run.requester_id,
+                task_run.task_type,
+                task_run.provider_type,
+                count=0,
+            ),
+            [],
+        )
+        self.assertEqual(len(db.find_assignments()), 5)
+
     def test_unit(self) -> None:
         """Test creation and querying of units"""
         assert self.db is not None, "No db initialized"
@@ -684,6 +745,141 @@ class BaseDatabaseTests(unittest.TestCase):
         units = db.find_units()
         self.assertEqual(len(units), 1)
 
+    def test_units_bulk(self) -> None:
+        """Test creation of many units at once, and that failures create none"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run_id = get_test_task_run(db)
+        task_run = TaskRun.get(db, task_run_id)
+        assignment_ids = [get_test_assignment(db, task_run) for _ in range(3)]
+        unit_keys = [(assignment_id, idx) for assignment_id in assignment_ids for idx in range(2)]
+        pay_amount = 15.0
+
+        unit_ids = db.new_units_bulk(
+            task_run.task_id,
+            task_run_id,
+            task_run.requester_id,
+            unit_keys,
+            pay_amount,
+            PROVIDER_TYPE,
+            task_run.task_type,
+            sandbox=task_run.sandbox,
+        )
+        self.assertEqual(len(unit_ids), 6)
+        self.assertEqual(len(set(unit_ids)), 6)
+        for unit_id, (assignment_id, unit_index) in zip(unit_ids, unit_keys):
+            self.assertTrue(isinstance(unit_id, str))
+            unit = Unit.get(db, unit_id)
+            self.assertEqual(unit.assignment_id, assignment_id)
+            self.assertEqual(unit.unit_index, unit_index)
+            self.assertEqual(unit.pay_amount, pay_amount)
+            self.assertEqual(unit.db_status, AssignmentState.CREATED)
+
+        units = db.find_units(assignment_id=assignment_ids[0])
+        self.assertEqual(len(units), 2)
+
+        # A batch with an existing unit fails entirely
+        new_assignment_id = get_test_assignment(db, task_run)
+        with self.assertRaises(EntryAlreadyExistsException):
+            db.new_units_bulk(
+                task_run.task_id,
+                task_run_id,
+                task_run.requester_id,
+                [(new_assignment_id, 0), (assignment_ids[0], 0)],
+                pay_amount,
+                PROVIDER_TYPE,
+                task_run.task_type,
+            )
+        self.assertEqual(len(db.find_units(assignment_id=new_assignment_id)), 0)
+
+        # A batch with an invalid assignment fails entirely
+        with self.assertRaises(EntryDoesNotExistException):
+            db.new_units_bulk(
+                task_run.task_id,
+                task_run_id,
+                task_run.requester_id,
+                [(new_assignment_id, 0), (self.get_fake_id("Assignment"), 0)],
+                pay_amount,
+                PROVIDER_TYPE,
+                task_run.task_type,
+            )
+        self.assertEqual(len(db.find_units(assignment_id=new_assignment_id)), 0)
+        self.assertEqual(len(db.find_units()), 6)
+
+    def test_iter_assignments_units_agents(self) -> None:
+        """Test that iterating over entries matches finding them, across many pages"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run_id = get_test_task_run(db)
+        task_run = TaskRun.get(db, task_run_id)
+        _, worker_id = get_test_worker(db)
+        assignment_ids = [get_test_assignment(db, task_run) for _ in range(7)]
+        unit_ids = []
+        for assignment_id in assignment_ids:
+            assignment = Assignment.get(db, assignment_id)
+            unit_ids += [get_test_unit(db, idx, assignment) for idx in range(2)]
+        agent_ids = [get_test_agent(db, unit_id, worker_id) for unit_id in unit_ids[:5]]
+        other_task_run_id = get_test_task_run(db, task_run.task_id, task_run.requester_id)
+        other_assignment_id = get_test_assignment(db, TaskRun.get(db, other_task_run_id))
+
+        for batch_size in [1, 3, 14, 100]:
+            assignments = list(db.iter_assignments(task_run_id=task_run_id, batch_size=batch_size))
+            self.assertTrue(all(isinstance(a, Assignment) for a in assignments))
+            self.assertEqual([a.db_id for a in assignments], sorted(assignment_ids, key=int))
+
+            units = list(db.iter_units(batch_size=batch_size))
+            self.assertTrue(all(isinstance(u, Unit) for u in units))
+            self.assertEqual([u.db_id for u in units], sorted(unit_ids, key=int))
+
+            agents = list(db.iter_agents(worker_id=worker_id, batch_size=batch_size))
+            self.assertTrue(all(isinstance(a, Agent) for a in agents))
+            self.assertEqual([a.db_id for a in agents], sorted(agent_ids, key=int))
+
+        self.assertEqual(
+            sorted((a.db_id for a in db.iter_assignments()), key=int),
+            sorted(assignment_ids + [other_assignment_id], key=int),
+        )
+        units = list(db.iter_units(assignment_id=assignment_ids[0], unit_index=1))
+        self.assertEqual(len(units), 1)
+        self.assertEqual(units[0].db_id, unit_ids[1])
+        self.assertEqual(list(db.iter_units(assignment_id=other_assignment_id)), [])
+
+    def test_select_records(self) -> None:
+        """Test that selecting records matches finding the full objects"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run_id = get_test_task_run(db)
+        task_run = TaskRun.get(db, task_run_id)
+        _, worker_id = get_test_worker(db)
+        assignment = Assignment.get(db, get_test_assignment(db, task_run))
+        unit_ids = [get_test_unit(db, idx, assignment) for idx in range(3)]
+        get_test_agent(db, unit_ids[0], worker_id)
+        db.update_unit(unit_ids[1], status=AssignmentState.COMPLETED)
+
+        for find, select in [
+            (db.find_assignments, db.select_assignments),
+            (db.find_units, db.select_units),
+            (db.find_agents, db.select_agents),
+            (db.find_workers, db.select_workers),
+        ]:
+            models = find()
+            records = select()
+            self.assertEqual([r[0] for r in records], [m.db_id for m in models])
+            for record, model in zip(records, models):
+                self.assertTrue(all(isinstance(v, (str, int, float, type(None))) for v in record))
+                hydrated = record.hydrate(db)
+                self.assertIsInstance(hydrated, type(model))
+                self.assertEqual(hydrated.db_id, model.db_id)
+
+        records = db.select_units(status=AssignmentState.COMPLETED)
+        self.assertEqual([r.unit_id for r in records], [unit_ids[1]])
+        self.assertEqual(records[0].assignment_id, assignment.db_id)
+        self.assertEqual(records[0].hydrate(db).get_status(), AssignmentState.COMPLETED)
+        self.assertEqual(db.select_units(task_run_id=self.get_fake_id("TaskRun")), [])
+
     def test_unit_updates(self) -> None:
         """Test updating a unit's status"""
         assert self.db is not None, "No db initialized"
@@ -705,6 +901,100 @@ class BaseDatabaseTests(unittest.TestCase):
         with self.assertRaises(MephistoDBException):
             db.update_unit(unit_id, status="FAKE_STATUS")
 
+    def test_unit_reservations(self) -> None:
+        """Test that units can only be reserved by one holder until released or expired"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run = TaskRun.get(db, get_test_task_run(db))
+        assignment = Assignment.get(db, get_test_assignment(db, task_run))
+        unit_ids = [get_test_unit(db, idx, assignment) for idx in range(3)]
+
+        self.assertEqual(db.reserve_unit(unit_ids, "first", lease_seconds=60), unit_ids[0])
+        self.assertEqual(db.reserve_unit(unit_ids, "second", lease_seconds=60), unit_ids[1])
+        self.assertIsNone(db.reserve_unit(unit_ids[:2], "third", lease_seconds=60))
+
+        db.clear_unit_reservation(unit_ids[0])
+        self.assertEqual(db.reserve_unit(unit_ids, "third", lease_seconds=60), unit_ids[0])
+
+        # Expired reservations can be taken over
+        self.assertEqual(db.reserve_unit(unit_ids[2:], "first", lease_seconds=-1), unit_ids[2])
+        self.assertEqual(db.reserve_unit(unit_ids, "second", lease_seconds=60), unit_ids[2])
+        self.assertIsNone(db.reserve_unit([], "second", lease_seconds=60))
+
+        units = [Unit.get(db, unit_id) for unit_id in unit_ids]
+        db.clear_unit_reservation(unit_ids[1])
+        self.assertEqual(task_run.reserve_first_unit(units), units[1])
+        self.assertIsNone(task_run.reserve_unit(units[1]))
+        units[1].clear_assigned_agent()
+        self.assertEqual(task_run.reserve_unit(units[1]), units[1])
+
+    def test_count_units_by_status(self) -> None:
+        """Test that unit status counts follow unit creation and status updates"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run_id = get_test_task_run(db)
+        task_run = TaskRun.get(db, task_run_id)
+        counts = db.count_units_by_status(task_run_id)
+        self.assertEqual(set(counts.keys()), set(AssignmentState.valid_unit()))
+        self.assertEqual(sum(counts.values()), 0)
+
+        assignment = Assignment.get(db, get_test_assignment(db, task_run))
+        unit_ids = [get_test_unit(db, idx, assignment) for idx in range(3)]
+        counts = db.count_units_by_status(task_run_id)
+        self.assertEqual(counts[AssignmentState.CREATED], 3)
+        self.assertEqual(sum(counts.values()), 3)
+
+        db.update_unit(unit_ids[0], status=AssignmentState.LAUNCHED)
+        db.update_unit(unit_ids[1], status=AssignmentState.LAUNCHED)
+        _, worker_id = get_test_worker(db)
+        get_test_agent(db, unit_ids[1], worker_id)
+        db.update_unit(unit_ids[2], status=AssignmentState.COMPLETED)
+        counts = db.count_units_by_status(task_run_id)
+        self.assertEqual(counts[AssignmentState.CREATED], 0)
+        self.assertEqual(counts[AssignmentState.LAUNCHED], 1)
+        self.assertEqual(counts[AssignmentState.ASSIGNED], 1)
+        self.assertEqual(counts[AssignmentState.COMPLETED], 1)
+
+        db.clear_unit_agent_assignment(unit_ids[1])
+        counts = db.count_units_by_status(task_run_id)
+        self.assertEqual(counts[AssignmentState.LAUNCHED], 2)
+        self.assertEqual(counts[AssignmentState.ASSIGNED], 0)
+
+        # Counts are per run
+        other_task_run_id = get_test_task_run(db, task_run.task_id, task_run.requester_id)
+        other_assignment_id = get_test_assignment(db, TaskRun.get(db, other_task_run_id))
+        get_test_unit(db, 0, Assignment.get(db, other_assignment_id))
+        self.assertEqual(db.count_units_by_status(other_task_run_id)[AssignmentState.CREATED], 1)
+        self.assertEqual(db.count_units_by_status(task_run_id)[AssignmentState.CREATED], 0)
+
+    def test_task_run_completion(self) -> None:
+        """Test that a task run completes once all of its units are complete"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        task_run_id = get_test_task_run(db)
+        task_run = TaskRun.get(db, task_run_id)
+        task_run.update_completion_progress(status=True)
+        self.assertFalse(task_run.get_is_completed())
+
+        # Assignments without units are not complete
+        assignment = Assignment.get(db, get_test_assignment(db, task_run))
+        self.assertFalse(task_run.get_is_completed())
+
+        unit_ids = [get_test_unit(db, idx, assignment) for idx in range(2)]
+        self.assertFalse(task_run.get_is_completed())
+        for unit_id in unit_ids:
+            db.update_unit(unit_id, status=AssignmentState.LAUNCHED)
+        self.assertFalse(task_run.get_is_completed())
+
+        db.update_unit(unit_ids[0], status=AssignmentState.COMPLETED)
+        self.assertFalse(task_run.get_is_completed())
+        db.update_unit(unit_ids[1], status=AssignmentState.EXPIRED)
+        self.assertTrue(task_run.get_is_completed())
+        self.assertTrue(TaskRun.get(db, task_run_id).get_is_completed())
+
     def test_agent(self) -> None:
         """Test creation and querying of agents"""
         assert self.db is not None, "No db initialized"
@@ -890,6 +1180,69 @@ class BaseDatabaseTests(unittest.TestCase):
         with self.assertRaises(EntryDoesNotExistException):
             qualification_row = db.get_granted_qualification(qual_id, worker_id)
 
+    def test_find_qualified_workers(self) -> None:
+        """Ensure bulk qualification checks agree with worker_is_qualified"""
+        assert self.db is not None, "No db initialized"
+        db: MephistoDB = self.db
+
+        worker_ids = [get_test_worker(db, f"worker_{idx}")[1] for idx in range(6)]
+        other_worker_id = db.new_worker("other_worker", "inhouse")
+        skill_id = db.make_qualification("skill")
+        blocked_id = db.make_qualification("blocked")
+        for idx, worker_id in enumerate(worker_ids[:4]):
+            db.grant_qualification(skill_id, worker_id, value=idx)
+        db.grant_qualification(skill_id, other_worker_id, value=3)
+        db.grant_qualification(blocked_id, worker_ids[3])
+
+        def check(qualifications, expected_idxs, **kwargs):
+            expected = {worker_ids[idx] for idx in expected_idxs}
+            found = db.find_qualified_workers(qualifications, **kwargs)
+            self.assertEqual(found, expected)
+            for worker_id in kwargs.get("worker_ids", worker_ids):
+                worker = Worker.get(db, worker_id)
+                self.assertEqual(
+                    worker_is_qualified(worker, qualifications),
+                    worker_id in expected,
+                )
+
+        for comparator, value, expected_idxs in [
+            (QUAL_EXISTS, None, [0, 1, 2, 3]),
+            (QUAL_NOT_EXIST, None, [4, 5]),
+            (QUAL_GREATER_EQUAL, 2, [2, 3]),
+            (QUAL_IN_LIST, [0, 3], [0, 3]),
+        ]:
+            qualification = make_qualification_dict("skill", comparator, value)
+            check([qualification], expected_idxs, worker_ids=worker_ids)
+        check(
+            [
+                make_qualification_dict("skill", QUAL_GREATER_EQUAL, 1),
+                make_qualification_dict("blocked", QUAL_NOT_EXIST, None),
+            ],
+            [1, 2],
+            provider_type=PROVIDER_TYPE,
+        )
+        # Missing qualifications are skipped, like in worker_is_qualified
+        check(
+            [make_qualification_dict("missing", QUAL_EXISTS, None)],
+            range(6),
+            provider_type=PROVIDER_TYPE,
+        )
+        check([], [0, 5], worker_ids=[worker_ids[0], worker_ids[5]])
+
+        # Without filters, every worker of every provider is considered
+        self.assertEqual(
+            db.find_qualified_workers([make_qualification_dict("skill", QUAL_GREATER_EQUAL, 3)]),
+            {worker_ids[3], other_worker_id},
+        )
+        self.assertEqual(
+            db.find_qualified_workers(
+                [make_qualification_dict("skill", QUAL_EXISTS, None)],
+                worker_ids=[worker_ids[0], other_worker_id],
+                provider_type=PROVIDER_TYPE,
+            ),
+            {worker_ids[0]},
+        )
+
     def test_onboarding_agents(self) -> None:
         """Ensure that the db can create and manipulate onboarding agents"""
         assert self.db is not None, "No db initialized"
@@ -4,6 +4,9 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import os
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 from typing import Optional
 
@@ -11,10 +14,28 @@ import click
 from rich_click import RichCommand
 from rich_click import RichGroup
 
+from mephisto.abstractions.databases.agent_data_store import compress_agent_data_files
+from mephisto.abstractions.databases.agent_data_store import compress_packed_run
+from mephisto.abstractions.databases.agent_data_store import DEFAULT_COMPRESSION_THRESHOLD_BYTES
+from mephisto.abstractions.databases.agent_data_store import find_agent_data_files
+from mephisto.abstractions.databases.agent_data_store import find_run_dirs
+from mephisto.abstractions.databases.agent_data_store import PACKED_AGENT_DATA_FILE
+from mephisto.abstractions.databases.agent_data_store import pack_run_dir
+from mephisto.abstractions.databases.archive_shards import ARCHIVE_PERIODS
+from mephisto.abstractions.databases.archive_shards import DEFAULT_ARCHIVE_PERIOD
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.abstractions.databases.query_profiler import DEFAULT_PROFILE_LOG_NAME
+from mephisto.abstractions.databases.query_profiler import load_query_log
+from mephisto.abstractions.databases.query_profiler import summarize_query_log
 from mephisto.tools.db_data_porter import DBDataPorter
 from mephisto.tools.db_data_porter.constants import DEFAULT_CONFLICT_RESOLVER
 from mephisto.tools.db_data_porter.export_dump import get_export_options_for_metadata
 from mephisto.utils.console_writer import ConsoleWriter
+from mephisto.utils.dirs import get_data_dir
+from mephisto.utils.dirs import get_root_data_dir
+from mephisto.utils.rich import console
+from mephisto.utils.rich import create_table
 
 VERBOSITY_HELP = "write more informative messages about progress (Default 0. Values: 0, 1)"
 VERBOSITY_DEFAULT_VALUE = 0
@@ -37,6 +58,16 @@ def _print_used_options_for_running_command_message(ctx: click.Context, options:
     logger.debug(message)
 
 
+def _get_read_only_db() -> LocalMephistoDB:
+    """
+    Open the Mephisto DB read-only for commands that only read it, so that they
+    don't slow down a running operator. A missing database is created as usual.
+    """
+    if not os.path.exists(os.path.join(get_data_dir(), "database.db")):
+        return LocalMephistoDB()
+    return LocalMephistoDB(args=LocalMephistoDBArgs(read_only=True))
+
+
 @click.group(name="db", cls=RichGroup)
 def db_cli():
     """Operations with Mephisto DB and provider-specific datastores"""
@@ -152,7 +183,7 @@ def export(ctx: click.Context, **options: dict):
     qualification_names: Optional[List[str]] = options.get("qualification_names")
     verbosity: int = options.get("verbosity", VERBOSITY_DEFAULT_VALUE)
 
-    porter = DBDataPorter()
+    porter = DBDataPorter(db=LocalMephistoDB() if delete_exported_data else _get_read_only_db())
 
     has_conflicting_task_runs_options = (
         len(
@@ -399,7 +430,7 @@ def backup(ctx: click.Context, **options: dict):
 
     verbosity: int = options.get("verbosity", VERBOSITY_DEFAULT_VALUE)
 
-    porter = DBDataPorter()
+    porter = DBDataPorter(db=_get_read_only_db())
     backup_path = porter.create_backup(verbosity=verbosity)
     logger.info(f"[green]Finished successfully, saved to file: {backup_path}[/green]")
 
@@ -433,3 +464,278 @@ def restore(ctx: click.Context, **options):
     porter = DBDataPorter()
     porter.restore_from_backup(backup_file_name_or_path=file, verbosity=verbosity)
     logger.info(f"[green]Finished successfully[/green]")
+
+
+# --- PROFILE ---
+@db_cli.command("profile", cls=RichCommand)
+@click.pass_context
+@click.option(
+    "-f",
+    "--log-file",
+    type=str,
+    default=None,
+    help=(
+        "location of the slow query log (Default `query_profile.log` "
+        "in the Mephisto data directory)"
+    ),
+)
+@click.option(
+    "-n",
+    "--top",
+    type=int,
+    default=20,
+    help="number of query shapes to show, by total time spent in them (Default 20)",
+)
+@click.option(
+    "-s",
+    "--full-scans-only",
+    is_flag=True,
+    default=False,
+    help="only show queries that scan a full table",
+)
+@click.option("-v", "--verbosity", type=int, default=VERBOSITY_DEFAULT_VALUE, help=VERBOSITY_HELP)
+def profile(ctx: click.Context, **options):
+    """
+    Reports slow queries recorded by a database running with
+    `mephisto.database.profile_queries=true`, grouped by query shape.
+
+    mephisto db profile --top 10
+    """
+    _print_used_options_for_running_command_message(ctx, options)
+
+    log_file: Optional[str] = options.get("log_file")
+    top: int = options.get("top", 20)
+    full_scans_only: bool = options.get("full_scans_only", False)
+    verbosity: int = options.get("verbosity", VERBOSITY_DEFAULT_VALUE)
+
+    if log_file is None:
+        log_file = os.path.join(get_root_data_dir(), DEFAULT_PROFILE_LOG_NAME)
+
+    records = load_query_log(log_file)
+    if not records:
+        logger.info(f"[yellow]No slow queries recorded in {log_file}[/yellow]")
+        return
+
+    summaries = summarize_query_log(records)
+    if full_scans_only:
+        summaries = [s for s in summaries if s["full_scans"]]
+
+    headers = ["Query shape", "Count", "Total ms", "Mean ms", "Max ms", "Full scans"]
+    if verbosity:
+        headers += ["Parameters", "Query plan"]
+    table = create_table(headers, f"\n[b]Slow queries in {log_file}[/b]")
+    for summary in summaries[:top]:
+        row = [
+            summary["shape"],
+            str(summary["count"]),
+            f"{summary['total_ms']:.1f}",
+            f"{summary['mean_ms']:.1f}",
+            f"{summary['max_ms']:.1f}",
+            "[red]" + ", ".join(summary["full_scans"]) + "[/red]",
+        ]
+        if verbosity:
+            row += [
+                "\n".join(summary["param_shapes"]),
+                "\n".join(summary["plan"] or []),
+            ]
+        table.add_row(*row)
+    console.print(table)
+    logger.info(
+        f"{len(records)} slow queries of {len(summaries)} shapes, "
+        f"{len([s for s in summaries if s['full_scans']])} of which scan a full table"
+    )
+
+
+def _get_runs_root() -> str:
+    return os.path.join(get_data_dir(), "data", "runs")
+
+
+def _find_run_dirs(runs_root: str, task_run_ids: Optional[List[str]]) -> List[str]:
+    run_dirs = find_run_dirs(runs_root)
+    if task_run_ids:
+        run_dirs = [d for d in run_dirs if os.path.basename(d) in task_run_ids]
+    return run_dirs
+
+
+# --- PACK AGENT DATA ---
+@db_cli.command("pack-agent-data", cls=RichCommand)
+@click.pass_context
+@click.option(
+    "-tr",
+    "--task-run-ids",
+    type=str,
+    multiple=True,
+    default=None,
+    help="only pack the agent data of the listed task runs (Default all task runs)",
+)
+@click.option(
+    "-k",
+    "--keep-files",
+    is_flag=True,
+    default=False,
+    help="keep the original agent data files after packing them",
+)
+@click.option("-v", "--verbosity", type=int, default=VERBOSITY_DEFAULT_VALUE, help=VERBOSITY_HELP)
+def pack_agent_data(ctx: click.Context, **options):
+    """
+    Moves the per-agent JSON files of finished task runs into a single
+    `agent_data.db` file per task run, as written with
+    `mephisto.database.agent_data.backend=sqlite`. Don't run it on live task runs.
+
+    mephisto db pack-agent-data --task-run-ids 1 --task-run-ids 2
+    """
+    _print_used_options_for_running_command_message(ctx, options)
+
+    task_run_ids: Optional[List[str]] = list(options.get("task_run_ids") or [])
+    keep_files: bool = options.get("keep_files", False)
+    verbosity: int = options.get("verbosity", VERBOSITY_DEFAULT_VALUE)
+
+    runs_root = _get_runs_root()
+    run_dirs = _find_run_dirs(runs_root, task_run_ids)
+
+    total_files = 0
+    for run_dir in run_dirs:
+        num_files = pack_run_dir(run_dir, remove_files=not keep_files)
+        total_files += num_files
+        if verbosity and num_files:
+            logger.info(f"Packed {num_files} files of {os.path.relpath(run_dir, runs_root)}")
+
+    logger.info(
+        f"[green]Finished successfully, packed {total_files} files "
+        f"of {len(run_dirs)} task runs[/green]"
+    )
+
+
+# --- COMPRESS AGENT DATA ---
+@db_cli.command("compress-data", cls=RichCommand)
+@click.pass_context
+@click.option(
+    "-tr",
+    "--task-run-ids",
+    type=str,
+    multiple=True,
+    default=None,
+    help="only compress the agent data of the listed task runs (Default all task runs)",
+)
+@click.option(
+    "-t",
+    "--threshold",
+    type=int,
+    default=DEFAULT_COMPRESSION_THRESHOLD_BYTES,
+    help=(
+        f"size in bytes from which agent data is compressed "
+        f"(Default {DEFAULT_COMPRESSION_THRESHOLD_BYTES})"
+    ),
+)
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    default=None,
+    help="number of processes compressing data in parallel (Default number of CPUs)",
+)
+@click.option("-v", "--verbosity", type=int, default=VERBOSITY_DEFAULT_VALUE, help=VERBOSITY_HELP)
+def compress_data(ctx: click.Context, **options):
+    """
+    Gzips the agent data of existing task runs, both as files and packed into
+    `agent_data.db`, as written with `mephisto.database.agent_data.compression=true`.
+    Compressed data is read transparently. Don't run it on live task runs.
+
+    mephisto db compress-data --workers 8
+    """
+    _print_used_options_for_running_command_message(ctx, options)
+
+    task_run_ids: Optional[List[str]] = list(options.get("task_run_ids") or [])
+    threshold: int = options.get("threshold", DEFAULT_COMPRESSION_THRESHOLD_BYTES)
+    workers: Optional[int] = options.get("workers")
+    verbosity: int = options.get("verbosity", VERBOSITY_DEFAULT_VALUE)
+
+    batch_size = 500
+    run_dirs = _find_run_dirs(_get_runs_root(), task_run_ids)
+    size_before = 0
+    size_after = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for run_dir in run_dirs:
+            if os.path.exists(os.path.join(run_dir, PACKED_AGENT_DATA_FILE)):
+                futures.append(executor.submit(compress_packed_run, run_dir, threshold))
+            paths = find_agent_data_files(run_dir)
+            for batch_start in range(0, len(paths), batch_size):
+                futures.append(
+                    executor.submit(
+                        compress_agent_data_files,
+                        paths[batch_start : batch_start + batch_size],
+                        threshold,
+                    )
+                )
+        for num_done, future in enumerate(as_completed(futures), start=1):
+            batch_size_before, batch_size_after = future.result()
+            size_before += batch_size_before
+            size_after += batch_size_after
+            if verbosity:
+                logger.info(f"Compressed {num_done}/{len(futures)} batches")
+
+    saved_percent = 100 * (1 - size_after / size_before) if size_before else 0
+    logger.info(
+        f"[green]Finished successfully, agent data of {len(run_dirs)} task runs went from "
+        f"{size_before / 2**20:.1f}MB to {size_after / 2**20:.1f}MB "
+        f"({saved_percent:.0f}% saved)[/green]"
+    )
+
+
+# --- ARCHIVE ---
+@db_cli.command("archive", cls=RichCommand)
+@click.pass_context
+@click.option(
+    "-b",
+    "--before",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    required=True,
+    help="archive task runs created before this date (format YYYY-MM-DD)",
+)
+@click.option(
+    "-p",
+    "--period",
+    type=click.Choice(ARCHIVE_PERIODS),
+    default=DEFAULT_ARCHIVE_PERIOD,
+    help=f"period of time covered by each archive shard (Default {DEFAULT_ARCHIVE_PERIOD})",
+)
+@click.option(
+    "-tr",
+    "--task-run-ids",
+    type=str,
+    multiple=True,
+    default=None,
+    help="only archive the listed task runs (Default all archivable task runs)",
+)
+@click.option("-v", "--verbosity", type=int, default=VERBOSITY_DEFAULT_VALUE, help=VERBOSITY_HELP)
+def archive(ctx: click.Context, **options):
+    """
+    Moves completed task runs created before the given date, with all of their
+    units reviewed, out of the Mephisto DB into per-period shard databases in
+    `<data dir>/archive/`, along with their assignments, units, agents and reviews.
+    Reads keep seeing archived task runs, but they can't be changed anymore.
+
+    mephisto db archive --before 2024-01-01 --period quarter
+    """
+    _print_used_options_for_running_command_message(ctx, options)
+
+    before = options["before"].date()
+    period: str = options.get("period", DEFAULT_ARCHIVE_PERIOD)
+    task_run_ids: Optional[List[str]] = list(options.get("task_run_ids") or []) or None
+    verbosity: int = options.get("verbosity", VERBOSITY_DEFAULT_VALUE)
+
+    db = LocalMephistoDB()
+    try:
+        archived = db.archive_task_runs(before, period=period, task_run_ids=task_run_ids)
+    finally:
+        db.shutdown()
+
+    if verbosity:
+        for shard_name, shard_task_run_ids in sorted(archived.items()):
+            logger.info(f"{shard_name}: task runs {', '.join(shard_task_run_ids)}")
+    logger.info(
+        f"[green]Finished successfully, archived "
+        f"{sum(len(ids) for ids in archived.values())} task runs "
+        f"into {len(archived)} shards[/green]"
+    )
@@ -4,8 +4,6 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-import asyncio
-from functools import partial
 from typing import List, Optional, Tuple, Mapping, Dict, Any, TYPE_CHECKING
 
 from abc import ABCMeta
@@ -20,9 +18,12 @@ def base_db_backed_call(my_super, cls, a, kw):
     versions with and without ABCMeta.
 
     Checks the database first for an optimized load, then loads
-    normally, then caches the result if desired
+    normally, then caches the result if desired. Databases that don't
+    override either step skip straight to loading.
     """
     db = a[0]
+    if not getattr(db, "optimizes_loads", True):
+        return my_super.__call__(*a, **kw)
     db_id = a[1]
     row = kw.get("row")
     loaded_val = db.optimized_load(cls, db_id, row)
@@ -61,6 +62,8 @@ class MephistoDataModelComponentMixin:
     Mixin that provides the `get` method for classes in the Mephisto data model
     """
 
+    __slots__ = ()
+
     @classmethod
     def get(
         cls,
@@ -69,11 +72,8 @@ class MephistoDataModelComponentMixin:
         row: Optional[Mapping[str, Any]] = None,
         _used_new_call: bool = False,
     ):
-        loaded_val = db.optimized_load(cls, db_id, row)
-        if loaded_val is None:
-            loaded_val = cls.__call__(db, db_id, row=row, _used_new_call=True)
-            db.cache_result(cls, loaded_val)
-        return loaded_val
+        # The metaclass already tries an optimized load and caches the result
+        return cls.__call__(db, db_id, row=row, _used_new_call=True)
 
     @classmethod
     async def async_get(
@@ -83,16 +83,7 @@ class MephistoDataModelComponentMixin:
         row: Optional[Mapping[str, Any]] = None,
     ):
         """
-        Async wrapper for retrieving from the db. In the future, if a db implements
-        a different get method, will call that instead.
+        Async wrapper for retrieving from the db, run on the db's async executor.
+        In the future, if a db implements a different get method, will call that instead.
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
-            partial(
-                cls.get,
-                db,
-                db_id,
-                row=row,
-            ),
-        )
+        return await db.aio.run(cls.get, db, db_id, row=row)
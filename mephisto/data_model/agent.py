@@ -67,6 +67,28 @@ class _AgentBase(ABC):
     mephisto data model.
     """
 
+    __slots__ = (
+        "db",
+        "db_id",
+        "db_status",
+        "worker_id",
+        "task_type",
+        "task_run_id",
+        "task_id",
+        "_worker",
+        "_task_run",
+        "_task",
+        "_associated_live_run",
+        "pending_actions",
+        "has_live_update",
+        "did_submit",
+        "is_shutdown",
+        "_state",
+        # Agents of any kind can still hold attributes set by blueprints and providers
+        "__dict__",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         db: "MephistoDB",
@@ -309,6 +331,14 @@ class Agent(_AgentBase, MephistoDataModelComponentMixin, metaclass=MephistoDBBac
     connection status, etc.
     """
 
+    __slots__ = (
+        "unit_id",
+        "provider_type",
+        "assignment_id",
+        "_unit",
+        "_assignment",
+    )
+
     def __init__(
         self,
         db: "MephistoDB",
@@ -404,6 +434,8 @@ class Agent(_AgentBase, MephistoDataModelComponentMixin, metaclass=MephistoDBBac
         """Update the database status of this agent, and
         possibly send a message to the frontend agent informing
         them of this update"""
+        from mephisto.operations.run_completion_tracker import publish_agent_status
+
         if self.db_status == new_status:
             return  # Noop, this is already the case
         logger.debug(f"Updating {self} to {new_status}")
@@ -413,6 +445,7 @@ class Agent(_AgentBase, MephistoDataModelComponentMixin, metaclass=MephistoDBBac
         old_status = self.db_status
         self.db.update_agent(self.db_id, status=new_status)
         self.db_status = new_status
+        publish_agent_status(self.task_run_id, self.unit_id, new_status)
         if self.agent_in_active_run():
             live_run = self.get_live_run()
             live_run.loop_wrap.execute_coro(live_run.worker_pool.push_status_update(self))
@@ -52,6 +52,23 @@ class Assignment(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta
     for the set of units within via abstracted database helpers
     """
 
+    __slots__ = (
+        "db",
+        "db_id",
+        "task_run_id",
+        "sandbox",
+        "task_id",
+        "requester_id",
+        "task_type",
+        "provider_type",
+        "__task_run",
+        "__task",
+        "__requester",
+        # Assignments keep supporting extra attributes and weak references
+        "__dict__",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         db: "MephistoDB",
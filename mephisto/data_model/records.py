@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Lightweight read-only records of data model rows, returned by the `select_*`
+methods of a `MephistoDB`. They hold the columns of a row as plain values,
+skipping the construction of a full data model object for every row, and
+can be turned into that object when needed with `hydrate`.
+
+Records built by `from_model` only have a `creation_date` if the data model
+object keeps it.
+"""
+
+from typing import NamedTuple
+from typing import Optional
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mephisto.abstractions.database import MephistoDB
+    from mephisto.data_model.agent import Agent
+    from mephisto.data_model.assignment import Assignment
+    from mephisto.data_model.unit import Unit
+    from mephisto.data_model.worker import Worker
+
+
+class AssignmentRecord(NamedTuple):
+    """Row of the assignments table"""
+
+    assignment_id: str
+    task_id: str
+    task_run_id: str
+    requester_id: str
+    task_type: str
+    provider_type: str
+    sandbox: bool
+    creation_date: Optional[str]
+
+    @classmethod
+    def from_model(cls, assignment: "Assignment") -> "AssignmentRecord":
+        """Return the record of the given assignment"""
+        return cls(
+            assignment_id=assignment.db_id,
+            task_id=assignment.task_id,
+            task_run_id=assignment.task_run_id,
+            requester_id=assignment.requester_id,
+            task_type=assignment.task_type,
+            provider_type=assignment.provider_type,
+            sandbox=assignment.sandbox,
+            creation_date=None,
+        )
+
+    def hydrate(self, db: "MephistoDB") -> "Assignment":
+        """Return the Assignment this record was read from"""
+        from mephisto.data_model.assignment import Assignment
+
+        return Assignment(db, self.assignment_id, row=self._asdict(), _used_new_call=True)
+
+
+class UnitRecord(NamedTuple):
+    """Row of the units table"""
+
+    unit_id: str
+    assignment_id: str
+    unit_index: int
+    pay_amount: float
+    provider_type: str
+    status: str
+    agent_id: Optional[str]
+    worker_id: Optional[str]
+    task_type: str
+    task_id: str
+    task_run_id: str
+    sandbox: bool
+    requester_id: str
+    creation_date: Optional[str]
+
+    @classmethod
+    def from_model(cls, unit: "Unit") -> "UnitRecord":
+        """Return the record of the given unit"""
+        return cls(
+            unit_id=unit.db_id,
+            assignment_id=unit.assignment_id,
+            unit_index=unit.unit_index,
+            pay_amount=unit.pay_amount,
+            provider_type=unit.provider_type,
+            status=unit.db_status,
+            agent_id=unit.agent_id,
+            worker_id=unit.worker_id,
+            task_type=unit.task_type,
+            task_id=unit.task_id,
+            task_run_id=unit.task_run_id,
+            sandbox=unit.sandbox,
+            requester_id=unit.requester_id,
+            creation_date=None if unit.creation_date is None else str(unit.creation_date),
+        )
+
+    def hydrate(self, db: "MephistoDB") -> "Unit":
+        """Return the Unit this record was read from"""
+        from mephisto.data_model.unit import Unit
+
+        return Unit(db, self.unit_id, row=self._asdict(), _used_new_call=True)
+
+
+class AgentRecord(NamedTuple):
+    """Row of the agents table"""
+
+    agent_id: str
+    worker_id: str
+    unit_id: str
+    task_id: str
+    task_run_id: str
+    assignment_id: str
+    task_type: str
+    provider_type: str
+    status: str
+    creation_date: Optional[str]
+
+    @classmethod
+    def from_model(cls, agent: "Agent") -> "AgentRecord":
+        """Return the record of the given agent"""
+        return cls(
+            agent_id=agent.db_id,
+            worker_id=agent.worker_id,
+            unit_id=agent.unit_id,
+            task_id=agent.task_id,
+            task_run_id=agent.task_run_id,
+            assignment_id=agent.assignment_id,
+            task_type=agent.task_type,
+            provider_type=agent.provider_type,
+            status=agent.db_status,
+            creation_date=None,
+        )
+
+    def hydrate(self, db: "MephistoDB") -> "Agent":
+        """Return the Agent this record was read from"""
+        from mephisto.data_model.agent import Agent
+
+        return Agent(db, self.agent_id, row=self._asdict(), _used_new_call=True)
+
+
+class WorkerRecord(NamedTuple):
+    """Row of the workers table"""
+
+    worker_id: str
+    worker_name: str
+    provider_type: str
+    creation_date: Optional[str]
+
+    @classmethod
+    def from_model(cls, worker: "Worker") -> "WorkerRecord":
+        """Return the record of the given worker"""
+        return cls(
+            worker_id=worker.db_id,
+            worker_name=worker.worker_name,
+            provider_type=worker.provider_type,
+            creation_date=None,
+        )
+
+    def hydrate(self, db: "MephistoDB") -> "Worker":
+        """Return the Worker this record was read from"""
+        from mephisto.data_model.worker import Worker
+
+        return Worker(db, self.worker_id, row=self._asdict(), _used_new_call=True)
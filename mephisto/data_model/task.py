@@ -9,14 +9,13 @@ import os
 from datetime import datetime
 from shutil import copytree
 
-from dateutil.parser import parse
-
 from mephisto.data_model.project import Project
 from mephisto.data_model._db_backed_meta import (
     MephistoDBBackedMeta,
     MephistoDataModelComponentMixin,
 )
 from mephisto.utils.dirs import get_dir_for_task
+from mephisto.utils.misc import parse_db_date
 
 from functools import reduce
 
@@ -68,7 +67,7 @@ class Task(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         self.task_type: str = row["task_type"]
         self.project_id: Optional[str] = row["project_id"]
         self.parent_task_id: Optional[str] = row["parent_task_id"]
-        self.creation_date: Optional[datetime] = parse(row["creation_date"])
+        self.creation_date: Optional[datetime] = parse_db_date(row["creation_date"])
 
     def get_project(self) -> Optional[Project]:
         """
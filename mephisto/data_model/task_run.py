@@ -7,9 +7,9 @@
 
 import os
 import json
+import socket
 from dataclasses import dataclass, field
 from datetime import datetime
-from dateutil.parser import parse
 
 from mephisto.data_model.requester import Requester
 from mephisto.data_model.constants.assignment_state import AssignmentState
@@ -18,10 +18,11 @@ from mephisto.data_model._db_backed_meta import (
     MephistoDataModelComponentMixin,
 )
 from mephisto.utils.dirs import get_dir_for_run
+from mephisto.utils.misc import parse_db_date
 
 from omegaconf import OmegaConf, MISSING
 
-from typing import List, Optional, Dict, Mapping, TYPE_CHECKING, Any
+from typing import List, Optional, Dict, Iterable, Mapping, TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from mephisto.abstractions.database import MephistoDB
@@ -37,6 +38,11 @@ from mephisto.utils.logger_core import get_logger
 
 logger = get_logger(name=__name__)
 
+# Holder recorded on the units this process reserves
+UNIT_RESERVATION_OWNER = f"{socket.gethostname()}:{os.getpid()}"
+# Time past a run's assignment duration before a unit reservation expires
+UNIT_RESERVATION_GRACE_SECONDS = 5 * 60
+
 
 @dataclass
 class TaskRunArgs:
@@ -118,6 +124,26 @@ class TaskRunArgs:
             )
         },
     )
+    assignment_batch_size: int = field(
+        default=100,
+        metadata={
+            "help": (
+                "Number of assignments (and their units) to register in the "
+                "database with a single write when creating a run's assignments."
+            )
+        },
+    )
+    assignment_prefetch: int = field(
+        default=0,
+        metadata={
+            "help": (
+                "Maximum number of created assignments with units still waiting to be "
+                "launched. Assignments are only read from the initialization data as "
+                "launches make room, so that large generators run in constant memory. "
+                "(0 creates all assignments up front)."
+            )
+        },
+    )
     submission_timeout: int = field(
         default=600,
         metadata={
@@ -181,6 +207,31 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
     for the set of assignments within
     """
 
+    __slots__ = (
+        "db",
+        "db_id",
+        "task_id",
+        "requester_id",
+        "param_string",
+        "args",
+        "start_time",
+        "provider_type",
+        "task_type",
+        "sandbox",
+        "assignments_generator_done",
+        "creation_date",
+        "__is_completed",
+        "__has_assignments",
+        "__task",
+        "__requester",
+        "__run_dir",
+        "__blueprint",
+        "__crowd_provider",
+        # Kept so that callers can still set their own attributes on runs
+        "__dict__",
+        "__weakref__",
+    )
+
     ArgsClass = TaskRunArgs
 
     def __init__(
@@ -213,7 +264,7 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         self.task_type: str = row["task_type"]
         self.sandbox: bool = row["sandbox"]
         self.assignments_generator_done: bool = False
-        self.creation_date: Optional[datetime] = parse(row["creation_date"])
+        self.creation_date: Optional[datetime] = parse_db_date(row["creation_date"])
 
         # properties with deferred loading
         self.__is_completed = row["is_completed"]
@@ -230,10 +281,15 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         """
         return self.db.find_units(task_run_id=self.db_id)
 
-    def get_valid_units_for_worker(self, worker: "Worker") -> List["Unit"]:
+    def get_valid_units_for_worker(
+        self, worker: "Worker", limit: Optional[int] = None
+    ) -> List["Unit"]:
         """
         Get any units that the given worker could work on in this
-        task run
+        task run, or up to `limit` of them.
+
+        Live runs find them in the index of available units maintained
+        by their launcher and worker pool, others scan all of their units
         """
         config = self.get_task_args()
 
@@ -266,6 +322,21 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
                     )
                     return []  # Currently at the maximum number of units for this task
 
+        # Should load cached blueprint for SharedTaskState
+        blueprint = self.get_blueprint()
+
+        from mephisto.operations.available_units import get_available_units
+
+        available_units = get_available_units(self.db_id)
+        if available_units is not None:
+            ret_units = available_units.get_units_for_worker(
+                worker.db_id,
+                can_do_unit=lambda u: blueprint.shared_state.worker_can_do_unit(worker, u),
+                limit=limit,
+            )
+            logger.debug(f"Found {ret_units[:3]} for {worker}.")
+            return ret_units
+
         task_units: List["Unit"] = self.get_units()
         unit_assigns: Dict[str, List["Unit"]] = {}
         for unit in task_units:
@@ -289,9 +360,9 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         ]
         logger.debug(f"Found {len(valid_units)} available units")
 
-        # Should load cached blueprint for SharedTaskState
-        blueprint = self.get_blueprint()
         ret_units = [u for u in valid_units if blueprint.shared_state.worker_can_do_unit(worker, u)]
+        if limit is not None:
+            ret_units = ret_units[:limit]
 
         logger.debug(f"This worker is qualified for {len(ret_units)} unit.")
         logger.debug(f"Found {ret_units[:3]} for {worker}.")
@@ -299,30 +370,43 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
 
     def clear_reservation(self, unit: "Unit") -> None:
         """
-        Remove the holder used to reserve a unit
+        Release the reservation held on a unit
         """
-        file_name = f"unit_res_{unit.db_id}"
-        write_dir = os.path.join(self.get_run_dir(), "reservations")
-        if os.path.exists(os.path.join(write_dir, file_name)):
-            os.unlink(os.path.join(write_dir, file_name))
-            logger.debug(f"Cleared reservation {file_name} for {unit}")
+        self.db.clear_unit_reservation(unit.db_id)
+        logger.debug(f"Cleared reservation for {unit}")
 
     def reserve_unit(self, unit: "Unit") -> Optional["Unit"]:
         """
-        'Atomically' reserve a unit by writing to the filesystem. If
-        the file creation fails, return none
+        Atomically reserve a unit in the database. If it is already
+        reserved, return none
         """
-        file_name = f"unit_res_{unit.db_id}"
-        write_dir = os.path.join(self.get_run_dir(), "reservations")
-        os.makedirs(write_dir, exist_ok=True)
-        try:
-            with open(os.path.join(write_dir, file_name), "x") as res_file:
-                pass  # Creating the file is sufficient
-        except FileExistsError:
-            print(os.path.join(write_dir, file_name), " existed")
+        return self.reserve_first_unit([unit])
+
+    def reserve_first_unit(self, units: List["Unit"]) -> Optional["Unit"]:
+        """
+        Atomically reserve the first of the given units that isn't already
+        reserved, and return it. If all of them are, return none
+
+        Reservations last for the assignment duration of the run plus
+        UNIT_RESERVATION_GRACE_SECONDS, after which units reserved by a
+        process that crashed before releasing them can be reserved again.
+        """
+        if len(units) == 0:
+            return None
+        lease_seconds = (
+            self.get_task_args().assignment_duration_in_seconds + UNIT_RESERVATION_GRACE_SECONDS
+        )
+        reserved_id = self.db.reserve_unit(
+            [u.db_id for u in units],
+            reserved_by=UNIT_RESERVATION_OWNER,
+            lease_seconds=lease_seconds,
+        )
+        if reserved_id is None:
+            logger.debug(f"All of {len(units)} candidate units were already reserved")
             return None
-        logger.debug(f"Reserved {unit} with {file_name}")
-        return unit
+        reserved_unit = next(u for u in units if str(u.db_id) == reserved_id)
+        logger.debug(f"Reserved {reserved_unit}")
+        return reserved_unit
 
     def get_blueprint(
         self,
@@ -379,7 +463,8 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
     def get_has_assignments(self) -> bool:
         """See if this task run has any assignments launched yet"""
         if not self.__has_assignments:
-            if len(self.get_assignments()) > 0:
+            assignments = self.db.iter_assignments(task_run_id=self.db_id, batch_size=1)
+            if next(assignments, None) is not None:
                 self.__has_assignments = True
         return self.__has_assignments
 
@@ -405,6 +490,41 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
             for status in AssignmentState.valid()
         }
 
+    def get_unit_status_counts(self) -> Dict[str, int]:
+        """
+        Get the number of units of this run in each status, as currently
+        recorded in the database
+        """
+        return self.db.count_units_by_status(self.db_id)
+
+    def _has_incomplete_units(self) -> bool:
+        """
+        Determine if any unit of this run is still incomplete, as recorded in the
+        database. Units whose agents finished are only recorded as complete once
+        they are synced, see `sync_unit_statuses`.
+        """
+        counts = self.get_unit_status_counts()
+        if sum(counts.values()) == 0:
+            # Assignments without units yet are treated as just created
+            return True
+        return any(counts[status] > 0 for status in AssignmentState.incomplete())
+
+    def sync_unit_statuses(self, unit_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Sync the recorded status of units in this run with their agent and crowd
+        provider. Only the given units are synced, or if none are given every unit
+        that the database still records as LAUNCHED or ASSIGNED.
+        """
+        from mephisto.data_model.unit import Unit
+
+        if unit_ids is not None:
+            for unit_id in unit_ids:
+                Unit.get(self.db, unit_id).get_status()
+            return
+        for status in [AssignmentState.ASSIGNED, AssignmentState.LAUNCHED]:
+            for unit in self.db.iter_units(task_run_id=self.db_id, status=status):
+                unit.get_status()
+
     def update_completion_progress(self, task_launcher=None, status=None) -> None:
         """Flag the task run that the assignments' generator has finished"""
         if task_launcher:
@@ -425,11 +545,8 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         is not complete
         """
         if not self.__is_completed and self.get_has_assignments():
-            statuses = self.get_assignment_statuses()
-            has_incomplete = False
-            for status in AssignmentState.incomplete():
-                if statuses[status] > 0:
-                    has_incomplete = True
+            # An assignment is incomplete exactly when one of its units is
+            has_incomplete = self._has_incomplete_units()
             if not has_incomplete and self.assignments_generator_done is not False:
                 self.db.update_task_run(self.db_id, is_completed=True)
                 self.__is_completed = True
@@ -441,11 +558,7 @@ class TaskRun(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedMeta):
         """
         assignments = self.get_has_assignments()
         if self.__is_completed and assignments:
-            statuses = self.get_assignment_statuses()
-            has_incomplete = False
-            for status in AssignmentState.incomplete():
-                if statuses[status] > 0:
-                    has_incomplete = True
+            has_incomplete = self._has_incomplete_units()
             if has_incomplete:
                 self.db.update_task_run(self.db_id, is_completed=False)
                 self.__is_completed = False
@@ -8,13 +8,14 @@ from collections import defaultdict
 from datetime import datetime
 from typing import Any
 from typing import DefaultDict
+from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import TYPE_CHECKING
 from typing import Union
 
-from dateutil.parser import parse
 from prometheus_client import Gauge  # type: ignore
 
 from mephisto.data_model._db_backed_meta import MephistoDataModelComponentMixin
@@ -26,6 +27,7 @@ from mephisto.data_model.task import Task
 from mephisto.data_model.task_run import TaskRun
 from mephisto.data_model.worker import Worker
 from mephisto.utils.logger_core import get_logger
+from mephisto.utils.misc import parse_db_date
 
 if TYPE_CHECKING:
     from mephisto.abstractions.database import MephistoDB
@@ -68,6 +70,34 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
     It should be extended for usage with a specific crowd provider
     """
 
+    # Declared fields are slots, and __dict__ holds those of provider-specific
+    # subclasses or any others set on a unit
+    __slots__ = (
+        "db",
+        "db_id",
+        "assignment_id",
+        "unit_index",
+        "pay_amount",
+        "agent_id",
+        "provider_type",
+        "db_status",
+        "task_type",
+        "task_id",
+        "task_run_id",
+        "sandbox",
+        "requester_id",
+        "worker_id",
+        "creation_date",
+        "__task",
+        "__task_run",
+        "__assignment",
+        "__requester",
+        "__agent",
+        "__worker",
+        "__dict__",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         db: "MephistoDB",
@@ -97,7 +127,7 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         self.sandbox: bool = row["sandbox"]
         self.requester_id: str = row["requester_id"]
         self.worker_id: str = row["worker_id"]
-        self.creation_date: Optional[datetime] = parse(row["creation_date"])
+        self.creation_date: Optional[datetime] = parse_db_date(row["creation_date"])
 
         # Deferred loading of related entities
         self.__task: Optional["Task"] = None
@@ -180,8 +210,11 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         ACTIVE_UNIT_STATUSES.labels(
             status=status, unit_type=INDEX_TO_TYPE_MAP[self.unit_index]
         ).inc()
+        from mephisto.operations.run_completion_tracker import publish_unit_status
+
         self.db_status = status
         self.db.update_unit(self.db_id, status=status)
+        publish_unit_status(self.task_run_id, self.db_id, status)
 
     def _mark_agent_assignment(self) -> None:
         """Special helper to mark the transition from LAUNCHED to ASSIGNED"""
@@ -244,12 +277,15 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
 
     def clear_assigned_agent(self) -> None:
         """Clear the agent that is assigned to this unit"""
+        from mephisto.operations.available_units import publish_unit_returned
+
         logger.debug(f"Clearing assigned agent {self.agent_id} from {self}")
         self.db.clear_unit_agent_assignment(self.db_id)
         self.set_db_status(AssignmentState.LAUNCHED)
         self.get_task_run().clear_reservation(self)
         self.agent_id = None
         self.__agent = None
+        publish_unit_returned(self)
 
     def get_assigned_agent(self) -> Optional[Agent]:
         """
@@ -312,6 +348,45 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         logger.debug(f"Registered new unit {unit} for {assignment}.")
         return unit
 
+    @staticmethod
+    def _register_units_bulk(
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+        provider_type: str,
+    ) -> List["Unit"]:
+        """
+        Create entries for many units of the same task run in the database at once.
+        `unit_specs` is a list of (assignment, unit_index) pairs.
+        """
+        if len(unit_specs) == 0:
+            return []
+        first_assignment = unit_specs[0][0]
+        assert all(
+            a.task_run_id == first_assignment.task_run_id for a, _idx in unit_specs
+        ), "Units registered in bulk must all belong to the same task run"
+        db_ids = db.new_units_bulk(
+            first_assignment.task_id,
+            first_assignment.task_run_id,
+            first_assignment.requester_id,
+            [(assignment.db_id, index) for assignment, index in unit_specs],
+            pay_amount,
+            provider_type,
+            first_assignment.task_type,
+            sandbox=first_assignment.sandbox,
+        )
+        units = []
+        for db_id, (assignment, index) in zip(db_ids, unit_specs):
+            unit = Unit.get(db, db_id)
+            ACTIVE_UNIT_STATUSES.labels(
+                status=AssignmentState.CREATED, unit_type=INDEX_TO_TYPE_MAP[index]
+            ).inc()
+            units.append(unit)
+        logger.debug(
+            f"Registered {len(units)} new units for task run {first_assignment.task_run_id}."
+        )
+        return units
+
     def get_pay_amount(self) -> float:
         """
         Return the amount that this Unit is costing against the budget,
@@ -417,3 +492,19 @@ class Unit(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta):
         can be successfully created to have it put into the db.
         """
         raise NotImplementedError()
+
+    @classmethod
+    def new_bulk(
+        cls,
+        db: "MephistoDB",
+        unit_specs: List[Tuple["Assignment", int]],
+        pay_amount: float,
+    ) -> List["Unit"]:
+        """
+        Create a Unit for every (assignment, index) pair in `unit_specs`.
+
+        By default this creates the units one at a time with `new`. Providers
+        that don't need per-unit setup should override this to return the result
+        of _register_units_bulk, which creates all the units in one db write.
+        """
+        return [cls.new(db, assignment, index, pay_amount) for assignment, index in unit_specs]
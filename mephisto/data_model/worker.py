@@ -51,6 +51,16 @@ class Worker(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta)
     This class represents an individual - namely a person. It maintains components of ongoing identity for a user.
     """
 
+    __slots__ = (
+        "db",
+        "db_id",
+        "provider_type",
+        "worker_name",
+        # Also gives provider-specific workers their attributes and weak references
+        "__dict__",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         db: "MephistoDB",
@@ -136,16 +146,7 @@ class Worker(MephistoDataModelComponentMixin, metaclass=MephistoDBBackedABCMeta)
         self, qualification_name: str
     ) -> Optional["GrantedQualification"]:
         """Return the granted qualification for this worker for the given name"""
-        found_qualifications = self.db.find_qualifications(qualification_name)
-        if len(found_qualifications) == 0:
-            return None
-        qualification = found_qualifications[0]
-        granted_qualifications = self.db.check_granted_qualifications(
-            qualification.db_id, self.db_id
-        )
-        if len(granted_qualifications) == 0:
-            return None
-        return granted_qualifications[0]
+        return self.db.get_worker_granted_qualification(self.db_id, qualification_name)
 
     def is_disqualified(self, qualification_name: str):
         """
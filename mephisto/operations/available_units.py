@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+In-memory index of the units of a live task run that workers can be assigned to,
+so that finding candidate units for an arriving worker doesn't load and regroup
+every unit of the run.
+
+The task launcher adds units as it launches them, units returned by their worker
+are added back by `Unit.clear_assigned_agent`, and the worker pool records which
+worker each unit gets assigned to. Units that moved on to any other status are
+dropped from the index the next time they come up as a candidate. Runs that no
+index is registered for, like in scripts, fall back to scanning their units in
+`TaskRun.get_valid_units_for_worker`.
+"""
+
+import threading
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import TYPE_CHECKING
+
+from mephisto.data_model.constants.assignment_state import AssignmentState
+
+if TYPE_CHECKING:
+    from mephisto.data_model.unit import Unit
+
+_indices: Dict[str, "AvailableUnitIndex"] = {}
+_indices_lock = threading.Lock()
+
+
+class AvailableUnitIndex:
+    """
+    Launched units of a single task run, grouped by assignment, along with the
+    assignments each worker is excluded from as they already hold a unit in them.
+
+    Assignments without available units aren't kept, so listing the candidates of
+    a worker only costs the units listed and the worker's own exclusions.
+    """
+
+    def __init__(self, task_run_id: str):
+        self.task_run_id = task_run_id
+        self._units_by_assignment: Dict[str, Dict[str, "Unit"]] = {}
+        self._excluded_assignments: Dict[str, Set[str]] = {}
+        self._unit_workers: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _discard(self, unit: "Unit") -> None:
+        """Remove the unit from the available ones, with the lock held"""
+        assignment_units = self._units_by_assignment.get(unit.assignment_id)
+        if assignment_units is None:
+            return
+        assignment_units.pop(unit.db_id, None)
+        if len(assignment_units) == 0:
+            del self._units_by_assignment[unit.assignment_id]
+
+    def add_unit(self, unit: "Unit") -> None:
+        """
+        Make a launched unit available, lifting the exclusion of the worker it was
+        assigned to if it was returned. Special units (negative indices) are never
+        made available, as they're launched for a specific worker.
+        """
+        with self._lock:
+            worker_id = self._unit_workers.pop(unit.db_id, None)
+            if worker_id is not None:
+                self._excluded_assignments[worker_id].discard(unit.assignment_id)
+            if unit.unit_index >= 0:
+                assignment_units = self._units_by_assignment.setdefault(unit.assignment_id, {})
+                assignment_units[unit.db_id] = unit
+
+    def remove_unit(self, unit: "Unit") -> None:
+        """Remove a unit that can no longer be assigned"""
+        with self._lock:
+            self._discard(unit)
+
+    def assign_unit(self, unit: "Unit", worker_id: str) -> None:
+        """
+        Remove a unit assigned to the given worker, and exclude the worker from
+        the other units of its assignment
+        """
+        with self._lock:
+            self._discard(unit)
+            self._unit_workers[unit.db_id] = worker_id
+            self._excluded_assignments.setdefault(worker_id, set()).add(unit.assignment_id)
+
+    def get_units_for_worker(
+        self,
+        worker_id: str,
+        can_do_unit: Optional[Callable[["Unit"], bool]] = None,
+        limit: Optional[int] = None,
+    ) -> List["Unit"]:
+        """
+        Return the available units of assignments the given worker holds no unit
+        in, in the order they were made available, stopping at `limit` units.
+        Units `can_do_unit` returns False for are skipped.
+        """
+        candidates: List["Unit"] = []
+        stale_units: List["Unit"] = []
+        with self._lock:
+            excluded = self._excluded_assignments.get(worker_id, set())
+            for assignment_id, assignment_units in self._units_by_assignment.items():
+                if assignment_id in excluded:
+                    continue
+                for unit in assignment_units.values():
+                    # Can use db_status directly, as in the worst case we offer a unit
+                    # that was just assigned, which its reservation then refuses
+                    if unit.db_status != AssignmentState.LAUNCHED:
+                        stale_units.append(unit)
+                    else:
+                        candidates.append(unit)
+                if can_do_unit is None and limit is not None and len(candidates) >= limit:
+                    break
+            for unit in stale_units:
+                self._discard(unit)
+
+        # can_do_unit may query the database, so the candidates are filtered
+        # without holding the lock
+        if can_do_unit is None:
+            return candidates[:limit]
+        units: List["Unit"] = []
+        for unit in candidates:
+            if can_do_unit(unit):
+                units.append(unit)
+                if limit is not None and len(units) >= limit:
+                    break
+        return units
+
+
+def register_available_units(index: AvailableUnitIndex) -> None:
+    """Start maintaining the given index for its run"""
+    with _indices_lock:
+        _indices[index.task_run_id] = index
+
+
+def unregister_available_units(task_run_id: str) -> None:
+    """Stop maintaining the index of the given run"""
+    with _indices_lock:
+        _indices.pop(task_run_id, None)
+
+
+def get_available_units(task_run_id: str) -> Optional[AvailableUnitIndex]:
+    """Return the index registered for the given run, if any"""
+    return _indices.get(task_run_id)
+
+
+def publish_unit_returned(unit: "Unit") -> None:
+    """Make a unit whose worker returned it available again in its run's index"""
+    index = _indices.get(unit.task_run_id)
+    if index is not None:
+        index.add_unit(unit)
@@ -5,6 +5,10 @@
 # LICENSE file in the root directory of this source tree.
 
 from hydra.core.config_store import ConfigStoreWithProvider
+from mephisto.abstractions.databases.local_database_args import AgentDataArgs
+from mephisto.abstractions.databases.local_database_args import ArchiveArgs
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.abstractions.databases.object_cache import DEFAULT_OBJECT_CACHE_SIZE
 from mephisto.abstractions.blueprint import BlueprintArgs
 from mephisto.abstractions.architect import ArchitectArgs
 from mephisto.abstractions.crowd_provider import ProviderArgs
@@ -25,9 +29,22 @@ LOGGING_OVERRIDE = {"override /hydra/job_logging": "mephisto_default"}
 config = ConfigStoreWithProvider("mephisto")
 
 
+# The options of LocalMephistoDB are inherited, see local_database_args.py. Those
+# of the agent data store and archive shards are set on the database once built.
 @dataclass
-class DatabaseArgs:
+class DatabaseArgs(LocalMephistoDBArgs):
     _database_type: str = "singleton"  # default DB is performant singleton
+    singleton_cache_size: int = field(
+        default=DEFAULT_OBJECT_CACHE_SIZE,
+        metadata={
+            "help": (
+                "Maximum number of objects of each type the singleton database keeps "
+                "cached, beyond those belonging to live task runs."
+            )
+        },
+    )
+    agent_data: AgentDataArgs = field(default_factory=AgentDataArgs)
+    archives: ArchiveArgs = field(default_factory=ArchiveArgs)
 
 
 @dataclass
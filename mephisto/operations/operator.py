@@ -33,6 +33,11 @@ from mephisto.utils.qualifications import make_qualification_dict
 from mephisto.operations.task_launcher import TaskLauncher
 from mephisto.operations.client_io_handler import ClientIOHandler
 from mephisto.operations.worker_pool import WorkerPool
+from mephisto.operations.run_completion_tracker import (
+    RunCompletionTracker,
+    register_tracker,
+    unregister_tracker,
+)
 from mephisto.operations.registry import (
     get_blueprint_from_type,
     get_crowd_provider_from_type,
@@ -59,7 +64,9 @@ if TYPE_CHECKING:
 
 logger = get_logger(name=__name__)
 
-RUN_STATUS_POLL_TIME = 10
+# Runs are checked for completion when their units or agents change status, and
+# also this often, for changes only observable by asking the crowd provider
+RUN_STATUS_RESYNC_TIME = 60
 
 
 class Operator:
@@ -77,6 +84,7 @@ class Operator:
     def __init__(self, db: "MephistoDB"):
         self.db = db
         self._task_runs_tracked: Dict[str, LiveTaskRun] = {}
+        self._completion_trackers: Dict[str, RunCompletionTracker] = {}
         self.is_shutdown = False
 
         # Try to get an event loop. Only should be one
@@ -91,6 +99,10 @@ class Operator:
         # Create the event loop for this operator.
         self._event_loop = asyncio.new_event_loop()
         self._loop_wrapper = LoopWrapper(self._event_loop)
+        # Set from any thread through _wake_run_tracker, created in the loop
+        self._run_status_changed: Optional[asyncio.Event] = None
+        # Set through _wake_stop_loop when runs are untracked, created in the loop
+        self._runs_untracked: Optional[asyncio.Event] = None
         self._run_tracker_task = self._event_loop.create_task(
             self._track_and_kill_runs(),
         )
@@ -102,6 +114,49 @@ class Operator:
         """Return the currently running task runs and their handlers"""
         return self._task_runs_tracked.copy()
 
+    def _track_run(self, live_run: LiveTaskRun) -> None:
+        """Start tracking the given run, and the status changes that may complete it"""
+        task_run = live_run.task_run
+        tracker = RunCompletionTracker(
+            task_run.db_id,
+            no_submission_patience=task_run.get_task_args().no_submission_patience,
+            on_event=self._wake_run_tracker,
+        )
+        self._completion_trackers[task_run.db_id] = tracker
+        register_tracker(tracker)
+        self._task_runs_tracked[task_run.db_id] = live_run
+        self._wake_run_tracker()
+
+    def _untrack_run(self, task_run_id: str) -> None:
+        """Stop tracking the given run"""
+        del self._task_runs_tracked[task_run_id]
+        tracker = self._completion_trackers.pop(task_run_id, None)
+        if tracker is not None:
+            unregister_tracker(tracker)
+        self._wake_stop_loop()
+
+    def _wake_run_tracker(self) -> None:
+        """Wake `_track_and_kill_runs` to check pending runs. Safe to call from any thread."""
+        try:
+            self._event_loop.call_soon_threadsafe(self._set_run_status_changed)
+        except RuntimeError:
+            pass  # The loop is already closed, there's nothing left to wake
+
+    def _set_run_status_changed(self) -> None:
+        if self._run_status_changed is not None:
+            self._run_status_changed.set()
+
+    def _wake_stop_loop(self) -> None:
+        """Wake `_stop_loop_when_no_running_tasks`. Safe to call from any thread."""
+        try:
+            self._event_loop.call_soon_threadsafe(self._set_runs_untracked)
+        except RuntimeError:
+            pass  # The loop is already closed, there's nothing left to wake
+
+    def _set_runs_untracked(self) -> None:
+        if self._runs_untracked is not None:
+            self._runs_untracked.set()
+
     def _get_requester_and_provider_from_config(self, run_config: DictConfig):
         """
         Retrieve the desired provider from the config, raising an error
@@ -139,6 +194,9 @@ class Operator:
         """
         Initialize all of the members of a live task run object
         """
+        # Keep this run's data model objects loaded while it's live
+        self.db.pin_task_run(task_run.db_id)
+
         # Register the blueprint with args to the task run to ensure cached
         blueprint = task_run.get_blueprint(args=run_config, shared_state=shared_state)
 
@@ -180,6 +238,9 @@ class Operator:
             task_run,
             initialization_data_iterable,
             max_num_concurrent_units=run_config.task.max_num_concurrent_units,
+            assignment_batch_size=run_config.task.assignment_batch_size,
+            unit_launch_priority=shared_state.unit_launch_priority,
+            assignment_prefetch=run_config.task.assignment_prefetch,
         )
 
         worker_pool = WorkerPool(self.db)
@@ -305,7 +366,7 @@ class Operator:
         live_run.task_launcher.create_assignments()
         live_run.task_launcher.launch_units(url=task_url)
 
-        self._task_runs_tracked[task_run.db_id] = live_run
+        self._track_run(live_run)
         task_run.update_completion_progress(status=False)
 
         return task_run.db_id
@@ -314,24 +375,45 @@ class Operator:
         """
         Background task that shuts down servers when a task
         is fully done.
+
+        Runs are only checked once their completion tracker reports a status change
+        that may have completed them, once their no_submission_patience runs out,
+        or every RUN_STATUS_RESYNC_TIME otherwise, so idle runs cost nothing. Only
+        units whose agent finished are synced with their agent and provider before
+        a check, and every unit still in progress on a resync.
         """
-        # TODO(#649) only trigger these on a status change?
+        self._run_status_changed = asyncio.Event()
+        last_resync_time = time.time()
         while not self.is_shutdown:
+            self._run_status_changed.clear()
+            is_resync = time.time() - last_resync_time >= RUN_STATUS_RESYNC_TIME
+            if is_resync:
+                last_resync_time = time.time()
+            next_wakeup_time = last_resync_time + RUN_STATUS_RESYNC_TIME
+
             runs_to_check = list(self._task_runs_tracked.values())
             for tracked_run in runs_to_check:
-                await asyncio.sleep(0.01)  # Low pri, allow to be interrupted
-                patience = tracked_run.task_run.get_task_args().no_submission_patience
-                if patience < time.time() - tracked_run.client_io.last_submission_time:
+                task_run = tracked_run.task_run
+                tracker = self._completion_trackers[task_run.db_id]
+                patience = tracker.no_submission_patience
+                patience_deadline = tracked_run.client_io.last_submission_time + patience
+                if patience_deadline < time.time():
                     logger.warning(
                         f"It has been greater than the set no_submission_patience of {patience} "
                         f"for {tracked_run.task_run} since the last submission, "
                         f"shutting this run down."
                     )
                     tracked_run.force_shutdown = True
+                else:
+                    next_wakeup_time = min(next_wakeup_time, patience_deadline)
 
-                task_run = tracked_run.task_run
-
+                is_pending = tracker.take_pending()
+                units_to_sync = tracker.take_units_to_sync()
                 if not tracked_run.force_shutdown:
+                    if not is_pending and not is_resync:
+                        continue
+                    await asyncio.sleep(0.01)  # Low pri, allow to be interrupted
+                    task_run.sync_unit_statuses(None if is_resync else units_to_sync)
                     task_run.update_completion_progress(task_launcher=tracked_run.task_launcher)
                     if not task_run.get_is_completed():
                         continue
@@ -346,13 +428,20 @@ class Operator:
                 tracked_run.task_launcher.shutdown()
                 tracked_run.task_launcher.expire_units()
                 tracked_run.architect.shutdown()
-                del self._task_runs_tracked[task_run.db_id]
+                self._untrack_run(task_run.db_id)
+                self.db.unpin_task_run(task_run.db_id)
 
-            await asyncio.sleep(RUN_STATUS_POLL_TIME)
-
-            if self._using_prometheus and not self.is_shutdown:
+            if is_resync and self._using_prometheus and not self.is_shutdown:
                 launch_prometheus_server()
 
+            try:
+                await asyncio.wait_for(
+                    self._run_status_changed.wait(),
+                    timeout=max(next_wakeup_time - time.time(), 0),
+                )
+            except asyncio.TimeoutError:
+                pass
+
     def force_shutdown(self, timeout=5):
         """
         Force a best-effort shutdown of everything, letting no individual
@@ -401,8 +490,12 @@ class Operator:
     async def shutdown_async(self):
         """Shut down the asyncio parts of the Operator"""
         if self._stop_task is not None:
+            self._set_runs_untracked()
             await self._stop_task
+        self._set_run_status_changed()
         await self._run_tracker_task
+        for tracker in list(self._completion_trackers.values()):
+            unregister_tracker(tracker)
         self._event_loop.stop()
 
     def shutdown(self, skip_input=True):
@@ -441,6 +534,7 @@ class Operator:
                 )
                 next_runs = []
                 for tracked_run in remaining_runs:
+                    tracked_run.task_run.sync_unit_statuses()
                     if tracked_run.task_run.get_is_completed():
                         tracked_run.shutdown()
                         tracked_run.architect.shutdown()
@@ -534,15 +628,22 @@ class Operator:
     async def _stop_loop_when_no_running_tasks(self, log_rate: Optional[int] = None):
         """
         Stop this operator's event loop when no tasks are
-        running anymore
+        running anymore, checking whenever a run is untracked
         """
+        self._runs_untracked = asyncio.Event()
         last_log = 0.0
         while len(self.get_running_task_runs()) > 0 and not self.is_shutdown:
+            self._runs_untracked.clear()
+            timeout = None
             if log_rate is not None:
                 if time.time() - last_log > log_rate:
                     last_log = time.time()
                     self.print_run_details()
-            await asyncio.sleep(RUN_STATUS_POLL_TIME)
+                timeout = max(last_log + log_rate - time.time(), 0)
+            try:
+                await asyncio.wait_for(self._runs_untracked.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
         if not self.is_shutdown:
             self.shutdown()
 
@@ -579,6 +680,7 @@ class Operator:
 
         def trigger_shutdown():
             self.is_shutdown = True
+            self._set_runs_untracked()
 
         self._event_loop.call_later(timeout_time, trigger_shutdown)
         self._event_loop.run_forever()
@@ -742,7 +844,7 @@ class Operator:
         logger.debug(f"Launching units")
         live_run.task_launcher.launch_units(url=task_url)
 
-        self._task_runs_tracked[task_run.db_id] = live_run
+        self._track_run(live_run)
         task_run.resurrect_if_has_incomplete_assignments()
         task_run.update_completion_progress(status=False)
         logger.debug(f"Launching TaskRun finished successfuly")
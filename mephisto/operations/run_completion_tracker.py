@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Publishing of the status changes of the units of live task runs, so that the
+operator only checks a run for completion when one of its units may have just
+finished, and the task launcher reuses the launch slots of units as soon as
+they're done, rather than either of them polling every unit.
+
+Listeners are registered by task run id, and called with the id of a unit and
+its new status. The status is None when an agent of the unit reached a final
+status, as the status of the unit is only derived from it the next time it's
+requested, and both are None for progress of the run that isn't about a single
+unit. Changes for runs that no listener is registered for, like in scripts and
+review tools, are dropped at the cost of a dictionary lookup.
+"""
+
+import threading
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+from mephisto.abstractions._subcomponents.agent_state import AgentState
+from mephisto.data_model.constants.assignment_state import AssignmentState
+
+UnitStatusListener = Callable[[Optional[str], Optional[str]], None]
+
+_listeners: Dict[str, Tuple[UnitStatusListener, ...]] = {}
+_listeners_lock = threading.Lock()
+
+
+class RunCompletionTracker:
+    """
+    Completion state of a single live task run. Any event that may complete
+    the run marks it as pending a check, and calls `on_event` to wake whoever
+    performs those checks.
+
+    Units whose agent reached a final status are collected, so that only those
+    need to be synced with their agent and provider before the check.
+
+    Runs are pending a check as soon as they're tracked. `no_submission_patience`
+    is kept with the tracker, so that the run's task args needn't be loaded to
+    know when it has gone without submissions for too long.
+    """
+
+    def __init__(
+        self,
+        task_run_id: str,
+        no_submission_patience: float,
+        on_event: Callable[[], None],
+    ):
+        self.task_run_id = task_run_id
+        self.no_submission_patience = no_submission_patience
+        self._on_event = on_event
+        self._pending = True
+        self._units_to_sync: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def notify(self) -> None:
+        """
+        Mark the run as pending a completion check, and wake the checker unless
+        the run was already pending one
+        """
+        with self._lock:
+            was_pending, self._pending = self._pending, True
+        if not was_pending:
+            self._on_event()
+
+    def on_unit_status(self, unit_id: Optional[str], status: Optional[str]) -> None:
+        """Notify unless a unit moved to a status that can't complete the run"""
+        if status is None and unit_id is not None:
+            with self._lock:
+                self._units_to_sync.add(unit_id)
+        if status is None or status not in AssignmentState.incomplete():
+            self.notify()
+
+    def take_pending(self) -> bool:
+        """Return whether the run is pending a completion check, clearing the mark"""
+        with self._lock:
+            pending, self._pending = self._pending, False
+        return pending
+
+    def take_units_to_sync(self) -> List[str]:
+        """Return the units whose agent reached a final status, clearing them"""
+        with self._lock:
+            unit_ids, self._units_to_sync = list(self._units_to_sync), set()
+        return unit_ids
+
+
+def register_listener(task_run_id: str, listener: UnitStatusListener) -> None:
+    """Start calling the given listener on the status changes of the given run"""
+    with _listeners_lock:
+        _listeners[task_run_id] = _listeners.get(task_run_id, ()) + (listener,)
+
+
+def unregister_listener(task_run_id: str, listener: UnitStatusListener) -> None:
+    """Stop calling the given listener on the status changes of the given run"""
+    with _listeners_lock:
+        listeners = tuple(l for l in _listeners.get(task_run_id, ()) if l != listener)
+        if len(listeners) > 0:
+            _listeners[task_run_id] = listeners
+        else:
+            _listeners.pop(task_run_id, None)
+
+
+def register_tracker(tracker: RunCompletionTracker) -> None:
+    """Start notifying the given tracker of the status changes of its run"""
+    register_listener(tracker.task_run_id, tracker.on_unit_status)
+
+
+def unregister_tracker(tracker: RunCompletionTracker) -> None:
+    """Stop notifying the given tracker"""
+    unregister_listener(tracker.task_run_id, tracker.on_unit_status)
+
+
+def publish_unit_status(
+    task_run_id: str, unit_id: Optional[str], status: Optional[str]
+) -> None:
+    """Call the listeners of the given run with a status change"""
+    for listener in _listeners.get(task_run_id, ()):
+        listener(unit_id, status)
+
+
+def publish_agent_status(task_run_id: str, unit_id: str, status: str) -> None:
+    """
+    Publish a status change of the given unit if its agent reached a final
+    status, for the status of the unit to be derived from it again
+    """
+    if status in AgentState.complete():
+        publish_unit_status(task_run_id, unit_id, None)
+
+
+def publish_run_progress(task_run_id: str) -> None:
+    """Publish progress of the given run that isn't about a single unit"""
+    publish_unit_status(task_run_id, None, None)
@@ -16,9 +16,18 @@ from mephisto.data_model.unit import (
     GOLD_UNIT_INDEX,
     COMPENSATION_UNIT_INDEX,
 )
+from mephisto.operations.available_units import AvailableUnitIndex
+from mephisto.operations.available_units import register_available_units
+from mephisto.operations.available_units import unregister_available_units
+from mephisto.operations.run_completion_tracker import publish_run_progress
+from mephisto.operations.run_completion_tracker import register_listener
+from mephisto.operations.run_completion_tracker import unregister_listener
 
 from typing import Dict, Optional, List, Any, TYPE_CHECKING, Iterator, Iterable
+from typing import Callable, Set, Tuple
 from tqdm import tqdm  # type: ignore
+import heapq
+import itertools
 import os
 import time
 import enum
@@ -32,8 +41,8 @@ import types
 
 logger = get_logger(name=__name__)
 
-UNIT_GENERATOR_WAIT_SECONDS = 10
 ASSIGNMENT_GENERATOR_WAIT_SECONDS = 0.5
+DEFAULT_ASSIGNMENT_BATCH_SIZE = 100
 
 
 class GeneratorType(enum.Enum):
@@ -55,8 +64,22 @@ class TaskLauncher:
         task_run: "TaskRun",
         assignment_data_iterator: Iterable[InitializationData],
         max_num_concurrent_units: int = 0,
+        assignment_batch_size: int = DEFAULT_ASSIGNMENT_BATCH_SIZE,
+        unit_launch_priority: Optional[Callable[[Unit], float]] = None,
+        assignment_prefetch: int = 0,
     ):
-        """Prepare the task launcher to get it ready to launch the assignments"""
+        """
+        Prepare the task launcher to get it ready to launch the assignments.
+
+        Units are launched highest `unit_launch_priority` first, and in the
+        order their assignments were created otherwise.
+
+        With `assignment_prefetch` set, assignments are created in the background
+        only while fewer than that many assignments have units waiting to be
+        launched, and the launcher only keeps track of units that aren't done.
+        """
+        assert assignment_batch_size > 0, "Assignment batch size must be positive"
+        assert assignment_prefetch >= 0, "Assignment prefetch can't be negative"
         self.db = db
         self.task_run = task_run
         self.assignment_data_iterable = assignment_data_iterator
@@ -65,8 +88,19 @@ class TaskLauncher:
         self.provider_type = task_run.get_provider().PROVIDER_TYPE
         self.UnitClass = task_run.get_provider().UnitClass
         self.max_num_concurrent_units = max_num_concurrent_units
+        self.assignment_batch_size = assignment_batch_size
+        self.assignment_prefetch = assignment_prefetch
+        self.unit_launch_priority = unit_launch_priority
         self.launched_units: Dict[str, Unit] = {}
+        self.available_units = AvailableUnitIndex(task_run.db_id)
         self.unlaunched_units: Dict[str, Unit] = {}
+        # Heap of (negated priority, order queued, unit id) of the unlaunched units
+        self._launch_queue: List[Tuple[float, int, str]] = []
+        self._launch_order = itertools.count()
+        # Launched units to poll the status of, as one of their agents finished
+        self._units_to_check: Set[str] = set()
+        # Number of unlaunched units of each assignment with any
+        self._unlaunched_assignments: Dict[str, int] = {}
         self.keep_launching_units: bool = False
         self.finished_generators: bool = False
         self.assignment_thread_done: bool = True
@@ -87,27 +121,56 @@ class TaskLauncher:
         self.units_thread: Optional[threading.Thread] = None
         self.assignments_thread: Optional[threading.Thread] = None
 
-    def _create_single_assignment(self, assignment_data) -> None:
-        """Create a single assignment in the database using its read assignment_data"""
+    def _create_assignments_batch(self, assignment_data_list: List[InitializationData]) -> None:
+        """
+        Create assignments for all of the given assignment_data in the database,
+        registering all of the assignments and all of their units with one write each
+        """
+        if len(assignment_data_list) == 0:
+            return
         task_run = self.task_run
         task_args = task_run.get_task_args()
-        assignment_id = self.db.new_assignment(
+        assignment_ids = self.db.new_assignments_bulk(
             task_run.task_id,
             task_run.db_id,
             task_run.requester_id,
             task_run.task_type,
             task_run.provider_type,
-            task_run.sandbox,
+            count=len(assignment_data_list),
+            sandbox=task_run.sandbox,
         )
-        assignment = Assignment.get(self.db, assignment_id)
-        assignment.write_assignment_data(assignment_data)
-        self.assignments.append(assignment)
-        unit_count = len(assignment_data.unit_data)
-        for unit_idx in range(unit_count):
-            unit = self.UnitClass.new(self.db, assignment, unit_idx, task_args.task_reward)
-            self.units.append(unit)
-            with self.unlaunched_units_access_condition:
+        unit_specs = []
+        for assignment_id, assignment_data in zip(assignment_ids, assignment_data_list):
+            assignment = Assignment.get(self.db, assignment_id)
+            assignment.write_assignment_data(assignment_data)
+            if self.assignment_prefetch == 0:
+                self.assignments.append(assignment)
+            unit_count = len(assignment_data.unit_data)
+            unit_specs += [(assignment, unit_idx) for unit_idx in range(unit_count)]
+        units = self.UnitClass.new_bulk(self.db, unit_specs, task_args.task_reward)
+        if self.assignment_prefetch == 0:
+            self.units += units
+        self._queue_units(units)
+
+    def _queue_units(self, units: List[Unit]) -> None:
+        """Queue units to be launched once there is a launch slot for them"""
+        with self.unlaunched_units_access_condition:
+            for unit in units:
+                priority = 0.0
+                if self.unit_launch_priority is not None:
+                    priority = self.unit_launch_priority(unit)
                 self.unlaunched_units[unit.db_id] = unit
+                self._unlaunched_assignments[unit.assignment_id] = (
+                    self._unlaunched_assignments.get(unit.assignment_id, 0) + 1
+                )
+                heapq.heappush(
+                    self._launch_queue, (-priority, next(self._launch_order), unit.db_id)
+                )
+            self.unlaunched_units_access_condition.notify_all()
+
+    def _create_single_assignment(self, assignment_data) -> None:
+        """Create a single assignment in the database using its read assignment_data"""
+        self._create_assignments_batch([assignment_data])
 
     def _try_generating_assignments(
         self, assignment_data_iterator: Iterator[InitializationData]
@@ -118,15 +181,54 @@ class TaskLauncher:
                 data = next(assignment_data_iterator)
                 self._create_single_assignment(data)
             except StopIteration:
-                self.assignment_thread_done = True
+                if not self.assignment_thread_done:
+                    self._set_assignment_thread_done()
+                    publish_run_progress(self.task_run.db_id)
             time.sleep(ASSIGNMENT_GENERATOR_WAIT_SECONDS)
 
+    def _prefetch_assignments(self, assignment_data_iterator: Iterator[InitializationData]) -> None:
+        """
+        Create assignments from the assignment_data_iterator in batches, whenever
+        fewer than assignment_prefetch assignments have units waiting to be launched
+        """
+        condition = self.unlaunched_units_access_condition
+        while not self.finished_generators:
+            with condition:
+                while (
+                    len(self._unlaunched_assignments) >= self.assignment_prefetch
+                    and not self.finished_generators
+                ):
+                    condition.wait()
+                room = self.assignment_prefetch - len(self._unlaunched_assignments)
+            if self.finished_generators:
+                break
+            batch_size = min(room, self.assignment_batch_size)
+            batch = list(itertools.islice(assignment_data_iterator, batch_size))
+            if len(batch) == 0:
+                break
+            self._create_assignments_batch(batch)
+        self._set_assignment_thread_done()
+        publish_run_progress(self.task_run.db_id)
+
     def create_assignments(self) -> None:
         """Create an assignment and associated units for the generated assignment data"""
         self.keep_launching_units = True
-        if self.generator_type != GeneratorType.ASSIGNMENT:
-            for data in self.assignment_data_iterable:
-                self._create_single_assignment(data)
+        if self.assignment_prefetch > 0:
+            # Assignments are created in the background as launches make room
+            self.assignment_thread_done = False
+            self.assignments_thread = threading.Thread(
+                target=self._prefetch_assignments,
+                args=(iter(self.assignment_data_iterable),),
+                name="assignment-generator",
+            )
+            self.assignments_thread.start()
+        elif self.generator_type != GeneratorType.ASSIGNMENT:
+            assignment_data_iterator = iter(self.assignment_data_iterable)
+            while True:
+                batch = list(itertools.islice(assignment_data_iterator, self.assignment_batch_size))
+                if len(batch) == 0:
+                    break
+                self._create_assignments_batch(batch)
         else:
             assert isinstance(
                 self.assignment_data_iterable, types.GeneratorType
@@ -138,65 +240,117 @@ class TaskLauncher:
             )
             self.assignments_thread.start()
 
+    def _set_assignment_thread_done(self) -> None:
+        """Mark that no more assignments will be created, waking the unit generator"""
+        with self.unlaunched_units_access_condition:
+            self.assignment_thread_done = True
+            self.unlaunched_units_access_condition.notify_all()
+
+    def _stop_launching_units(self) -> None:
+        """Stop launching units, waking the unit generator so that it exits"""
+        with self.unlaunched_units_access_condition:
+            self.keep_launching_units = False
+            self.finished_generators = True
+            self.unlaunched_units_access_condition.notify_all()
+
+    def _on_unit_status(self, unit_id: Optional[str], status: Optional[str]) -> None:
+        """
+        Free the launch slot of a launched unit that is no longer LAUNCHED or ASSIGNED.
+        Units whose agent finished (with no status given) are polled by the unit generator.
+        """
+        if unit_id is None or status in [AssignmentState.LAUNCHED, AssignmentState.ASSIGNED]:
+            return
+        with self.unlaunched_units_access_condition:
+            if unit_id not in self.launched_units:
+                return
+            if status is None:
+                self._units_to_check.add(unit_id)
+            else:
+                self.launched_units.pop(unit_id)
+            self.unlaunched_units_access_condition.notify_all()
+
+    def _poll_launched_units(self, unit_ids: Iterable[str]) -> None:
+        """Free the launch slots of the given launched units if they're done"""
+        for db_id in unit_ids:
+            with self.unlaunched_units_access_condition:
+                unit = self.launched_units.get(db_id)
+            if unit is None:
+                continue
+            status = unit.get_status()
+            if status != AssignmentState.LAUNCHED and status != AssignmentState.ASSIGNED:
+                with self.unlaunched_units_access_condition:
+                    self.launched_units.pop(db_id, None)
+
+    def _pop_launchable_units(self) -> List[Unit]:
+        """
+        Take the highest priority unlaunched units that there are free launch slots
+        for, and count them as launched. Called with the launch condition held
+        """
+        if self.max_num_concurrent_units == 0:
+            num_avail_units = len(self._launch_queue)
+        else:
+            num_avail_units = self.max_num_concurrent_units - len(self.launched_units)
+        units = []
+        while num_avail_units > 0 and len(self._launch_queue) > 0:
+            _, _, db_id = heapq.heappop(self._launch_queue)
+            unit = self.unlaunched_units.pop(db_id, None)
+            if unit is None:
+                continue
+            self.launched_units[unit.db_id] = unit
+            units.append(unit)
+            num_avail_units -= 1
+            self._unlaunched_assignments[unit.assignment_id] -= 1
+            if self._unlaunched_assignments[unit.assignment_id] == 0:
+                del self._unlaunched_assignments[unit.assignment_id]
+        if len(units) > 0:
+            # Wake the prefetching of assignments that this made room for
+            self.unlaunched_units_access_condition.notify_all()
+        return units
+
     def generate_units(self):
         """
         units generator which checks that only 'max_num_concurrent_units' running at the same time,
         i.e. in the LAUNCHED or ASSIGNED states
-        """
-        while self.keep_launching_units:
-            units_id_to_remove = []
-            for db_id, unit in self.launched_units.items():
-                status = unit.get_status()
-                if status != AssignmentState.LAUNCHED and status != AssignmentState.ASSIGNED:
-                    units_id_to_remove.append(db_id)
-            for db_id in units_id_to_remove:
-                self.launched_units.pop(db_id)
 
-            num_avail_units = self.max_num_concurrent_units - len(self.launched_units)
-            num_avail_units = (
-                len(self.unlaunched_units)
-                if self.max_num_concurrent_units == 0
-                else num_avail_units
-            )
+        Launch slots are freed as unit status transitions are published, rather than by
+        polling launched units. Transitions only visible to the crowd provider are
+        published too, once the operator's periodic resync of the run asks for them.
+        Returns once every unit is launched and no more assignments will be created.
+        """
+        condition = self.unlaunched_units_access_condition
+        while True:
+            with condition:
+                if not self.keep_launching_units:
+                    break
+                units_to_check, self._units_to_check = self._units_to_check, set()
+            self._poll_launched_units(units_to_check)
 
-            units_id_to_remove = []
-            with self.unlaunched_units_access_condition:
-                for i, item in enumerate(self.unlaunched_units.items()):
-                    db_id, unit = item
-                    if i < num_avail_units:
-                        self.launched_units[unit.db_id] = unit
-                        units_id_to_remove.append(db_id)
-                        yield unit
-                    else:
+            with condition:
+                units = self._pop_launchable_units()
+                if len(units) == 0:
+                    if len(self._launch_queue) == 0 and self.assignment_thread_done:
                         break
-                for db_id in units_id_to_remove:
-                    self.unlaunched_units.pop(db_id)
-
-            time.sleep(UNIT_GENERATOR_WAIT_SECONDS)
-            if not self.unlaunched_units:
-                break
+                    if len(self._units_to_check) == 0 and self.keep_launching_units:
+                        condition.wait()
+            for unit in units:
+                yield unit
 
     def _launch_limited_units(self, url: str) -> None:
         """
         use units' generator to launch limited number of units according to
         (max_num_concurrent_units)
         """
-        # Continue launching if we haven't pulled the plug, so long as there are currently
-        # units to launch, or more may come in the future.
-        while not self.finished_generators and (
-            len(self.unlaunched_units) > 0 or not self.assignment_thread_done
-        ):
-            for unit in self.generate_units():
-                if unit is None:
-                    break
-                unit.launch(url)
-            if self.generator_type == GeneratorType.NONE:
-                break
+        register_listener(self.task_run.db_id, self._on_unit_status)
+        for unit in self.generate_units():
+            unit.launch(url)
+            self.available_units.add_unit(unit)
         self.finished_generators = True
+        publish_run_progress(self.task_run.db_id)
 
     def launch_units(self, url: str) -> None:
         """launch any units registered by this TaskLauncher"""
         self.launch_url = url
+        register_available_units(self.available_units)
         self.units_thread = threading.Thread(
             target=self._launch_limited_units,
             args=(url,),
@@ -242,9 +396,13 @@ class TaskLauncher:
 
     def expire_units(self) -> None:
         """Clean up all units on this TaskLauncher"""
-        self.keep_launching_units = False
-        self.finished_generators = True
-        for unit in tqdm(self.units):
+        self._stop_launching_units()
+        units = self.units
+        if self.assignment_prefetch > 0:
+            # Only units that aren't done are kept track of when prefetching
+            with self.unlaunched_units_access_condition:
+                units = [*self.launched_units.values(), *self.unlaunched_units.values()]
+        for unit in tqdm(units):
             try:
                 unit.expire()
             except Exception as e:
@@ -255,13 +413,14 @@ class TaskLauncher:
 
     def shutdown(self) -> None:
         """Clean up running threads for generating assignments and units"""
-        self.assignment_thread_done = True
-        self.keep_launching_units = False
-        self.finished_generators = True
+        self._set_assignment_thread_done()
+        self._stop_launching_units()
         if self.assignments_thread is not None:
             self.assignments_thread.join()
         if self.units_thread is not None:
             self.units_thread.join()
+        unregister_available_units(self.task_run.db_id)
+        unregister_listener(self.task_run.db_id, self._on_unit_status)
 
     def resume_assignments(self) -> None:
         """
@@ -295,13 +454,16 @@ class TaskLauncher:
                     # Update these units to created, then prepare to launch them
                     unit.set_db_status(AssignmentState.CREATED)
                     self.units.append(unit)
-
-                    with self.unlaunched_units_access_condition:
-                        self.unlaunched_units[unit.db_id] = unit
+                    self._queue_units([unit])
+                elif unit.worker_id is not None:
+                    # Keep workers from being paired with themselves in resumed assignments
+                    self.available_units.assign_unit(unit, unit.worker_id)
 
         assert len(self.units) > 0, "Cannot relaunch a job with no incomplete units!"
 
         logger.debug(f"Resuming assignments finished successfuly")
         self.keep_launching_units = True
+        # No assignments are created when resuming, so units can run out
+        self._set_assignment_thread_done()
 
         return None
@@ -10,7 +10,6 @@ from dataclasses import dataclass, fields
 from prometheus_client import Histogram, Gauge, Counter  # type: ignore
 from mephisto.data_model.worker import Worker
 from mephisto.data_model.agent import Agent, OnboardingAgent
-from mephisto.utils.qualifications import worker_is_qualified
 from mephisto.abstractions.blueprint import AgentState
 from mephisto.abstractions.blueprints.mixins.onboarding_required import (
     OnboardingRequired,
@@ -19,6 +18,7 @@ from mephisto.abstractions.blueprints.mixins.screen_task_required import (
     ScreenTaskRequired,
 )
 from mephisto.abstractions.blueprints.mixins.use_gold_unit import UseGoldUnit
+from mephisto.abstractions._subcomponents.task_runner import TaskRunner
 from mephisto.operations.task_launcher import (
     SCREENING_UNIT_INDEX,
     GOLD_UNIT_INDEX,
@@ -69,6 +69,9 @@ EXTERNAL_FUNCTION_LATENCY.labels(function="get_screening_unit_data")
 EXTERNAL_FUNCTION_LATENCY.labels(function="launch_screening_unit")
 EXTERNAL_FUNCTION_LATENCY.labels(function="get_gold_unit_data_for_worker")
 
+# Candidate units listed for an arriving worker, when the task runner doesn't filter them
+MAX_CANDIDATE_UNITS = 100
+
 
 @dataclass
 class OnboardingInfo:
@@ -136,38 +139,42 @@ class WorkerPool:
             return self.final_onboardings[agent_id]
         return None
 
+    def _get_candidate_limit(self) -> Optional[int]:
+        """
+        Return how many candidate units to list for an arriving worker. Task runners
+        overriding `filter_units_for_worker` are given all of them to choose from
+        """
+        task_runner = self.get_live_run().task_runner
+        if type(task_runner).filter_units_for_worker is TaskRunner.filter_units_for_worker:
+            return MAX_CANDIDATE_UNITS
+        return None
+
     async def register_worker(self, crowd_data: Dict[str, Any], request_id: str) -> None:
         """
         First process the worker registration, then hand off for
         registering an agent
         """
         live_run = self.get_live_run()
-        loop = live_run.loop_wrap.loop
         crowd_provider = live_run.provider
         is_sandbox = crowd_provider.is_sandbox()
         worker_name = crowd_data["worker_name"]
         if crowd_provider.is_sandbox():
             # TODO(WISH) there are better ways to get rid of this designation
             worker_name += "_sandbox"
-        workers = await loop.run_in_executor(
-            None, partial(self.db.find_workers, worker_name=worker_name)
-        )
+        workers = await self.db.aio.find_workers(worker_name=worker_name)
         if len(workers) == 0:
-            worker = await loop.run_in_executor(
-                None,
-                partial(
-                    crowd_provider.WorkerClass.new_from_provider_data,
-                    self.db,
-                    crowd_data,
-                ),
+            worker = await self.db.aio.run(
+                crowd_provider.WorkerClass.new_from_provider_data,
+                self.db,
+                crowd_data,
             )
         else:
             worker = workers[0]
 
-        is_qualified = await loop.run_in_executor(
-            None, partial(worker_is_qualified, worker, live_run.qualifications)
+        qualified_workers = await self.db.aio.find_qualified_workers(
+            live_run.qualifications, worker_ids=[worker.db_id]
         )
-        if not is_qualified:
+        if worker.db_id not in qualified_workers:
             AGENT_DETAILS_COUNT.labels(response="not_qualified").inc()
             live_run.client_io.enqueue_agent_details(
                 request_id,
@@ -191,11 +198,8 @@ class WorkerPool:
 
         logger.debug(f"Worker {worker.db_id} is being assigned one of {len(units)} units.")
 
-        reserved_unit = None
-        while len(units) > 0 and reserved_unit is None:
-            unit = units.pop(0)
-            reserved_unit = task_run.reserve_unit(unit)
-        if reserved_unit is None:
+        unit = await self.db.aio.run(task_run.reserve_first_unit, units)
+        if unit is None:
             AGENT_DETAILS_COUNT.labels(response="no_available_units").inc()
             live_run.client_io.enqueue_agent_details(
                 request_id,
@@ -205,17 +209,15 @@ class WorkerPool:
                 ).to_dict(),
             )
         else:
-            agent = await loop.run_in_executor(
-                None,
-                partial(
-                    crowd_provider.AgentClass.new_from_provider_data,
-                    self.db,
-                    worker,
-                    unit,
-                    crowd_data,
-                ),
+            agent = await self.db.aio.run(
+                crowd_provider.AgentClass.new_from_provider_data,
+                self.db,
+                worker,
+                unit,
+                crowd_data,
             )
             agent.set_live_run(live_run)
+            live_run.task_launcher.available_units.assign_unit(unit, worker.db_id)
             live_run.client_io.associate_agent_with_registration(
                 agent.get_agent_id(),
                 request_id,
@@ -253,14 +255,14 @@ class WorkerPool:
                     agent,
                 )
             else:
-                assignment = await loop.run_in_executor(None, unit.get_assignment)
+                assignment = await self.db.aio.run(unit.get_assignment)
 
                 # Set status to waiting
                 agent.update_status(AgentState.STATUS_WAITING)
 
                 # See if the concurrent assignment is ready to launch
                 logger.debug(f"Attempting to launch {assignment}.")
-                agents = await loop.run_in_executor(None, assignment.get_agents)
+                agents = await self.db.aio.run(assignment.get_agents)
                 if None in agents:
                     return  # need to wait for all agents to be here to launch
 
@@ -322,8 +324,10 @@ class WorkerPool:
 
         # get the list of tentatively valid units
         with EXTERNAL_FUNCTION_LATENCY.labels(function="get_valid_units_for_worker").time():
-            units = await loop.run_in_executor(
-                None, partial(live_run.task_run.get_valid_units_for_worker, worker)
+            units = await self.db.aio.run(
+                live_run.task_run.get_valid_units_for_worker,
+                worker,
+                self._get_candidate_limit(),
             )
         with EXTERNAL_FUNCTION_LATENCY.labels(function="filter_units_for_worker").time():
             usable_units = await loop.run_in_executor(
@@ -381,7 +385,7 @@ class WorkerPool:
                 ).to_dict(),
             )
             return
-        worker = agent.get_worker()
+        worker = await self.db.aio.run(agent.get_worker)
         AGENT_DETAILS_COUNT.labels(response="reconnection").inc()
         if isinstance(agent, OnboardingAgent):
             if agent.get_status() == AgentState.STATUS_REJECTED:
@@ -519,7 +523,9 @@ class WorkerPool:
 
         # get the list of tentatively valid units
         with EXTERNAL_FUNCTION_LATENCY.labels(function="get_valid_units_for_worker").time():
-            units = task_run.get_valid_units_for_worker(worker)
+            units = await self.db.aio.run(
+                task_run.get_valid_units_for_worker, worker, self._get_candidate_limit()
+            )
 
         if len(units) == 0:
             AGENT_DETAILS_COUNT.labels(response="no_available_units").inc()
@@ -20,6 +20,7 @@ from werkzeug.exceptions import HTTPException as WerkzeugHTTPException
 from werkzeug.utils import import_string
 
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
 from mephisto.utils import http_status
 from mephisto.abstractions.providers.prolific.api.exceptions import ProlificException
 from mephisto.tools.data_browser import DataBrowser
@@ -59,8 +60,13 @@ def create_app(debug: bool = False, database_path: Optional[str] = None) -> Flas
     # Settings
     app.config.from_object(FLASK_SETTINGS_MODULE)
 
-    # Databases
+    # Databases. Views that only read use a read-only connection to the same database,
+    # so that browsing and stats don't slow down the operator of a running task.
+    # The DataBrowser needs to write the unit statuses it computes.
     app.db = LocalMephistoDB(database_path=database_path)
+    app.read_db = LocalMephistoDB(
+        database_path=app.db.db_path, args=LocalMephistoDBArgs(read_only=True)
+    )
     app.data_browser = DataBrowser(db=app.db)
 
     # API URLS
@@ -27,8 +27,7 @@ def _find_granted_qualifications(
 ) -> List[StringIDRow]:
     """Return the granted qualifications in the database"""
 
-    with db.table_access_condition:
-        conn = db.get_connection()
+    with db.read_connection() as conn:
         c = conn.cursor()
 
         params = []
@@ -126,8 +125,7 @@ def _find_grants(
 ) -> List[StringIDRow]:
     """Return the units for granted qualification"""
 
-    with db.table_access_condition:
-        conn = db.get_connection()
+    with db.read_connection() as conn:
         c = conn.cursor()
 
         params = [
@@ -201,7 +199,7 @@ class GrantedQualificationsView(MethodView):
         sort_param = request.args.get("sort")
 
         db_granted_qualifications = _find_granted_qualifications(
-            db=app.db,
+            db=app.read_db,
             qualification_id=qualification_id_param,
             sort_param=sort_param,
         )
@@ -219,7 +217,7 @@ class GrantedQualificationsView(MethodView):
                     "value": u["updated_qualification_value"],
                 }
                 for u in _find_grants(
-                    db=app.db,
+                    db=app.read_db,
                     worker_id=gq["worker_id"],
                     qualification_id=gq["qualification_id"],
                     statuses=STATUSES_UNITS_FOR_QUALIFICATION,
@@ -14,10 +14,10 @@ class QualificationDetailsView(MethodView):
     def get(self, qualification_id: str = None) -> dict:
         """Get qualification details"""
 
-        db_qualification: StringIDRow = app.db.get_qualification(qualification_id)
+        db_qualification: StringIDRow = app.read_db.get_qualification(qualification_id)
         app.logger.debug(f"Found Qualification in DB: {db_qualification}")
 
-        db_granted_qualifications: StringIDRow = app.db.find_granted_qualifications(
+        db_granted_qualifications: StringIDRow = app.read_db.find_granted_qualifications(
             qualification_id=qualification_id
         )
 
@@ -19,8 +19,7 @@ from mephisto.abstractions.databases.local_database import StringIDRow
 def _find_granted_qualifications(db: LocalMephistoDB, qualification_id: str) -> List[StringIDRow]:
     """Return the granted qualifications in the database by the given qualification id"""
 
-    with db.table_access_condition:
-        conn = db.get_connection()
+    with db.read_connection() as conn:
         c = conn.cursor()
         c.execute(
             f"""
@@ -49,8 +48,7 @@ def _find_worker_reviews(
     if task_id:
         params.append(nonesafe_int(task_id))
 
-    with db.table_access_condition:
-        conn = db.get_connection()
+    with db.read_connection() as conn:
         c = conn.cursor()
         c.execute(
             f"""
@@ -71,10 +69,10 @@ class QualificationWorkersView(MethodView):
 
         task_id = request.args.get("task_id")
 
-        db_qualification: StringIDRow = app.db.get_qualification(qualification_id)
+        db_qualification: StringIDRow = app.read_db.get_qualification(qualification_id)
         app.logger.debug(f"Found qualification in DB: {dict(db_qualification)}")
 
-        db_granted_qualifications = _find_granted_qualifications(app.db, qualification_id)
+        db_granted_qualifications = _find_granted_qualifications(app.read_db, qualification_id)
 
         app.logger.debug(
             f"Found granted qualifications for this qualification in DB: "
@@ -85,7 +83,7 @@ class QualificationWorkersView(MethodView):
 
         for gq in db_granted_qualifications:
             worker_reviews = _find_worker_reviews(
-                app.db,
+                app.read_db,
                 qualification_id,
                 gq["worker_id"],
                 task_id,
@@ -66,8 +66,7 @@ def _find_worker_reviews(
     if limit:
         params.append(nonesafe_int(limit))
 
-    with db.table_access_condition:
-        conn = db.get_connection()
+    with db.read_connection() as conn:
         c = conn.cursor()
         c.execute(
             f"""
@@ -128,8 +127,7 @@ def _find_units_for_worker(
     if limit:
         params.append(nonesafe_int(limit))
 
-    with db.table_access_condition:
-        conn = db.get_connection()
+    with db.read_connection() as conn:
         c = conn.cursor()
         c.execute(
             f"""
@@ -161,7 +159,7 @@ class ReviewStatsView(MethodView):
                 raise BadRequest("Wrong date format.")
 
         approved_worker_reviews = _find_worker_reviews(
-            db=app.db,
+            db=app.read_db,
             worker_id=worker_id,
             task_id=task_id,
             status=AgentState.STATUS_APPROVED,
@@ -169,7 +167,7 @@ class ReviewStatsView(MethodView):
             limit=limit,
         )
         rejected_worker_reviews = _find_worker_reviews(
-            db=app.db,
+            db=app.read_db,
             worker_id=worker_id,
             task_id=task_id,
             status=AgentState.STATUS_REJECTED,
@@ -177,7 +175,7 @@ class ReviewStatsView(MethodView):
             limit=limit,
         )
         soft_rejected_worker_reviews = _find_worker_reviews(
-            db=app.db,
+            db=app.read_db,
             worker_id=worker_id,
             task_id=task_id,
             status=AgentState.STATUS_SOFT_REJECTED,
@@ -185,7 +183,7 @@ class ReviewStatsView(MethodView):
             limit=limit,
         )
         all_units_for_worker = _find_units_for_worker(
-            db=app.db,
+            db=app.read_db,
             worker_id=worker_id,
             task_id=task_id,
             statuses=AssignmentState.completed(),
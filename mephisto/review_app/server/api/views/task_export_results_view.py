@@ -35,7 +35,7 @@ class TaskExportResultsView(MethodView):
     def get(self, task_id: str = None) -> dict:
         """Assemble results for all Units related to the Task into a single file"""
 
-        db_task: StringIDRow = app.db.get_task(task_id)
+        db_task: StringIDRow = app.read_db.get_task(task_id)
         app.logger.debug(f"Found Task in DB: {db_task}")
 
         db_units: List[StringIDRow] = find_completed_units(int(task_id))
@@ -51,7 +51,7 @@ class TaskExportResultsView(MethodView):
         task_units_data = {}
         for db_unit in db_units:
             unit_id = db_unit["unit_id"]
-            unit: Unit = Unit.get(app.db, unit_id)
+            unit: Unit = Unit.get(app.read_db, unit_id)
 
             try:
                 unit_data = app.data_browser.get_data_from_unit(unit)
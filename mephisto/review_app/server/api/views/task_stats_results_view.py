@@ -22,7 +22,7 @@ class TaskStatsResultsView(MethodView):
     def get(self, task_id: str = None) -> dict:
         """Assemble stats with results for Task"""
 
-        task: Task = Task.get(db=app.db, db_id=task_id)
+        task: Task = Task.get(db=app.read_db, db_id=task_id)
         app.logger.debug(f"Found Task in DB: {task}")
 
         task_runs: List[TaskRun] = task.get_runs()
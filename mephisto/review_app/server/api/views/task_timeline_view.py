@@ -16,7 +16,7 @@ class TaskTimelineView(MethodView):
     def get(self, task_id: str = None) -> dict:
         """Check if Grafana server is available and redirect or return error"""
 
-        task: Task = Task.get(db=app.db, db_id=task_id)
+        task: Task = Task.get(db=app.read_db, db_id=task_id)
         app.logger.debug(f"Found Task in DB: {task}")
 
         try:
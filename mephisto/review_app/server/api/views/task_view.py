@@ -14,7 +14,7 @@ class TaskView(MethodView):
     def get(self, task_id: str = None) -> dict:
         """Get task"""
 
-        db_task: StringIDRow = app.db.get_task(task_id)
+        db_task: StringIDRow = app.read_db.get_task(task_id)
         app.logger.debug(f"Found Task in DB: {db_task}")
 
         return {
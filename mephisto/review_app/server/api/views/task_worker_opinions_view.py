@@ -17,7 +17,7 @@ class TaskWorkerOpinionsView(MethodView):
     def get(self, task_id: str = None) -> dict:
         """Returns all Worker Opinions related to a Task"""
 
-        task: Task = Task.get(db=app.db, db_id=task_id)
+        task: Task = Task.get(db=app.read_db, db_id=task_id)
         app.logger.debug(f"Found Task in DB: {task}")
 
         units: List[Unit] = task.db.find_units(task_id=task_id)
@@ -22,9 +22,7 @@ from mephisto.review_app.server.db_queries import find_units
 
 
 def _find_tasks(db, debug: bool = False) -> List[StringIDRow]:
-    with db.table_access_condition:
-        conn = db.get_connection()
-
+    with db.read_connection() as conn:
         c = conn.cursor()
         c.execute(
             """
@@ -37,12 +35,12 @@ def _find_tasks(db, debug: bool = False) -> List[StringIDRow]:
 
 
 def find_all_units(task_id: int) -> List[StringIDRow]:
-    return find_units(app.db, task_id, debug=app.debug)
+    return find_units(app.read_db, task_id, debug=app.debug)
 
 
 def find_completed_units(task_id: int) -> List[StringIDRow]:
     return find_units(
-        app.db,
+        app.read_db,
         task_id,
         statuses=AssignmentState.completed(),
         debug=app.debug,
@@ -61,7 +59,7 @@ def check_if_task_reviewed(task_id: int) -> bool:
 
 
 def _check_task_has_stats(task_id: str) -> bool:
-    task: Task = Task.get(db=app.db, db_id=task_id)
+    task: Task = Task.get(db=app.read_db, db_id=task_id)
     task_runs: List[TaskRun] = task.get_runs()
 
     if not task_runs:
@@ -82,7 +80,7 @@ class TasksView(MethodView):
     def get(self) -> dict:
         """Get all available tasks (to select one for review)"""
 
-        db_tasks: List[StringIDRow] = _find_tasks(app.db, debug=app.debug)
+        db_tasks: List[StringIDRow] = _find_tasks(app.read_db, debug=app.debug)
         app.logger.debug(f"Found tasks in DB: {[t['task_id'] for t in db_tasks]}")
 
         tasks = []
@@ -21,11 +21,11 @@ class TaskUnitIdsView(MethodView):
         (for subsequent client-side grouping by worker_id and GET /task-units pagination)
         """
 
-        db_task: StringIDRow = app.db.get_task(task_id)
+        db_task: StringIDRow = app.read_db.get_task(task_id)
         app.logger.debug(f"Found task in DB: {dict(db_task)}")
 
         db_units: List[StringIDRow] = find_units(
-            app.db,
+            app.read_db,
             int(db_task["task_id"]),
             statuses=AssignmentState.completed(),
             debug=app.debug,
@@ -51,7 +51,7 @@ class UnitDataStaticView(MethodView):
         It can return files by name from file system (auto generated name) or
         by original name (that name with what user uploaded a file)
         """
-        unit: Unit = Unit.get(app.db, str(unit_id))
+        unit: Unit = Unit.get(app.read_db, str(unit_id))
         app.logger.debug(f"Found Unit in DB: {unit}")
 
         # Mephisto saves files with its own format of file names,
@@ -23,7 +23,7 @@ class UnitReviewBundleView(MethodView):
     def get(self, unit_id: str = None) -> Union[dict, Response]:
         """Return review ReactJS bundle depending on TaskRun args from config"""
 
-        unit: Unit = Unit.get(app.db, str(unit_id))
+        unit: Unit = Unit.get(app.read_db, str(unit_id))
         app.logger.debug(f"Found Unit in DB: {unit}")
         task_run: TaskRun = unit.get_task_run()
 
@@ -18,7 +18,7 @@ class UnitReviewHtmlView(MethodView):
     def get(self, unit_id: str = None) -> Response:
         """Return 'index.html' with review ReactJS bundle URL"""
 
-        unit: Unit = Unit.get(app.db, str(unit_id))
+        unit: Unit = Unit.get(app.read_db, str(unit_id))
         app.logger.debug(f"Found Unit in DB: {unit}")
 
         html_file_path = os.path.join(
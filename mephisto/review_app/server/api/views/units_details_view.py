@@ -3,6 +3,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+from typing import Iterator
 from typing import List
 from typing import Optional
 
@@ -33,8 +34,7 @@ def _find_worker_reviews(
 ) -> List[dict]:
     """Return all unit reviews for unit"""
 
-    with db.table_access_condition:
-        conn = db.get_connection()
+    with db.read_connection() as conn:
         c = conn.cursor()
         c.execute(
             f"""
@@ -108,7 +108,7 @@ class UnitsDetailsView(MethodView):
             raise BadRequest("`unit_ids` parameter must be specified.")
 
         # Get units
-        db_units: List[Unit] = app.db.find_units()
+        db_units: Iterator[Unit] = app.read_db.iter_units()
 
         # Prepare response
         units = []
@@ -154,7 +154,7 @@ class UnitsDetailsView(MethodView):
                 task_name = task_run.get_task().task_name
                 metadata["webvtt"] = convert_annotation_tracks_to_webvtt(task_name, inputs, outputs)
 
-            metadata["worker_reviews"] = _find_worker_reviews(app.db, unit.db_id)
+            metadata["worker_reviews"] = _find_worker_reviews(app.read_db, unit.db_id)
 
             # Get Unit data path
             agent = unit.get_assigned_agent()
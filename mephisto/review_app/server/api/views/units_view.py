@@ -48,14 +48,14 @@ class UnitsView(MethodView):
 
         # Check if task with past `task_id` exists
         if task_id_param:
-            Task.get(app.db, str(task_id_param))
+            Task.get(app.read_db, str(task_id_param))
             if not unit_ids_param:
-                unit_ids = [int(u.db_id) for u in app.db.find_units(task_id=task_id_param)]
+                unit_ids = [int(u.unit_id) for u in app.read_db.select_units(task_id=task_id_param)]
 
         # Prepare response
         units = []
         for unit_id in unit_ids:
-            unit: Unit = Unit.get(app.db, str(unit_id))
+            unit: Unit = Unit.get(app.read_db, str(unit_id))
 
             if task_id_param and unit.task_id != task_id_param:
                 continue
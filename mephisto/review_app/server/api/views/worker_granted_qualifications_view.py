@@ -17,8 +17,7 @@ from mephisto.data_model.worker import Worker
 def _find_granted_qualifications(db: LocalMephistoDB, worker_id: str) -> List[StringIDRow]:
     """Return the granted qualifications in the database by the given worker id"""
 
-    with db.table_access_condition:
-        conn = db.get_connection()
+    with db.read_connection() as conn:
         c = conn.cursor()
         c.execute(
             """
@@ -53,10 +52,10 @@ class WorkerGrantedQualificationsView(MethodView):
     def get(self, worker_id: int) -> dict:
         """Get list of all granted queslifications for a worker."""
 
-        worker: Worker = Worker.get(app.db, str(worker_id))
+        worker: Worker = Worker.get(app.read_db, str(worker_id))
         app.logger.debug(f"Found Worker in DB: {worker}")
 
-        db_granted_qualifications = _find_granted_qualifications(app.db, worker.db_id)
+        db_granted_qualifications = _find_granted_qualifications(app.read_db, worker.db_id)
 
         app.logger.debug(
             f"Found granted qualifications for worker {worker_id} in DB: "
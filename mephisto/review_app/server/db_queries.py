@@ -17,9 +17,7 @@ def find_units(
     statuses: Optional[List[str]] = None,
     debug: bool = False,
 ) -> List[StringIDRow]:
-    with db.table_access_condition:
-        conn = db.get_connection()
-
+    with db.read_connection() as conn:
         params = []
 
         task_query = "task_id = ?" if task_id else ""
@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Micro-benchmarks for the local MephistoDB implementations. Each module in this
+package is runnable on its own against a throwaway database in a temp directory:
+
+    python -m mephisto.scripts.local_db.benchmarks.<benchmark_name> --help
+"""
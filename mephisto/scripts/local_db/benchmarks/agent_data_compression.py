@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark the disk usage and the write/read time of a synthetic corpus of
+ParlAI chat agent states, saved with and without agent data compression, both
+as one file per agent and once the run is packed by `pack_run_dir`.
+
+To run this benchmark:
+    python -m mephisto.scripts.local_db.benchmarks.agent_data_compression --messages 100
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict
+from typing import List
+
+from mephisto.abstractions.databases.agent_data_store import DEFAULT_COMPRESSION_THRESHOLD_BYTES
+from mephisto.abstractions.databases.agent_data_store import pack_run_dir
+from mephisto.abstractions.databases.agent_data_store import PACKED_AGENT_DATA_FILE
+from mephisto.abstractions.databases.agent_data_store import SQLITE_BACKEND
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import AgentDataArgs
+from mephisto.scripts.local_db.benchmarks.agent_data_reads import make_chat_state
+from mephisto.utils.console_writer import ConsoleWriter
+
+logger = ConsoleWriter()
+
+
+def time_reads(db: LocalMephistoDB, keys: List[str]) -> float:
+    """Return the seconds taken to read every key"""
+    start_time = time.monotonic()
+    for key in keys:
+        db.read_dict(key)
+    return time.monotonic() - start_time
+
+
+def run_benchmark(
+    num_agents: int, num_messages: int, compression: bool, threshold: int
+) -> Dict[str, float]:
+    """Write and read back the state of `num_agents` chat agents, returning the measurements"""
+    data_dir = tempfile.mkdtemp()
+    db_path = os.path.join(data_dir, "database.db")
+    db = LocalMephistoDB(db_path)
+    db.configure_agent_data(AgentDataArgs(compression=compression, compression_threshold=threshold))
+    try:
+        run_dir = os.path.join(data_dir, "data", "runs", "NO_PROJECT", "1")
+        states = [make_chat_state(idx, num_messages) for idx in range(num_agents)]
+        keys = [os.path.join(run_dir, "1", str(idx), "state.json") for idx in range(num_agents)]
+
+        start_time = time.monotonic()
+        for key, state in zip(keys, states):
+            db.write_dict(key, state)
+        write_seconds = time.monotonic() - start_time
+        read_seconds = time_reads(db, keys)
+
+        num_bytes = 0
+        num_blocks = 0
+        for key in keys:
+            stat = os.stat(key)
+            num_bytes += stat.st_size
+            num_blocks += stat.st_blocks
+        db.shutdown()
+
+        pack_run_dir(run_dir)
+        db = LocalMephistoDB(db_path)
+        db.configure_agent_data(AgentDataArgs(backend=SQLITE_BACKEND))
+        packed_read_seconds = time_reads(db, keys)
+        return {
+            "megabytes": num_bytes / 2**20,
+            # st_blocks is in 512 byte units whatever the file system block size
+            "disk_megabytes": num_blocks * 512 / 2**20,
+            "write_seconds": write_seconds,
+            "read_seconds": read_seconds,
+            "packed_megabytes": os.path.getsize(os.path.join(run_dir, PACKED_AGENT_DATA_FILE))
+            / 2**20,
+            "packed_read_seconds": packed_read_seconds,
+        }
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=5000, help="Agent states in the corpus")
+    parser.add_argument("--messages", type=int, default=100, help="Messages per conversation")
+    parser.add_argument(
+        "--threshold",
+        type=int,
+        default=DEFAULT_COMPRESSION_THRESHOLD_BYTES,
+        help="Size in bytes from which agent state is compressed",
+    )
+    args = parser.parse_args()
+
+    for compression in [False, True]:
+        mode = "gzip" if compression else "plain"
+        results = run_benchmark(args.agents, args.messages, compression, args.threshold)
+        logger.info(
+            f"[blue]{mode:>6}[/blue]: {results['megabytes']:8.1f}MB of data, "
+            f"{results['disk_megabytes']:8.1f}MB on disk, "
+            f"write {results['write_seconds']:6.2f}s, read {results['read_seconds']:6.2f}s; "
+            f"packed {results['packed_megabytes']:8.1f}MB, "
+            f"read {results['packed_read_seconds']:6.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark reading the data of every agent of a ParlAI chat task run, the way
+the review app and `DataBrowser` do, with one JSON file per agent compared
+against the run packed into a single file by `pack_run_dir`. The time spent
+in `key_exists`/`read_dict` alone is reported separately, as `DataBrowser`
+also makes a number of database queries per unit.
+
+To run this benchmark:
+    python -m mephisto.scripts.local_db.benchmarks.agent_data_reads --agents 20000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import List
+from typing import Tuple
+
+from mephisto.abstractions.databases.agent_data_store import FILES_BACKEND
+from mephisto.abstractions.databases.agent_data_store import pack_run_dir
+from mephisto.abstractions.databases.agent_data_store import SQLITE_BACKEND
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import AgentDataArgs
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.unit import Unit
+from mephisto.tools.data_browser import DataBrowser
+from mephisto.utils.console_writer import ConsoleWriter
+from mephisto.utils.testing import get_test_requester
+from mephisto.utils.testing import get_test_task
+
+logger = ConsoleWriter()
+
+TASK_TYPE = "parlai_chat"
+MESSAGES_PER_AGENT = 20
+BATCH_SIZE = 1000
+
+
+def make_chat_state(agent_idx: int, num_messages: int = MESSAGES_PER_AGENT) -> dict:
+    """Return a ParlAI chat state with a synthetic conversation of `num_messages` messages"""
+    start_time = time.time()
+    messages = [
+        {
+            "id": "Chat Agent" if msg_idx % 2 == 0 else "Model",
+            "text": f"Message {msg_idx} of conversation {agent_idx}, padded with some text.",
+            "task_data": {"agent_display_name": "Chat Agent"},
+            "timestamp": start_time + msg_idx,
+        }
+        for msg_idx in range(num_messages)
+    ]
+    return {
+        "outputs": {"messages": messages, "final_submission": None},
+        "inputs": {"persona": f"Persona of conversation {agent_idx}"},
+        "metadata": {"task_start": start_time, "task_end": start_time + num_messages},
+    }
+
+
+def populate_chat_run(db: LocalMephistoDB, num_agents: int) -> Tuple[str, List[str], List[str]]:
+    """
+    Create a ParlAI chat task run with one completed agent per unit, returning
+    the run dir, the ids of all units and the keys of all agent data
+    """
+    _, task_id = get_test_task(db)
+    _, requester_id = get_test_requester(db)
+    task_run = TaskRun.get(db, db.new_task_run(task_id, requester_id, "{}", "mock", TASK_TYPE))
+    worker_id = db.new_worker("chat_worker", "mock")
+    unit_ids: List[str] = []
+    keys: List[str] = []
+    while len(unit_ids) < num_agents:
+        count = min(BATCH_SIZE, num_agents - len(unit_ids))
+        assignment_ids = db.new_assignments_bulk(
+            task_id, task_run.db_id, requester_id, TASK_TYPE, "mock", count
+        )
+        new_unit_ids = db.new_units_bulk(
+            task_id,
+            task_run.db_id,
+            requester_id,
+            [(assignment_id, 0) for assignment_id in assignment_ids],
+            1.0,
+            "mock",
+            TASK_TYPE,
+        )
+        for assignment_id, unit_id in zip(assignment_ids, new_unit_ids):
+            agent_id = db.new_agent(
+                worker_id, unit_id, task_id, task_run.db_id, assignment_id, TASK_TYPE, "mock"
+            )
+            db.update_agent(agent_id, status=AssignmentState.COMPLETED)
+            db.update_unit(unit_id, status=AssignmentState.COMPLETED)
+            agent_dir = os.path.join(task_run.get_run_dir(), assignment_id, agent_id)
+            state_key = os.path.join(agent_dir, "state.json")
+            metadata_key = os.path.join(agent_dir, "agent_meta.json")
+            db.write_dict(state_key, make_chat_state(len(unit_ids)))
+            db.write_dict(metadata_key, {"task_start": time.time()})
+            keys += [state_key, metadata_key]
+        unit_ids += new_unit_ids
+    return task_run.get_run_dir(), unit_ids, keys
+
+
+def count_files(path: str) -> int:
+    """Return the number of files under the given directory"""
+    return sum(len(file_names) for _, _, file_names in os.walk(path))
+
+
+def time_read_all(
+    db_path: str, unit_ids: List[str], keys: List[str], backend: str
+) -> Tuple[float, float]:
+    """
+    Return the seconds taken to read the data of every unit through DataBrowser,
+    and to read every agent data key directly
+    """
+    db = LocalMephistoDB(db_path)
+    db.configure_agent_data(AgentDataArgs(backend=backend))
+    try:
+        data_browser = DataBrowser(db)
+        start_time = time.monotonic()
+        for unit_id in unit_ids:
+            data = data_browser.get_data_from_unit(Unit.get(db, unit_id))
+            assert len(data["data"]["messages"]) == MESSAGES_PER_AGENT
+        browser_seconds = time.monotonic() - start_time
+
+        start_time = time.monotonic()
+        for key in keys:
+            assert db.key_exists(key)
+            db.read_dict(key)
+        return browser_seconds, time.monotonic() - start_time
+    finally:
+        db.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=20000, help="Agents in the task run")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    db_path = os.path.join(data_dir, "database.db")
+    try:
+        db = LocalMephistoDB(db_path)
+        db.configure_agent_data(AgentDataArgs(backend=FILES_BACKEND))
+        run_dir, unit_ids, keys = populate_chat_run(db, args.agents)
+        db.shutdown()
+
+        files_before = count_files(run_dir)
+        files_seconds = time_read_all(db_path, unit_ids, keys, FILES_BACKEND)
+        pack_start = time.monotonic()
+        num_packed = pack_run_dir(run_dir)
+        pack_seconds = time.monotonic() - pack_start
+        files_after = count_files(run_dir)
+        packed_seconds = time_read_all(db_path, unit_ids, keys, SQLITE_BACKEND)
+
+        logger.info(f"Packed {num_packed} files in {pack_seconds:.1f}s")
+        for name, num_files, (browser_seconds, read_seconds) in [
+            ("files", files_before, files_seconds),
+            ("packed", files_after, packed_seconds),
+        ]:
+            logger.info(
+                f"[blue]{name:>8}[/blue]: {num_files:8d} files in run dir, "
+                f"DataBrowser read all {args.agents} agents in {browser_seconds:6.2f}s, "
+                f"read_dict of all {len(keys)} keys took {read_seconds:6.2f}s"
+            )
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark `find_units`/`get_unit` throughput of a LocalMephistoDB with many
+concurrent reader threads and one writer thread, comparing the default
+single-lock mode against WAL mode.
+
+To run this benchmark:
+    python -m mephisto.scripts.local_db.benchmarks.concurrent_reads --readers 32
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict
+from typing import List
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.scripts.local_db.benchmarks.utils import populate_units
+from mephisto.utils.console_writer import ConsoleWriter
+
+logger = ConsoleWriter()
+
+
+def run_benchmark(
+    use_wal: bool,
+    num_readers: int,
+    num_assignments: int,
+    duration: float,
+) -> Dict[str, float]:
+    """Run the mixed read/write load against a fresh database, returning ops/sec"""
+    data_dir = tempfile.mkdtemp()
+    db = LocalMephistoDB(
+        os.path.join(data_dir, "database.db"),
+        args=LocalMephistoDBArgs(use_wal=use_wal, max_reader_connections=num_readers),
+    )
+    try:
+        task_run_id, unit_ids = populate_units(db, num_assignments)
+        assignment_ids = [a.db_id for a in db.find_assignments(task_run_id=task_run_id)]
+        for unit_id in unit_ids:
+            db.update_unit(unit_id, status=AssignmentState.LAUNCHED)
+        stop_event = threading.Event()
+        read_counts: List[int] = [0] * num_readers
+        write_count = [0]
+
+        def read_loop(reader_idx: int) -> None:
+            while not stop_event.is_set():
+                if read_counts[reader_idx] % 2 == 0:
+                    db.get_unit(random.choice(unit_ids))
+                else:
+                    db.find_units(assignment_id=random.choice(assignment_ids))
+                read_counts[reader_idx] += 1
+
+        def write_loop() -> None:
+            # Flip units between LAUNCHED and ASSIGNED, keeping the table stable
+            while not stop_event.is_set():
+                unit_id = random.choice(unit_ids)
+                db.update_unit(unit_id, status=AssignmentState.ASSIGNED)
+                db.update_unit(unit_id, status=AssignmentState.LAUNCHED)
+                write_count[0] += 2
+
+        threads = [threading.Thread(target=read_loop, args=(i,)) for i in range(num_readers)]
+        threads.append(threading.Thread(target=write_loop))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+        return {
+            "reads_per_sec": sum(read_counts) / duration,
+            "writes_per_sec": write_count[0] / duration,
+        }
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=32, help="Concurrent reader threads")
+    parser.add_argument("--assignments", type=int, default=2000, help="Units in the test run")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per mode")
+    args = parser.parse_args()
+
+    for use_wal in [False, True]:
+        mode = "wal" if use_wal else "default"
+        results = run_benchmark(use_wal, args.readers, args.assignments, args.duration)
+        logger.info(
+            f"[blue]{mode:>8}[/blue]: "
+            f"{results['reads_per_sec']:10.1f} reads/sec, "
+            f"{results['writes_per_sec']:10.1f} writes/sec "
+            f"({args.readers} readers, 1 writer)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Build a synthetic LocalMephistoDB with a large number of units, then run every
+hot `find_*` lookup against it with query profiling enabled, asserting that
+none of them scans a full table and reporting how long each one took.
+
+To run this benchmark:
+    python -m mephisto.scripts.local_db.benchmarks.index_usage --units 1000000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.abstractions.databases.query_profiler import DEFAULT_PROFILE_LOG_NAME
+from mephisto.abstractions.databases.query_profiler import load_query_log
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.utils.console_writer import ConsoleWriter
+from mephisto.utils.testing import get_test_task_run
+
+logger = ConsoleWriter()
+
+UNITS_PER_ASSIGNMENT = 10
+INSERT_BATCH_SIZE = 10000
+NUM_WORKERS = 100
+NUM_AGENTS = 1000
+
+
+class Fixture(NamedTuple):
+    """Ids of the entries the hot lookups are run against"""
+
+    task_id: str
+    task_run_id: str
+    assignment_id: str
+    unit_id: str
+    worker_id: str
+    qualification_id: str
+
+
+def build_database(db: LocalMephistoDB, num_units: int) -> Fixture:
+    """
+    Populate the given database with one task run holding `num_units` units,
+    and a smaller number of workers, agents, onboarding agents, qualifications
+    and worker reviews
+    """
+    task_run = TaskRun.get(db, get_test_task_run(db))
+    num_assignments = max(1, num_units // UNITS_PER_ASSIGNMENT)
+    unit_ids: List[str] = []
+    assignment_ids: List[str] = []
+    batch_assignments = INSERT_BATCH_SIZE // UNITS_PER_ASSIGNMENT
+    while len(assignment_ids) < num_assignments:
+        count = min(batch_assignments, num_assignments - len(assignment_ids))
+        new_assignment_ids = db.new_assignments_bulk(
+            task_run.task_id,
+            task_run.db_id,
+            task_run.requester_id,
+            task_run.task_type,
+            task_run.provider_type,
+            count,
+            sandbox=task_run.sandbox,
+        )
+        assignment_ids += new_assignment_ids
+        unit_ids += db.new_units_bulk(
+            task_run.task_id,
+            task_run.db_id,
+            task_run.requester_id,
+            [(a, i) for a in new_assignment_ids for i in range(UNITS_PER_ASSIGNMENT)],
+            1.0,
+            task_run.provider_type,
+            task_run.task_type,
+            sandbox=task_run.sandbox,
+        )
+
+    worker_ids = [db.new_worker(f"worker_{idx}", "mock") for idx in range(NUM_WORKERS)]
+    qualification_id = db.make_qualification("index_usage_qualification")
+    for idx, unit_id in enumerate(unit_ids[:NUM_AGENTS]):
+        worker_id = worker_ids[idx % NUM_WORKERS]
+        db.new_agent(
+            worker_id,
+            unit_id,
+            task_run.task_id,
+            task_run.db_id,
+            assignment_ids[idx // UNITS_PER_ASSIGNMENT],
+            task_run.task_type,
+            task_run.provider_type,
+        )
+    for worker_id in worker_ids:
+        db.new_onboarding_agent(worker_id, task_run.task_id, task_run.db_id, task_run.task_type)
+        db.grant_qualification(qualification_id, worker_id)
+        db.new_worker_review(worker_id, status="approved", task_id=task_run.task_id)
+
+    return Fixture(
+        task_id=task_run.task_id,
+        task_run_id=task_run.db_id,
+        assignment_id=assignment_ids[0],
+        unit_id=unit_ids[0],
+        worker_id=worker_ids[0],
+        qualification_id=qualification_id,
+    )
+
+
+def find_worker_reviews_by_status(db: LocalMephistoDB, worker_id: str, status: str) -> None:
+    """Worker reviews have no `find_*` method, query them as the review app does"""
+    with db.table_access_condition, db.get_connection() as conn:
+        conn.execute(
+            "SELECT * FROM worker_review WHERE (worker_id = ?) AND (status = ?);",
+            (int(worker_id), status),
+        ).fetchall()
+
+
+# Lookups made on hot paths of a live run or of the review app
+HOT_LOOKUPS: Dict[str, Callable[[LocalMephistoDB, Fixture], object]] = {
+    "find_units(assignment_id)": lambda db, f: db.find_units(assignment_id=f.assignment_id),
+    "find_units(task_run_id, worker_id, status)": lambda db, f: db.find_units(
+        task_run_id=f.task_run_id, worker_id=f.worker_id, status=AssignmentState.ASSIGNED
+    ),
+    "find_units(status)": lambda db, f: db.find_units(status=AssignmentState.ACCEPTED),
+    "find_agents(unit_id)": lambda db, f: db.find_agents(unit_id=f.unit_id),
+    "find_agents(worker_id, status)": lambda db, f: db.find_agents(
+        worker_id=f.worker_id, status="in task"
+    ),
+    "find_onboarding_agents(worker_id, task_run_id)": lambda db, f: db.find_onboarding_agents(
+        worker_id=f.worker_id, task_run_id=f.task_run_id
+    ),
+    "find_granted_qualifications(worker_id, qualification_id)": (
+        lambda db, f: db.find_granted_qualifications(
+            qualification_id=f.qualification_id, worker_id=f.worker_id
+        )
+    ),
+    "find_granted_qualifications(qualification_id)": (
+        lambda db, f: db.find_granted_qualifications(qualification_id=f.qualification_id)
+    ),
+    "find_task_runs(task_id, is_completed)": lambda db, f: db.find_task_runs(
+        task_id=f.task_id, is_completed=False
+    ),
+    "worker_review(worker_id, status)": lambda db, f: find_worker_reviews_by_status(
+        db, f.worker_id, "approved"
+    ),
+}
+
+
+def check_index_usage(db_path: str, fixture: Fixture) -> Dict[str, float]:
+    """
+    Run every hot lookup against the database at `db_path`, raising an
+    AssertionError naming the lookups that scan a full table. Returns the
+    time each lookup took, in milliseconds.
+    """
+    db = LocalMephistoDB(
+        db_path, args=LocalMephistoDBArgs(profile_queries=True, slow_query_threshold_ms=0)
+    )
+    log_path = os.path.join(os.path.dirname(os.path.abspath(db_path)), DEFAULT_PROFILE_LOG_NAME)
+    timings: Dict[str, float] = {}
+    full_scans: Dict[str, List[str]] = {}
+    try:
+        for name, lookup in HOT_LOOKUPS.items():
+            num_records = len(load_query_log(log_path))
+            start_time = time.monotonic()
+            lookup(db, fixture)
+            timings[name] = (time.monotonic() - start_time) * 1000
+            for record in load_query_log(log_path)[num_records:]:
+                if record["full_scans"]:
+                    full_scans[name] = full_scans.get(name, []) + record["full_scans"]
+    finally:
+        db.shutdown()
+    assert not full_scans, f"Lookups scanning full tables: {full_scans}"
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--units", type=int, default=1000000, help="Units in the test run")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    db_path = os.path.join(data_dir, "database.db")
+    try:
+        start_time = time.monotonic()
+        db = LocalMephistoDB(db_path, args=LocalMephistoDBArgs(use_wal=True))
+        fixture = build_database(db, args.units)
+        db.shutdown()
+        logger.info(
+            f"Built a database of {args.units} units in {time.monotonic() - start_time:.1f}s"
+        )
+
+        timings = check_index_usage(db_path, fixture)
+        for name, duration_ms in timings.items():
+            logger.info(f"[blue]{name:>58}[/blue]: {duration_ms:8.2f} ms")
+        logger.info("[green]Every hot lookup uses an index[/green]")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
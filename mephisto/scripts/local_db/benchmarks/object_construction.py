@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark how many data model objects are constructed per second from rows
+already read from the database, through `LocalMephistoDB` and through
+`MephistoSingletonDB` (with an empty cache, then with every object cached).
+
+To run this benchmark:
+    python -m mephisto.scripts.local_db.benchmarks.object_construction --units 50000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Any
+from typing import List
+from typing import Mapping
+from typing import Tuple
+from typing import Type
+
+from mephisto.abstractions.database import MephistoDB
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.data_model.agent import Agent
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.unit import Unit
+from mephisto.data_model.worker import Worker
+from mephisto.scripts.local_db.benchmarks.index_usage import build_database
+from mephisto.utils.console_writer import ConsoleWriter
+
+logger = ConsoleWriter()
+
+# Class, table and id column of every benchmarked kind of object
+BENCHMARKED_CLASSES: List[Tuple[Type[Any], str, str]] = [
+    (Unit, "units", "unit_id"),
+    (Assignment, "assignments", "assignment_id"),
+    (Agent, "agents", "agent_id"),
+    (Worker, "workers", "worker_id"),
+]
+
+
+def load_rows(db: LocalMephistoDB, table_name: str) -> List[Mapping[str, Any]]:
+    """Read every row of the given table"""
+    with db.read_connection() as conn:
+        return conn.execute(f"SELECT * FROM {table_name};").fetchall()
+
+
+def construct_all(
+    db: MephistoDB,
+    target_cls: Type[Any],
+    id_column: str,
+    rows: List[Mapping[str, Any]],
+) -> float:
+    """Return the objects of the given class constructed per second from the rows"""
+    start_time = time.monotonic()
+    for row in rows:
+        target_cls.get(db, row[id_column], row=row)
+    return len(rows) / (time.monotonic() - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--units", type=int, default=50000, help="Units in the test run")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    db_path = os.path.join(data_dir, "database.db")
+    try:
+        db = LocalMephistoDB(db_path)
+        build_database(db, args.units)
+        singleton_db = MephistoSingletonDB(db_path, cache_size=args.units * 2)
+
+        for target_cls, table_name, id_column in BENCHMARKED_CLASSES:
+            rows = load_rows(db, table_name)
+            local_rate = construct_all(db, target_cls, id_column, rows)
+            cold_rate = construct_all(singleton_db, target_cls, id_column, rows)
+            warm_rate = construct_all(singleton_db, target_cls, id_column, rows)
+            logger.info(
+                f"[blue]{target_cls.__name__:>10}[/blue] x{len(rows):<6} objects/s: "
+                f"local {local_rate:7.0f}, singleton {cold_rate:7.0f} (cold) "
+                f"{warm_rate:7.0f} (warm)"
+            )
+        singleton_db.shutdown()
+        db.shutdown()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
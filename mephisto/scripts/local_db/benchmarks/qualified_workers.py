@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark checking qualification requirements for every worker of a provider,
+one worker at a time with `worker_is_qualified`, compared against the bulk
+`find_qualified_workers`.
+
+To run this benchmark:
+    python -m mephisto.scripts.local_db.benchmarks.qualified_workers --workers 5000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.abstractions.providers.mock.provider_type import PROVIDER_TYPE
+from mephisto.data_model.qualification import QUAL_GREATER_EQUAL
+from mephisto.data_model.qualification import QUAL_NOT_EXIST
+from mephisto.utils.console_writer import ConsoleWriter
+from mephisto.utils.qualifications import make_qualification_dict
+from mephisto.utils.qualifications import worker_is_qualified
+
+logger = ConsoleWriter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=5000, help="Workers to check")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    db_path = os.path.join(data_dir, "database.db")
+    try:
+        db = LocalMephistoDB(db_path, args=LocalMephistoDBArgs(use_wal=True))
+        skill_id = db.make_qualification("skill")
+        blocked_id = db.make_qualification("blocked")
+        for idx in range(args.workers):
+            worker_id = db.new_worker(f"worker_{idx}", PROVIDER_TYPE)
+            db.grant_qualification(skill_id, worker_id, value=idx % 10)
+            if idx % 7 == 0:
+                db.grant_qualification(blocked_id, worker_id)
+        qualifications = [
+            make_qualification_dict("skill", QUAL_GREATER_EQUAL, 5),
+            make_qualification_dict("blocked", QUAL_NOT_EXIST, None),
+        ]
+
+        start_time = time.monotonic()
+        workers = db.find_workers(provider_type=PROVIDER_TYPE)
+        num_qualified = len([w for w in workers if worker_is_qualified(w, qualifications)])
+        duration = time.monotonic() - start_time
+        logger.info(
+            f"[blue]{'worker_is_qualified':>22}[/blue]: "
+            f"{num_qualified} qualified in {duration:6.2f}s"
+        )
+
+        start_time = time.monotonic()
+        num_qualified = len(db.find_qualified_workers(qualifications, provider_type=PROVIDER_TYPE))
+        duration = time.monotonic() - start_time
+        logger.info(
+            f"[blue]{'find_qualified_workers':>22}[/blue]: "
+            f"{num_qualified} qualified in {duration:6.2f}s"
+        )
+        db.shutdown()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark loading every unit of a large task run as full `Unit` objects with
+`find_units`, compared against lightweight records with `select_units`.
+
+To run this benchmark:
+    python -m mephisto.scripts.local_db.benchmarks.select_records --units 500000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.scripts.local_db.benchmarks.index_usage import build_database
+from mephisto.utils.console_writer import ConsoleWriter
+
+logger = ConsoleWriter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--units", type=int, default=500000, help="Units in the test run")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp()
+    db_path = os.path.join(data_dir, "database.db")
+    try:
+        db = LocalMephistoDB(db_path, args=LocalMephistoDBArgs(use_wal=True))
+        fixture = build_database(db, args.units)
+
+        for name, select in [
+            ("find_units", db.find_units),
+            ("select_units", db.select_units),
+        ]:
+            start_time = time.monotonic()
+            num_units = len(select(task_run_id=fixture.task_run_id))
+            duration = time.monotonic() - start_time
+            logger.info(f"[blue]{name:>14}[/blue]: {num_units} units in {duration:6.2f}s")
+
+        start_time = time.monotonic()
+        records = db.select_units(task_run_id=fixture.task_run_id)
+        for record in records[:1000]:
+            record.hydrate(db)
+        duration = time.monotonic() - start_time
+        logger.info(
+            f"[blue]{'select+hydrate':>14}[/blue]: 1000 of {len(records)} units in {duration:6.2f}s"
+        )
+        db.shutdown()
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
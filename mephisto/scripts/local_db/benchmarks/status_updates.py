@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmark status update throughput of a LocalMephistoDB with several writer
+threads, comparing the default mode (one transaction per update) against
+group commit.
+
+To run this benchmark:
+    python -m mephisto.scripts.local_db.benchmarks.status_updates --writers 8
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from typing import List
+
+from mephisto.abstractions.databases.local_database import DEFAULT_GROUP_COMMIT_INTERVAL_MS
+from mephisto.abstractions.databases.local_database import DEFAULT_GROUP_COMMIT_MAX_WRITES
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.scripts.local_db.benchmarks.utils import populate_units
+from mephisto.utils.console_writer import ConsoleWriter
+
+logger = ConsoleWriter()
+
+
+def run_benchmark(
+    group_commit: bool,
+    num_writers: int,
+    num_assignments: int,
+    duration: float,
+    interval_ms: int,
+    max_writes: int,
+) -> float:
+    """Run the status update load against a fresh database, returning updates/sec"""
+    data_dir = tempfile.mkdtemp()
+    db = LocalMephistoDB(
+        os.path.join(data_dir, "database.db"),
+        args=LocalMephistoDBArgs(
+            group_commit=group_commit,
+            group_commit_interval_ms=interval_ms,
+            group_commit_max_writes=max_writes,
+        ),
+    )
+    try:
+        _, unit_ids = populate_units(db, num_assignments)
+        stop_event = threading.Event()
+        write_counts: List[int] = [0] * num_writers
+
+        def write_loop(writer_idx: int) -> None:
+            # Flip this writer's units between LAUNCHED and ASSIGNED, reading
+            # each update back
+            own_unit_ids = unit_ids[writer_idx::num_writers]
+            while not stop_event.is_set():
+                unit_id = random.choice(own_unit_ids)
+                db.update_unit(unit_id, status=AssignmentState.LAUNCHED)
+                db.update_unit(unit_id, status=AssignmentState.ASSIGNED)
+                assert db.get_unit(unit_id)["status"] == AssignmentState.ASSIGNED
+                write_counts[writer_idx] += 2
+
+        threads = [threading.Thread(target=write_loop, args=(i,)) for i in range(num_writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+        return sum(write_counts) / duration
+    finally:
+        db.shutdown()
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads")
+    parser.add_argument("--assignments", type=int, default=2000, help="Units in the test run")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per mode")
+    parser.add_argument(
+        "--interval-ms",
+        type=int,
+        default=DEFAULT_GROUP_COMMIT_INTERVAL_MS,
+        help="Group commit flush interval",
+    )
+    parser.add_argument(
+        "--max-writes",
+        type=int,
+        default=DEFAULT_GROUP_COMMIT_MAX_WRITES,
+        help="Queued updates that trigger an early group commit",
+    )
+    args = parser.parse_args()
+
+    for group_commit in [False, True]:
+        mode = "group" if group_commit else "default"
+        updates_per_sec = run_benchmark(
+            group_commit,
+            args.writers,
+            args.assignments,
+            args.duration,
+            args.interval_ms,
+            args.max_writes,
+        )
+        logger.info(
+            f"[blue]{mode:>8}[/blue]: {updates_per_sec:10.1f} updates/sec "
+            f"({args.writers} writers)"
+        )
+
+
+if __name__ == "__main__":
+    main()
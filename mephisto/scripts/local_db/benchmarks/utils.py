@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import time
+from typing import Callable
+from typing import List
+from typing import Tuple
+
+from mephisto.abstractions.database import MephistoDB
+from mephisto.data_model.task_run import TaskRun
+from mephisto.utils.testing import get_test_task_run
+
+
+def populate_units(
+    db: MephistoDB,
+    num_assignments: int,
+    units_per_assignment: int = 1,
+) -> Tuple[str, List[str]]:
+    """
+    Create a mock task run with the given number of assignments and units,
+    returning the task run id and the ids of all created units
+    """
+    task_run_id = get_test_task_run(db)
+    task_run = TaskRun.get(db, task_run_id)
+    unit_ids = []
+    for _ in range(num_assignments):
+        assignment_id = db.new_assignment(
+            task_run.task_id,
+            task_run.db_id,
+            task_run.requester_id,
+            task_run.task_type,
+            task_run.provider_type,
+            task_run.sandbox,
+        )
+        for unit_index in range(units_per_assignment):
+            unit_ids.append(
+                db.new_unit(
+                    task_run.task_id,
+                    task_run.db_id,
+                    task_run.requester_id,
+                    assignment_id,
+                    unit_index,
+                    1.0,
+                    task_run.provider_type,
+                    task_run.task_type,
+                    task_run.sandbox,
+                )
+            )
+    return task_run_id, unit_ids
+
+
+def time_calls(fn: Callable[[], object], num_calls: int) -> float:
+    """Return the number of calls per second achieved calling `fn` `num_calls` times"""
+    start_time = time.monotonic()
+    for _ in range(num_calls):
+        fn()
+    return num_calls / (time.monotonic() - start_time)
@@ -19,7 +19,10 @@ from mephisto.data_model.worker import Worker
 class DataBrowser:
     """
     Class with convenience methods for getting completed data
-    back from runs to parse and manage with other scripts
+    back from runs to parse and manage with other scripts.
+
+    The database must be writable, as `Unit.get_status` records the statuses
+    it computes from agents and crowd providers.
     """
 
     def __init__(self, db=None):
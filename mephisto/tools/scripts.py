@@ -11,6 +11,7 @@ Utilities that are useful for Mephisto-related scripts.
 import functools
 import os
 import subprocess
+from dataclasses import fields
 from typing import Any
 from typing import Callable
 from typing import cast
@@ -28,7 +29,11 @@ from rich import print
 from rich.markdown import Markdown
 
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import AgentDataArgs
+from mephisto.abstractions.databases.local_database_args import ArchiveArgs
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
 from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.abstractions.databases.object_cache import DEFAULT_OBJECT_CACHE_SIZE
 from mephisto.abstractions.providers.mturk.mturk_utils import try_prerun_cleanup
 from mephisto.operations.hydra_config import build_default_task_config
 from mephisto.operations.hydra_config import register_script_config
@@ -136,15 +141,25 @@ def get_db_from_config(cfg: DictConfig) -> "MephistoDB":
 
     database_path = os.path.join(datapath, "database.db")
 
-    database_type = cfg.mephisto.database._database_type
+    # Database args extend the LocalMephistoDB ones, see DatabaseArgs
+    database_args = cfg.mephisto.database
+    database_type = database_args["_database_type"]
+    arg_names = [f.name for f in fields(LocalMephistoDBArgs)]
+    db_args = LocalMephistoDBArgs(**{k: v for k, v in database_args.items() if k in arg_names})
 
+    db: LocalMephistoDB
     if database_type == "local":
-        return LocalMephistoDB(database_path=database_path)
+        db = LocalMephistoDB(database_path=database_path, args=db_args)
     elif database_type == "singleton":
-        return MephistoSingletonDB(database_path=database_path)
+        cache_size = database_args.get("singleton_cache_size", DEFAULT_OBJECT_CACHE_SIZE)
+        db = MephistoSingletonDB(database_path=database_path, args=db_args, cache_size=cache_size)
     else:
         raise AssertionError(f"Provided database_type {database_type} is not valid")
 
+    db.configure_agent_data(AgentDataArgs(**database_args.get("agent_data", {})))
+    db.configure_archives(ArchiveArgs(**database_args.get("archives", {})))
+    return db
+
 
 def augment_config_from_db(script_cfg: DictConfig, db: "MephistoDB") -> DictConfig:
     """
@@ -7,10 +7,12 @@
 import json
 
 import random
+from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime
 from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Type
@@ -53,6 +55,32 @@ class EntryDoesNotExistException(MephistoDBException):
 # --- Functions ---
 
 
+@contextmanager
+def _read_connection(db: "MephistoDB") -> Iterator:
+    """
+    Provide a connection for a read-only query, that sees the task runs archived
+    into shards for databases that have them
+    """
+    if hasattr(db, "read_connection"):
+        with db.read_connection() as conn:
+            yield conn
+    else:
+        with db.table_access_condition, db.get_connection() as conn:
+            yield conn
+
+
+def _check_no_archive_shards(db: "MephistoDB") -> None:
+    """Refuse to delete exported data while some of it is archived into shards"""
+    from mephisto.abstractions.databases.archive_shards import find_archive_shards
+
+    db_path = getattr(db, "db_path", None)
+    if db_path is not None and len(find_archive_shards(db_path)) > 0:
+        raise MephistoDBException(
+            f"Can't delete data from {db_path} while it has archived task runs, "
+            f"which would be left behind. Remove its archive shards first."
+        )
+
+
 def _select_rows_from_table_related_to_task(
     db: "MephistoDB",
     table_name: str,
@@ -100,7 +128,7 @@ def make_randomized_int_id() -> int:
 
 
 def get_task_ids_by_task_names(db: "MephistoDB", task_names: List[str]) -> List[str]:
-    with db.table_access_condition, db.get_connection() as conn:
+    with _read_connection(db) as conn:
         c = conn.cursor()
         task_names_string = ",".join([f"'{s}'" for s in task_names])
         c.execute(
@@ -114,7 +142,7 @@ def get_task_ids_by_task_names(db: "MephistoDB", task_names: List[str]) -> List[
 
 
 def get_task_run_ids_by_task_ids(db: "MephistoDB", task_ids: List[str]) -> List[str]:
-    with db.table_access_condition, db.get_connection() as conn:
+    with _read_connection(db) as conn:
         c = conn.cursor()
         task_ids_string = ",".join([f"'{s}'" for s in task_ids])
         c.execute(
@@ -128,7 +156,7 @@ def get_task_run_ids_by_task_ids(db: "MephistoDB", task_ids: List[str]) -> List[
 
 
 def get_task_run_ids_by_labels(db: "MephistoDB", labels: List[str]) -> List[str]:
-    with db.table_access_condition, db.get_connection() as conn:
+    with _read_connection(db) as conn:
         if not labels:
             return []
 
@@ -172,7 +200,7 @@ def select_all_table_rows(
     order_by: Optional[str] = None,
 ) -> List[dict]:
     order_by_string = f" ORDER BY {order_by}" if order_by else ""
-    with db.table_access_condition, db.get_connection() as conn:
+    with _read_connection(db) as conn:
         c = conn.cursor()
         c.execute(f"SELECT * FROM {table_name}{order_by_string};")
         rows = c.fetchall()
@@ -197,7 +225,7 @@ def select_rows_by_list_of_field_values(
     And in this case we will select all Granted Qualifications,
     if we have rows in DB with two Qualification IDs _AND_ one Worder ID
     """
-    with db.table_access_condition, db.get_connection() as conn:
+    with _read_connection(db) as conn:
         c = conn.cursor()
 
         # Combine WHERE statement
@@ -239,6 +267,8 @@ def delete_exported_data_without_fk_constraints(
 ):
     table_names_can_be_cleaned = table_names_can_be_cleaned or []
 
+    _check_no_archive_shards(db)
+
     with db.table_access_condition, db.get_connection() as conn:
         c = conn.cursor()
         c.execute("PRAGMA foreign_keys = off;")
@@ -261,10 +291,12 @@ def delete_exported_data_without_fk_constraints(
 
 def delete_entire_exported_data(db: "MephistoDB"):
     """Delete all rows in tables without dropping tables"""
-    exclude_table_names = ["migrations"]
+    exclude_table_names = ["migrations", "unit_writes"]
     table_names = get_list_of_db_table_names(db)
     table_names = [tn for tn in table_names if tn not in exclude_table_names]
 
+    _check_no_archive_shards(db)
+
     with db.table_access_condition, db.get_connection() as conn:
         c = conn.cursor()
         c.execute("PRAGMA foreign_keys = off;")
@@ -282,7 +314,7 @@ def delete_entire_exported_data(db: "MephistoDB"):
 
 
 def get_list_of_provider_types(db: "MephistoDB") -> List[str]:
-    with db.table_access_condition, db.get_connection() as conn:
+    with _read_connection(db) as conn:
         c = conn.cursor()
         c.execute("SELECT provider_type FROM requesters;")
         rows = c.fetchall()
@@ -294,7 +326,7 @@ def get_latest_row_from_table(
     table_name: str,
     order_by: Optional[str] = "creation_date",
 ) -> Optional[dict]:
-    with db.table_access_condition, db.get_connection() as conn:
+    with _read_connection(db) as conn:
         c = conn.cursor()
         c.execute(
             f"""
@@ -360,14 +392,17 @@ def get_list_of_tables_to_export(db: "MephistoDB") -> List[str]:
 
     filtered_table_names = []
     for table_name in table_names:
-        if not table_name.startswith("sqlite_") and table_name not in ["migrations"]:
+        if not table_name.startswith("sqlite_") and table_name not in [
+            "migrations",
+            "unit_writes",
+        ]:
             filtered_table_names.append(table_name)
 
     return filtered_table_names
 
 
 def get_list_of_available_labels(db: "MephistoDB") -> List[str]:
-    with db.table_access_condition, db.get_connection() as conn:
+    with _read_connection(db) as conn:
         c = conn.cursor()
         c.execute("SELECT data_labels FROM imported_data;")
         rows = c.fetchall()
@@ -389,7 +424,7 @@ def check_if_row_with_params_exists(
     """
     Check if row exists in `table_name` for passed dict of `params`
     """
-    with db.table_access_condition, db.get_connection() as conn:
+    with _read_connection(db) as conn:
         c = conn.cursor()
 
         where_args = []
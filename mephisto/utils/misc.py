@@ -6,10 +6,23 @@
 
 from datetime import datetime
 from typing import Any
+from typing import Optional
 
 from dateutil.parser import parse as dateutil_parse
 
 
+def parse_db_date(value: str) -> Optional[datetime]:
+    """
+    Parse a date stored in the database. SQLite's `CURRENT_TIMESTAMP` format is
+    parsed directly, as this runs for every data model object constructed, and
+    anything else falls back to dateutil.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return dateutil_parse(value)
+
+
 def serialize_date_to_python(value: Any) -> datetime:
     """Convert string dates or integer timestamps into Python datetime format"""
     # If integer timestamp
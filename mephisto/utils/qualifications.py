@@ -28,6 +28,21 @@ QualificationType = Dict[str, Any]
 logger = get_logger(name=__name__)
 
 
+def requirement_is_met(
+    qualification: QualificationType, is_granted: bool, granted_value: Optional[int] = None
+) -> bool:
+    """
+    Return whether a worker meets the given qualification requirement, given
+    whether they were granted the qualification and the value it was granted with
+    """
+    comp = qualification["comparator"]
+    if comp == QUAL_EXISTS:
+        return is_granted
+    elif comp == QUAL_NOT_EXIST:
+        return not is_granted
+    return is_granted and COMPARATOR_OPERATIONS[comp](granted_value, qualification["value"])
+
+
 def worker_is_qualified(worker: "Worker", qualifications: List[QualificationType]):
     db = worker.db
     for qualification in qualifications:
@@ -42,20 +57,9 @@ def worker_is_qualified(worker: "Worker", qualifications: List[QualificationType
         granted_quals = db.check_granted_qualifications(
             qualification_id=qual_obj.db_id, worker_id=worker.db_id
         )
-        comp = qualification["comparator"]
-        compare_value = qualification["value"]
-        if comp == QUAL_EXISTS and not granted_quals:
-            return False
-        elif comp == QUAL_NOT_EXIST and granted_quals:
+        granted_value = granted_quals[0].value if granted_quals else None
+        if not requirement_is_met(qualification, len(granted_quals) > 0, granted_value):
             return False
-        elif comp in [QUAL_EXISTS, QUAL_NOT_EXIST]:
-            continue
-        else:
-            if not granted_quals:
-                return False
-            granted_qual = granted_quals[0]
-            if not COMPARATOR_OPERATIONS[comp](granted_qual.value, compare_value):
-                return False
     return True
 
 
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from mephisto.abstractions._subcomponents.agent_state import AgentState
+from mephisto.abstractions._subcomponents.agent_state_journal import JOURNAL_FILE
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.data_model.agent import Agent
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.task_run import TaskRun
+from mephisto.utils.testing import get_test_agent
+from mephisto.utils.testing import get_test_assignment
+from mephisto.utils.testing import get_test_requester
+from mephisto.utils.testing import get_test_task
+from mephisto.utils.testing import get_test_unit
+
+
+class TestAgentStateJournal(unittest.TestCase):
+    """
+    Unit testing for the journaled mode of ParlAIChatAgentState and
+    RemoteProcedureAgentState
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(self.database_path)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def get_agent(self, task_type: str, journal: bool = True) -> Agent:
+        """Return a new agent of a task run of the given type"""
+        _, task_id = get_test_task(self.db)
+        _, requester_id = get_test_requester(self.db)
+        params = json.dumps({"blueprint": {"journal_agent_state": journal}})
+        task_run_id = self.db.new_task_run(task_id, requester_id, params, "mock", task_type)
+        assignment_id = get_test_assignment(self.db, TaskRun.get(self.db, task_run_id))
+        unit_id = get_test_unit(self.db, assignment=Assignment.get(self.db, assignment_id))
+        return Agent.get(self.db, get_test_agent(self.db, unit_id=unit_id))
+
+    def reload_state(self, agent: Agent) -> AgentState:
+        """Return the state of the given agent, as loaded from scratch"""
+        return AgentState(Agent.get(self.db, agent.db_id))
+
+    def test_parlai_chat_journal(self) -> None:
+        agent = self.get_agent("parlai_chat")
+        state = agent.state
+        state.set_init_state({"persona": "test"})
+        state_path = os.path.join(agent.get_data_dir(), "state.json")
+        journal_path = os.path.join(agent.get_data_dir(), JOURNAL_FILE)
+        snapshot = self.db.read_text(state_path)
+
+        for idx in range(5):
+            state.update_data({"text": f"message {idx}", "task_data": {}})
+        # Messages are only appended to the journal, one line each
+        self.assertEqual(self.db.read_text(state_path), snapshot)
+        with open(journal_path) as journal_file:
+            self.assertEqual(len(journal_file.readlines()), 5)
+
+        # Loading replays the journal, without compacting it while the agent is live
+        reloaded_state = self.reload_state(agent)
+        self.assertEqual(reloaded_state.get_data(), state.get_data())
+        self.assertTrue(os.path.exists(journal_path))
+
+        # Submitting compacts the journal into the snapshot
+        state.update_submit({"done": True})
+        self.assertFalse(os.path.exists(journal_path))
+        self.assertEqual(self.reload_state(agent).get_data(), state.get_data())
+
+    def test_crash_recovery(self) -> None:
+        agent = self.get_agent("parlai_chat")
+        state = agent.state
+        state.set_init_state({"persona": "test"})
+        for idx in range(3):
+            state.update_data({"text": f"message {idx}", "task_data": {}})
+        expected_data = state.get_data()
+
+        # A record cut short by a crash is ignored
+        journal_path = os.path.join(agent.get_data_dir(), JOURNAL_FILE)
+        with open(journal_path, "a") as journal_file:
+            journal_file.write('{"index": 3, "mess')
+        self.assertEqual(self.reload_state(agent).get_data(), expected_data)
+
+        # A crash between writing a snapshot and removing the journal doesn't
+        # duplicate the messages that are in both
+        with open(journal_path, "rb") as journal_file:
+            journal = journal_file.read()
+        state.save_data()
+        with open(journal_path, "wb") as journal_file:
+            journal_file.write(journal)
+        self.assertEqual(self.reload_state(agent).get_data(), expected_data)
+
+        # Loading the state of a done agent doesn't write, even to compact the journal
+        agent.update_status(AgentState.STATUS_DISCONNECT)
+        read_db = LocalMephistoDB(self.database_path, args=LocalMephistoDBArgs(read_only=True))
+        self.assertEqual(AgentState(Agent.get(read_db, agent.db_id)).get_data(), expected_data)
+        read_db.shutdown()
+        self.assertTrue(os.path.exists(journal_path))
+
+    def test_records_appended_after_crash(self) -> None:
+        agent = self.get_agent("parlai_chat")
+        state = agent.state
+        state.set_init_state({"persona": "test"})
+        state.update_data({"text": "message 0", "task_data": {}})
+
+        # Records appended after one that was cut short are still replayed
+        journal_path = os.path.join(agent.get_data_dir(), JOURNAL_FILE)
+        with open(journal_path, "a") as journal_file:
+            journal_file.write('{"index": 1, "mess')
+        for idx in range(1, 3):
+            state.update_data({"text": f"message {idx}", "task_data": {}})
+        self.assertEqual(self.reload_state(agent).get_data(), state.get_data())
+
+    def test_journal_disabled(self) -> None:
+        agent = self.get_agent("parlai_chat", journal=False)
+        agent.state.set_init_state({"persona": "test"})
+        agent.state.update_data({"text": "message", "task_data": {}})
+        self.assertFalse(os.path.exists(os.path.join(agent.get_data_dir(), JOURNAL_FILE)))
+        self.assertEqual(len(self.reload_state(agent).messages), 1)
+
+    def test_remote_procedure_journal(self) -> None:
+        agent = self.get_agent("remote_procedure")
+        state = agent.state
+        state.set_init_state({"task": "test"})
+        state.update_data({"request_id": "1", "target": "query", "args": "{}"})
+        state.update_data({"handles": "1", "response": '{"answer": 42}'})
+
+        reloaded_state = self.reload_state(agent)
+        self.assertEqual(reloaded_state.get_data(), state.get_data())
+        self.assertEqual(len(reloaded_state.requests), 2)
+
+        state.update_submit({"done": True})
+        self.assertFalse(os.path.exists(os.path.join(agent.get_data_dir(), JOURNAL_FILE)))
+        self.assertEqual(self.reload_state(agent).get_data(), state.get_data())
+
+
+if __name__ == "__main__":
+    unittest.main()
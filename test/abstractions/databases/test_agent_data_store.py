@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mephisto.abstractions.databases.agent_data_store import compress_agent_data
+from mephisto.abstractions.databases.agent_data_store import compress_agent_data_files
+from mephisto.abstractions.databases.agent_data_store import compress_packed_run
+from mephisto.abstractions.databases.agent_data_store import decompress_agent_data
+from mephisto.abstractions.databases.agent_data_store import GZIP_MAGIC
+from mephisto.abstractions.databases.agent_data_store import pack_run_dir
+from mephisto.abstractions.databases.agent_data_store import PACKED_AGENT_DATA_FILE
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import AgentDataArgs
+from mephisto.data_model.task_run import TaskRun
+from mephisto.utils.testing import get_test_task_run
+
+
+class TestAgentDataStore(unittest.TestCase):
+    """
+    Unit testing for the agent data backends of LocalMephistoDB
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(self.database_path)
+        self.run_dir = TaskRun.get(self.db, get_test_task_run(self.db)).get_run_dir()
+        self.state_key = os.path.join(self.run_dir, "1", "2", "state.json")
+        self.metadata_key = os.path.join(self.run_dir, "1", "2", "agent_meta.json")
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def reopen_db(self, agent_data_backend: str) -> None:
+        self.db.shutdown()
+        self.db = LocalMephistoDB(self.database_path)
+        self.db.configure_agent_data(AgentDataArgs(backend=agent_data_backend))
+
+    def test_files_backend_writes_files(self) -> None:
+        self.db.write_dict(self.state_key, {"messages": [1, 2]})
+        self.assertTrue(os.path.isfile(self.state_key))
+        self.assertEqual(self.db.read_dict(self.state_key), {"messages": [1, 2]})
+        self.assertFalse(os.path.exists(os.path.join(self.run_dir, PACKED_AGENT_DATA_FILE)))
+
+    def test_sqlite_backend_packs_new_runs(self) -> None:
+        self.reopen_db("sqlite")
+        self.assertFalse(self.db.key_exists(self.state_key))
+        self.db.write_dict(self.state_key, {"messages": [1, 2]})
+        self.db.write_text(self.metadata_key, "{}")
+        self.assertFalse(os.path.exists(self.state_key))
+        self.assertTrue(os.path.isfile(os.path.join(self.run_dir, PACKED_AGENT_DATA_FILE)))
+        self.assertTrue(self.db.key_exists(self.state_key))
+        self.assertEqual(self.db.read_dict(self.state_key), {"messages": [1, 2]})
+        self.assertEqual(self.db.read_text(self.metadata_key), "{}")
+
+        # Data outside of run dirs is still stored as files
+        other_key = os.path.join(self.db.db_root, "other", "data.json")
+        self.db.write_dict(other_key, {"other": True})
+        self.assertTrue(os.path.isfile(other_key))
+
+    def test_pack_run_dir(self) -> None:
+        self.db.write_dict(self.state_key, {"messages": [1, 2]})
+        self.db.write_dict(self.metadata_key, {"task_start": 1})
+        assignment_data_path = os.path.join(self.run_dir, "1", "assign_data.json")
+        with open(assignment_data_path, "w") as assignment_data_file:
+            assignment_data_file.write("{}")
+
+        self.assertEqual(pack_run_dir(self.run_dir), 2)
+        self.assertFalse(os.path.exists(os.path.dirname(self.state_key)))
+        self.assertTrue(os.path.isfile(assignment_data_path))
+
+        # Packed runs are read and updated whichever backend is in use
+        for backend in ["files", "sqlite"]:
+            self.reopen_db(backend)
+            self.assertEqual(self.db.read_dict(self.state_key), {"messages": [1, 2]})
+            self.db.write_dict(self.metadata_key, {"task_start": backend})
+            self.assertEqual(self.db.read_dict(self.metadata_key), {"task_start": backend})
+            self.assertFalse(os.path.exists(self.metadata_key))
+
+    def test_compress_agent_data(self) -> None:
+        small_data = b'{"messages": []}'
+        large_data = b'{"messages": [' + b'"hello", ' * 1000 + b'"bye"]}'
+        self.assertIs(compress_agent_data(small_data, 4096), small_data)
+        compressed_data = compress_agent_data(large_data, 4096)
+        self.assertTrue(compressed_data.startswith(GZIP_MAGIC))
+        self.assertLess(len(compressed_data), len(large_data))
+        # Compressed data isn't compressed twice, and plain data is read as is
+        self.assertIs(compress_agent_data(compressed_data, 0), compressed_data)
+        self.assertEqual(decompress_agent_data(compressed_data), large_data)
+        self.assertIs(decompress_agent_data(small_data), small_data)
+
+    def test_compressed_agent_data(self) -> None:
+        state = {"messages": ["hello"] * 1000}
+        self.db.shutdown()
+        self.db = LocalMephistoDB(self.database_path)
+        self.db.configure_agent_data(AgentDataArgs(compression=True))
+        self.db.write_dict(self.state_key, state)
+        self.db.write_dict(self.metadata_key, {"task_start": 1})
+        with open(self.state_key, "rb") as state_file:
+            self.assertTrue(state_file.read().startswith(GZIP_MAGIC))
+        with open(self.metadata_key, "rb") as metadata_file:
+            self.assertFalse(metadata_file.read().startswith(GZIP_MAGIC))
+
+        # Compressed data is read transparently, whether or not compression is enabled
+        self.assertEqual(self.db.read_dict(self.state_key), state)
+        for backend in ["files", "sqlite"]:
+            self.reopen_db(backend)
+            self.assertEqual(self.db.read_dict(self.state_key), state)
+            self.assertEqual(self.db.read_dict(self.metadata_key), {"task_start": 1})
+
+    def test_compress_existing_data(self) -> None:
+        state = {"messages": ["hello"] * 1000}
+        self.db.write_dict(self.state_key, state)
+        self.db.write_dict(self.metadata_key, {"task_start": 1})
+        paths = [self.state_key, self.metadata_key]
+        size_before, size_after = compress_agent_data_files(paths, 4096)
+        self.assertEqual(size_before, sum(len(self.db.read_text(p)) for p in paths))
+        self.assertLess(size_after, size_before)
+        self.assertEqual(self.db.read_dict(self.state_key), state)
+        self.assertEqual(compress_agent_data_files(paths, 4096), (size_after, size_after))
+
+        other_key = os.path.join(self.run_dir, "3", "4", "state.json")
+        self.db.write_dict(other_key, state)
+        pack_run_dir(self.run_dir)
+        size_before, size_after = compress_packed_run(self.run_dir, 4096)
+        self.assertLess(size_after, size_before)
+        self.assertEqual(self.db.read_dict(self.state_key), state)
+        self.assertEqual(self.db.read_dict(other_key), state)
+        self.assertEqual(self.db.read_dict(self.metadata_key), {"task_start": 1})
+
+    def test_invalid_backend(self) -> None:
+        with self.assertRaises(AssertionError):
+            self.reopen_db("nonexistent")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+from mephisto.abstractions.databases.archive_shards import find_archive_shards
+from mephisto.abstractions.databases.archive_shards import get_shard_name
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import ArchiveArgs
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.unit import Unit
+from mephisto.utils.testing import get_test_agent
+from mephisto.utils.testing import get_test_assignment
+from mephisto.utils.testing import get_test_requester
+from mephisto.utils.testing import get_test_task
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_unit
+from mephisto.utils.db import MephistoDBException
+from mephisto.utils.db import delete_entire_exported_data
+from mephisto.utils.db import select_all_table_rows
+from mephisto.utils.testing import get_test_worker
+
+
+class TestArchiveShards(unittest.TestCase):
+    """
+    Unit testing for the archival of finished task runs into shard databases
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(self.database_path)
+        _, self.worker_id = get_test_worker(self.db)
+        _, self.task_id = get_test_task(self.db)
+        _, self.requester_id = get_test_requester(self.db)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def make_task_run(self, creation_date: str, unit_status: str, is_completed: bool) -> str:
+        """Return a task run created on the given date, with a reviewed unit"""
+        task_run_id = get_test_task_run(self.db, self.task_id, self.requester_id)
+        assignment_id = get_test_assignment(self.db, TaskRun.get(self.db, task_run_id))
+        unit_id = get_test_unit(self.db, assignment=Assignment.get(self.db, assignment_id))
+        get_test_agent(self.db, unit_id=unit_id, worker_id=self.worker_id)
+        self.db.update_unit(unit_id, status=unit_status)
+        self.db.update_task_run(task_run_id, is_completed=is_completed)
+        unit = Unit.get(self.db, unit_id)
+        self.db.new_worker_review(
+            self.worker_id, status=unit_status, task_id=unit.task_id, unit_id=unit_id
+        )
+        with self.db.table_access_condition, self.db.get_connection() as conn:
+            conn.execute(
+                "UPDATE task_runs SET creation_date = ? WHERE task_run_id = ?;",
+                (creation_date, int(task_run_id)),
+            )
+        return task_run_id
+
+    def count_rows(self, path: str, table_name: str, task_run_id: str) -> int:
+        """Return the rows of the given task run in the given database file"""
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute(
+                f"SELECT COUNT(*) FROM {table_name} WHERE task_run_id = ?;", (int(task_run_id),)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_shard_names(self) -> None:
+        self.assertEqual(get_shard_name("2024-05-03 10:00:00", "year"), "2024")
+        self.assertEqual(get_shard_name("2024-05-03 10:00:00", "quarter"), "2024-Q2")
+        self.assertEqual(get_shard_name("2024-05-03 10:00:00", "month"), "2024-05")
+
+    def test_archive_and_read(self) -> None:
+        db = self.db
+        old_run_id = self.make_task_run("2023-02-01 00:00:00", AssignmentState.ACCEPTED, True)
+        older_run_id = self.make_task_run("2022-02-01 00:00:00", AssignmentState.REJECTED, True)
+        # Still awaiting review, and still running
+        pending_run_id = self.make_task_run("2023-03-01 00:00:00", AssignmentState.COMPLETED, True)
+        live_run_id = self.make_task_run("2023-03-01 00:00:00", AssignmentState.ACCEPTED, False)
+        units_before = {u.db_id: u.db_status for u in db.find_units()}
+
+        archived = db.archive_task_runs(date(2024, 1, 1), period="year")
+        self.assertEqual(archived, {"2022": [older_run_id], "2023": [old_run_id]})
+        shard_paths = find_archive_shards(self.database_path)
+        self.assertEqual([os.path.basename(p) for p in shard_paths], ["2022.db", "2023.db"])
+
+        # Rows were moved out of the main database
+        for table_name in ["task_runs", "assignments", "units", "agents"]:
+            self.assertEqual(self.count_rows(self.database_path, table_name, old_run_id), 0)
+            self.assertEqual(self.count_rows(shard_paths[1], table_name, old_run_id), 1)
+            self.assertEqual(self.count_rows(self.database_path, table_name, live_run_id), 1)
+
+        # Reads see them transparently
+        self.assertEqual({u.db_id: u.db_status for u in db.find_units()}, units_before)
+        archived_units = db.find_units(task_run_id=old_run_id)
+        self.assertEqual(len(archived_units), 1)
+        self.assertIsNotNone(archived_units[0].get_assigned_agent())
+        self.assertTrue(TaskRun.get(db, older_run_id).get_is_completed())
+        with db.read_connection() as conn:
+            reviews = conn.execute(
+                "SELECT * FROM worker_review WHERE unit_id = ?;",
+                (int(archived_units[0].db_id),),
+            ).fetchall()
+        self.assertEqual(len(reviews), 1)
+
+        # Writes to live runs are unaffected, and archiving again is a no-op
+        db.update_unit(db.find_units(task_run_id=live_run_id)[0].db_id, status="expired")
+        self.assertEqual(db.archive_task_runs(date(2024, 1, 1)), {})
+        self.assertEqual(len(db.find_units(task_run_id=pending_run_id)), 1)
+
+        # Other database objects attach the shards too, unless told not to
+        other_db = LocalMephistoDB(self.database_path, args=LocalMephistoDBArgs(use_wal=True))
+        self.assertEqual(len(other_db.find_units()), 4)
+        other_db.shutdown()
+        hot_db = LocalMephistoDB(self.database_path)
+        hot_db.configure_archives(ArchiveArgs(attach=False))
+        self.assertEqual(len(hot_db.find_units()), 2)
+        hot_db.shutdown()
+
+    def test_archive_selected_runs(self) -> None:
+        run_ids = [
+            self.make_task_run("2023-02-01 00:00:00", AssignmentState.ACCEPTED, True)
+            for _ in range(2)
+        ]
+        archived = self.db.archive_task_runs(date(2024, 1, 1), "month", task_run_ids=run_ids[:1])
+        self.assertEqual(archived, {"2023-02": run_ids[:1]})
+        self.assertEqual(self.count_rows(self.database_path, "units", run_ids[1]), 1)
+        self.assertEqual(len(self.db.find_task_runs()), 2)
+
+    def test_archived_runs_seen_by_other_processes(self) -> None:
+        """Ensure a database sees task runs archived after it opened its readers"""
+        run_id = self.make_task_run("2023-02-01 00:00:00", AssignmentState.ACCEPTED, True)
+        other_db = LocalMephistoDB(self.database_path)
+        try:
+            self.assertEqual(len(other_db.find_units(task_run_id=run_id)), 1)
+            self.db.archive_task_runs(date(2024, 1, 1))
+            self.assertEqual(len(other_db.find_units(task_run_id=run_id)), 1)
+            rows = select_all_table_rows(other_db, "task_runs")
+            self.assertEqual([r["task_run_id"] for r in rows], [run_id])
+        finally:
+            other_db.shutdown()
+
+    def test_archived_runs_are_read_only(self) -> None:
+        """Ensure writes to archived rows and deletes of exported data fail loudly"""
+        run_id = self.make_task_run("2023-02-01 00:00:00", AssignmentState.ACCEPTED, True)
+        unit_id = self.db.find_units(task_run_id=run_id)[0].db_id
+        self.db.archive_task_runs(date(2024, 1, 1))
+
+        with self.assertRaises(MephistoDBException):
+            self.db.update_unit(unit_id, status=AssignmentState.EXPIRED)
+        with self.assertRaises(MephistoDBException):
+            self.db.update_task_run(run_id, is_completed=False)
+        with self.assertRaises(MephistoDBException):
+            delete_entire_exported_data(self.db)
+        self.assertEqual(
+            self.db.find_units(task_run_id=run_id)[0].db_status, AssignmentState.ACCEPTED
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.unit import Unit
+from mephisto.utils.testing import get_test_unit
+from mephisto.utils.testing import get_test_worker
+
+
+class TestAsyncMephistoDB(unittest.TestCase):
+    """
+    Unit testing for the awaitable `aio` facade of a MephistoDB
+    """
+
+    MAX_WORKERS = 2
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(
+            database_path, args=LocalMephistoDBArgs(aio_max_workers=self.MAX_WORKERS)
+        )
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_aio_is_shared(self) -> None:
+        """Ensure the facade and its executor are created once per db"""
+        self.assertIs(self.db.aio, self.db.aio)
+        self.assertEqual(self.db.aio.max_workers, self.MAX_WORKERS)
+
+    def test_hot_calls(self) -> None:
+        """Ensure the awaitable calls match their blocking counterparts"""
+        worker_name, worker_id = get_test_worker(self.db)
+        unit_id = get_test_unit(self.db)
+        unit = Unit.get(self.db, unit_id)
+
+        async def run_calls():
+            workers = await self.db.aio.find_workers(worker_name=worker_name)
+            self.assertEqual([w.db_id for w in workers], [worker_id])
+
+            agent_id = await self.db.aio.new_agent(
+                worker_id,
+                unit_id,
+                unit.task_id,
+                unit.task_run_id,
+                unit.assignment_id,
+                unit.task_type,
+                unit.provider_type,
+            )
+            units = await self.db.aio.find_units(status=AssignmentState.ASSIGNED)
+            self.assertEqual([u.db_id for u in units], [unit_id])
+            self.assertEqual(units[0].agent_id, agent_id)
+
+            quals = await self.db.aio.check_granted_qualifications(worker_id=worker_id)
+            self.assertEqual(quals, [])
+
+            loaded_unit = await Unit.async_get(self.db, unit_id)
+            self.assertEqual(loaded_unit.db_id, unit_id)
+
+        asyncio.run(run_calls())
+
+    def test_connections_are_bounded(self) -> None:
+        """Ensure concurrent calls only ever use the executor's threads"""
+        get_test_worker(self.db)
+        thread_names = set()
+
+        def find_workers():
+            thread_names.add(threading.current_thread().name)
+            return self.db.find_workers()
+
+        async def run_calls():
+            await asyncio.gather(*[self.db.aio.run(find_workers) for _ in range(50)])
+
+        asyncio.run(run_calls())
+        self.assertLessEqual(len(thread_names), self.MAX_WORKERS)
+        self.assertTrue(all(name.startswith("mephisto-db") for name in thread_names))
+        self.assertEqual(self.db._connection_pool.num_active, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from mephisto.abstractions.databases.connection_pool import LeasedConnectionCondition
+from mephisto.abstractions.databases.connection_pool import SQLiteConnectionPool
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.providers.mock.mock_datastore import MockDatastore
+from mephisto.utils.db import MephistoDBException
+
+
+class TestSQLiteConnectionPool(unittest.TestCase):
+    """
+    Unit testing for the bounded SQLite connection pool
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.data_dir, "pool.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_connections_are_reused(self) -> None:
+        pool = SQLiteConnectionPool(self.db_path, max_size=2)
+        with pool.connection() as conn:
+            self.assertEqual(pool.num_active, 1)
+        with pool.connection() as reused_conn:
+            self.assertIs(reused_conn, conn)
+        self.assertEqual(pool.num_active, 0)
+        self.assertEqual(pool.num_idle, 1)
+        pool.close()
+
+    def test_checkout_waits_when_exhausted(self) -> None:
+        pool = SQLiteConnectionPool(self.db_path, max_size=1)
+        conn = pool.checkout()
+        waiter_conns = []
+        waiter = threading.Thread(target=lambda: waiter_conns.append(pool.checkout()))
+        waiter.start()
+        waiter.join(timeout=0.2)
+        self.assertTrue(waiter.is_alive(), "Checkout didn't wait for a free connection")
+
+        pool.checkin(conn)
+        waiter.join(timeout=5)
+        self.assertEqual(waiter_conns, [conn])
+        pool.checkin(conn)
+        pool.close()
+
+    def test_idle_connections_are_reaped(self) -> None:
+        pool = SQLiteConnectionPool(self.db_path, max_size=2, max_idle_seconds=0)
+        conn = pool.checkout()
+        pool.checkin(conn)
+        with pool.connection() as new_conn:
+            self.assertIsNot(new_conn, conn)
+        self.assertLessEqual(pool.num_idle, 1)
+        pool.close()
+
+    def test_uncommitted_writes_are_discarded(self) -> None:
+        pool = SQLiteConnectionPool(self.db_path, max_size=1)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY);")
+            conn.execute("INSERT INTO items (id) VALUES (1);")
+        with pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM items;").fetchone()[0], 0)
+        pool.close()
+
+    def test_closed_pool_rejects_checkout(self) -> None:
+        pool = SQLiteConnectionPool(self.db_path)
+        pool.close()
+        with self.assertRaises(MephistoDBException):
+            pool.checkout()
+
+
+class TestLeasedConnectionCondition(unittest.TestCase):
+    """
+    Unit testing for connections leased to the holder of a datastore's lock
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.pool = SQLiteConnectionPool(os.path.join(self.data_dir, "pool.db"), max_size=2)
+        self.condition = LeasedConnectionCondition(self.pool)
+
+    def tearDown(self):
+        self.pool.close()
+        shutil.rmtree(self.data_dir)
+
+    def test_lease_follows_lock(self) -> None:
+        with self.condition:
+            conn = self.condition.get_connection()
+            with self.condition:
+                self.assertIs(self.condition.get_connection(), conn)
+            self.assertEqual(self.pool.num_active, 1)
+        self.assertEqual(self.pool.num_active, 0)
+
+    def test_unguarded_leases_are_released_with_their_thread(self) -> None:
+        thread = threading.Thread(target=self.condition.get_connection)
+        thread.start()
+        thread.join()
+        self.assertEqual(self.pool.num_active, 1)
+        with self.condition:
+            self.assertEqual(self.pool.num_active, 1)
+        self.assertEqual(self.pool.num_active, 0)
+
+    def test_unguarded_leases_are_released_with_their_block(self) -> None:
+        with self.condition.get_connection() as conn:
+            conn.execute("SELECT 1;")
+            with self.condition:
+                self.assertIs(self.condition.get_connection(), conn)
+            self.assertEqual(self.pool.num_active, 1)
+        self.assertEqual(self.pool.num_active, 0)
+
+    def test_exhausted_pool_does_not_block_lock(self) -> None:
+        for _ in range(self.pool.max_size - 1):
+            self.pool.checkout()
+        lease_taken = threading.Event()
+        lock_waiting = threading.Event()
+        finished = []
+
+        def use_lease():
+            with self.condition.get_connection():
+                lease_taken.set()
+                lock_waiting.wait(timeout=5)
+                # The lease is reused rather than waiting for another connection
+                with self.condition:
+                    finished.append("lease")
+
+        def use_lock():
+            lease_taken.wait(timeout=5)
+            self.assertFalse(self.condition.acquire(blocking=False))
+            lock_waiting.set()
+            with self.condition:
+                finished.append("lock")
+
+        threads = [threading.Thread(target=use_lease), threading.Thread(target=use_lock)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        self.assertEqual(finished, ["lease", "lock"])
+
+
+class TestPooledDatastores(unittest.TestCase):
+    """
+    Ensure short-lived threads don't leave connections behind
+    """
+
+    NUM_THREADS = 50
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def run_in_threads(self, fn) -> None:
+        for _ in range(self.NUM_THREADS):
+            thread = threading.Thread(target=fn)
+            thread.start()
+            thread.join()
+
+    def test_local_database(self) -> None:
+        db = LocalMephistoDB(os.path.join(self.data_dir, "mephisto.db"))
+        self.run_in_threads(db.find_workers)
+        pool = db._connection_pool
+        self.assertEqual(pool.num_active, 0)
+        self.assertLessEqual(pool.num_idle, pool.max_size)
+        db.shutdown()
+
+    def test_provider_datastore(self) -> None:
+        datastore = MockDatastore(self.data_dir)
+        self.run_in_threads(lambda: datastore.get_requester_registered("requester"))
+        pool = datastore._connection_pool
+        self.assertEqual(pool.num_active, 0)
+        self.assertLessEqual(pool.num_idle, pool.max_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,10 +7,26 @@
 import unittest
 import shutil
 import os
+import sqlite3
 import tempfile
+import threading
+import time
+from unittest import mock
 
 from mephisto.abstractions.test.data_model_database_tester import BaseDatabaseTests
+from mephisto.abstractions.blueprint import AgentState
+from mephisto.abstractions.database import MephistoDB
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.scripts.local_db.benchmarks.index_usage import build_database
+from mephisto.scripts.local_db.benchmarks.index_usage import check_index_usage
+from mephisto.utils.testing import get_test_agent
+from mephisto.utils.testing import get_test_assignment
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_unit
 
 
 class TestLocalMephistoDB(BaseDatabaseTests):
@@ -34,6 +50,262 @@ class TestLocalMephistoDB(BaseDatabaseTests):
 
     # TODO(#97) are there any other unit tests we'd like to have?
 
+    def test_hot_lookups_use_indices(self) -> None:
+        """Ensure none of the hot find_* lookups scans a full table"""
+        fixture = build_database(self.db, 100)
+        timings = check_index_usage(self.db.db_path, fixture)
+        self.assertGreater(len(timings), 0)
+
+    def test_unit_status_counts_see_other_writers(self) -> None:
+        """Ensure tracked unit status counts follow writes made by other databases"""
+        task_run_id = get_test_task_run(self.db)
+        task_run = TaskRun.get(self.db, task_run_id)
+        assignment = Assignment.get(self.db, get_test_assignment(self.db, task_run))
+        unit_id = get_test_unit(self.db, 0, assignment)
+        self.assertEqual(self.db.count_units_by_status(task_run_id)[AssignmentState.CREATED], 1)
+
+        other_db = LocalMephistoDB(self.db.db_path)
+        other_db.update_unit(unit_id, status=AssignmentState.COMPLETED)
+        other_db.shutdown()
+        counts = self.db.count_units_by_status(task_run_id)
+        self.assertEqual(counts[AssignmentState.CREATED], 0)
+        self.assertEqual(counts[AssignmentState.COMPLETED], 1)
+
+        # Counts of unpinned runs are dropped
+        self.db.pin_task_run(task_run_id)
+        self.db.unpin_task_run(task_run_id)
+        self.assertNotIn(task_run_id, self.db._unit_status_counts)
+
+    def test_default_unit_reservations(self) -> None:
+        """Ensure the in-process reservations of MephistoDB behave like the local ones"""
+        with mock.patch.object(
+            LocalMephistoDB, "_reserve_unit", MephistoDB._reserve_unit
+        ), mock.patch.object(
+            LocalMephistoDB, "_clear_unit_reservation", MephistoDB._clear_unit_reservation
+        ):
+            self.test_unit_reservations()
+
+    def test_unit_status_counts_across_connections(self) -> None:
+        """Ensure writes on any leased connection keep the counts without recounting"""
+        task_run_id = get_test_task_run(self.db)
+        task_run = TaskRun.get(self.db, task_run_id)
+        assignment = Assignment.get(self.db, get_test_assignment(self.db, task_run))
+        unit_ids = [get_test_unit(self.db, idx, assignment) for idx in range(4)]
+        self.db.count_units_by_status(task_run_id)
+
+        # Hold one of two pooled connections at a time, so consecutive calls
+        # alternate between them
+        pool = self.db.table_access_condition.pool
+        pool.close_idle()
+        held = pool.checkout()
+        used_connections = set()
+
+        def swap_connections() -> None:
+            nonlocal held
+            idle = pool.checkout()
+            used_connections.add(id(idle))
+            pool.checkin(held)
+            held = idle
+
+        aggregate = mock.patch.object(
+            self.db,
+            "_LocalMephistoDB__aggregate_unit_status_counts",
+            wraps=self.db._LocalMephistoDB__aggregate_unit_status_counts,
+        )
+        with aggregate as aggregate_mock:
+            for completed, unit_id in enumerate(unit_ids, start=1):
+                swap_connections()
+                self.db.update_unit(unit_id, status=AssignmentState.COMPLETED)
+                swap_connections()
+                counts = self.db.count_units_by_status(task_run_id)
+                self.assertEqual(counts[AssignmentState.COMPLETED], completed)
+                self.assertEqual(counts[AssignmentState.CREATED], len(unit_ids) - completed)
+            self.assertEqual(aggregate_mock.call_count, 0, "Counts shouldn't be recounted")
+
+            # Writes made on the connections from outside the tracked writes are seen
+            swap_connections()
+            with self.db.table_access_condition, self.db.get_connection() as conn:
+                conn.execute("UPDATE units SET status = ?;", (AssignmentState.EXPIRED,))
+            counts = self.db.count_units_by_status(task_run_id)
+            self.assertEqual(counts[AssignmentState.EXPIRED], len(unit_ids))
+            self.assertEqual(aggregate_mock.call_count, 1)
+        pool.checkin(held)
+        self.assertEqual(len(used_connections), 2)
+
+
+class TestLocalMephistoDBWAL(BaseDatabaseTests):
+    """
+    Unit testing for the LocalMephistoDB running in WAL mode
+
+    Inherits all tests directly from BaseDataModelTests, and
+    adds tests for the concurrent reader path.
+    """
+
+    is_base = False
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(database_path, args=LocalMephistoDBArgs(use_wal=True))
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_journal_mode_is_wal(self) -> None:
+        """Ensure the database file is switched into WAL mode"""
+        with self.db.table_access_condition:
+            conn = self.db.get_connection()
+            journal_mode = conn.execute("PRAGMA journal_mode;").fetchone()["journal_mode"]
+        self.assertEqual(journal_mode, "wal")
+
+    def test_reads_do_not_wait_for_writer_lock(self) -> None:
+        """Ensure reads proceed while another thread holds the writer lock"""
+        unit_id = get_test_unit(self.db)
+        results = []
+
+        def read_unit():
+            results.append(self.db.get_unit(unit_id)["unit_id"])
+            results.append(len(self.db.find_units()))
+
+        with self.db.table_access_condition:
+            reader = threading.Thread(target=read_unit)
+            reader.start()
+            reader.join(timeout=5)
+            self.assertFalse(reader.is_alive(), "Reader blocked on the writer lock")
+
+        self.assertEqual(results, [unit_id, 1])
+
+    def test_reader_connections_are_query_only(self) -> None:
+        """Ensure pooled reader connections can't be used to write"""
+        with self.db._read_connection() as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("DELETE FROM units;")
+
+
+class TestLocalMephistoDBGroupCommit(BaseDatabaseTests):
+    """
+    Unit testing for the LocalMephistoDB with group commit of status updates
+
+    Inherits all tests directly from BaseDataModelTests, and
+    adds tests for the queued status update path.
+    """
+
+    is_base = False
+
+    # Long enough that the background flush never runs during a test
+    INTERVAL_MS = 60 * 1000
+    MAX_WRITES = 10
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(
+            self.database_path,
+            args=LocalMephistoDBArgs(
+                group_commit=True,
+                group_commit_interval_ms=self.INTERVAL_MS,
+                group_commit_max_writes=self.MAX_WRITES,
+            ),
+        )
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def get_committed_status(self, table_name: str, id_name: str, db_id: str) -> str:
+        """Read a status straight from the file, bypassing the queue"""
+        conn = sqlite3.connect(self.database_path)
+        try:
+            row = conn.execute(
+                f"SELECT status FROM {table_name} WHERE {id_name} = ?;", (int(db_id),)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0]
+
+    def test_status_updates_are_queued(self) -> None:
+        """Ensure status updates are only committed on flush, but read back immediately"""
+        unit_id = get_test_unit(self.db)
+        self.db.update_unit(unit_id, status=AssignmentState.LAUNCHED)
+
+        self.assertEqual(self.db.get_unit(unit_id)["status"], AssignmentState.LAUNCHED)
+        self.assertEqual(
+            self.get_committed_status("units", "unit_id", unit_id), AssignmentState.CREATED
+        )
+
+        self.db._flush_status_writes()
+        self.assertEqual(
+            self.get_committed_status("units", "unit_id", unit_id), AssignmentState.LAUNCHED
+        )
+        self.assertEqual(len(self.db._pending_status_writes), 0)
+
+    def test_queries_flush_queued_updates(self) -> None:
+        """Ensure filtered queries see queued statuses"""
+        unit_id = get_test_unit(self.db)
+        self.db.update_unit(unit_id, status=AssignmentState.LAUNCHED)
+        units = self.db.find_units(status=AssignmentState.LAUNCHED)
+        self.assertEqual([u.db_id for u in units], [unit_id])
+
+    def test_agent_status_updates_are_queued(self) -> None:
+        """Ensure agent status updates are queued and read back"""
+        agent_id = get_test_agent(self.db)
+        self.db.update_agent(agent_id, status=AgentState.STATUS_WAITING)
+        self.assertEqual(self.db.get_agent(agent_id)["status"], AgentState.STATUS_WAITING)
+        self.assertEqual(
+            self.get_committed_status("agents", "agent_id", agent_id), AgentState.STATUS_NONE
+        )
+        agents = self.db.find_agents(status=AgentState.STATUS_WAITING)
+        self.assertEqual([a.db_id for a in agents], [agent_id])
+
+    def test_max_writes_triggers_flush(self) -> None:
+        """Ensure the queue is flushed once group_commit_max_writes updates are queued"""
+        assignment = Assignment.get(self.db, get_test_assignment(self.db))
+        unit_id = get_test_unit(self.db, 0, assignment)
+        statuses = [AssignmentState.LAUNCHED, AssignmentState.CREATED]
+        for idx in range(self.MAX_WRITES - 1):
+            self.db.update_unit(unit_id, status=statuses[idx % 2])
+        # Repeated updates of a single row only take one slot in the queue
+        self.assertEqual(len(self.db._pending_status_writes), 1)
+
+        unit_ids = [get_test_unit(self.db, idx + 1, assignment) for idx in range(self.MAX_WRITES)]
+        for new_unit_id in unit_ids[:-2]:
+            self.db.update_unit(new_unit_id, status=AssignmentState.LAUNCHED)
+        self.assertEqual(len(self.db._pending_status_writes), self.MAX_WRITES - 1)
+        self.db.update_unit(unit_ids[-2], status=AssignmentState.LAUNCHED)
+        self.assertEqual(len(self.db._pending_status_writes), 0)
+        self.assertEqual(
+            self.get_committed_status("units", "unit_id", unit_ids[-2]),
+            AssignmentState.LAUNCHED,
+        )
+
+    def test_shutdown_flushes_queued_updates(self) -> None:
+        """Ensure queued updates are written on shutdown"""
+        unit_id = get_test_unit(self.db)
+        self.db.update_unit(unit_id, status=AssignmentState.LAUNCHED)
+        self.db.shutdown()
+        self.assertEqual(
+            self.get_committed_status("units", "unit_id", unit_id), AssignmentState.LAUNCHED
+        )
+        self.db = LocalMephistoDB(self.database_path)
+
+    def test_background_flush(self) -> None:
+        """Ensure queued updates are written after the flush interval"""
+        self.db.shutdown()
+        self.db = LocalMephistoDB(
+            self.database_path,
+            args=LocalMephistoDBArgs(group_commit=True, group_commit_interval_ms=10),
+        )
+        unit_id = get_test_unit(self.db)
+        self.db.update_unit(unit_id, status=AssignmentState.LAUNCHED)
+        for _ in range(100):
+            if len(self.db._pending_status_writes) == 0:
+                break
+            time.sleep(0.05)
+        self.assertEqual(
+            self.get_committed_status("units", "unit_id", unit_id), AssignmentState.LAUNCHED
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
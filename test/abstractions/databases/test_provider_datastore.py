@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import shutil
+import tempfile
+import threading
+import unittest
+
+from prometheus_client import REGISTRY  # type: ignore
+
+from mephisto.abstractions.providers.inhouse.inhouse_datastore import InhouseDatastore
+from mephisto.abstractions.providers.prolific.prolific_datastore import ProlificDatastore
+
+
+class TestProviderDatastore(unittest.TestCase):
+    """
+    Unit testing for the pooled connections and batched writes shared by provider datastores
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.datastore = ProlificDatastore(self.data_dir)
+
+    def tearDown(self):
+        self.datastore.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_reads_dont_wait_for_writers(self) -> None:
+        datastore = self.datastore
+        datastore.create_unit("1", task_run_id="1", prolific_study_id="study")
+        with datastore.get_connection() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode;").fetchone()[0]
+        self.assertEqual(journal_mode, "wal")
+
+        results = []
+        with datastore.table_access_condition:
+            thread = threading.Thread(
+                target=lambda: results.append(datastore.get_unit("1")["prolific_study_id"])
+            )
+            thread.start()
+            thread.join(timeout=5)
+        self.assertEqual(results, ["study"])
+
+    def test_batched_writes(self) -> None:
+        datastore = self.datastore
+        datastore.new_study("study_1", "link", 60, task_run_id="1")
+        datastore.new_study("study_2", "link", 60, task_run_id="2")
+        datastore.update_study_statuses({"study_1": "ACTIVE", "study_2": "COMPLETED"})
+        studies = datastore.find_studies_by_status(["ACTIVE", "COMPLETED"])
+        statuses = {s["prolific_study_id"]: s["status"] for s in studies}
+        self.assertEqual(statuses, {"study_1": "ACTIVE", "study_2": "COMPLETED"})
+
+        datastore.create_units(["1", "2"], task_run_id="1", prolific_study_id="study_1")
+        # Existing units are skipped rather than failing the batch
+        datastore.create_units(["2", "3"], task_run_id="1", prolific_study_id="study_1")
+        datastore.create_unit("3", task_run_id="1", prolific_study_id="study_1")
+        with datastore.get_connection() as conn:
+            unit_ids = [r["unit_id"] for r in conn.execute("SELECT unit_id FROM units;")]
+        self.assertEqual(sorted(unit_ids), ["1", "2", "3"])
+
+        datastore.register_submissions_to_study("study_1", [("1", "sub_1"), ("2", "sub_2")])
+        datastore.register_submission_to_study("study_1", "1", "sub_1")
+        with datastore.get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM submissions;").fetchone()[0]
+        self.assertEqual(count, 2)
+
+    def test_latency_metrics(self) -> None:
+        labels = {"provider": "inhouse", "method": "get_worker_blocked"}
+        before = REGISTRY.get_sample_value("provider_datastore_latency_seconds_count", labels) or 0
+        datastore = InhouseDatastore(self.data_dir)
+        self.assertFalse(datastore.get_worker_blocked("worker"))
+        after = REGISTRY.get_sample_value("provider_datastore_latency_seconds_count", labels)
+        self.assertEqual(after, before + 1)
+        datastore.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
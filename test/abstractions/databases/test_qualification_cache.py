@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.abstractions.databases.qualification_cache import QualificationCache
+from mephisto.data_model.worker import Worker
+from mephisto.utils.testing import get_test_worker
+
+
+class TestQualificationCache(unittest.TestCase):
+    """
+    Unit testing for the cache of granted qualifications by worker and name
+    """
+
+    def test_hits_and_invalidation(self) -> None:
+        cache = QualificationCache(ttl_seconds=0)
+        loads = []
+
+        def load():
+            loads.append(1)
+            return None
+
+        self.assertIsNone(cache.get_or_load("1", "qual", load))
+        self.assertIsNone(cache.get_or_load("1", "qual", load))
+        self.assertEqual(len(loads), 1, "Absent qualifications should be cached too")
+        self.assertEqual(cache.hit_ratio, 0.5)
+
+        cache.get_or_load("2", "qual", load)
+        cache.invalidate_worker("1")
+        cache.get_or_load("1", "qual", load)
+        cache.get_or_load("2", "qual", load)
+        self.assertEqual(len(loads), 3, "Only the invalidated worker should be read again")
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl(self) -> None:
+        cache = QualificationCache(ttl_seconds=0.05)
+        loads = []
+        cache.get_or_load("1", "qual", lambda: loads.append(1))
+        cache.get_or_load("1", "qual", lambda: loads.append(1))
+        self.assertEqual(len(loads), 1)
+        time.sleep(0.1)
+        cache.get_or_load("1", "qual", lambda: loads.append(1))
+        self.assertEqual(len(loads), 2, "Expired entries should be read again")
+
+    def test_racing_invalidation_is_not_cached(self) -> None:
+        cache = QualificationCache(ttl_seconds=0)
+
+        def load_during_grant():
+            # Stale read, the grant committed while it was in flight
+            cache.invalidate_worker("1")
+            return None
+
+        cache.get_or_load("1", "qual", load_during_grant)
+        self.assertEqual(len(cache), 0)
+
+    def test_eviction(self) -> None:
+        cache = QualificationCache(ttl_seconds=0, max_size=2)
+        for name in ["a", "b", "c"]:
+            cache.get_or_load("1", name, lambda: None)
+        self.assertEqual(len(cache), 2)
+        loads = []
+        cache.get_or_load("1", "a", lambda: loads.append(1))
+        self.assertEqual(len(loads), 1, "Least recently used entry should have been evicted")
+
+
+class TestLocalMephistoDBQualificationCache(unittest.TestCase):
+    """
+    Ensure qualifications looked up through a LocalMephistoDB follow grants and revokes
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.db = LocalMephistoDB(
+            os.path.join(self.data_dir, "mephisto.db"),
+            args=LocalMephistoDBArgs(qualification_cache=True),
+        )
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_grants_invalidate(self) -> None:
+        db = self.db
+        _, worker_id = get_test_worker(db)
+        worker = Worker.get(db, worker_id)
+        qualification_id = db.make_qualification("qual")
+        self.assertFalse(worker.is_qualified("qual"))
+
+        db.grant_qualification(qualification_id, worker_id, value=1)
+        self.assertTrue(worker.is_qualified("qual"))
+        worker.grant_qualification("qual", value=0, skip_crowd=True)
+        self.assertTrue(worker.is_disqualified("qual"))
+        worker.revoke_qualification("qual", skip_crowd=True)
+        self.assertIsNone(worker.get_granted_qualification("qual"))
+
+        db.grant_qualification(qualification_id, worker_id, value=1)
+        self.assertTrue(worker.is_qualified("qual"))
+        db.delete_qualification("qual")
+        self.assertFalse(worker.is_qualified("qual"))
+
+    def test_cache_disabled(self) -> None:
+        db = LocalMephistoDB(os.path.join(self.data_dir, "uncached.db"))
+        _, worker_id = get_test_worker(db)
+        qualification_id = db.make_qualification("qual")
+        self.assertIsNone(db.get_worker_granted_qualification(worker_id, "qual"))
+        # Writes that bypass grant_qualification are seen immediately
+        db._grant_qualification(qualification_id, worker_id, value=3)
+        granted_qualification = db.get_worker_granted_qualification(worker_id, "qual")
+        assert granted_qualification is not None
+        self.assertEqual(granted_qualification.value, 3)
+        db.shutdown()
+
+    def test_read_only_is_not_cached(self) -> None:
+        read_db = LocalMephistoDB(
+            self.db.db_path, args=LocalMephistoDBArgs(read_only=True, qualification_cache=True)
+        )
+        self.assertIsNone(read_db._qualification_cache)
+        read_db.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
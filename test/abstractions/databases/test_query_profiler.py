@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.abstractions.databases.query_profiler import DEFAULT_PROFILE_LOG_NAME
+from mephisto.abstractions.databases.query_profiler import get_full_scans
+from mephisto.abstractions.databases.query_profiler import get_query_shape
+from mephisto.abstractions.databases.query_profiler import load_query_log
+from mephisto.abstractions.databases.query_profiler import summarize_query_log
+
+
+class TestQueryShapes(unittest.TestCase):
+    """
+    Unit testing for query normalization and plan inspection
+    """
+
+    def test_literals_are_normalized(self) -> None:
+        self.assertEqual(
+            get_query_shape("SELECT * FROM units\n  WHERE status = 'launched' AND unit_index = 2;"),
+            "SELECT * FROM units WHERE status = ? AND unit_index = ?",
+        )
+
+    def test_in_lists_share_a_shape(self) -> None:
+        self.assertEqual(
+            get_query_shape("SELECT * FROM units WHERE unit_id IN (?, ?)"),
+            get_query_shape("SELECT * FROM units WHERE unit_id IN (?,?,?,?)"),
+        )
+
+    def test_full_scans_are_flagged(self) -> None:
+        plan = [
+            "SCAN TABLE agents",
+            "SCAN units USING INDEX sqlite_autoindex_units_1",
+            "SEARCH workers USING INTEGER PRIMARY KEY (rowid=?)",
+            "SCAN requesters",
+        ]
+        self.assertEqual(get_full_scans(plan), ["agents", "requesters"])
+
+
+class TestLocalMephistoDBProfiling(unittest.TestCase):
+    """
+    Ensure a profiled LocalMephistoDB logs its slow queries
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.db = LocalMephistoDB(
+            os.path.join(self.data_dir, "mephisto.db"),
+            args=LocalMephistoDBArgs(profile_queries=True, slow_query_threshold_ms=0),
+        )
+        self.log_path = os.path.join(self.data_dir, DEFAULT_PROFILE_LOG_NAME)
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_slow_queries_are_logged(self) -> None:
+        self.db.new_requester("requester", "mock")
+        self.db.find_agents(task_id="1")
+        self.db.find_agents(task_id="2")
+
+        records = load_query_log(self.log_path)
+        insert_records = [r for r in records if r["shape"].startswith("INSERT INTO requesters")]
+        self.assertEqual(len(insert_records), 1)
+        self.assertEqual(insert_records[0]["param_shape"], "(int, str, str)")
+
+        agent_records = [r for r in records if "from agents" in r["shape"].lower()]
+        self.assertEqual(len(agent_records), 2)
+        # The query plan is only captured for the first query of each shape
+        self.assertIn("plan", agent_records[0])
+        self.assertNotIn("plan", agent_records[1])
+        self.assertEqual(agent_records[1]["full_scans"], ["agents"])
+
+        summaries = summarize_query_log(records)
+        agent_summary = [s for s in summaries if "from agents" in s["shape"].lower()][0]
+        self.assertEqual(agent_summary["count"], 2)
+        self.assertEqual(agent_summary["full_scans"], ["agents"])
+
+    def test_profiling_is_opt_in(self) -> None:
+        unprofiled_dir = os.path.join(self.data_dir, "unprofiled")
+        os.makedirs(unprofiled_dir)
+        db = LocalMephistoDB(os.path.join(unprofiled_dir, "mephisto.db"))
+        db.find_agents()
+        db.shutdown()
+        self.assertFalse(os.path.exists(os.path.join(unprofiled_dir, DEFAULT_PROFILE_LOG_NAME)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.abstractions.databases.local_database import READ_ONLY_MMAP_SIZE_BYTES
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.unit import Unit
+from mephisto.utils.db import MephistoDBException
+from mephisto.utils.testing import get_test_assignment
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_unit
+
+
+class TestReadOnlyLocalMephistoDB(unittest.TestCase):
+    """
+    Unit testing for opening a LocalMephistoDB read-only beside a writer
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = LocalMephistoDB(self.database_path)
+        task_run_id = get_test_task_run(self.db)
+        assignment_id = get_test_assignment(self.db, TaskRun.get(self.db, task_run_id))
+        self.task_run_id = task_run_id
+        self.unit_id = get_test_unit(self.db, assignment=Assignment.get(self.db, assignment_id))
+        self.read_db = LocalMephistoDB(self.database_path, args=LocalMephistoDBArgs(read_only=True))
+
+    def tearDown(self):
+        self.read_db.shutdown()
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_reads_follow_writer(self) -> None:
+        read_db = self.read_db
+        self.assertEqual(Unit.get(read_db, self.unit_id).get_status(), AssignmentState.CREATED)
+        self.db.update_unit(self.unit_id, status=AssignmentState.LAUNCHED)
+        self.assertEqual(read_db.get_unit(self.unit_id)["status"], AssignmentState.LAUNCHED)
+        counts = read_db.count_units_by_status(self.task_run_id)
+        self.assertEqual(counts[AssignmentState.LAUNCHED], 1)
+        self.db.update_unit(self.unit_id, status=AssignmentState.EXPIRED)
+        counts = read_db.count_units_by_status(self.task_run_id)
+        self.assertEqual(counts[AssignmentState.EXPIRED], 1, "Counts shouldn't be cached")
+
+        with read_db.read_connection() as conn:
+            mmap_size = conn.execute("PRAGMA mmap_size;").fetchone()["mmap_size"]
+            self.assertEqual(mmap_size, READ_ONLY_MMAP_SIZE_BYTES)
+        self.assertEqual(read_db.table_access_condition._depth(), 0)
+
+    def test_writes_fail(self) -> None:
+        with self.assertRaises(sqlite3.OperationalError):
+            self.read_db.update_unit(self.unit_id, status=AssignmentState.LAUNCHED)
+        self.assertEqual(self.db.get_unit(self.unit_id)["status"], AssignmentState.CREATED)
+        with self.assertRaises(sqlite3.OperationalError):
+            self.read_db.new_project("read_only_project")
+
+    def test_no_tables_created(self) -> None:
+        with self.assertRaises(MephistoDBException):
+            LocalMephistoDB(
+                os.path.join(self.data_dir, "missing.db"), args=LocalMephistoDBArgs(read_only=True)
+            )
+
+        empty_path = os.path.join(self.data_dir, "empty.db")
+        sqlite3.connect(empty_path).close()
+        empty_db = LocalMephistoDB(empty_path, args=LocalMephistoDBArgs(read_only=True))
+        with self.assertRaises(sqlite3.OperationalError):
+            empty_db.find_units()
+        empty_db.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
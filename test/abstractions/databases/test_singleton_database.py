@@ -8,9 +8,18 @@ import unittest
 import shutil
 import os
 import tempfile
+import weakref
 
 from mephisto.abstractions.test.data_model_database_tester import BaseDatabaseTests
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.abstractions.providers.mock.mock_unit import MockUnit
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.unit import Unit
+from mephisto.utils.testing import get_test_assignment
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_unit
 
 
 class TestMephistoSingletonDB(BaseDatabaseTests):
@@ -35,5 +44,85 @@ class TestMephistoSingletonDB(BaseDatabaseTests):
     # TODO(#97) are there any other unit tests we'd like to have?
 
 
+class TestMephistoSingletonDBCache(unittest.TestCase):
+    """
+    Unit testing for the bounded object cache of the MephistoSingletonDB
+    """
+
+    CACHE_SIZE = 5
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        database_path = os.path.join(self.data_dir, "mephisto.db")
+        self.db = MephistoSingletonDB(database_path, cache_size=self.CACHE_SIZE)
+        self.task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        self.assignment = Assignment.get(self.db, get_test_assignment(self.db, self.task_run))
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_cache_returns_same_object(self):
+        unit_id = get_test_unit(self.db, 0, self.assignment)
+        self.assertIs(Unit.get(self.db, unit_id), Unit.get(self.db, unit_id))
+
+    def test_provider_classes_share_cache(self):
+        unit_id = get_test_unit(self.db, 0, self.assignment)
+        unit = Unit.get(self.db, unit_id)
+        self.assertIsInstance(unit, MockUnit)
+        self.assertIs(MockUnit.get(self.db, unit_id), unit)
+        self.assertIs(self.db._get_cached_class(MockUnit), Unit)
+        self.assertIsNone(self.db._get_cached_class(str))
+        self.assertTrue(MephistoSingletonDB.optimizes_loads)
+        self.assertFalse(LocalMephistoDB.optimizes_loads)
+
+    def test_objects_keep_attributes_and_weakrefs(self):
+        unit = Unit.get(self.db, get_test_unit(self.db, 0, self.assignment))
+        for obj in [self.task_run, self.assignment, unit]:
+            obj.extra_attribute = True
+            self.assertTrue(obj.extra_attribute)
+            self.assertIs(weakref.ref(obj)(), obj)
+
+    def test_cache_is_bounded(self):
+        unit_ids = [get_test_unit(self.db, idx, self.assignment) for idx in range(20)]
+        units = [Unit.get(self.db, unit_id) for unit_id in unit_ids]
+        unit_cache = self.db._singleton_cache[Unit]
+        self.assertEqual(len(unit_cache), self.CACHE_SIZE)
+
+        # Most recently used units are kept, older ones are reloaded
+        self.assertIs(Unit.get(self.db, unit_ids[-1]), units[-1])
+        self.assertIsNot(Unit.get(self.db, unit_ids[0]), units[0])
+        self.assertEqual(len(unit_cache), self.CACHE_SIZE)
+
+    def test_evicted_units_clear_assignment_mapping(self):
+        unit_ids = [get_test_unit(self.db, idx, self.assignment) for idx in range(2)]
+        units = self.db.find_units(assignment_id=self.assignment.db_id)
+        self.assertEqual(len(units), 2)
+        self.assertIn(self.assignment.db_id, self.db._assignment_to_unit_mapping)
+
+        other_assignment = Assignment.get(self.db, get_test_assignment(self.db, self.task_run))
+        for idx in range(self.CACHE_SIZE):
+            Unit.get(self.db, get_test_unit(self.db, idx, other_assignment))
+        self.assertNotIn(self.assignment.db_id, self.db._assignment_to_unit_mapping)
+        self.assertEqual(
+            sorted(u.db_id for u in self.db.find_units(assignment_id=self.assignment.db_id)),
+            sorted(unit_ids),
+        )
+
+    def test_pinned_task_run_objects_are_kept(self):
+        self.db.pin_task_run(self.task_run.db_id)
+        unit_ids = [get_test_unit(self.db, idx, self.assignment) for idx in range(20)]
+        units = [Unit.get(self.db, unit_id) for unit_id in unit_ids]
+        for unit_id, unit in zip(unit_ids, units):
+            self.assertIs(Unit.get(self.db, unit_id), unit)
+
+        # Once unpinned, the cache shrinks back to its budget
+        self.db.unpin_task_run(self.task_run.db_id)
+        unit_cache = self.db._singleton_cache[Unit]
+        self.assertEqual(len(unit_cache), self.CACHE_SIZE)
+        kept_units = [u for u_id, u in zip(unit_ids, units) if unit_cache.get(u_id) is u]
+        self.assertEqual(len(kept_units), self.CACHE_SIZE)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.assignment import Assignment
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.task_run import TaskRun
+from mephisto.data_model.unit import Unit
+from mephisto.data_model.worker import Worker
+from mephisto.operations.available_units import AvailableUnitIndex
+from mephisto.operations.available_units import register_available_units
+from mephisto.operations.available_units import unregister_available_units
+from mephisto.utils.testing import get_test_assignment
+from mephisto.utils.testing import get_test_task_run
+from mephisto.utils.testing import get_test_unit
+from mephisto.utils.testing import get_test_worker
+
+
+class TestAvailableUnits(unittest.TestCase):
+    """
+    Unit testing for the index of units available to arriving workers
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.db = LocalMephistoDB(os.path.join(self.data_dir, "mephisto.db"))
+        self.task_run = TaskRun.get(self.db, get_test_task_run(self.db))
+        self.units = []
+        for _ in range(2):
+            assignment = Assignment.get(self.db, get_test_assignment(self.db, self.task_run))
+            for unit_index in range(2):
+                unit = Unit.get(self.db, get_test_unit(self.db, unit_index, assignment))
+                unit.set_db_status(AssignmentState.LAUNCHED)
+                self.units.append(unit)
+        self.index = AvailableUnitIndex(self.task_run.db_id)
+        for unit in self.units:
+            self.index.add_unit(unit)
+
+    def tearDown(self):
+        unregister_available_units(self.task_run.db_id)
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def test_worker_exclusions(self) -> None:
+        index = self.index
+        units = self.units
+        self.assertEqual(index.get_units_for_worker("1"), units)
+        self.assertEqual(index.get_units_for_worker("1", limit=3), units[:3])
+        self.assertEqual(
+            index.get_units_for_worker("1", can_do_unit=lambda u: u.unit_index == 1),
+            [units[1], units[3]],
+        )
+
+        # Workers can't be paired with themselves
+        index.assign_unit(units[0], "1")
+        self.assertEqual(index.get_units_for_worker("1"), units[2:])
+        self.assertEqual(index.get_units_for_worker("2"), units[1:])
+
+        # Returned units are available again, to their worker as well
+        index.add_unit(units[0])
+        self.assertEqual(index.get_units_for_worker("1"), [units[1], units[0], *units[2:]])
+
+        # Units that moved on are dropped
+        units[2].set_db_status(AssignmentState.EXPIRED)
+        self.assertEqual(index.get_units_for_worker("2"), [units[1], units[0], units[3]])
+
+    def test_can_do_unit_outside_lock(self) -> None:
+        index = self.index
+
+        def can_do_unit(unit: Unit) -> bool:
+            # Filters may query the database, which shouldn't block the index
+            self.assertFalse(index._lock.locked())
+            return unit.unit_index == 0
+
+        self.assertEqual(
+            index.get_units_for_worker("1", can_do_unit=can_do_unit, limit=1), self.units[:1]
+        )
+
+    def test_task_run_uses_index(self) -> None:
+        _, worker_id = get_test_worker(self.db)
+        worker = Worker.get(self.db, worker_id)
+        scanned_units = self.task_run.get_valid_units_for_worker(worker)
+        self.assertEqual([u.db_id for u in scanned_units], [u.db_id for u in self.units])
+
+        register_available_units(self.index)
+        self.index.assign_unit(self.units[0], worker_id)
+        self.assertEqual(self.task_run.get_valid_units_for_worker(worker), self.units[2:])
+        self.assertEqual(self.task_run.get_valid_units_for_worker(worker, limit=1), self.units[2:3])
+
+        # Units cleared from their agent are made available again
+        self.units[0].clear_assigned_agent()
+        self.assertEqual(len(self.task_run.get_valid_units_for_worker(worker)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -145,7 +145,7 @@ class OperatorBaseTest(object):
             f"Channeled requests not processed in time!",
         )
 
-    @patch("mephisto.operations.operator.RUN_STATUS_POLL_TIME", 1.5)
+    @patch("mephisto.operations.operator.RUN_STATUS_RESYNC_TIME", 1.5)
     def test_run_job_concurrent(self):
         """Ensure that a job can be run that requires connected concurrent workers"""
         self.operator = Operator(self.db)
@@ -203,7 +203,7 @@ class OperatorBaseTest(object):
         assignment = task_run.get_assignments()[0]
         self.assertEqual(assignment.get_status(), AssignmentState.COMPLETED)
 
-    @patch("mephisto.operations.operator.RUN_STATUS_POLL_TIME", 1.5)
+    @patch("mephisto.operations.operator.RUN_STATUS_RESYNC_TIME", 1.5)
     def test_run_job_not_concurrent(self):
         """Ensure that a job can be run that doesn't require connected workers"""
         self.operator = Operator(self.db)
@@ -263,7 +263,37 @@ class OperatorBaseTest(object):
         assignment = task_run.get_assignments()[0]
         self.assertEqual(assignment.get_status(), AssignmentState.COMPLETED)
 
-    @patch("mephisto.operations.operator.RUN_STATUS_POLL_TIME", 1.5)
+    @patch("mephisto.operations.operator.RUN_STATUS_RESYNC_TIME", TIMEOUT_TIME * 10)
+    def test_unit_status_change_completes_run(self):
+        """Ensure runs complete on the status changes of their units, without a resync"""
+        self.operator = Operator(self.db)
+        config = MephistoConfig(
+            blueprint=MockBlueprintArgs(num_assignments=1, is_concurrent=False),
+            provider=MockProviderArgs(requester_name=self.requester_name),
+            architect=MockArchitectArgs(should_run_server=True),
+            task=MOCK_TASK_ARGS,
+        )
+        self.operator.launch_task_run(OmegaConf.structured(config))
+        task_run_id, tracked_run = list(self.operator.get_running_task_runs().items())[0]
+        architect = tracked_run.architect
+        self.assertIsInstance(architect, MockArchitect, "Must use mock in testing")
+
+        agent_ids = []
+        for idx, mock_worker_name in enumerate(["MOCK_WORKER", "MOCK_WORKER_2"], start=1):
+            architect.server.register_mock_agent(mock_worker_name, f"FAKE_ASSIGNMENT_{idx}")
+            self.assert_sandbox_worker_created(mock_worker_name)
+            agent_ids.append(self.assert_agent_created(idx))
+        for agent_id in agent_ids:
+            architect.server.submit_mock_unit(agent_id, {"completed": True})
+
+        # The resync is far beyond the timeout, so only the unit events can end the run
+        start_time = time.time()
+        self.operator._wait_for_runs_in_testing(TIMEOUT_TIME)
+        self.assertLess(time.time() - start_time, TIMEOUT_TIME, "Task not completed in time")
+        self.assertEqual(len(self.operator.get_running_task_runs()), 0)
+        self.assertTrue(self.db.get_task_run(task_run_id)["is_completed"])
+
+    @patch("mephisto.operations.operator.RUN_STATUS_RESYNC_TIME", 1.5)
     def test_patience_shutdown(self):
         """Ensure that a job shuts down if patience is exceeded"""
         self.operator = Operator(self.db)
@@ -305,7 +335,7 @@ class OperatorBaseTest(object):
         unit = assignment.get_units()[0]
         self.assertEqual(unit.get_status(), AssignmentState.EXPIRED)
 
-    @patch("mephisto.operations.operator.RUN_STATUS_POLL_TIME", 1.5)
+    @patch("mephisto.operations.operator.RUN_STATUS_RESYNC_TIME", 1.5)
     def test_run_jobs_with_restrictions(self):
         """Ensure allowed_concurrent and maximum_units_per_worker work"""
         self.operator = Operator(self.db)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mephisto.abstractions.blueprint import AgentState
+from mephisto.abstractions.databases.local_database import LocalMephistoDB
+from mephisto.data_model.agent import Agent
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.unit import Unit
+from mephisto.operations.run_completion_tracker import publish_run_progress
+from mephisto.operations.run_completion_tracker import register_listener
+from mephisto.operations.run_completion_tracker import register_tracker
+from mephisto.operations.run_completion_tracker import RunCompletionTracker
+from mephisto.operations.run_completion_tracker import unregister_listener
+from mephisto.operations.run_completion_tracker import unregister_tracker
+from mephisto.utils.testing import get_test_agent
+from mephisto.utils.testing import get_test_unit
+
+
+class TestRunCompletionTracker(unittest.TestCase):
+    """
+    Unit testing for the status change events that wake the operator's run checks
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.db = LocalMephistoDB(os.path.join(self.data_dir, "mephisto.db"))
+        self.wakeups = 0
+
+    def tearDown(self):
+        self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def wake(self) -> None:
+        self.wakeups += 1
+
+    def test_pending_checks(self) -> None:
+        tracker = RunCompletionTracker("1", no_submission_patience=60, on_event=self.wake)
+        self.assertTrue(tracker.take_pending(), "Runs should be checked once tracked")
+        self.assertFalse(tracker.take_pending())
+
+        tracker.notify()
+        tracker.notify()
+        self.assertEqual(self.wakeups, 1, "Already pending runs shouldn't wake the checker")
+        self.assertTrue(tracker.take_pending())
+        tracker.notify()
+        self.assertEqual(self.wakeups, 2)
+
+    def test_status_changes_are_published(self) -> None:
+        unit = Unit.get(self.db, get_test_unit(self.db))
+        agent = Agent.get(self.db, get_test_agent(self.db, unit_id=unit.db_id))
+        tracker = RunCompletionTracker(unit.task_run_id, 60, on_event=self.wake)
+        tracker.take_pending()
+        register_tracker(tracker)
+        try:
+            unit.set_db_status(AssignmentState.LAUNCHED)
+            agent.update_status(AgentState.STATUS_IN_TASK)
+            self.assertFalse(tracker.take_pending(), "Units in progress can't complete runs")
+
+            agent.update_status(AgentState.STATUS_COMPLETED)
+            self.assertTrue(tracker.take_pending())
+            self.assertEqual(tracker.take_units_to_sync(), [unit.db_id])
+            self.assertEqual(tracker.take_units_to_sync(), [])
+            unit.set_db_status(AssignmentState.COMPLETED)
+            self.assertTrue(tracker.take_pending())
+            self.assertEqual(self.wakeups, 2)
+        finally:
+            unregister_tracker(tracker)
+
+        unit.set_db_status(AssignmentState.ACCEPTED)
+        self.assertFalse(tracker.take_pending(), "Untracked runs shouldn't be notified")
+
+    def test_listeners_get_unit_statuses(self) -> None:
+        unit = Unit.get(self.db, get_test_unit(self.db))
+        agent = Agent.get(self.db, get_test_agent(self.db, unit_id=unit.db_id))
+        tracker = RunCompletionTracker(unit.task_run_id, 60, on_event=self.wake)
+        tracker.take_pending()
+        events = []
+        listener = lambda unit_id, status: events.append((unit_id, status))
+        register_tracker(tracker)
+        register_listener(unit.task_run_id, listener)
+        try:
+            unit.set_db_status(AssignmentState.EXPIRED)
+            agent.update_status(AgentState.STATUS_IN_TASK)
+            agent.update_status(AgentState.STATUS_EXPIRED)
+            publish_run_progress(unit.task_run_id)
+        finally:
+            unregister_listener(unit.task_run_id, listener)
+            unregister_tracker(tracker)
+        self.assertEqual(
+            events,
+            [(unit.db_id, AssignmentState.EXPIRED), (unit.db_id, None), (None, None)],
+        )
+        self.assertTrue(tracker.take_pending(), "Each of these events may complete the run")
+
+    def test_completion_trusts_synced_unit_statuses(self) -> None:
+        unit = Unit.get(self.db, get_test_unit(self.db))
+        agent = Agent.get(self.db, get_test_agent(self.db, unit_id=unit.db_id))
+        task_run = unit.get_task_run()
+        task_run.update_completion_progress(status=True)
+        unit.set_db_status(AssignmentState.ASSIGNED)
+        agent.update_status(AgentState.STATUS_COMPLETED)
+        self.assertFalse(
+            task_run.get_is_completed(), "Units are only complete once synced with agents"
+        )
+
+        task_run.sync_unit_statuses([unit.db_id])
+        self.assertEqual(self.db.get_unit(unit.db_id)["status"], AssignmentState.COMPLETED)
+        self.assertTrue(task_run.get_is_completed())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -121,6 +121,39 @@ class BaseTestTaskLauncher:
         for assignment in launcher.assignments:
             self.assertEqual(assignment.get_status(), AssignmentState.EXPIRED)
 
+    def test_create_assignments_in_batches(self):
+        """Ensure assignments are registered with the db in the configured batch sizes"""
+        num_assignments = 7
+        mock_data_array = [
+            MockTaskRunner.get_mock_assignment_data() for _ in range(num_assignments)
+        ]
+        launcher = TaskLauncher(self.db, self.task_run, mock_data_array, assignment_batch_size=3)
+
+        batch_sizes = []
+        new_assignments_bulk = self.db.new_assignments_bulk
+
+        def record_batch_size(*args, **kwargs):
+            batch_sizes.append(kwargs["count"])
+            return new_assignments_bulk(*args, **kwargs)
+
+        self.db.new_assignments_bulk = record_batch_size
+        launcher.create_assignments()
+
+        self.assertEqual(batch_sizes, [3, 3, 1])
+        self.assertEqual(len(launcher.assignments), num_assignments)
+        self.assertEqual(
+            len(launcher.units),
+            num_assignments * len(mock_data_array[0].unit_data),
+        )
+        self.assertEqual(len(launcher.unlaunched_units), len(launcher.units))
+        self.assertEqual(
+            len(self.db.find_units(task_run_id=self.task_run_id)),
+            len(launcher.units),
+        )
+        for assignment, data in zip(launcher.assignments, mock_data_array):
+            self.assertEqual(assignment.get_assignment_data(), data)
+            self.assertEqual(len(assignment.get_units()), len(data.unit_data))
+
     def test_launch_assignments_with_concurrent_unit_cap(self):
         """Initialize a launcher on a task run, then create the assignments"""
         cap_values = [1, 2, 3, 4, 5]
@@ -149,6 +182,110 @@ class BaseTestTaskLauncher:
             self.tearDown()
             self.setUp()
 
+    def test_launch_priority(self):
+        """Ensure units launch by priority as the slots of finished units free up"""
+        mock_data_array = [MockTaskRunner.get_mock_assignment_data() for _ in range(3)]
+        launcher = TaskLauncher(
+            self.db,
+            self.task_run,
+            mock_data_array,
+            max_num_concurrent_units=1,
+            unit_launch_priority=lambda unit: unit.unit_index,
+        )
+        launcher.create_assignments()
+        launcher.launch_units("dummy-url:3000")
+
+        launch_order = []
+        start_time = time.time()
+        while len(launch_order) < len(launcher.units):
+            for unit in launcher.units:
+                if unit.db_status == AssignmentState.LAUNCHED:
+                    launch_order.append(unit)
+                    unit.set_db_status(AssignmentState.COMPLETED)
+            time.sleep(WAIT_TIME_TILL_NEXT_UNIT)
+            # Slots are freed by the status change, without waiting for a resync
+            self.assertLessEqual(time.time() - start_time, MAX_WAIT_TIME_UNIT_LAUNCH)
+        launcher.shutdown()
+
+        expected_order = sorted(launcher.units, key=lambda unit: -unit.unit_index)
+        self.assertEqual(launch_order, expected_order)
+
+    def test_assignment_prefetch(self):
+        """Ensure assignments are only created as launches make room for them"""
+        num_assignments = 6
+        consumed = []
+
+        def assignment_data():
+            for idx in range(num_assignments):
+                consumed.append(idx)
+                yield MockTaskRunner.get_mock_assignment_data()
+
+        launcher = TaskLauncher(
+            self.db,
+            self.task_run,
+            assignment_data(),
+            max_num_concurrent_units=1,
+            assignment_prefetch=2,
+        )
+        launcher.create_assignments()
+        launcher.launch_units("dummy-url:3000")
+
+        completed = 0
+        start_time = time.time()
+        while completed < num_assignments * 2:
+            # Assignments with units left to launch never exceed the prefetch
+            units = self.db.find_units(task_run_id=self.task_run_id)
+            self.assertLessEqual(len(units), 2 * (completed // 2 + 3))
+            for unit in list(launcher.launched_units.values()):
+                if unit.db_status == AssignmentState.LAUNCHED:
+                    unit.set_db_status(AssignmentState.COMPLETED)
+                    completed += 1
+            time.sleep(WAIT_TIME_TILL_NEXT_UNIT)
+            self.assertLessEqual(time.time() - start_time, MAX_WAIT_TIME_UNIT_LAUNCH)
+
+        launcher.shutdown()
+        self.assertEqual(consumed, list(range(num_assignments)))
+        self.assertEqual(len(launcher.units), 0, "Finished units shouldn't be kept")
+
+    def test_resume_with_assignment_prefetch(self):
+        """Ensure resumed runs finish creating assignments, so that they can complete"""
+        mock_data_array = [MockTaskRunner.get_mock_assignment_data() for _ in range(2)]
+        launcher = TaskLauncher(self.db, self.task_run, mock_data_array)
+        launcher.create_assignments()
+        launcher.launch_units("dummy-url:3000")
+        launcher.expire_units()
+        launcher.shutdown()
+
+        launcher = TaskLauncher(
+            self.db,
+            self.task_run,
+            mock_data_array,
+            max_num_concurrent_units=1,
+            assignment_prefetch=2,
+        )
+        launcher.resume_assignments()
+        self.assertTrue(launcher.get_assignments_are_all_created())
+        launcher.launch_units("dummy-url:3000")
+
+        # Units only launch as the ones before them complete, and the unit generator
+        # has to exit on its own once the last of them is launched
+        start_time = time.time()
+        while launcher.units_thread.is_alive():
+            for unit in launcher.units:
+                if unit.db_status == AssignmentState.LAUNCHED:
+                    unit.set_db_status(AssignmentState.COMPLETED)
+            time.sleep(WAIT_TIME_TILL_NEXT_UNIT)
+            self.assertLessEqual(time.time() - start_time, MAX_WAIT_TIME_UNIT_LAUNCH)
+        self.assertTrue(launcher.finished_generators)
+        for unit in launcher.units:
+            self.assertNotEqual(unit.db_status, AssignmentState.CREATED)
+            if unit.db_status == AssignmentState.LAUNCHED:
+                unit.set_db_status(AssignmentState.COMPLETED)
+
+        self.task_run.update_completion_progress(task_launcher=launcher)
+        self.assertTrue(self.task_run.get_is_completed())
+        launcher.shutdown()
+
     def test_assignments_generator(self):
         """Initialize a launcher on a task run, then try generate the assignments"""
         mock_data_array = self.get_mock_assignment_data_generator()
@@ -161,6 +298,8 @@ class BaseTestTaskLauncher:
             end_time - start_time,
             (NUM_GENERATED_ASSIGNMENTS * WAIT_TIME_TILL_NEXT_ASSIGNMENT) / 2,
         )
+        # Stop generating before the database is removed
+        launcher.shutdown()
 
 
 class TestTaskLauncherLocal(BaseTestTaskLauncher, unittest.TestCase):
@@ -12,10 +12,17 @@ import time
 import pytest
 
 
+from unittest import mock
+
+from mephisto.abstractions.blueprint import AgentState
 from mephisto.abstractions.databases.local_database import LocalMephistoDB
 from mephisto.tools.data_browser import DataBrowser
+from mephisto.data_model.constants.assignment_state import AssignmentState
+from mephisto.data_model.unit import Unit
 from mephisto.data_model.worker import Worker
 from mephisto.utils.qualifications import find_or_create_qualification
+from mephisto.utils.testing import get_test_agent
+from mephisto.utils.testing import get_test_unit
 
 
 class TestMTurkComponents(unittest.TestCase):
@@ -81,6 +88,29 @@ class TestMTurkComponents(unittest.TestCase):
         )
         self.assertNotIn(worker_2.db_id, qualified_ids, "Worker 2 should not be in qualified list")
 
+    def test_units_of_completed_agents(self) -> None:
+        """Ensure units still assigned in the db are found once their agent completed"""
+        unit_id = get_test_unit(self.db)
+        agent_id = get_test_agent(self.db, unit_id=unit_id)
+        self.db.update_agent(agent_id, status=AgentState.STATUS_COMPLETED)
+        unit = Unit.get(self.db, unit_id)
+        self.assertEqual(unit.db_status, AssignmentState.ASSIGNED)
+
+        # The default database is opened writable, as statuses are recorded
+        with mock.patch(
+            "mephisto.tools.data_browser.LocalMephistoDB",
+            side_effect=lambda **kwargs: LocalMephistoDB(self.db.db_path, **kwargs),
+        ):
+            data_browser = DataBrowser()
+        try:
+            units = data_browser.get_units_for_run_id(unit.task_run_id)
+            self.assertEqual([u.db_id for u in units], [unit_id])
+            self.assertEqual(
+                Unit.get(self.db, unit_id).get_db_status(), AssignmentState.COMPLETED
+            )
+        finally:
+            data_browser.db.shutdown()
+
 
 if __name__ == "__main__":
     unittest.main()
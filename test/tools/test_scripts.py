@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+# Copyright (c) Meta Platforms and its affiliates.
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import inspect
+import shutil
+import tempfile
+import unittest
+
+from omegaconf import OmegaConf
+
+from mephisto.abstractions.databases.agent_data_store import DEFAULT_AGENT_DATA_BACKEND
+from mephisto.abstractions.databases.agent_data_store import DEFAULT_COMPRESSION_THRESHOLD_BYTES
+from mephisto.abstractions.databases.agent_data_store import SQLITE_BACKEND
+from mephisto.abstractions.databases.connection_pool import DEFAULT_MAX_READER_CONNECTIONS
+from mephisto.abstractions.databases.local_database import DEFAULT_GROUP_COMMIT_INTERVAL_MS
+from mephisto.abstractions.databases.local_database import DEFAULT_GROUP_COMMIT_MAX_WRITES
+from mephisto.abstractions.databases.local_database_args import AgentDataArgs
+from mephisto.abstractions.databases.local_database_args import LocalMephistoDBArgs
+from mephisto.abstractions.databases.local_singleton_database import MephistoSingletonDB
+from mephisto.operations.hydra_config import DatabaseArgs
+from mephisto.tools.scripts import get_db_from_config
+
+
+class TestGetDBFromConfig(unittest.TestCase):
+    """
+    Unit testing for building databases from the database args of a config
+    """
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        self.db = None
+
+    def tearDown(self) -> None:
+        if self.db is not None:
+            self.db.shutdown()
+        shutil.rmtree(self.data_dir)
+
+    def get_config(self, **database_args):
+        database = OmegaConf.structured(DatabaseArgs)
+        for key, value in database_args.items():
+            OmegaConf.update(database, key, value)
+        return OmegaConf.create({"mephisto": {"datapath": self.data_dir, "database": database}})
+
+    def test_database_args_defaults_match(self) -> None:
+        """Ensure the config defaults are the ones of the modules they're used by"""
+        db_args = LocalMephistoDBArgs()
+        self.assertEqual(db_args.max_reader_connections, DEFAULT_MAX_READER_CONNECTIONS)
+        self.assertEqual(db_args.group_commit_interval_ms, DEFAULT_GROUP_COMMIT_INTERVAL_MS)
+        self.assertEqual(db_args.group_commit_max_writes, DEFAULT_GROUP_COMMIT_MAX_WRITES)
+        agent_data_args = AgentDataArgs()
+        self.assertEqual(agent_data_args.backend, DEFAULT_AGENT_DATA_BACKEND)
+        self.assertEqual(
+            agent_data_args.compression_threshold, DEFAULT_COMPRESSION_THRESHOLD_BYTES
+        )
+        singleton_parameters = inspect.signature(MephistoSingletonDB.__init__).parameters
+        self.assertEqual(
+            DatabaseArgs().singleton_cache_size, singleton_parameters["cache_size"].default
+        )
+
+    def test_database_args_passed_through(self) -> None:
+        """Ensure database args reach the database built from them"""
+        cfg = self.get_config(
+            _database_type="singleton",
+            singleton_cache_size=10,
+            group_commit_max_writes=7,
+        )
+        self.db = get_db_from_config(cfg)
+        self.assertIsInstance(self.db, MephistoSingletonDB)
+        self.assertEqual(self.db.group_commit_max_writes, 7)
+        self.assertTrue(all(c.max_size == 10 for c in self.db._singleton_cache.values()))
+        self.db.shutdown()
+
+        cfg = self.get_config(
+            _database_type="local",
+            group_commit_max_writes=7,
+            **{"agent_data.backend": SQLITE_BACKEND, "archives.attach": False},
+        )
+        self.db = get_db_from_config(cfg)
+        self.assertNotIsInstance(self.db, MephistoSingletonDB)
+        self.assertEqual(self.db.group_commit_max_writes, 7)
+        self.assertEqual(self.db.agent_data_backend, SQLITE_BACKEND)
+        self.assertFalse(self.db.attach_archives)
+
+
+if __name__ == "__main__":
+    unittest.main()
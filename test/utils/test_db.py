@@ -307,7 +307,7 @@ class TestUtilsDB(unittest.TestCase):
 
         for table_name in table_names:
             rows = db_utils.select_all_table_rows(self.db, table_name)
-            if table_name == "migrations":
+            if table_name in ["migrations", "unit_writes"]:
                 self.assertGreater(len(rows), 0)
             else:
                 self.assertEqual(len(rows), 0)
@@ -383,6 +383,7 @@ class TestUtilsDB(unittest.TestCase):
                     "task_runs",
                     "tasks",
                     "worker_review",
+                    "unit_writes",
                     "units",
                     "workers",
                 ]
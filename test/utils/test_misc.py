@@ -11,6 +11,7 @@ import pytest
 from dateutil.parser import ParserError
 from dateutil.tz import tzlocal
 
+from mephisto.utils.misc import parse_db_date
 from mephisto.utils.misc import serialize_date_to_python
 
 
@@ -38,3 +39,10 @@ class TestUtilsMisc(unittest.TestCase):
         with self.assertRaises(ParserError) as cm:
             serialize_date_to_python(wrong_date_string)
         self.assertEqual(cm.exception.__str__(), f"Unknown string format: {wrong_date_string}")
+
+    def test_parse_db_date(self, *args):
+        self.assertEqual(parse_db_date("2001-01-01 01:01:01"), datetime(2001, 1, 1, 1, 1, 1))
+        self.assertEqual(
+            parse_db_date("2002-02-02T02:02:02.000Z"),
+            datetime(2002, 2, 2, 2, 2, 2, tzinfo=tzlocal()),
+        )